@@ -0,0 +1,340 @@
+#-----------------------------------------------------------------------
+# The pyORBIT benchmark cases. All lattices and bunches are synthetic
+# and generated here, so the suite does not need any input files.
+#
+# Groups:
+#   tracking   - TEAPOT tracking throughput for each element type
+#   traversal  - the pure Python cost of the lattice walk
+#   sc2p5d     - 2.5D space charge calculator for several grid sizes
+#   sc3d       - 3D space charge calculator for several grid sizes
+#   mpi        - Grid2D MPI synchronization for several grid sizes
+#   matrix     - TEAPOT_MATRIX_Lattice construction
+#   parsers    - MAD and XML lattice files load times
+#   linac      - linac lattice tracking (drifts, quads, RF gaps)
+#-----------------------------------------------------------------------
+
+import os
+import math
+import random
+import shutil
+import tempfile
+
+from bunch import Bunch
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+
+from spacecharge import SpaceChargeCalc2p5D
+from spacecharge import SpaceChargeCalc3D
+from spacecharge import Grid2D
+
+from orbit.lattice import AccActionsContainer
+from orbit.teapot import TEAPOT_Lattice, TEAPOT_MATRIX_Lattice
+from orbit.teapot import DriftTEAPOT, QuadTEAPOT, BendTEAPOT
+from orbit.teapot import MultipoleTEAPOT, SolenoidTEAPOT, KickTEAPOT
+
+from orbit.utils.xml import XmlDataAdaptor
+
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, Quad, BaseRF_Gap
+
+from benchmark_lib import BenchmarkCase
+
+#-----------------------------------------------------
+# Synthetic bunches
+#-----------------------------------------------------
+
+def makeRingBunch(n_parts, seed = 1):
+	"""
+	Returns a 1 GeV proton bunch with n_parts macro-particles (on each CPU)
+	distributed by Gauss in all directions. The seed depends on the rank,
+	so CPUs have different, but reproducible particles.
+	"""
+	rank = orbit_mpi.MPI_Comm_rank(mpi_comm.MPI_COMM_WORLD)
+	rnd = random.Random(seed + 1000*rank)
+	bunch = Bunch()
+	bunch.mass(0.93827231)
+	bunch.macroSize(1.0e+10)
+	bunch.getSyncParticle().kinEnergy(1.0)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.003)
+		xp = rnd.gauss(0.,0.0003)
+		y = rnd.gauss(0.,0.003)
+		yp = rnd.gauss(0.,0.0003)
+		z = rnd.gauss(0.,1.0)
+		dE = rnd.gauss(0.,0.0005)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+def makeLinacBunch(n_parts, seed = 1):
+	"""
+	Returns a 2.5 MeV H- bunch with n_parts macro-particles (on each CPU).
+	"""
+	rank = orbit_mpi.MPI_Comm_rank(mpi_comm.MPI_COMM_WORLD)
+	rnd = random.Random(seed + 1000*rank)
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.macroSize(1.0e+5)
+	bunch.getSyncParticle().kinEnergy(0.0025)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.002)
+		xp = rnd.gauss(0.,0.002)
+		y = rnd.gauss(0.,0.002)
+		yp = rnd.gauss(0.,0.002)
+		z = rnd.gauss(0.,0.002)
+		dE = rnd.gauss(0.,0.00001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+#-----------------------------------------------------
+# Synthetic lattices
+#-----------------------------------------------------
+
+def makeElementLattice(elem_type, n_elems):
+	"""
+	Returns the TEAPOT_Lattice with n_elems elements of one type.
+	"""
+	lattice = TEAPOT_Lattice("bench_"+elem_type)
+	for ind in range(n_elems):
+		name = elem_type+"_"+str(ind)
+		if(elem_type == "drift"):
+			elem = DriftTEAPOT(name)
+		elif(elem_type == "quad"):
+			elem = QuadTEAPOT(name)
+			elem.addParam("kq",0.5*(1 - 2*(ind%2)))
+		elif(elem_type == "bend"):
+			elem = BendTEAPOT(name)
+			elem.addParam("theta",2*math.pi/n_elems)
+		elif(elem_type == "multipole"):
+			elem = MultipoleTEAPOT(name)
+			elem.addParam("poles",[2,3])
+			elem.addParam("kls",[0.01,0.001])
+			elem.addParam("skews",[0,0])
+		elif(elem_type == "solenoid"):
+			elem = SolenoidTEAPOT(name)
+			elem.addParam("B",0.1)
+		elif(elem_type == "kick"):
+			elem = KickTEAPOT(name)
+			elem.addParam("kx",1.0e-6)
+			elem.addParam("ky",1.0e-6)
+		elem.setLength(1.0)
+		lattice.addNode(elem)
+	lattice.initialize()
+	return lattice
+
+def makeFODOLattice(n_cells):
+	"""
+	Returns the TEAPOT_Lattice with n_cells FODO cells with bends.
+	"""
+	lattice = TEAPOT_Lattice("bench_fodo")
+	theta = 2*math.pi/(2*n_cells)
+	for ind in range(n_cells):
+		qf = QuadTEAPOT("qf_"+str(ind))
+		qf.addParam("kq",0.5)
+		qf.setLength(0.5)
+		b1 = BendTEAPOT("b1_"+str(ind))
+		b1.addParam("theta",theta)
+		b1.setLength(2.0)
+		qd = QuadTEAPOT("qd_"+str(ind))
+		qd.addParam("kq",-0.5)
+		qd.setLength(0.5)
+		b2 = BendTEAPOT("b2_"+str(ind))
+		b2.addParam("theta",theta)
+		b2.setLength(2.0)
+		for elem in [qf,b1,qd,b2]:
+			lattice.addNode(elem)
+	lattice.initialize()
+	return lattice
+
+def makeLinacLattice(n_cells):
+	"""
+	Returns the LinacAccLattice with n_cells periods drift-quad-drift-gap-drift-quad-drift-gap.
+	Each period has one RF cavity with two gaps.
+	"""
+	lattice = LinacAccLattice("bench_linac")
+	seq = Sequence("BENCH")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	frequency = 402.5e+6
+	for ind in range(n_cells):
+		cav = RF_Cavity("cav_"+str(ind))
+		cav.setFrequency(frequency)
+		cav.setAmp(1.0)
+		cav.setPhase(-30.*math.pi/180.)
+		seq.addRF_Cavity(cav)
+		nodes = []
+		for quad_ind in range(2):
+			drift_in = Drift("d_in_"+str(ind)+"_"+str(quad_ind))
+			drift_in.setLength(0.05)
+			quad = Quad("q_"+str(ind)+"_"+str(quad_ind))
+			quad.setLength(0.06)
+			quad.setParam("dB/dr",30.*(1 - 2*quad_ind))
+			drift_out = Drift("d_out_"+str(ind)+"_"+str(quad_ind))
+			drift_out.setLength(0.05)
+			gap = BaseRF_Gap("gap_"+str(ind)+"_"+str(quad_ind))
+			gap.setParam("E0TL",0.0001)
+			gap.setParam("E0L",0.0001)
+			gap.setParam("mode",1.0)
+			cav.addRF_GapNode(gap)
+			nodes += [drift_in,quad,drift_out,gap]
+		for node in nodes:
+			seq.addNode(node)
+			lattice.addNode(node)
+	lattice.initialize()
+	return lattice
+
+#-----------------------------------------------------
+# Synthetic input files for parsers
+#-----------------------------------------------------
+
+def writeMADFile(dir_name, n_cells):
+	""" Writes the MAD file with n_cells FODO cells and returns the file name. """
+	file_name = os.path.join(dir_name,"bench_lattice.mad")
+	fl_out = open(file_name,"w")
+	fl_out.write("qf: quadrupole, l=0.5, k1=0.5"+os.linesep)
+	fl_out.write("qd: quadrupole, l=0.5, k1=-0.5"+os.linesep)
+	fl_out.write("b1: sbend, l=2.0, angle="+str(math.pi/n_cells)+os.linesep)
+	fl_out.write("d1: drift, l=1.0"+os.linesep)
+	fl_out.write("cell: line=(qf,d1,b1,d1,qd,d1,b1,d1)"+os.linesep)
+	fl_out.write("ring: line=("+str(n_cells)+"*cell)"+os.linesep)
+	fl_out.close()
+	return file_name
+
+def writeXMLFile(dir_name, n_nodes):
+	""" Writes the XML linac-like file with n_nodes accElement nodes and returns the file name. """
+	file_name = os.path.join(dir_name,"bench_linac.xml")
+	root_da = XmlDataAdaptor("BENCH_Linac")
+	seq_da = root_da.createChild("BENCH")
+	seq_da.setValue("length",n_nodes*0.1)
+	for ind in range(n_nodes):
+		node_da = seq_da.createChild("accElement")
+		node_da.setValue("name","QUAD_"+str(ind))
+		node_da.setValue("type","QUAD")
+		node_da.setValue("length",0.06)
+		node_da.setValue("pos",0.1*ind)
+		params_da = node_da.createChild("parameters")
+		params_da.setValue("field",30.0)
+		params_da.setValue("aperture",0.02)
+		params_da.setValue("aprt_type",1)
+	root_da.writeToFile(file_name)
+	return file_name
+
+#-----------------------------------------------------
+# Cases factory
+#-----------------------------------------------------
+
+def addTrackingCases(suite, n_parts, n_elems = 100):
+	""" Tracking throughput for each TEAPOT element type. """
+	for elem_type in ["drift","quad","bend","multipole","solenoid","kick"]:
+		def setup(elem_type = elem_type):
+			return {"lattice":makeElementLattice(elem_type,n_elems),"bunch":makeRingBunch(n_parts)}
+		def timed(data):
+			data["lattice"].trackBunch(data["bunch"])
+			return data["bunch"].getSize()*len(data["lattice"].getNodes())
+		suite.addCase(BenchmarkCase("tracking_"+elem_type,"tracking",setup,timed,units = "part*elem"))
+
+def addTraversalCases(suite, n_cells = 250):
+	""" The cost of the lattice walk without any physics. """
+	def setup():
+		return {"lattice":makeFODOLattice(n_cells)}
+	def timed(data):
+		actions = AccActionsContainer()
+		data["lattice"].trackActions(actions,{})
+		return len(data["lattice"].getNodes())
+	suite.addCase(BenchmarkCase("traversal_fodo","traversal",setup,timed,units = "node"))
+
+def addSC2p5DCases(suite, n_parts, grid_sizes = [64,128,256]):
+	""" 2.5D space charge solver for different grid sizes. """
+	for size in grid_sizes:
+		def setup(size = size):
+			return {"calc":SpaceChargeCalc2p5D(size,size,1),"bunch":makeRingBunch(n_parts)}
+		def timed(data, size = size):
+			data["calc"].trackBunch(data["bunch"],0.1)
+			return size*size
+		suite.addCase(BenchmarkCase("sc2p5d_grid_"+str(size),"sc2p5d",setup,timed,units = "cell"))
+
+def addSC3DCases(suite, n_parts, grid_sizes = [16,32,64]):
+	""" 3D space charge solver for different grid sizes. """
+	for size in grid_sizes:
+		def setup(size = size):
+			return {"calc":SpaceChargeCalc3D(size,size,size),"bunch":makeLinacBunch(n_parts)}
+		def timed(data, size = size):
+			data["calc"].trackBunch(data["bunch"],0.01)
+			return size*size*size
+		suite.addCase(BenchmarkCase("sc3d_grid_"+str(size),"sc3d",setup,timed,units = "cell"))
+
+def addMPICases(suite, grid_sizes = [128,256,512]):
+	""" MPI synchronization of the Grid2D. """
+	for size in grid_sizes:
+		def setup(size = size):
+			grid = Grid2D(size,size,-0.01,0.01,-0.01,0.01)
+			grid.setValue(1.0,size/2,size/2)
+			return {"grid":grid}
+		def timed(data, size = size):
+			data["grid"].synchronizeMPI()
+			return size*size
+		suite.addCase(BenchmarkCase("mpi_grid2d_sync_"+str(size),"mpi",setup,timed,units = "cell"))
+
+def addMatrixCases(suite, n_cells = 100):
+	""" TEAPOT_MATRIX_Lattice construction. """
+	def setup():
+		return {"lattice":makeFODOLattice(n_cells),"bunch":makeRingBunch(0)}
+	def timed(data):
+		matrix_lattice = TEAPOT_MATRIX_Lattice(data["lattice"],data["bunch"])
+		return len(matrix_lattice.getNodes())
+	suite.addCase(BenchmarkCase("matrix_lattice_fodo","matrix",setup,timed,n_repeats = 3,units = "matrix"))
+
+def addParserCases(suite, n_cells = 500):
+	""" Load times of MAD and XML lattice files. """
+	dir_name = tempfile.mkdtemp(prefix = "orbit_bench_")
+	def setupMAD():
+		return {"file":writeMADFile(dir_name,n_cells)}
+	def timedMAD(data):
+		lattice = TEAPOT_Lattice()
+		lattice.readMAD(data["file"],"ring")
+		return len(lattice.getNodes())
+	suite.addCase(BenchmarkCase("parser_mad","parsers",setupMAD,timedMAD,n_repeats = 3,units = "node"))
+	def setupXML():
+		return {"file":writeXMLFile(dir_name,8*n_cells)}
+	def timedXML(data):
+		root_da = XmlDataAdaptor.adaptorForFile(data["file"])
+		return len(root_da.childAdaptors()[0].childAdaptors())
+	suite.addCase(BenchmarkCase("parser_xml","parsers",setupXML,timedXML,n_repeats = 3,units = "node"))
+	return dir_name
+
+def addLinacCases(suite, n_parts, n_cells = 50):
+	""" Linac lattice tracking. """
+	def setup():
+		lattice = makeLinacLattice(n_cells)
+		bunch = makeLinacBunch(n_parts)
+		lattice.trackDesignBunch(bunch)
+		return {"lattice":lattice,"bunch":bunch}
+	def timed(data):
+		bunch = Bunch()
+		data["bunch"].copyBunchTo(bunch)
+		data["lattice"].trackBunch(bunch)
+		return bunch.getSize()*len(data["lattice"].getNodes())
+	suite.addCase(BenchmarkCase("linac_tracking","linac",setup,timed,units = "part*node"))
+
+def makeAllCases(suite, n_parts):
+	"""
+	Adds all benchmark cases to the suite. Returns the list of
+	temporary directories that should be removed at the end.
+	"""
+	addTrackingCases(suite,n_parts)
+	addTraversalCases(suite)
+	addSC2p5DCases(suite,n_parts)
+	addSC3DCases(suite,n_parts)
+	addMPICases(suite)
+	addMatrixCases(suite)
+	tmp_dir = addParserCases(suite)
+	addLinacCases(suite,n_parts)
+	return [tmp_dir,]
+
+def removeTemporaryDirs(dir_names):
+	""" Removes temporary directories created by the parsers cases. """
+	orbit_mpi.MPI_Barrier(mpi_comm.MPI_COMM_WORLD)
+	for dir_name in dir_names:
+		if(os.path.isdir(dir_name)):
+			shutil.rmtree(dir_name,True)
@@ -0,0 +1,182 @@
+#-----------------------------------------------------------------------
+# The infrastructure for the pyORBIT performance benchmarks.
+#
+#  BenchmarkCase   - one timed case (setup function + timed function)
+#  BenchmarkSuite  - the collection of cases. It runs them, writes
+#                    the results into a JSON file, and compares the
+#                    results with a stored baseline JSON file.
+#
+# Timing is done with orbit_mpi.MPI_Wtime(). In the parallel case each
+# case is timed on every CPU and the maximal time over the CPUs is
+# reported, because it is the slowest CPU that defines the wall time.
+#-----------------------------------------------------------------------
+
+import os
+import sys
+import math
+import json
+import platform
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+from orbit_mpi import mpi_datatype
+from orbit_mpi import mpi_op
+
+# the version of the results file format
+BENCHMARK_FORMAT_VERSION = 1
+
+class BenchmarkCase:
+	"""
+	One benchmark case. The setup function is called once before timing
+	and it returns the object (usually a dictionary) that is passed into
+	the timed function. The timed function returns the number of
+	'work units' (particles*passes, grid points etc.) performed by one call,
+	it is used to calculate the throughput.
+	"""
+	def __init__(self, name, group, setup_func, timed_func, n_repeats = 5, units = "call"):
+		self.name = name
+		self.group = group
+		self.setup_func = setup_func
+		self.timed_func = timed_func
+		self.n_repeats = n_repeats
+		self.units = units
+
+	def run(self, comm = mpi_comm.MPI_COMM_WORLD):
+		"""
+		Runs the case and returns a dictionary with results.
+		The first call of the timed function is a warm-up and it is not timed.
+		"""
+		setup_data = self.setup_func()
+		self.timed_func(setup_data)
+		times = []
+		work = 1.
+		for ind in range(self.n_repeats):
+			orbit_mpi.MPI_Barrier(comm)
+			time_start = orbit_mpi.MPI_Wtime()
+			work = self.timed_func(setup_data)
+			time_local = orbit_mpi.MPI_Wtime() - time_start
+			time_max = orbit_mpi.MPI_Allreduce(time_local,mpi_datatype.MPI_DOUBLE,mpi_op.MPI_MAX,comm)
+			times.append(time_max)
+		if(work == None): work = 1.
+		times.sort()
+		time_min = times[0]
+		time_median = times[len(times)/2]
+		time_avg = sum(times)/len(times)
+		time_rms = 0.
+		for time in times:
+			time_rms += (time - time_avg)**2
+		time_rms = math.sqrt(time_rms/len(times))
+		throughput = 0.
+		if(time_median > 0.): throughput = work/time_median
+		res_dict = {}
+		res_dict["name"] = self.name
+		res_dict["group"] = self.group
+		res_dict["n_repeats"] = self.n_repeats
+		res_dict["time_min"] = time_min
+		res_dict["time_median"] = time_median
+		res_dict["time_rms"] = time_rms
+		res_dict["work"] = work
+		res_dict["units"] = self.units
+		res_dict["throughput"] = throughput
+		return res_dict
+
+class BenchmarkSuite:
+	"""
+	The collection of the benchmark cases.
+	"""
+	def __init__(self, name = "pyORBIT benchmarks"):
+		self.name = name
+		self.cases = []
+		self.results = []
+
+	def addCase(self, case):
+		""" Adds the BenchmarkCase instance. """
+		self.cases.append(case)
+
+	def getGroups(self):
+		""" Returns the list of the groups names in the order of appearance. """
+		groups = []
+		for case in self.cases:
+			if(not case.group in groups): groups.append(case.group)
+		return groups
+
+	def run(self, groups = None, n_repeats = None, comm = mpi_comm.MPI_COMM_WORLD):
+		"""
+		Runs the cases from the specified groups (all of them by default).
+		Returns the list of the result dictionaries.
+		"""
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		self.results = []
+		for case in self.cases:
+			if(groups != None and not case.group in groups): continue
+			if(n_repeats != None): case.n_repeats = n_repeats
+			res_dict = case.run(comm)
+			self.results.append(res_dict)
+			if(rank == 0):
+				st = " %-40s  median[sec]= %12.5e  rms= %10.3e throughput= %12.5e %s/sec"
+				print st%(case.name,res_dict["time_median"],res_dict["time_rms"],res_dict["throughput"],case.units)
+				sys.stdout.flush()
+		return self.results
+
+	def getResultsDict(self, comm = mpi_comm.MPI_COMM_WORLD):
+		"""
+		Returns the dictionary with the results and information about the
+		environment. This dictionary is dumped into the JSON file.
+		"""
+		info = {}
+		info["suite"] = self.name
+		info["format_version"] = BENCHMARK_FORMAT_VERSION
+		info["n_cpus"] = orbit_mpi.MPI_Comm_size(comm)
+		info["host"] = platform.node()
+		info["platform"] = platform.platform()
+		info["python"] = platform.python_version()
+		res_dict = {}
+		res_dict["info"] = info
+		res_dict["results"] = self.results
+		return res_dict
+
+	def writeResults(self, file_name, comm = mpi_comm.MPI_COMM_WORLD):
+		""" Writes the results into the JSON file. Only rank 0 writes. """
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		if(rank != 0): return
+		fl_out = open(file_name,"w")
+		json.dump(self.getResultsDict(comm),fl_out,indent = 1,sort_keys = True)
+		fl_out.write(os.linesep)
+		fl_out.close()
+
+	def compareWithBaseline(self, baseline_file_name, tolerance = 0.10, comm = mpi_comm.MPI_COMM_WORLD):
+		"""
+		Compares the median times with the ones from the baseline JSON file.
+		It returns the list of (name,time_baseline,time_now,ratio,status)
+		tuples, where status is "SLOWER", "FASTER", "OK", or "NEW".
+		The tolerance is the relative change that is considered as noise.
+		"""
+		fl_in = open(baseline_file_name,"r")
+		baseline_dict = json.load(fl_in)
+		fl_in.close()
+		baseline_times = {}
+		for res_dict in baseline_dict["results"]:
+			baseline_times[res_dict["name"]] = res_dict["time_median"]
+		comparison_arr = []
+		for res_dict in self.results:
+			name = res_dict["name"]
+			time_now = res_dict["time_median"]
+			if(not baseline_times.has_key(name)):
+				comparison_arr.append((name,None,time_now,None,"NEW"))
+				continue
+			time_base = baseline_times[name]
+			ratio = 1.0
+			if(time_base > 0.): ratio = time_now/time_base
+			status = "OK"
+			if(ratio > 1.0 + tolerance): status = "SLOWER"
+			if(ratio < 1.0 - tolerance): status = "FASTER"
+			comparison_arr.append((name,time_base,time_now,ratio,status))
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		if(rank == 0):
+			print "======= Comparison with baseline: ",baseline_file_name
+			for (name,time_base,time_now,ratio,status) in comparison_arr:
+				if(time_base == None):
+					print " %-40s  %-6s now= %12.5e"%(name,status,time_now)
+				else:
+					print " %-40s  %-6s base= %12.5e now= %12.5e ratio= %6.3f"%(name,status,time_base,time_now,ratio)
+		return comparison_arr
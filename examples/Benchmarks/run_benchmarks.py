@@ -0,0 +1,68 @@
+#-----------------------------------------------------------------------
+# The pyORBIT performance benchmark suite.
+#
+# It runs offline with synthetic lattices and bunches, writes the results
+# into a JSON file, and optionally compares them with a stored baseline
+# (a JSON results file from a previous run).
+#
+# Usage:
+#   ./START.sh run_benchmarks.py <N CPUs>
+#   pyORBIT run_benchmarks.py [--groups tracking,sc2p5d] [--n_parts 20000]
+#           [--repeats 5] [--output results.json]
+#           [--baseline baseline.json] [--tolerance 0.1]
+#
+# To store a new baseline just copy the output JSON file.
+# The exit code is 1 if some cases are slower than the baseline
+# beyond the tolerance, so the script can be used in the CI scripts.
+#-----------------------------------------------------------------------
+
+import sys
+import argparse
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+
+from benchmark_lib import BenchmarkSuite
+from benchmark_cases import makeAllCases, removeTemporaryDirs
+
+parser = argparse.ArgumentParser(description = "pyORBIT performance benchmarks")
+parser.add_argument("--groups", default = None, help = "comma separated list of groups, all by default")
+parser.add_argument("--n_parts", type = int, default = 20000, help = "number of macro-particles per CPU")
+parser.add_argument("--repeats", type = int, default = None, help = "number of timed repetitions for each case")
+parser.add_argument("--output", default = "benchmark_results.json", help = "output JSON file")
+parser.add_argument("--baseline", default = None, help = "baseline JSON file to compare with")
+parser.add_argument("--tolerance", type = float, default = 0.10, help = "relative change treated as noise")
+args = parser.parse_args(sys.argv[1:])
+
+rank = orbit_mpi.MPI_Comm_rank(mpi_comm.MPI_COMM_WORLD)
+
+suite = BenchmarkSuite()
+tmp_dirs = makeAllCases(suite,args.n_parts)
+
+groups = None
+if(args.groups != None):
+	groups = args.groups.split(",")
+	for group in groups:
+		if(not group in suite.getGroups()):
+			if(rank == 0):
+				print "Unknown benchmark group=",group," possible groups=",suite.getGroups()
+			removeTemporaryDirs(tmp_dirs)
+			sys.exit(1)
+
+if(rank == 0):
+	print "======= pyORBIT benchmarks n_parts per CPU=",args.n_parts," CPUs=",orbit_mpi.MPI_Comm_size(mpi_comm.MPI_COMM_WORLD)
+
+suite.run(groups,args.repeats)
+suite.writeResults(args.output)
+removeTemporaryDirs(tmp_dirs)
+
+exit_code = 0
+if(args.baseline != None):
+	comparison_arr = suite.compareWithBaseline(args.baseline,args.tolerance)
+	for (name,time_base,time_now,ratio,status) in comparison_arr:
+		if(status == "SLOWER"): exit_code = 1
+
+if(rank == 0):
+	print "======= results are in the file=",args.output
+
+sys.exit(exit_code)
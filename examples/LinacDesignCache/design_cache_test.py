@@ -0,0 +1,108 @@
+#-----------------------------------------------------------------------
+# The test of the design bunch tracking cache. The linac with 100 RF
+# cavities is tracked by the trackDesignBunch method without the cache,
+# and with the cache after the phase change of the last RF cavity or
+# without any changes. The design parameters of the RF cavities found
+# with the cache are compared with the ones found by the full design
+# tracking, and the average times of one call are printed.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import time
+
+from bunch import Bunch
+
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, Quad, BaseRF_Gap
+
+def makeLattice(n_cells = 100):
+	"""
+	Returns the LinacAccLattice with n_cells periods drift-quad-drift-gap-drift-quad-drift-gap.
+	Each period has one RF cavity with two gaps.
+	"""
+	lattice = LinacAccLattice("design_cache_test_linac")
+	seq = Sequence("TEST")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	for ind in range(n_cells):
+		cav = RF_Cavity("cav_"+str(ind))
+		cav.setFrequency(402.5e+6)
+		cav.setAmp(1.0)
+		cav.setPhase(-30.*math.pi/180.)
+		seq.addRF_Cavity(cav)
+		for quad_ind in range(2):
+			drift_in = Drift("d_in_"+str(ind)+"_"+str(quad_ind))
+			drift_in.setLength(0.05)
+			quad = Quad("q_"+str(ind)+"_"+str(quad_ind))
+			quad.setLength(0.06)
+			quad.setParam("dB/dr",30.*(1 - 2*quad_ind))
+			drift_out = Drift("d_out_"+str(ind)+"_"+str(quad_ind))
+			drift_out.setLength(0.05)
+			gap = BaseRF_Gap("gap_"+str(ind)+"_"+str(quad_ind))
+			gap.setParam("E0TL",0.0001)
+			gap.setParam("E0L",0.0001)
+			gap.setParam("mode",1.0)
+			cav.addRF_GapNode(gap)
+			for node in (drift_in,quad,drift_out,gap):
+				seq.addNode(node)
+				lattice.addNode(node)
+	lattice.initialize()
+	return lattice
+
+def makeDesignBunch():
+	""" Returns the 2.5 MeV H- bunch without particles. """
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.getSyncParticle().kinEnergy(0.0025)
+	return bunch
+
+def cavitiesDesign(lattice):
+	""" Returns the list of (design arrival time, design phase, design amp) of the RF cavities. """
+	res = []
+	for cav in lattice.getRF_Cavities():
+		res.append((cav.getDesignArrivalTime(),cav.getDesignPhase(),cav.getDesignAmp()))
+	return res
+
+def averageTime(lattice, bunch, n_repeats, change_phase):
+	""" Returns the average time of the trackDesignBunch call. """
+	last_cav = lattice.getRF_Cavities()[-1]
+	time_start = time.time()
+	for ind in range(n_repeats):
+		if(change_phase):
+			last_cav.setPhase((-30. + ind % 2)*math.pi/180.)
+		lattice.trackDesignBunch(bunch)
+	return (time.time() - time_start)/n_repeats
+
+lattice = makeLattice()
+bunch = makeDesignBunch()
+print "N nodes =",len(lattice.getNodes())," N RF cavities =",len(lattice.getRF_Cavities())
+
+n_repeats = 20
+
+time_full = averageTime(lattice,bunch,n_repeats,True)
+
+lattice.setDesignCache(True)
+lattice.trackDesignBunch(bunch)
+time_cached_changed = averageTime(lattice,bunch,n_repeats,True)
+time_cached_unchanged = averageTime(lattice,bunch,n_repeats,False)
+
+#---- the cached results should be the same as the full design tracking
+last_cav = lattice.getRF_Cavities()[-1]
+last_cav.setPhase(-25.*math.pi/180.)
+lattice.trackDesignBunch(bunch)
+design_cached = cavitiesDesign(lattice)
+lattice.setDesignCache(False)
+lattice.trackDesignBunch(bunch)
+design_full = cavitiesDesign(lattice)
+print "Cached design parameters are the same as the full tracking ones =",(design_cached == design_full)
+
+print "Time of the full design tracking [sec]                =",time_full
+print "Time with cache after the last cavity change [sec]    =",time_cached_changed
+print "Time with cache without changes [sec]                 =",time_cached_unchanged
+print "Speedup after the last cavity change =",time_full/time_cached_changed
+
+print "====STOP==="
+
+sys.exit(0)
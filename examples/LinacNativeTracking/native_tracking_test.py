@@ -0,0 +1,180 @@
+#-----------------------------------------------------------------------
+# The test of the linac native tracking. The same lattice is tracked at
+# the python level and by the C++ instruction lists, and the difference
+# of particles' coordinates is printed. Then the parameters of the quads
+# and RF cavities are changed by the setters and by updateParamsDict(...),
+# and the comparison is repeated to check that the instruction lists
+# are created again after the changes. The coordinates and the loss
+# positions of the lost particles are compared too, because the lost
+# particles should be removed right after the aperture, phase aperture,
+# or energy aperture. At the end the tracking times are printed.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import time
+import random
+
+from bunch import Bunch
+
+from orbit.lattice import AccNode
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, Quad, BaseRF_Gap
+from orbit.py_linac.lattice import CircleLinacApertureNode
+from orbit.py_linac.lattice import LinacPhaseApertureNode, LinacEnergyApertureNode
+
+def makeLattice(n_cells = 20):
+	"""
+	Returns the LinacAccLattice with n_cells periods drift-quad-drift-gap-drift-quad-drift-gap.
+	Each period has one RF cavity with two gaps. The quads have aperture child nodes,
+	and the second gaps of every fifth period have phase and energy aperture child nodes.
+	"""
+	lattice = LinacAccLattice("native_test_linac")
+	seq = Sequence("TEST")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	for ind in range(n_cells):
+		cav = RF_Cavity("cav_"+str(ind))
+		cav.setFrequency(402.5e+6)
+		cav.setAmp(1.0)
+		cav.setPhase(-30.*math.pi/180.)
+		seq.addRF_Cavity(cav)
+		nodes = []
+		for quad_ind in range(2):
+			drift_in = Drift("d_in_"+str(ind)+"_"+str(quad_ind))
+			drift_in.setLength(0.05)
+			quad = Quad("q_"+str(ind)+"_"+str(quad_ind))
+			quad.setLength(0.06)
+			quad.setParam("dB/dr",30.*(1 - 2*quad_ind))
+			aprt = CircleLinacApertureNode(0.004,0.,0.,0.,quad.getName()+"_aprt")
+			quad.addChildNode(aprt,AccNode.EXIT)
+			drift_out = Drift("d_out_"+str(ind)+"_"+str(quad_ind))
+			drift_out.setLength(0.05)
+			gap = BaseRF_Gap("gap_"+str(ind)+"_"+str(quad_ind))
+			gap.setParam("E0TL",0.0001)
+			gap.setParam("E0L",0.0001)
+			gap.setParam("mode",1.0)
+			cav.addRF_GapNode(gap)
+			if(quad_ind == 1 and ind % 5 == 4):
+				phase_aprt = LinacPhaseApertureNode(402.5e+6,gap.getName()+"_phase_aprt")
+				phase_aprt.setMinMaxPhase(-25.,25.)
+				gap.addChildNode(phase_aprt,AccNode.EXIT)
+				energy_aprt = LinacEnergyApertureNode(gap.getName()+"_energy_aprt")
+				energy_aprt.setMinMaxEnergy(-0.00004,0.00004)
+				gap.addChildNode(energy_aprt,AccNode.EXIT)
+			nodes += [drift_in,quad,drift_out,gap]
+		for node in nodes:
+			seq.addNode(node)
+			lattice.addNode(node)
+	lattice.initialize()
+	#---- the positions of the aperture child nodes are the positions of the parents
+	for node in lattice.getNodes():
+		for child in node.getAllChildren():
+			child.setPosition(node.getPosition())
+	return lattice
+
+def makeBunch(n_parts):
+	""" Returns the 2.5 MeV H- bunch. """
+	rnd = random.Random(1)
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.getSyncParticle().kinEnergy(0.0025)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.001)
+		xp = rnd.gauss(0.,0.001)
+		y = rnd.gauss(0.,0.001)
+		yp = rnd.gauss(0.,0.001)
+		z = rnd.gauss(0.,0.002)
+		dE = rnd.gauss(0.,0.00001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+def trackBunch(lattice, bunch_init):
+	""" Returns the tracked copy of the bunch and the lost bunch. """
+	bunch = Bunch()
+	bunch_init.copyBunchTo(bunch)
+	lostbunch = Bunch()
+	bunch.copyEmptyBunchTo(lostbunch)
+	paramsDict = {"lostbunch":lostbunch}
+	lattice.trackBunch(bunch,paramsDict)
+	return (bunch,lostbunch)
+
+def compare(lattice, lattice_native, bunch_init, title):
+	""" Prints the difference between the python level and native tracking. """
+	(bunch,lostbunch) = trackBunch(lattice,bunch_init)
+	(bunch_nt,lostbunch_nt) = trackBunch(lattice_native,bunch_init)
+	print "========",title
+	print "N parts python =",bunch.getSize()," native =",bunch_nt.getSize()
+	print "N lost python  =",lostbunch.getSize()," native =",lostbunch_nt.getSize()
+	print "Ekin python =",bunch.getSyncParticle().kinEnergy()," native =",bunch_nt.getSyncParticle().kinEnergy()
+	if(lostbunch.getSize() == lostbunch_nt.getSize()):
+		radius_max = 0.
+		radius_max_nt = 0.
+		diff_max = 0.
+		pos_diff_max = 0.
+		for ip in range(lostbunch.getSize()):
+			radius_max = max(radius_max,math.sqrt(lostbunch.x(ip)**2 + lostbunch.y(ip)**2))
+			radius_max_nt = max(radius_max_nt,math.sqrt(lostbunch_nt.x(ip)**2 + lostbunch_nt.y(ip)**2))
+			coords = (lostbunch.x(ip),lostbunch.xp(ip),lostbunch.y(ip),lostbunch.yp(ip),lostbunch.z(ip),lostbunch.dE(ip))
+			coords_nt = (lostbunch_nt.x(ip),lostbunch_nt.xp(ip),lostbunch_nt.y(ip),lostbunch_nt.yp(ip),lostbunch_nt.z(ip),lostbunch_nt.dE(ip))
+			for ind in range(6):
+				diff_max = max(diff_max,abs(coords[ind] - coords_nt[ind]))
+			pos = lostbunch.partAttrValue("LostParticleAttributes",ip,0)
+			pos_nt = lostbunch_nt.partAttrValue("LostParticleAttributes",ip,0)
+			pos_diff_max = max(pos_diff_max,abs(pos - pos_nt))
+		print "Max lost radius python =",radius_max," native =",radius_max_nt
+		print "Max difference of lost coordinates =",diff_max," of loss positions =",pos_diff_max
+	else:
+		print "The numbers of lost particles are different!"
+	if(bunch.getSize() != bunch_nt.getSize()):
+		print "The numbers of particles are different!"
+		return
+	diff_max = [0.]*6
+	for ip in range(bunch.getSize()):
+		coords = (bunch.x(ip),bunch.xp(ip),bunch.y(ip),bunch.yp(ip),bunch.z(ip),bunch.dE(ip))
+		coords_nt = (bunch_nt.x(ip),bunch_nt.xp(ip),bunch_nt.y(ip),bunch_nt.yp(ip),bunch_nt.z(ip),bunch_nt.dE(ip))
+		for ind in range(6):
+			diff_max[ind] = max(diff_max[ind],abs(coords[ind] - coords_nt[ind]))
+	print "Max difference (x,xp,y,yp,z,dE) =",diff_max
+
+#---- two copies of the same lattice, the second one uses the native tracking
+lattice = makeLattice()
+lattice_native = makeLattice()
+
+bunch_init = makeBunch(2000)
+
+lattice.trackDesignBunch(bunch_init)
+lattice_native.trackDesignBunch(bunch_init)
+lattice_native.setNativeTracking(True)
+
+compare(lattice,lattice_native,bunch_init,"Initial lattice")
+
+#---- the changes by the setters without the lattice initialization
+#---- or the design tracking, so the instruction lists are not lowered again
+#---- by the lattice and the changes should be found by the change counters
+for lat in (lattice,lattice_native):
+	lat.getNodesForName("q_3_0")[0].setParam("dB/dr",40.)
+	lat.getNodesForName("d_in_5_1")[0].setLength(0.07)
+	lat.getRF_Cavities()[2].setPhase(-20.*math.pi/180.)
+
+compare(lattice,lattice_native,bunch_init,"After setParam, setLength, and setPhase")
+
+#---- the changes by updateParamsDict(...) like in the lattice factories
+for lat in (lattice,lattice_native):
+	lat.getRF_Cavities()[4].updateParamsDict({"Amp":0.5})
+	lat.getNodesForName("q_7_1")[0].updateParamsDict({"dB/dr":-40.})
+
+compare(lattice,lattice_native,bunch_init,"After updateParamsDict")
+
+#---- the tracking times
+n_repeats = 5
+for (lat,title) in ((lattice,"python"),(lattice_native,"native")):
+	time_start = time.time()
+	for ind in range(n_repeats):
+		trackBunch(lat,bunch_init)
+	print "Tracking time",title,"=",(time.time() - time_start)/n_repeats," sec"
+
+print "====STOP==="
+
+sys.exit(0)
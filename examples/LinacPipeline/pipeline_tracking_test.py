@@ -0,0 +1,131 @@
+#-----------------------------------------------------------------------
+# The test of the pipeline tracking of the linac bunches. The bunches
+# are tracked by the LinacPipelineTracker with 1, 2, and 4 stages (the
+# number of stages should divide the number of CPUs), and the results
+# on the CPUs of the first stage are compared with the serial tracking
+# of the same bunches by trackBunch(...) of the whole lattice.
+# Run it as: ./START.sh pipeline_tracking_test.py 4
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import time
+import random
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+from orbit_mpi import mpi_datatype
+from orbit_mpi import mpi_op
+
+from bunch import Bunch
+
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, Quad, BaseRF_Gap
+from orbit.py_linac.lattice import LinacPipelineTracker
+
+def makeLattice(n_cells = 10):
+	"""
+	Returns the LinacAccLattice with n_cells periods drift-quad-drift-gap-drift-quad-drift-gap.
+	Each period has one RF cavity with two gaps.
+	"""
+	lattice = LinacAccLattice("pipeline_test_linac")
+	seq = Sequence("TEST")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	for ind in range(n_cells):
+		cav = RF_Cavity("cav_"+str(ind))
+		cav.setFrequency(402.5e+6)
+		cav.setAmp(1.0)
+		cav.setPhase(-30.*math.pi/180.)
+		seq.addRF_Cavity(cav)
+		for quad_ind in range(2):
+			drift_in = Drift("d_in_"+str(ind)+"_"+str(quad_ind))
+			drift_in.setLength(0.05)
+			quad = Quad("q_"+str(ind)+"_"+str(quad_ind))
+			quad.setLength(0.06)
+			quad.setParam("dB/dr",30.*(1 - 2*quad_ind))
+			drift_out = Drift("d_out_"+str(ind)+"_"+str(quad_ind))
+			drift_out.setLength(0.05)
+			gap = BaseRF_Gap("gap_"+str(ind)+"_"+str(quad_ind))
+			gap.setParam("E0TL",0.0001)
+			gap.setParam("E0L",0.0001)
+			gap.setParam("mode",1.0)
+			cav.addRF_GapNode(gap)
+			for node in (drift_in,quad,drift_out,gap):
+				seq.addNode(node)
+				lattice.addNode(node)
+	lattice.initialize()
+	return lattice
+
+def makeBunch(n_parts, seed):
+	""" Returns the 2.5 MeV H- bunch. """
+	rnd = random.Random(seed)
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.getSyncParticle().kinEnergy(0.0025)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.001)
+		xp = rnd.gauss(0.,0.001)
+		y = rnd.gauss(0.,0.001)
+		yp = rnd.gauss(0.,0.001)
+		z = rnd.gauss(0.,0.002)
+		dE = rnd.gauss(0.,0.00001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+def maxDifference(bunch, bunch_ref):
+	""" Returns the max difference of the coordinates of two bunches. """
+	diff_max = 0.
+	if(bunch.getSize() != bunch_ref.getSize()): return 1.0e+36
+	for ip in range(bunch.getSize()):
+		coords = (bunch.x(ip),bunch.xp(ip),bunch.y(ip),bunch.yp(ip),bunch.z(ip),bunch.dE(ip))
+		coords_ref = (bunch_ref.x(ip),bunch_ref.xp(ip),bunch_ref.y(ip),bunch_ref.yp(ip),bunch_ref.z(ip),bunch_ref.dE(ip))
+		for ind in range(6):
+			diff_max = max(diff_max,abs(coords[ind] - coords_ref[ind]))
+	return diff_max
+
+rank = orbit_mpi.MPI_Comm_rank(mpi_comm.MPI_COMM_WORLD)
+size = orbit_mpi.MPI_Comm_size(mpi_comm.MPI_COMM_WORLD)
+
+n_bunches = 8
+n_parts = 1000
+
+lattice = makeLattice()
+lattice.trackDesignBunch(makeBunch(n_parts,1))
+
+for nStages in (1,2,4):
+	if(size < nStages or size % nStages != 0): continue
+	tracker = LinacPipelineTracker(lattice,nStages,bunch_template = makeBunch(0,1))
+	stage_rank = orbit_mpi.MPI_Comm_rank(tracker.getStageComm())
+	bunches = []
+	bunches_ref = []
+	for ind in range(n_bunches):
+		if(tracker.getStage() == 0):
+			bunch = makeBunch(n_parts,1000*(ind+1) + stage_rank)
+			bunch_ref = Bunch()
+			bunch.copyBunchTo(bunch_ref)
+			bunch_ref.setMPIComm(tracker.getStageComm())
+			bunches_ref.append(bunch_ref)
+		else:
+			bunch = makeBunch(0,1)
+		bunches.append(bunch)
+	time_start = time.time()
+	tracker.trackBunches(bunches)
+	time_pipeline = time.time() - time_start
+	#---- the serial tracking of the same bunches on the CPUs of the first stage
+	diff_max = 0.
+	time_start = time.time()
+	for ind in range(len(bunches_ref)):
+		lattice.trackBunch(bunches_ref[ind])
+		diff_max = max(diff_max,maxDifference(bunches[ind],bunches_ref[ind]))
+	time_serial = time.time() - time_start
+	diff_max = orbit_mpi.MPI_Allreduce(diff_max,mpi_datatype.MPI_DOUBLE,mpi_op.MPI_MAX,mpi_comm.MPI_COMM_WORLD)
+	if(rank == 0):
+		print "N stages =",nStages," max difference with serial =",diff_max,
+		print " time pipeline [sec] =",time_pipeline," serial [sec] =",time_serial
+
+if(rank == 0):
+	print "====STOP==="
+
+sys.exit(0)
@@ -0,0 +1,119 @@
+#-----------------------------------------------------------------------
+# The test of the RF cavity scanner for the multi-gap cavity. The results
+# of the one-pass scan are compared with the traditional scan where for
+# each phase the cavity phase is set by setPhase(...), the design bunch
+# is tracked by trackDesignBunch(...), and the particle with zero
+# coordinates is tracked by trackBunch(...) through the cavity.
+# The scanner maps the phase offsets to the longitudinal coordinates
+# exactly at the first gap only, so the differences grow with the energy
+# gain of the cavity. The differences and the scan times are printed.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import time
+
+from bunch import Bunch
+
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, BaseRF_Gap
+from orbit.py_linac.lattice import RF_CavityScanner
+from orbit.utils import phaseNearTargetPhase
+
+frequency = 402.5e+6
+
+def makeLattice(n_gaps, e0tl, eKin):
+	"""
+	Returns the LinacAccLattice with one pi-mode RF cavity with n_gaps gaps.
+	The distance between gaps is beta*lambda/2 for the initial energy.
+	"""
+	mass = 0.939294
+	gamma = (mass + eKin)/mass
+	beta = math.sqrt(1.0 - 1.0/(gamma*gamma))
+	lmbd = 2.99792458e+8/frequency
+	lattice = LinacAccLattice("scan_test_linac")
+	seq = Sequence("TEST")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	cav = RF_Cavity("cav")
+	cav.setFrequency(frequency)
+	cav.setAmp(1.0)
+	cav.setPhase(-30.*math.pi/180.)
+	seq.addRF_Cavity(cav)
+	for ind in range(n_gaps):
+		gap = BaseRF_Gap("gap_"+str(ind))
+		gap.setParam("E0TL",e0tl)
+		gap.setParam("E0L",e0tl)
+		gap.setParam("mode",1.0)
+		cav.addRF_GapNode(gap)
+		drift = Drift("drift_"+str(ind))
+		drift.setLength(beta*lmbd/2)
+		for node in (gap,drift):
+			seq.addNode(node)
+			lattice.addNode(node)
+	lattice.initialize()
+	return lattice
+
+def makeBunch(eKin):
+	""" Returns the H- bunch without particles. """
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.getSyncParticle().kinEnergy(eKin)
+	return bunch
+
+def setPhaseScan(lattice, bunch_in, phase_arr, index_start, index_stop):
+	"""
+	The traditional scan with setPhase, trackDesignBunch, and trackBunch for each phase.
+	"""
+	cav = lattice.getRF_Cavities()[0]
+	phase_init = cav.getPhase()
+	eKin_arr = []
+	phase_out_arr = []
+	for phase in phase_arr:
+		cav.setPhase(phase)
+		lattice.trackDesignBunch(bunch_in)
+		bunch = Bunch()
+		bunch_in.copyEmptyBunchTo(bunch)
+		bunch.addParticle(0.,0.,0.,0.,0.,0.)
+		lattice.trackBunch(bunch,None,None,index_start,index_stop)
+		syncPart = bunch.getSyncParticle()
+		eKin_arr.append(syncPart.kinEnergy() + bunch.dE(0))
+		z_to_phase = - 2.0*math.pi*frequency/(2.99792458e+8*syncPart.beta())
+		phase_out = 2.0*math.pi*frequency*syncPart.time() + z_to_phase*bunch.z(0)
+		phase_out_arr.append(phaseNearTargetPhase(phase_out,0.))
+	cav.setPhase(phase_init)
+	lattice.trackDesignBunch(bunch_in)
+	return (eKin_arr,phase_out_arr)
+
+eKin_in = 0.0025
+n_phases = 72
+phase_arr = [(-180. + 360.*ind/n_phases)*math.pi/180. for ind in range(n_phases)]
+
+for e0tl in (0.00001,0.0001,0.0003):
+	lattice = makeLattice(4,e0tl,eKin_in)
+	bunch_in = makeBunch(eKin_in)
+	lattice.trackDesignBunch(bunch_in)
+	scanner = RF_CavityScanner(lattice,lattice.getRF_Cavities()[0])
+	(index_start,index_stop) = scanner.getLatticeIndexes()
+	time_start = time.time()
+	(eKin_res_arr,phase_res_arr) = scanner.scan(bunch_in,phase_arr)
+	time_scanner = time.time() - time_start
+	time_start = time.time()
+	(eKin_ref_arr,phase_ref_arr) = setPhaseScan(lattice,bunch_in,phase_arr,index_start,index_stop)
+	time_ref = time.time() - time_start
+	eKin_diff_max = 0.
+	phase_diff_max = 0.
+	for ind in range(n_phases):
+		if(eKin_res_arr[0][ind] == None): continue
+		eKin_diff_max = max(eKin_diff_max,abs(eKin_res_arr[0][ind] - eKin_ref_arr[ind]))
+		phase_diff = phaseNearTargetPhase(phase_res_arr[0][ind] - phase_ref_arr[ind],0.)
+		phase_diff_max = max(phase_diff_max,abs(phase_diff))
+	eKin_gain_max = max(eKin_ref_arr) - eKin_in
+	print "======== E0TL per gap [MeV] =",e0tl*1000.," max energy gain [MeV] =",eKin_gain_max*1000.
+	print "Max diff. scanner - setPhase scan: eKin [keV] =",eKin_diff_max*1.0e+6," phase [deg] =",phase_diff_max*180./math.pi
+	print "Scan time scanner [sec] =",time_scanner," setPhase scan [sec] =",time_ref
+
+print "====STOP==="
+
+sys.exit(0)
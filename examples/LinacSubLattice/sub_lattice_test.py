@@ -0,0 +1,122 @@
+#-----------------------------------------------------------------------
+# The test of the linac sub-lattice. The design bunch is tracked through
+# the whole lattice, then the bunch is tracked to the entrance of the
+# segment. The segment is tracked by the parent lattice with the
+# trackBunch(...,index_start,index_stop) call and by the sub-lattice, and
+# the differences of the coordinates and of the synchronous particles
+# are printed. The sub-lattice shares the RF cavities with the parent
+# lattice, so the design parameters of the cavities should be the same
+# before and after the sub-lattice tracking.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import random
+
+from bunch import Bunch
+
+from orbit.py_linac.lattice import LinacAccLattice, Sequence, RF_Cavity
+from orbit.py_linac.lattice import Drift, Quad, BaseRF_Gap
+
+def makeLattice(n_cells = 10):
+	"""
+	Returns the LinacAccLattice with n_cells periods drift-quad-drift-gap-drift-quad-drift-gap.
+	Each period has one RF cavity with two gaps.
+	"""
+	lattice = LinacAccLattice("sub_lattice_test_linac")
+	seq = Sequence("TEST")
+	seq.setLinacAccLattice(lattice)
+	lattice.addSequence(seq)
+	for ind in range(n_cells):
+		cav = RF_Cavity("cav_"+str(ind))
+		cav.setFrequency(402.5e+6)
+		cav.setAmp(1.0)
+		cav.setPhase(-30.*math.pi/180.)
+		seq.addRF_Cavity(cav)
+		for quad_ind in range(2):
+			drift_in = Drift("d_in_"+str(ind)+"_"+str(quad_ind))
+			drift_in.setLength(0.05)
+			quad = Quad("q_"+str(ind)+"_"+str(quad_ind))
+			quad.setLength(0.06)
+			quad.setParam("dB/dr",30.*(1 - 2*quad_ind))
+			drift_out = Drift("d_out_"+str(ind)+"_"+str(quad_ind))
+			drift_out.setLength(0.05)
+			gap = BaseRF_Gap("gap_"+str(ind)+"_"+str(quad_ind))
+			gap.setParam("E0TL",0.0001)
+			gap.setParam("E0L",0.0001)
+			gap.setParam("mode",1.0)
+			cav.addRF_GapNode(gap)
+			for node in (drift_in,quad,drift_out,gap):
+				seq.addNode(node)
+				lattice.addNode(node)
+	lattice.initialize()
+	return lattice
+
+def makeBunch(n_parts):
+	""" Returns the 2.5 MeV H- bunch. """
+	rnd = random.Random(1)
+	bunch = Bunch()
+	bunch.mass(0.939294)
+	bunch.charge(-1.0)
+	bunch.getSyncParticle().kinEnergy(0.0025)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.001)
+		xp = rnd.gauss(0.,0.001)
+		y = rnd.gauss(0.,0.001)
+		yp = rnd.gauss(0.,0.001)
+		z = rnd.gauss(0.,0.002)
+		dE = rnd.gauss(0.,0.00001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+def cavitiesDesign(lattice):
+	""" Returns the list of (design arrival time, design phase, design amp) of the RF cavities. """
+	res = []
+	for cav in lattice.getRF_Cavities():
+		res.append((cav.getDesignArrivalTime(),cav.getDesignPhase(),cav.getDesignAmp()))
+	return res
+
+lattice = makeLattice()
+bunch_init = makeBunch(1000)
+lattice.trackDesignBunch(bunch_init)
+design_before = cavitiesDesign(lattice)
+
+index_start = 17
+index_stop = 56
+sub_lattice = lattice.getSubLattice(index_start,index_stop)
+print "Parent lattice: N nodes =",len(lattice.getNodes())," L =",lattice.getLength()
+print "Sub-lattice   : N nodes =",len(sub_lattice.getNodes())," L =",sub_lattice.getLength()," start position =",sub_lattice.getParentPosition()
+print "Sub-lattice   : N RF cavities =",len(sub_lattice.getRF_Cavities())
+
+#---- the bunch at the entrance of the segment
+bunch_start = Bunch()
+bunch_init.copyBunchTo(bunch_start)
+lattice.trackBunch(bunch_start,None,None,0,index_start - 1)
+
+bunch = Bunch()
+bunch_start.copyBunchTo(bunch)
+lattice.trackBunch(bunch,None,None,index_start,index_stop)
+
+bunch_sub = Bunch()
+bunch_start.copyBunchTo(bunch_sub)
+sub_lattice.trackBunch(bunch_sub)
+
+syncPart = bunch.getSyncParticle()
+syncPart_sub = bunch_sub.getSyncParticle()
+print "Ekin parent =",syncPart.kinEnergy()," sub-lattice =",syncPart_sub.kinEnergy()
+print "Time parent =",syncPart.time()," sub-lattice =",syncPart_sub.time()
+print "N parts parent =",bunch.getSize()," sub-lattice =",bunch_sub.getSize()
+diff_max = [0.]*6
+for ip in range(min(bunch.getSize(),bunch_sub.getSize())):
+	coords = (bunch.x(ip),bunch.xp(ip),bunch.y(ip),bunch.yp(ip),bunch.z(ip),bunch.dE(ip))
+	coords_sub = (bunch_sub.x(ip),bunch_sub.xp(ip),bunch_sub.y(ip),bunch_sub.yp(ip),bunch_sub.z(ip),bunch_sub.dE(ip))
+	for ind in range(6):
+		diff_max[ind] = max(diff_max[ind],abs(coords[ind] - coords_sub[ind]))
+print "Max difference (x,xp,y,yp,z,dE) =",diff_max
+
+design_after = cavitiesDesign(lattice)
+print "RF cavities design parameters are not changed =",(design_before == design_after)
+
+print "====STOP==="
+
+sys.exit(0)
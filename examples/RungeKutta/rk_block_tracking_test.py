@@ -0,0 +1,117 @@
+#-----------------------------------------------------------------------
+# The test of the Runge-Kutta tracker with the Python field sources.
+# The bunch is tracked through the quadrupole field defined on the Python
+# level in four modes:
+# 1. particle by particle with a fixed step (the reference)
+# 2. in blocks of particles with a fixed step
+# 3. in blocks with the bulk getElectricMagneticFieldArr(points) method
+#    of the Python field source (one Python call per block and stage)
+# 4. in blocks with the adaptive Cash-Karp step size control
+# The differences with the reference, the numbers of Python calls, and
+# the tracking times are printed.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import random
+import time
+
+from bunch import Bunch
+from orbit_utils import PyBaseFieldSource
+from trackerrk4 import RungeKuttaTracker
+
+class QuadFieldSource(PyBaseFieldSource):
+	"""
+	The quadrupole field By = G*x, Bx = G*y inside |z| < length/2.
+	"""
+	def __init__(self, gradient, length):
+		PyBaseFieldSource.__init__(self)
+		self.gradient = gradient
+		self.length = length
+		self.n_calls = 0
+
+	def getElectricMagneticField(self, x, y, z, t):
+		self.n_calls += 1
+		if(abs(z) > self.length/2): return (0.,0.,0.,0.,0.,0.)
+		return (0.,0.,0.,self.gradient*y,self.gradient*x,0.)
+
+class QuadFieldSourceArr(QuadFieldSource):
+	"""
+	The same quadrupole field with the bulk method for the arrays of points.
+	"""
+	def getElectricMagneticFieldArr(self, points):
+		self.n_calls += 1
+		G = self.gradient
+		half_length = self.length/2
+		fields = []
+		for (x,y,z,t) in points:
+			if(abs(z) > half_length):
+				fields.append((0.,0.,0.,0.,0.,0.))
+			else:
+				fields.append((0.,0.,0.,G*y,G*x,0.))
+		return fields
+
+def makeBunch(n_parts):
+	""" Returns the 100 MeV proton bunch. """
+	rnd = random.Random(1)
+	bunch = Bunch()
+	bunch.mass(0.93827231)
+	bunch.getSyncParticle().kinEnergy(0.1)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.002)
+		xp = rnd.gauss(0.,0.001)
+		y = rnd.gauss(0.,0.002)
+		yp = rnd.gauss(0.,0.001)
+		z = rnd.gauss(0.,0.001)
+		dE = rnd.gauss(0.,0.0001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+def track(bunch_init, field_source, block_size, adaptive):
+	"""
+	Tracks the copy of the bunch and returns (bunch, time, number of Python calls).
+	"""
+	length = 1.0
+	tracker = RungeKuttaTracker(length)
+	tracker.spatialEps(0.0000001)
+	tracker.blockSize(block_size)
+	tracker.adaptiveStep(adaptive)
+	bunch = Bunch()
+	bunch_init.copyBunchTo(bunch)
+	field_source.n_calls = 0
+	time_start = time.time()
+	tracker.trackBunch(bunch,field_source)
+	return (bunch,time.time() - time_start,field_source.n_calls)
+
+def maxDiff(bunch, bunch_ref):
+	""" Returns the maximal differences of (x,xp,y,yp,z,dE) coordinates. """
+	diff_max = [0.]*6
+	for ip in range(bunch.getSize()):
+		coords = (bunch.x(ip),bunch.xp(ip),bunch.y(ip),bunch.yp(ip),bunch.z(ip),bunch.dE(ip))
+		coords_ref = (bunch_ref.x(ip),bunch_ref.xp(ip),bunch_ref.y(ip),bunch_ref.yp(ip),bunch_ref.z(ip),bunch_ref.dE(ip))
+		for ind in range(6):
+			diff_max[ind] = max(diff_max[ind],abs(coords[ind] - coords_ref[ind]))
+	return diff_max
+
+gradient = 1.0
+quad_length = 0.5
+fs = QuadFieldSource(gradient,quad_length)
+fs_arr = QuadFieldSourceArr(gradient,quad_length)
+
+bunch_init = makeBunch(500)
+
+(bunch_ref,time_ref,n_calls_ref) = track(bunch_init,fs,1,0)
+print "Particle by particle      : time [sec] =",time_ref," Python calls =",n_calls_ref
+
+cases = []
+cases.append(("Blocks, fixed step       ",fs,64,0))
+cases.append(("Blocks, bulk Python field",fs_arr,64,0))
+cases.append(("Blocks, adaptive step    ",fs_arr,64,1))
+for (name,field_source,block_size,adaptive) in cases:
+	(bunch,time_track,n_calls) = track(bunch_init,field_source,block_size,adaptive)
+	print name,": time [sec] =",time_track," Python calls =",n_calls
+	print "    max diff. with the reference (x,xp,y,yp,z,dE) =",maxDiff(bunch,bunch_ref)
+
+print "====STOP==="
+
+sys.exit(0)
@@ -0,0 +1,106 @@
+#-----------------------------------------------------------------------
+# The test of the Taylor maps for the TEAPOT_Ring lattice. The FODO ring
+# with the RF cavity is tracked by TEAPOT nodes and by the ring where
+# the sections between RF cavities are replaced by Taylor maps.
+# The difference of the coordinates after several turns and the
+# symplecticity error of the maps are printed.
+#-----------------------------------------------------------------------
+
+import sys
+import math
+import random
+
+from bunch import Bunch
+
+from orbit.lattice import AccNode
+from orbit.teapot import QuadTEAPOT, BendTEAPOT, DriftTEAPOT, RingRFTEAPOT
+from orbit.teapot import makeTaylorMapNode, replaceSectionsWithTaylorMaps
+from orbit.teapot.teapot import TEAPOT_Ring
+
+def makeRing(n_cells = 8):
+	"""
+	Returns the TEAPOT_Ring with n_cells FODO cells and one RF cavity.
+	"""
+	ring = TEAPOT_Ring("fodo_ring")
+	theta = 2*math.pi/(2*n_cells)
+	for ind in range(n_cells):
+		qf = QuadTEAPOT("qf_"+str(ind))
+		qf.addParam("kq",0.5)
+		qf.setLength(0.5)
+		b1 = BendTEAPOT("b1_"+str(ind))
+		b1.addParam("theta",theta)
+		b1.setLength(2.0)
+		qd = QuadTEAPOT("qd_"+str(ind))
+		qd.addParam("kq",-0.5)
+		qd.setLength(0.5)
+		b2 = BendTEAPOT("b2_"+str(ind))
+		b2.addParam("theta",theta)
+		b2.setLength(2.0)
+		for elem in [qf,b1,qd,b2]:
+			ring.addNode(elem)
+		if(ind == n_cells/2 - 1):
+			rf = RingRFTEAPOT("rf")
+			rf.addRF(1,0.00001,0.)
+			ring.addNode(rf)
+	ring.addChildren()
+	ring.initialize()
+	return ring
+
+def makeBunch(n_parts):
+	""" Returns the 1 GeV proton bunch. """
+	rnd = random.Random(1)
+	bunch = Bunch()
+	bunch.mass(0.93827231)
+	bunch.getSyncParticle().kinEnergy(1.0)
+	for ind in range(n_parts):
+		x = rnd.gauss(0.,0.001)
+		xp = rnd.gauss(0.,0.0001)
+		y = rnd.gauss(0.,0.001)
+		yp = rnd.gauss(0.,0.0001)
+		z = rnd.gauss(0.,1.0)
+		dE = rnd.gauss(0.,0.0001)
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	return bunch
+
+steps = (0.001,0.0001,0.001,0.0001,1.0,0.0001)
+n_turns = 10
+
+ring = makeRing()
+ring_map = makeRing()
+
+bunch_init = makeBunch(100)
+
+#---- the map of one section of the ring
+map_node = makeTaylorMapNode(ring,bunch_init,0,3,3,steps)
+print "Map of the first cell =",map_node.getName()," L=",map_node.getLength()
+print "Symplecticity error =",map_node.getSymplecticError()
+
+#---- the ring with all sections between RF replaced by maps
+map_nodes = replaceSectionsWithTaylorMaps(ring_map,bunch_init,3,steps)
+print "Number of nodes in ring =",len(ring.getNodes())," in ring with maps =",len(ring_map.getNodes())
+print "Ring length =",ring.getLength()," ring with maps length =",ring_map.getLength()
+for map_node in map_nodes:
+	print "map =",map_node.getName()," symplecticity error =",map_node.getSymplecticError()
+
+bunch = Bunch()
+bunch_map = Bunch()
+bunch_init.copyBunchTo(bunch)
+bunch_init.copyBunchTo(bunch_map)
+
+for turn in range(n_turns):
+	ring.trackBunch(bunch)
+	ring_map.trackBunch(bunch_map)
+
+diff_max = [0.]*6
+for ip in range(bunch.getSize()):
+	coords = (bunch.x(ip),bunch.xp(ip),bunch.y(ip),bunch.yp(ip),bunch.z(ip),bunch.dE(ip))
+	coords_map = (bunch_map.x(ip),bunch_map.xp(ip),bunch_map.y(ip),bunch_map.yp(ip),bunch_map.z(ip),bunch_map.dE(ip))
+	for ind in range(6):
+		diff_max[ind] = max(diff_max[ind],abs(coords[ind] - coords_map[ind]))
+
+print "Max difference after",n_turns,"turns (x,xp,y,yp,z,dE) =",diff_max
+print "Sync. particle time TEAPOT =",bunch.getSyncParticle().time()," maps =",bunch_map.getSyncParticle().time()
+
+print "====STOP==="
+
+sys.exit(0)
@@ -0,0 +1,64 @@
+"""
+Module. Includes the BunchLoadBalanceNode class. This node redistributes
+macro-particles between CPUs of the bunch's MPI communicator if the load
+imbalance (because of losses on apertures, collimators, foils, or uneven
+injection) is above the threshold.
+"""
+
+# import general accelerator elements and lattice
+from orbit.lattice import AccLattice, AccNode, AccActionsContainer, AccNodeBunchTracker
+
+class BunchLoadBalanceNode(AccNodeBunchTracker):
+	"""
+	The zero length node that calls bunch.balanceLoad(threshold) every
+	n_calls times it tracks the bunch. If it is placed at the end of a ring
+	lattice n_calls is the number of turns. The imbalance is defined as
+	(n_max - n_avg)/n_avg where n_max and n_avg are the maximal and average
+	numbers of macro-particles on CPUs. It can be a child node of any
+	node in TEAPOT or linac lattices.
+	"""
+	def __init__(self, imbalance_threshold = 0.1, n_calls = 1, name = "load_balance"):
+		AccNodeBunchTracker.__init__(self,name)
+		self.setType("load_balance")
+		self.setLength(0.)
+		self.imbalance_threshold = imbalance_threshold
+		self.n_calls = n_calls
+		self.count = 0
+		self.n_moved_total = 0
+
+	def setImbalanceThreshold(self, imbalance_threshold):
+		""" Sets the relative imbalance above which the particles will be moved. """
+		self.imbalance_threshold = imbalance_threshold
+
+	def getImbalanceThreshold(self):
+		""" Returns the relative imbalance above which the particles will be moved. """
+		return self.imbalance_threshold
+
+	def setNumberOfCalls(self, n_calls):
+		""" Sets the number of track calls between the balancing attempts. """
+		self.n_calls = n_calls
+		self.count = 0
+
+	def getNumberOfCalls(self):
+		""" Returns the number of track calls between the balancing attempts. """
+		return self.n_calls
+
+	def getNumberOfMovedParticles(self):
+		""" Returns the total number of macro-particles moved by this node. """
+		return self.n_moved_total
+
+	def track(self, paramsDict):
+		"""
+		The BunchLoadBalanceNode class implementation of the AccNode class track(probe) method.
+		"""
+		self.count += 1
+		if(self.count < self.n_calls): return
+		self.count = 0
+		bunch = paramsDict["bunch"]
+		self.n_moved_total += bunch.balanceLoad(self.imbalance_threshold)
+
+	def trackDesign(self, paramsDict):
+		"""
+		This method does nothing for the load balance node.
+		"""
+		pass
@@ -3,11 +3,14 @@
 ##
 ## Classes:
 ## - ParticleIdNumber  - Class for adding unique id numbers to particle in a bunch 
+## - BunchLoadBalanceNode  - Node for moving particles between CPUs if the load is unbalanced
 #
 
 from particleidnumber import ParticleIdNumber
+from BunchLoadBalanceNode import BunchLoadBalanceNode
 
 __all__ = []
 __all__.append("addParticleIdNumbers")
+__all__.append("BunchLoadBalanceNode")
 
 
@@ -0,0 +1,170 @@
+"""
+Module. Includes the ErrorEnsembleRunner class that performs the Monte Carlo
+error studies. The lattice is created once, the initial bunch is created once
+for each group of CPUs and kept, and for each random seed the errors are
+reassigned by the user's function (through the error nodes or error controllers),
+the bunch is restored from the initial one and tracked through the lattice.
+The seeds are distributed between groups of CPUs (MPI sub-communicators), and
+the per-seed summary statistics are collected into one table on all CPUs.
+"""
+
+import os
+import sys
+import math
+import random
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+from orbit_mpi import mpi_datatype
+from orbit_mpi import mpi_op
+
+from bunch import Bunch
+from bunch import BunchTwissAnalysis
+
+# import the function that finalizes the execution
+from orbit.utils import orbitFinalize
+
+class ErrorEnsembleRunner:
+	"""
+	The Monte Carlo error study runner. The user specifies:
+	  bunch_generator_func(comm) - creates and returns the initial bunch
+	                               distributed over the comm communicator
+	  errors_func(seed)          - assigns error values for the seed
+	                               (random generator is already seeded)
+	  track_func(lattice,bunch)  - optional, by default lattice.trackBunch(bunch)
+	  stat_func(bunch)           - optional, returns the dictionary {name:float}
+	                               with summary statistics. The default one
+	                               returns the bunch size, centroids, and emittances.
+	"""
+	def __init__(self, lattice, bunch_generator_func, errors_func):
+		self.lattice = lattice
+		self.bunch_generator_func = bunch_generator_func
+		self.errors_func = errors_func
+		self.track_func = None
+		self.stat_func = None
+		self.results = []
+		self.stat_names = []
+
+	def setTrackFunction(self, track_func):
+		""" Sets the track_func(lattice,bunch) function. """
+		self.track_func = track_func
+
+	def setStatisticsFunction(self, stat_func):
+		""" Sets the stat_func(bunch) function that returns {name:float} dictionary. """
+		self.stat_func = stat_func
+
+	def getStatisticsNames(self):
+		""" Returns the sorted list of names of the statistics in the results. """
+		return self.stat_names
+
+	def getResults(self):
+		""" Returns the list of dictionaries {"seed":seed,name:value,...} one per seed. """
+		return self.results
+
+	def run(self, seeds, n_groups = -1, comm = mpi_comm.MPI_COMM_WORLD):
+		"""
+		Runs the error study for all seeds in the list. The CPUs are split into
+		n_groups groups, and seeds are distributed between groups. By default
+		each CPU is a group. Returns the list of results dictionaries that is
+		the same on all CPUs.
+		"""
+		seeds = list(seeds)
+		n_seeds = len(seeds)
+		if(n_seeds == 0): return []
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		size = orbit_mpi.MPI_Comm_size(comm)
+		if(n_groups <= 0 or n_groups > size): n_groups = size
+		if(n_groups > n_seeds): n_groups = n_seeds
+		if(size % n_groups != 0):
+			msg = "ErrorEnsembleRunner.run(...): the number of CPUs should be divisible by the number of groups!"
+			msg = msg + os.linesep
+			msg = msg + "number of CPUs = " + str(size) + " number of groups = " + str(n_groups)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			orbitFinalize(msg)
+		group_size = size/n_groups
+		group_index = rank/group_size
+		group_comm = orbit_mpi.MPI_Comm_split(comm,group_index,rank)
+		group_rank = orbit_mpi.MPI_Comm_rank(group_comm)
+		#---- the initial bunch is created once for the group
+		bunch_init = self.bunch_generator_func(group_comm)
+		bunch_init.setMPIComm(group_comm)
+		bunch = Bunch()
+		#---- the local results {seed_index:stat_dict}
+		local_results = {}
+		for seed_index in range(group_index,n_seeds,n_groups):
+			seed = seeds[seed_index]
+			random.seed(seed)
+			self.errors_func(seed)
+			bunch_init.copyBunchTo(bunch)
+			if(self.track_func != None):
+				self.track_func(self.lattice,bunch)
+			else:
+				self.lattice.trackBunch(bunch)
+			if(self.stat_func != None):
+				stat_dict = self.stat_func(bunch)
+			else:
+				stat_dict = self.getDefaultStatistics(bunch)
+			if(group_rank == 0):
+				local_results[seed_index] = stat_dict
+		#---- the names of statistics are defined by the first seed
+		names_str = ""
+		if(rank == 0):
+			names = local_results[0].keys()
+			names.sort()
+			names_str = " ".join(names)
+		names_str = orbit_mpi.MPI_Bcast(names_str,mpi_datatype.MPI_CHAR,0,comm)
+		self.stat_names = names_str.split()
+		n_names = len(self.stat_names)
+		#---- collect the table on all CPUs
+		table = [0.]*(n_seeds*n_names)
+		for seed_index in local_results.keys():
+			stat_dict = local_results[seed_index]
+			for name_index in range(n_names):
+				table[seed_index*n_names + name_index] = stat_dict[self.stat_names[name_index]]
+		if(size > 1):
+			table = orbit_mpi.MPI_Allreduce(table,mpi_datatype.MPI_DOUBLE,mpi_op.MPI_SUM,comm)
+		self.results = []
+		for seed_index in range(n_seeds):
+			res_dict = {"seed":seeds[seed_index]}
+			for name_index in range(n_names):
+				res_dict[self.stat_names[name_index]] = table[seed_index*n_names + name_index]
+			self.results.append(res_dict)
+		orbit_mpi.MPI_Comm_free(group_comm)
+		return self.results
+
+	def getDefaultStatistics(self, bunch):
+		"""
+		Returns the dictionary with the global number of macro-particles,
+		centroids, and rms emittances of the bunch.
+		"""
+		twiss = BunchTwissAnalysis()
+		twiss.analyzeBunch(bunch)
+		stat_dict = {}
+		stat_dict["n_parts"] = 1.0*bunch.getSizeGlobal()
+		stat_dict["x_avg"] = twiss.getAverage(0)
+		stat_dict["xp_avg"] = twiss.getAverage(1)
+		stat_dict["y_avg"] = twiss.getAverage(2)
+		stat_dict["yp_avg"] = twiss.getAverage(3)
+		stat_dict["z_avg"] = twiss.getAverage(4)
+		stat_dict["dE_avg"] = twiss.getAverage(5)
+		stat_dict["x_emitt"] = twiss.getEmittance(0)
+		stat_dict["y_emitt"] = twiss.getEmittance(1)
+		stat_dict["z_emitt"] = twiss.getEmittance(2)
+		return stat_dict
+
+	def writeResults(self, file_name, comm = mpi_comm.MPI_COMM_WORLD):
+		""" Writes the results table into the text file. Only rank 0 writes. """
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		if(rank != 0): return
+		fl_out = open(file_name,"w")
+		st = "seed"
+		for name in self.stat_names:
+			st += " " + name
+		fl_out.write(st + os.linesep)
+		for res_dict in self.results:
+			st = str(res_dict["seed"])
+			for name in self.stat_names:
+				st += " %18.11e"%res_dict[name]
+			fl_out.write(st + os.linesep)
+		fl_out.close()
@@ -32,6 +32,7 @@ from orbit.teapot import BendTEAPOT
 from error_base import CoordDisplacement
 from error_base import LongDisplacement
 from error_base import StraightRotationXY
+from error_base import StraightRotationXYDisplacement
 from error_base import StraightRotationXSI
 from error_base import StraightRotationXSF
 from error_base import StraightRotationYSI
@@ -846,6 +847,86 @@ class quadkickerosc(DriftTEAPOT):
         QuadKickerOsc(bunch, k, phaselength, phase)
 
 
+# XY rotate and displace a bunch in one pass
+class rotationdisplacement(DriftTEAPOT):
+
+    def __init__(self, components = [],\
+	    name = "XY Rotation Displacement"):
+        """
+            Constructor. Creates the node that applies the sequence of
+            coorddisplacement, straightrotationxy, and dipolekicker
+            nodes (components) as one XY rotation followed by one
+            coordinate displacement. The components are not part of
+            the lattice, but their parameters are read at each pass,
+            so the error values can be changed in the components.
+        """
+        DriftTEAPOT.__init__(self, name)
+        self.setType("xy rotation displacement node")
+        self.setLength(0.0)
+        self.components = []
+        for component in components:
+            self.addComponent(component)
+
+    def addComponent(self, component):
+        """
+            Adds the error node to the end of the components list.
+        """
+        if(not isComposableErrorNode(component)):
+            print "Error node = ", component.getName(), " type = ",\
+            component.getType()
+            orbitFinalize("rotationdisplacement: this error node cannot be composed! Stop!")
+        self.components.append(component)
+
+    def getComponents(self):
+        """
+            Returns the list of the composed error nodes.
+        """
+        return self.components
+
+    def getTransformation(self):
+        """
+            Returns the (angle, dx, dxp, dy, dyp, dz, dE) tuple for
+            the composed transformation of all components.
+        """
+        angle = 0.0
+        (dx, dxp, dy, dyp, dz, dE) = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        for component in self.components:
+            if(isinstance(component, coorddisplacement)):
+                dx  += component.dx
+                dxp += component.dxp
+                dy  += component.dy
+                dyp += component.dyp
+                dz  += component.dz
+                dE  += component.dE
+            elif(isinstance(component, dipolekicker)):
+                dxp += component.dxp
+                dyp += component.dyp
+            else:
+                angle += component.angle
+                cs = math.cos(component.angle)
+                sn = math.sin(component.angle)
+                (dx, dy) = ( cs * dx  + sn * dy,  -sn * dx  + cs * dy)
+                (dxp, dyp) = ( cs * dxp + sn * dyp, -sn * dxp + cs * dyp)
+        return (angle, dx, dxp, dy, dyp, dz, dE)
+
+    def trackBunch(self, bunch):
+        """
+            The RotationDisplacement-teapot class implementation of the
+            AccNodeBunchTracker class trackBunch(probe) method.
+        """
+        (angle, dx, dxp, dy, dyp, dz, dE) = self.getTransformation()
+        StraightRotationXYDisplacement(bunch, angle, dx, dxp, dy, dyp, dz, dE)
+
+    def track(self, paramsDict):
+        """ 
+            The RotationDisplacement-teapot class implementation of the
+            AccNodeBunchTracker class track(probe) method.
+        """
+        bunch = paramsDict["bunch"]
+        (angle, dx, dxp, dy, dyp, dz, dE) = self.getTransformation()
+        StraightRotationXYDisplacement(bunch, angle, dx, dxp, dy, dyp, dz, dE)
+
+
 ######################################################################
 
 
@@ -1339,3 +1420,48 @@ def FindNode(lattice, position):
 		if(position >= lattice.getLength()):
 			nodeIndex -= 1
 	return (nodeIndex, zi, zf)
+
+
+def isComposableErrorNode(node):
+	"""
+	Returns True if the error node can be a part of rotationdisplacement node.
+	"""
+	if(isinstance(node, rotationdisplacement)): return False
+	if(isinstance(node, coorddisplacement)): return True
+	if(isinstance(node, straightrotationxy)): return True
+	if(isinstance(node, dipolekicker)): return True
+	return False
+
+
+def CombineErrorNodes(lattice):
+	"""
+	Replaces every run of two or more adjacent coorddisplacement,
+	straightrotationxy, and dipolekicker child nodes at the same place
+	of the lattice nodes by one rotationdisplacement node.
+	Returns the list of the created rotationdisplacement nodes.
+	"""
+	combined_nodes = []
+	for node in lattice.getNodes():
+		child_lists = [node.getChildNodes(AccNode.ENTRANCE), node.getChildNodes(AccNode.EXIT)]
+		for part_index in xrange(node.getnParts()):
+			child_lists.append(node.getChildNodes(AccNode.BODY, part_index, AccNode.BEFORE))
+			child_lists.append(node.getChildNodes(AccNode.BODY, part_index, AccNode.AFTER))
+		for child_nodes in child_lists:
+			new_child_nodes = []
+			run = []
+			for child_node in child_nodes + [None,]:
+				if(child_node != None and isComposableErrorNode(child_node)):
+					run.append(child_node)
+					continue
+				if(len(run) > 1):
+					combined_node = rotationdisplacement(run)
+					combined_nodes.append(combined_node)
+					new_child_nodes.append(combined_node)
+				else:
+					new_child_nodes += run
+				run = []
+				if(child_node != None):
+					new_child_nodes.append(child_node)
+			child_nodes[:] = new_child_nodes
+	lattice.initialize()
+	return combined_nodes
@@ -3,6 +3,7 @@
 ##
 ## Classes:
 ##   ErrorNode - error node for TEAPOT lattices
+##   ErrorEnsembleRunner - Monte Carlo error study runner
 ##
 ## Functions:
 ##   addErrorNode - function to add one error
@@ -29,17 +30,23 @@ from orbit.errors.ErrorNode import dipolekicker
 from orbit.errors.ErrorNode import dipolekickerosc
 from orbit.errors.ErrorNode import quadkicker
 from orbit.errors.ErrorNode import quadkickerosc
+from orbit.errors.ErrorNode import rotationdisplacement
 from orbit.errors.ErrorNode import AddErrorNode
 from orbit.errors.ErrorNode import AddErrorSet
+from orbit.errors.ErrorNode import CombineErrorNodes
 
 from orbit.errors.ErrorLatticeModifications import addErrorNode
 from orbit.errors.ErrorLatticeModifications import addErrorNodeAsChild
 from orbit.errors.ErrorLatticeModifications import addErrorNodeAsChild_I
 from orbit.errors.ErrorLatticeModifications import addErrorNodeAsChild_F
 
+from orbit.errors.ErrorEnsembleRunner import ErrorEnsembleRunner
+
 __all__ = []
 __all__.append("")
 __all__.append("addErrorNode")
 __all__.append("addErrorNodeAsChild")
 __all__.append("addErrorNodeAsChild_I")
 __all__.append("addErrorNodeAsChild_F")
+__all__.append("CombineErrorNodes")
+__all__.append("ErrorEnsembleRunner")
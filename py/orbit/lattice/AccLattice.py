@@ -253,3 +253,57 @@ class AccLattice(NamedObject, TypedObject):
 			paramsDict["node"] = node
 			paramsDict["parentNode"] = self
 			node.trackActions(actionsContainer, paramsDict)
+
+	def trackBunches(self, bunches, paramsDict = None, actionContainer = None, bunchParamsDicts = None, index_start = -1, index_stop = -1):
+		"""
+		Method. Tracks the list of bunches through the lattice in one traversal.
+		Each first level node tracks all bunches one after another before the
+		next node. The node and its child nodes track one bunch through all
+		parts of the node before the next bunch, so the nodes that keep the
+		state between parts and the collective effects (space charge, impedances)
+		are calculated for each bunch separately. The optional bunchParamsDicts 
+		is a list of dictionaries (one per bunch) with the bunch specific parameters
+		(e.g. "lostbunch"). Each bunch is tracked with its own copy of the paramsDict
+		updated with its bunch specific parameters, so the keys of one bunch are not
+		seen by other bunches. After tracking the paramsDict has the "path_length"
+		at the end of the lattice. The indexes of the nodes are inclusive.
+		The lattice is traversed once, but the actions of each node are still
+		performed for every bunch separately.
+		"""
+		if(actionContainer == None): actionContainer = AccActionsContainer("Ensemble Bunch Tracking")
+		if(paramsDict == None): paramsDict = {}
+		n_bunches = len(bunches)
+		if(bunchParamsDicts != None and len(bunchParamsDicts) != n_bunches):
+			msg = "AccLattice.trackBunches(...): the number of bunches and bunch parameters dictionaries should be the same!"
+			msg = msg + os.linesep
+			msg = msg + "number of bunches = " + str(n_bunches) + " number of dictionaries = " + str(len(bunchParamsDicts))
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			orbitFinalize(msg)
+		if(n_bunches == 0): return
+		
+		def track(paramsDict):
+			node = paramsDict["node"]
+			node.track(paramsDict)
+			
+		actionContainer.addAction(track, AccActionsContainer.BODY)
+		paramsDict["lattice"] = self
+		paramsDict["actions"] = actionContainer
+		if(not paramsDict.has_key("path_length")): paramsDict["path_length"] = 0.
+		#---- the separate parameters dictionary for each bunch
+		paramsDicts = []
+		for ind in range(n_bunches):
+			bunchParamsDict = dict(paramsDict)
+			if(bunchParamsDicts != None):
+				bunchParamsDict.update(bunchParamsDicts[ind])
+			bunchParamsDict["bunch"] = bunches[ind]
+			paramsDicts.append(bunchParamsDict)
+		if(index_start < 0): index_start = 0
+		if(index_stop < 0): index_stop = len(self.__children) - 1
+		for node in self.__children[index_start:index_stop+1]:
+			for bunchParamsDict in paramsDicts:
+				bunchParamsDict["node"] = node
+				bunchParamsDict["parentNode"] = self
+				node.trackActions(actionContainer, bunchParamsDict)
+		paramsDict["path_length"] = paramsDicts[0]["path_length"]
+		actionContainer.removeAction(track, AccActionsContainer.BODY)
@@ -83,6 +83,7 @@ class AccNode(NamedObject, TypedObject, ParamsDictObject):
 		"""
 		L = float(L)
 		if(math.fabs(L) < 1.0e-36): L = 0.
+		self.increaseParamsChangeCounter()
 		if(index >= 0):
 			self.__lengthArr[index] = L
 			return
@@ -133,6 +134,7 @@ class AccNode(NamedObject, TypedObject, ParamsDictObject):
 			msg = msg + "N body children=" + n_body_children
 			msg = msg + os.linesep		
 			orbitFinalize(msg)		
+		self.increaseParamsChangeCounter()
 		self.__lengthArr = []
 		self.__childNodesArr[AccNode.BODY] = []
 		for i in range(self.__nParts):
@@ -181,6 +183,7 @@ class AccNode(NamedObject, TypedObject, ParamsDictObject):
 		else:
 			nodes = self.__childNodesArr[place][part_index][place_in_part]
 		nodes.append(node)
+		self.increaseParamsChangeCounter()
 
 	def getChildNodes(self, place, part_index = 0, place_in_part = AccActionsContainer.BEFORE):
 		"""
@@ -228,6 +231,7 @@ class AccNode(NamedObject, TypedObject, ParamsDictObject):
 		distribution etc. Here this node specific reversal method should
 		be empty.
 		"""
+		self.increaseParamsChangeCounter()
 		self.__lengthArr.reverse()
 		self.__childNodesArr.reverse()
 		self.__childNodesArr[AccNode.ENTRANCE].reverse()
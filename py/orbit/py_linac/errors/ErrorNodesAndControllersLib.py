@@ -107,6 +107,56 @@ class ErrorCoordDisplacementNode(AccErrorNode):
 		(dx, dxp, dy, dyp, dz, dE) = self.error_controller_params_func()
 		CoordDisplacement(bunch, dx, dxp, dy, dyp, dz, dE)
 
+class ErrorCombinedCoordDisplacementNode(AccErrorNode):
+	"""
+	The subclass of AccErrorNode. It replaces the sequence of ErrorCoordDisplacementNode
+	instances (components) by one shift of 6 coordinates. The components are not
+	part of the lattice, but their controllers' parameters are read at each pass,
+	so the error values can be changed in the controllers.
+	"""
+	def __init__(self, components = [], name = "no_name"):
+		AccErrorNode.__init__(self,name,"ErrorCombinedCoordDisplacementNode")
+		self.components = []
+		for component in components:
+			self.addComponent(component)
+
+	def addComponent(self, component):
+		"""
+		Adds the ErrorCoordDisplacementNode to the end of the components list.
+		"""
+		if(not isinstance(component,ErrorCoordDisplacementNode)):
+			msg = "ErrorCombinedCoordDisplacementNode.addComponent(component) - this error node cannot be combined!"
+			msg = msg + os.linesep
+			msg = msg + "Error node =" + component.getName() + " type =" + component.getType()
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		self.components.append(component)
+
+	def getComponents(self):
+		"""
+		Returns the list of the combined error nodes.
+		"""
+		return self.components
+
+	def track(self, paramsDict):
+		"""
+		Performs the sum of the components' (dx, dxp, dy, dyp, dz, dE) shifts
+		with one CoordDisplacement function call.
+		"""
+		bunch = paramsDict["bunch"]
+		(dx, dxp, dy, dyp, dz, dE) = (0., 0., 0., 0., 0., 0.)
+		for component in self.components:
+			(dx_c, dxp_c, dy_c, dyp_c, dz_c, dE_c) = component.error_controller_params_func()
+			dx += dx_c
+			dxp += dxp_c
+			dy += dy_c
+			dyp += dyp_c
+			dz += dz_c
+			dE += dE_c
+		CoordDisplacement(bunch, dx, dxp, dy, dyp, dz, dE)
+
 class BaseErrorController(NamedObject, TypedObject, ParamsDictObject):
 	"""
 	The base class for Error Controllers. It keeps the reference to start and stop
@@ -245,4 +295,38 @@ class ErrorCntrlCoordDisplacement(BaseErrorController):
 		Sets one of the parameters for keys "dx","dxp","dy","dyp","dz","dE".
 		"""
 		self.param_dict[key] = value
-		
\ No newline at end of file
+		
+
+def CombineErrorNodes(accLattice):
+	"""
+	Replaces every run of two or more adjacent ErrorCoordDisplacementNode child
+	nodes at the same place of the lattice nodes by one ErrorCombinedCoordDisplacementNode.
+	The error controllers keep the references to the original error nodes, and
+	changes of the controllers' parameters are used by the combined nodes.
+	Returns the list of the created combined nodes.
+	"""
+	combined_nodes = []
+	for node in accLattice.getNodes():
+		child_lists = [node.getChildNodes(AccNode.ENTRANCE), node.getChildNodes(AccNode.EXIT)]
+		for part_index in range(node.getnParts()):
+			child_lists.append(node.getChildNodes(AccNode.BODY, part_index, AccNode.BEFORE))
+			child_lists.append(node.getChildNodes(AccNode.BODY, part_index, AccNode.AFTER))
+		for child_nodes in child_lists:
+			new_child_nodes = []
+			run = []
+			for child_node in child_nodes + [None,]:
+				if(child_node != None and isinstance(child_node,ErrorCoordDisplacementNode)):
+					run.append(child_node)
+					continue
+				if(len(run) > 1):
+					combined_node = ErrorCombinedCoordDisplacementNode(run,node.getName()+":combined_errors")
+					combined_nodes.append(combined_node)
+					new_child_nodes.append(combined_node)
+				else:
+					new_child_nodes += run
+				run = []
+				if(child_node != None):
+					new_child_nodes.append(child_node)
+			child_nodes[:] = new_child_nodes
+	accLattice.initialize()
+	return combined_nodes
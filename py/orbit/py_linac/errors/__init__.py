@@ -4,6 +4,8 @@
 
 from ErrorNodesAndControllersLib import AccErrorNode
 from ErrorNodesAndControllersLib import ErrorCoordDisplacementNode
+from ErrorNodesAndControllersLib import ErrorCombinedCoordDisplacementNode
+from ErrorNodesAndControllersLib import CombineErrorNodes
 
 from ErrorNodesAndControllersLib import BaseErrorController
 from ErrorNodesAndControllersLib import ErrorCntrlCoordDisplacement
@@ -18,3 +20,7 @@ __all__.append("ErrorCntrlCoordDisplacement")
 #---- Error nodes classes
 __all__.append("AccErrorNode")
 __all__.append("ErrorCoordDisplacementNode")
+__all__.append("ErrorCombinedCoordDisplacementNode")
+
+#---- Functions
+__all__.append("CombineErrorNodes")
@@ -19,6 +19,15 @@ from orbit.lattice import AccLattice, AccNode, AccActionsContainer
 # import acc. nodes
 from LinacAccNodes import Quad, AbstractRF_Gap, MarkerLinacNode
 
+# import the tracking state snapshot
+from LinacTrackingStateLib import LinacTrackingState
+
+# import the lowering of node runs into the C++ instruction lists
+from LinacNativeTrackingLib import lowerNativeRuns
+
+# import the cache of the design bunch tracking
+from LinacDesignCacheLib import LinacDesignCache
+
 # import orbit Bunch
 from bunch import Bunch
 
@@ -30,6 +39,14 @@ class LinacAccLattice(AccLattice):
 		AccLattice.__init__(self,name)
 		self.__rfCavities = []
 		self.__sequences = []
+		#---- the C++ instruction lists for runs of nodes {node index: LinacNativeRun}
+		self.__nativeTracking = False
+		self.__nativeRuns = {}
+		#---- the cache of the design bunch tracking (None if it is not used)
+		self.__designCache = None
+		#---- the parent lattice and the index of the first node in it for a sub-lattice
+		self.__parentLattice = None
+		self.__parentIndexStart = 0
 		
 	def initialize(self):
 		"""
@@ -44,7 +61,9 @@ class LinacAccLattice(AccLattice):
 			if(not seq in self.__sequences):
 				self.__sequences.append(seq)	
 		#------define sequences' position and length (position of the beginning of the sequence)
+		#------the sub-lattice does not change the sequences and nodes' positions of the parent lattice
 		seqs = self.getSequences()
+		if(self.__parentLattice != None): seqs = []
 		for seq in seqs:
 			nodes = seq.getNodes()
 			if(len(nodes) == 0): continue
@@ -73,6 +92,13 @@ class LinacAccLattice(AccLattice):
 					orbitFinalize(msg)					
 				if(not rf_cavity in self.__rfCavities):
 					self.__rfCavities.append(rf_cavity)
+		#------lower the runs of nodes into the C++ instruction lists
+		self.__nativeRuns = {}
+		if(self.__nativeTracking):
+			self._lowerNativeRuns()
+		#------the design bunch should be tracked through the whole lattice again
+		if(self.__designCache != None):
+			self.__designCache.clean()
 					
 	def setLinacTracker(self, switch = True):
 		"""
@@ -82,12 +108,89 @@ class LinacAccLattice(AccLattice):
 		for node in self.getNodes():
 			node.setLinacTracker(switch)
 						
+	def setNativeTracking(self, switch = True):
+		"""
+		Switches on or off the tracking of the contiguous runs of Drift, Quad, DCorrectorH,
+		DCorrectorV, and BaseRF_Gap nodes by the C++ instruction lists in the trackBunch
+		method. The runs are defined (lowered) by this method, by the initialize()
+		method, and after the design bunch tracking. The instruction list of the run is
+		created again if the parameters change counters of its nodes, their child nodes,
+		or RF cavities have been changed, so the parameters should be changed by
+		the setters and not inside the parameters dictionaries. The aperture
+		child nodes (LinacApertureNode and its shape subclasses) are checked inside
+		the instruction lists. The nodes with other child nodes (space charge etc.)
+		are tracked at the python level.
+		The instruction lists are used only if the trackBunch method is called 
+		without the actions container.
+		"""
+		self.__nativeTracking = switch
+		self.__nativeRuns = {}
+		if(self.__nativeTracking):
+			self._lowerNativeRuns()
+
+	def getNativeTracking(self):
+		"""
+		Returns True if the runs of nodes are tracked by the C++ instruction lists.
+		"""
+		return self.__nativeTracking
+
+	def setDesignCache(self, switch = True):
+		"""
+		Switches on or off the cache of the design bunch tracking. If it is on, the
+		trackDesignBunch method called without the actions container and the indexes
+		keeps the design bunch states at the entrances of the RF cavities. The next call
+		resumes the design tracking from the first RF cavity with the changed phase,
+		amplitude, or frequency (set by the cavity setters or by the setParam and
+		updateParamsDict methods). If other parameters of the lattice are changed
+		the cache should be cleaned by the cleanDesignCache() method.
+		"""
+		self.__designCache = None
+		if(switch):
+			self.__designCache = LinacDesignCache()
+
+	def getDesignCache(self):
+		"""
+		Returns True if the cache of the design bunch tracking is used.
+		"""
+		return (self.__designCache != None)
+
+	def cleanDesignCache(self):
+		"""
+		Removes the design bunch states from the cache. The next design bunch tracking
+		will be performed through the whole lattice.
+		"""
+		if(self.__designCache != None):
+			self.__designCache.clean()
+
+	def _lowerNativeRuns(self, index_start = 0, index_stop = -1):
+		"""
+		Lowers the runs of nodes with indexes between index_start and index_stop
+		inclusive into the C++ instruction lists.
+		"""
+		nodes = self.getNodes()
+		if(index_stop < 0 or index_stop > len(nodes) - 1): index_stop = len(nodes) - 1
+		for ind in range(index_start,index_stop+1):
+			if(self.__nativeRuns.has_key(ind)): del self.__nativeRuns[ind]
+		for run in lowerNativeRuns(nodes,index_start,index_stop):
+			for ind in range(run.index_start,run.index_stop+1):
+				self.__nativeRuns[ind] = run
+
 	def reverseOrder(self):
 		"""
 		This method is used for a lattice reversal and a bunch backtracking.
 		This method will reverse the order of the children nodes. It will 
 		apply the reverse recursively to the all children nodes.
 		"""
+		if(self.__parentLattice != None):
+			msg = "The reverseOrder method of LinacAccLattice!"
+			msg = msg + os.linesep
+			msg = msg + "The sub-lattice shares sequences and RF cavities with the parent lattice."
+			msg = msg + os.linesep
+			msg = msg + "Reverse the parent lattice instead."
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
 		AccLattice.reverseOrder(self)
 		self.getSequences().reverse()
 		seqs = self.getSequences()
@@ -121,21 +224,68 @@ class LinacAccLattice(AccLattice):
 	def getSubLattice(self, index_start = -1, index_stop = -1):
 		"""
 		It returns the new LinacAccLattice with children with indexes 
-		between index_start and index_stop inclusive. 
-		UNFORTUNATELY: At this moment it is not possible because the lattice has 
-		RF gap with unique references to RF cavities and Sequences which are
-		bidirectional.
-		"""
-		msg = "The getSubLattice method of LinacAccLattice!"
-		msg = msg + os.linesep
-		msg = msg + "That is not possible to get a sub-lattice for LinacAccLattice."
-		msg = msg + os.linesep
-		msg = msg + "Use the trackBunch method with start and end indexes."
-		msg = msg + os.linesep
-		msg = msg + "Stop."
-		msg = msg + os.linesep
-		orbitFinalize(msg)			
-		return self._getSubLattice(LinacAccLattice(),index_start,index_stop)
+		between index_start and index_stop inclusive. The sub-lattice shares
+		the nodes, Sequences, and RF cavities with this lattice. The design 
+		arrival times and phases of the RF cavities are kept by the cavities,
+		so the sub-lattice can be tracked independently after the design bunch
+		tracking through this lattice. The sub-lattice cannot track the design
+		bunch itself. The changes of nodes' and cavities'
+		parameters in the sub-lattice are the changes in this lattice too.
+		The sequences' and nodes' positions are not changed by the sub-lattice.
+		"""
+		nodes = self.getNodes()
+		if(index_start < 0): index_start = 0
+		if(index_stop < 0): index_stop = len(nodes) - 1
+		if(index_start > index_stop or index_stop > len(nodes) - 1):
+			msg = "The getSubLattice method of LinacAccLattice!"
+			msg = msg + os.linesep
+			msg = msg + "Wrong indexes of nodes: index_start=" + str(index_start) + " index_stop=" + str(index_stop)
+			msg = msg + os.linesep
+			msg = msg + "Number of nodes=" + str(len(nodes))
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		subLattice = LinacAccLattice(self.getName())
+		#---- the sub-lattice of the sub-lattice refers to the top parent lattice
+		parentLattice = self
+		parentIndexStart = index_start
+		if(self.__parentLattice != None):
+			parentLattice = self.__parentLattice
+			parentIndexStart = self.__parentIndexStart + index_start
+		subLattice._setParentLattice(parentLattice,parentIndexStart)
+		self._getSubLattice(subLattice,index_start,index_stop)
+		if(self.__nativeTracking):
+			subLattice.setNativeTracking(True)
+		return subLattice
+
+	def _setParentLattice(self, parentLattice, parentIndexStart):
+		"""
+		Sets the parent lattice and the index of the first node of this sub-lattice in it.
+		"""
+		self.__parentLattice = parentLattice
+		self.__parentIndexStart = parentIndexStart
+
+	def getParentLattice(self):
+		"""
+		Returns the parent lattice for the sub-lattice or None.
+		"""
+		return self.__parentLattice
+
+	def getParentIndexStart(self):
+		"""
+		Returns the index of the first node of the sub-lattice in the parent lattice.
+		"""
+		return self.__parentIndexStart
+
+	def getParentPosition(self):
+		"""
+		Returns the position of the sub-lattice's start in the parent lattice.
+		"""
+		if(self.__parentLattice == None): return 0.
+		node = self.__parentLattice.getNodes()[self.__parentIndexStart]
+		(pos_start,pos_stop) = self.__parentLattice.getNodePositionsDict()[node]
+		return pos_start
 
 	def trackActions(self, actionsContainer, paramsDict = {}, index_start = -1, index_stop = -1):
 		"""
@@ -160,6 +310,10 @@ class LinacAccLattice(AccLattice):
 		"""
 		It tracks the bunch through the lattice.
 		"""
+		if(actionContainer == None and self.__nativeTracking):
+			if(paramsDict == None): paramsDict = {}
+			self._trackBunchNative(bunch,paramsDict,index_start,index_stop)
+			return
 		if(actionContainer == None): actionContainer = AccActionsContainer("Bunch Tracking")
 		if(paramsDict == None): paramsDict = {}			
 		paramsDict["bunch"] = bunch
@@ -175,13 +329,42 @@ class LinacAccLattice(AccLattice):
 	def trackDesignBunch(self, bunch_in, paramsDict = None, actionContainer = None, index_start = -1, index_stop = -1):
 		"""
 		This will track the design bunch through the linac and set up RF Cavities times of
-		arrivals.
+		arrivals. If the design cache is used and the method is called without the actions
+		container and the indexes, the tracking starts from the first changed RF cavity.
+		The sub-lattice cannot track the design bunch, because it shares the RF cavities
+		with the parent lattice and would overwrite their design parameters.
 		"""
-		if(actionContainer == None): actionContainer = AccActionsContainer("Design Bunch Tracking")
+		if(self.__parentLattice != None):
+			msg = "The trackDesignBunch method of LinacAccLattice!"
+			msg = msg + os.linesep
+			msg = msg + "The sub-lattice shares RF cavities with the parent lattice."
+			msg = msg + os.linesep
+			msg = msg + "The design bunch tracking would change the design arrival times and phases of the parent lattice."
+			msg = msg + os.linesep
+			msg = msg + "Track the design bunch through the parent lattice instead."
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
 		if(paramsDict == None): paramsDict = {}		
 		bunch = Bunch()
 		bunch_in.copyEmptyBunchTo(bunch)
 		bunch.getSyncParticle().time(0.)	
+		if(actionContainer == None and self.__designCache != None and index_start < 0 and index_stop < 0):
+			self._trackDesignBunchCached(bunch,paramsDict)
+		else:
+			if(actionContainer == None): actionContainer = AccActionsContainer("Design Bunch Tracking")
+			self._trackDesignActions(bunch,paramsDict,actionContainer,index_start,index_stop)
+		#---- the RF gaps can be lowered after the RF cavities' set up
+		if(self.__nativeTracking):
+			self._lowerNativeRuns()
+		return bunch
+
+	def _trackDesignActions(self, bunch, paramsDict, actionContainer, index_start = -1, index_stop = -1):
+		"""
+		Tracks the design bunch through the nodes with indexes between index_start
+		and index_stop inclusive.
+		"""
 		paramsDict["bunch"] = bunch
 		
 		def trackDesign(localParamsDict):
@@ -191,7 +374,141 @@ class LinacAccLattice(AccLattice):
 		actionContainer.addAction(trackDesign, AccActionsContainer.BODY)
 		self.trackActions(actionContainer,paramsDict,index_start,index_stop)
 		actionContainer.removeAction(trackDesign, AccActionsContainer.BODY)
-		return bunch
+
+	def _trackDesignBunchCached(self, bunch, paramsDict):
+		"""
+		Tracks the design bunch through the lattice starting from the entrance of the first
+		changed RF cavity by using the cache. The states at the entrances of the RF cavities
+		downstream are updated in the cache.
+		"""
+		cache = self.__designCache
+		nNodes = len(self.getNodes())
+		ind_start = cache.getStartIndex(self,bunch)
+		if(ind_start == 0):
+			cache.start(self,bunch)
+		else:
+			cache.restoreState(ind_start,bunch,paramsDict)
+		if(ind_start >= nNodes):
+			paramsDict["bunch"] = bunch
+			return
+		actionContainer = AccActionsContainer("Design Bunch Tracking")
+		if(not paramsDict.has_key("path_length")): paramsDict["path_length"] = 0.
+		ind = ind_start
+		for (rf_cavity,cav_ind) in cache.getCavityIndexes():
+			if(cav_ind < ind_start): continue
+			if(cav_ind > ind):
+				self._trackDesignActions(bunch,paramsDict,actionContainer,ind,cav_ind - 1)
+				#---- the synchronous particle could stop, and the cache is not valid
+				if(paramsDict["stop tracking"]):
+					cache.clean()
+					return
+			cache.keepState(cav_ind,bunch,paramsDict)
+			ind = cav_ind
+		self._trackDesignActions(bunch,paramsDict,actionContainer,ind,nNodes - 1)
+		if(paramsDict["stop tracking"]):
+			cache.clean()
+			return
+		cache.keepFinalState(self,bunch,paramsDict)
+
+	def _trackBunchNative(self, bunch, paramsDict, index_start = -1, index_stop = -1):
+		"""
+		Tracks the bunch through the lattice by using the C++ instruction lists
+		for the runs of nodes and the python level tracking for other nodes.
+		"""
+		actionContainer = AccActionsContainer("Bunch Tracking")
+		paramsDict["bunch"] = bunch
+		
+		def track(paramsDict):
+			node = paramsDict["node"]
+			node.track(paramsDict)
+			
+		actionContainer.addAction(track, AccActionsContainer.BODY)
+		paramsDict["lattice"] = self
+		paramsDict["actions"] = actionContainer
+		paramsDict["stop tracking"] = False
+		if(not paramsDict.has_key("path_length")): paramsDict["path_length"] = 0.
+		nodes = self.getNodes()
+		if(index_start < 0): index_start = 0
+		if(index_stop < 0): index_stop = len(nodes) - 1
+		ind = index_start
+		while(ind <= index_stop):
+			if(paramsDict["stop tracking"]): break
+			paramsDict["parentNode"] = self
+			run = self.__nativeRuns.get(ind)
+			if(run != None):
+				ind_stop = min(run.index_stop,index_stop)
+				if(not run.isUpToDate(nodes,ind,ind_stop)):
+					self._lowerNativeRuns(run.index_start,run.index_stop)
+					continue
+				ind_stopped = run.trackBunch(bunch,paramsDict,ind,ind_stop)
+				if(ind_stopped < 0):
+					ind = ind_stop + 1
+					continue
+				#---- the rest of the run starting from this node is tracked at the python level
+				ind = ind_stopped
+			node = nodes[ind]
+			paramsDict["node"] = node
+			node.trackActions(actionContainer, paramsDict)
+			ind += 1
+		actionContainer.removeAction(track, AccActionsContainer.BODY)
+
+	def getTrackingState(self, bunch, paramsDict = None, node_index = 0):
+		"""
+		Returns the LinacTrackingState snapshot with the copy of the bunch, RF cavities 
+		parameters (including the design arrival times), RF gaps phases, the paramsDict 
+		content, and the states of the nodes with the getTrackingState() method. 
+		The node_index is the index of the first node that is not tracked yet.
+		"""
+		state = LinacTrackingState(node_index)
+		state.collect(self,bunch,paramsDict)
+		return state
+		
+	def restoreTrackingState(self, state, bunch, paramsDict = None):
+		"""
+		Restores the tracking state from the LinacTrackingState instance. The content 
+		of the bunch and the paramsDict are replaced by the saved ones. It returns
+		the index of the node from which the tracking should be resumed with the 
+		trackBunch(bunch,paramsDict,index_start = index) method.
+		"""
+		return state.restore(self,bunch,paramsDict)
+		
+	def saveTrackingState(self, file_name, bunch, paramsDict = None, node_index = 0):
+		"""
+		Saves the tracking state snapshot to the file and returns the state.
+		"""
+		state = self.getTrackingState(bunch,paramsDict,node_index)
+		state.save(file_name)
+		return state
+		
+	def readTrackingState(self, file_name, bunch, paramsDict = None):
+		"""
+		Reads the tracking state from the file and restores it. It returns 
+		the index of the node from which the tracking should be resumed.
+		"""
+		state = LinacTrackingState()
+		state.read(file_name,bunch)
+		return self.restoreTrackingState(state,bunch,paramsDict)
+		
+	def trackBunchWithStates(self, bunch, state_indexes, paramsDict = None, actionContainer = None, index_start = -1, index_stop = -1):
+		"""
+		It tracks the bunch through the lattice like the trackBunch method, and 
+		it keeps the tracking states before the nodes with indexes in the state_indexes 
+		list. It returns the dictionary {node_index:LinacTrackingState}.
+		"""
+		if(paramsDict == None): paramsDict = {}
+		if(index_start < 0): index_start = 0
+		if(index_stop < 0): index_stop = len(self.getNodes()) - 1
+		states_dict = {}
+		ind_start = index_start
+		for ind in sorted(state_indexes):
+			if(ind < index_start or ind > index_stop): continue
+			if(ind > ind_start):
+				self.trackBunch(bunch,paramsDict,actionContainer,ind_start,ind - 1)
+				if(paramsDict["stop tracking"]): return states_dict
+			states_dict[ind] = self.getTrackingState(bunch,paramsDict,ind)
+			ind_start = ind
+		self.trackBunch(bunch,paramsDict,actionContainer,ind_start,index_stop)
+		return states_dict
 
 	def getRF_Cavity(self,name):
 		""" Returns the cavity instance according to the name """
@@ -352,6 +669,8 @@ class RF_Cavity(NamedObject,ParamsDictObject):
 		#---- of non-zero length gaps
 		self.__firstGapEntrancePhase = 0.
 		self.__firstGapEntranceDesignPhase = 0.
+		#---- the counter of changes of phase, amplitude, and frequency
+		self.__changeCounter = 0
 		self.addParam("frequency",0.)
 		self.addParam("phase",0.)
 		self.addParam("amp",1.)		
@@ -396,6 +715,7 @@ class RF_Cavity(NamedObject,ParamsDictObject):
 	def setPhase(self,phase):
 		""" Sets the phase for the first RF gap. """
 		self.setParam("phase",phase)
+		self.__changeCounter += 1
 		
 	def getPhase(self):
 		""" Returns the phase for the first RF gap. """
@@ -420,6 +740,7 @@ class RF_Cavity(NamedObject,ParamsDictObject):
 	def setAmp(self,Amp):
 		""" Sets the Amp for RF cavity. """
 		self.setParam("Amp",Amp)
+		self.__changeCounter += 1
 		
 	def getAmp(self):
 		""" Returns the Amp for RF cavity. """
@@ -428,11 +749,19 @@ class RF_Cavity(NamedObject,ParamsDictObject):
 	def setFrequency(self,freq):
 		""" Sets the frequency in Hz. """
 		self.setParam("frequency",freq)
+		self.__changeCounter += 1
 		
 	def getFrequency(self):
 		""" Returns the frequency in Hz. """
 		return self.getParam("frequency")
 		
+	def getChangeCounter(self):
+		"""
+		Returns the number of changes of the phase, amplitude, and frequency.
+		It is used by the design tracking cache of the lattice.
+		"""
+		return self.__changeCounter
+		
 	def setPosition(self,pos):
 		""" Sets the position of the RF cavity in the sequence. """
 		self.setParam("pos",pos)
@@ -46,6 +46,7 @@ class BaseLinacNode(AccNodeBunchTracker):
 		"""
 		This method will switch tracker module to the linac specific traker by default
 		"""
+		self.increaseParamsChangeCounter()
 		if(switch):
 			self.tracking_module = linac_tracking
 		else:
@@ -854,9 +855,10 @@ class AbstractRF_Gap(BaseLinacNode):
 	
 	def setGapPhase(self, gap_phase):
 		"""
-		Sets the rf gap phase.
+		Sets the rf gap phase. The phase is a result of the tracking,
+		so it does not increase the parameters change counter.
 		"""
-		self.setParam("gap_phase",gap_phase)
+		self.getParamsDict()["gap_phase"] = gap_phase
 
 	def getGapPhase(self):
 		"""
@@ -899,6 +901,7 @@ class TiltElement(BaseLinacNode):
 		Sets the tilt angle for the tilt operation.
 		"""
 		self.__angle = angle
+		self.increaseParamsChangeCounter()
 
 	def getTiltAngle(self):
 		"""
@@ -943,6 +946,7 @@ class FringeField(BaseLinacNode):
 		Sets the fringe field function that will track the bunch through the fringe.
 		"""
 		self.__trackFunc = trackFunction
+		self.increaseParamsChangeCounter()
 
 	def getFringeFieldFunction(self):
 		"""
@@ -956,6 +960,7 @@ class FringeField(BaseLinacNode):
 		field will be used in calculation.
 		"""
 		self.__usage = usage
+		self.increaseParamsChangeCounter()
 
 	def getUsage(self):
 		"""
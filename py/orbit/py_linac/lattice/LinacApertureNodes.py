@@ -96,12 +96,14 @@ class LinacPhaseApertureNode(BaseLinacNode):
 
 	def setMinMaxPhase(self,minPhase,maxPhase):
 		self.aperture.setMinMaxPhase(minPhase,maxPhase)
+		self.increaseParamsChangeCounter()
 		
 	def getMinMaxPhase(self):
 		return self.aperture.getMinMaxPhase()
 
 	def setRfFrequency(self,frequency):
 		self.aperture.setRfFrequency(frequency)
+		self.increaseParamsChangeCounter()
 		
 	def getRfFrequency(self):
 		return self.aperture.getRfFrequency()
@@ -142,6 +144,7 @@ class LinacEnergyApertureNode(BaseLinacNode):
 
 	def setMinMaxEnergy(self,minEnergy,maxEnergy):
 		self.aperture.setMinMaxEnergy(minEnergy,maxEnergy)
+		self.increaseParamsChangeCounter()
 		
 	def getMinMaxEnergy(self):
 		return self.aperture.getMinMaxEnergy()
@@ -0,0 +1,124 @@
+"""
+This module includes the LinacDesignCache class. It keeps the states of the design
+bunch (the synchronous particle) at the entrances of the first level nodes that
+belong to the RF cavities. After the change of the RF cavities' parameters
+the design bunch tracking is resumed from the entrance of the first changed cavity
+instead of the tracking through the whole lattice.
+"""
+
+# import acc. nodes
+from LinacAccNodes import AbstractRF_Gap
+
+# import the bunch data conversion function
+from LinacTrackingStateLib import _bunchToDict
+
+# import orbit Bunch
+from bunch import Bunch
+
+class LinacDesignCache:
+	"""
+	The cache of the design bunch tracking. It keeps the design bunch and the path
+	length at the entrance of the first node of each RF cavity and at the end of
+	the lattice, and the change counters and the "phase", "Amp", and "frequency"
+	parameters of RF cavities at the moment of tracking. The RF cavity is considered
+	changed if its counter or one of these parameters is different, so the changes
+	made by the setParam or updateParamsDict methods (e.g. by the LinacTrackingState
+	restore) are also found. The changes of other parameters (RF gaps, nodes' lengths
+	etc.) are not tracked, and the cache should be cleaned by the user in this case.
+	"""
+	def __init__(self):
+		self.clean()
+
+	def clean(self):
+		""" Removes all states from the cache. """
+		self.start_bunch_dict = None
+		self.nodes = []
+		#---- node index: (design bunch, path length)
+		self.states = {}
+		self.final_state = None
+		#---- [(RF cavity, node index, change counter, (phase, Amp, frequency))]
+		self.cavity_counters = []
+		#---- [(RF cavity, index of its first node)] found once by the start method
+		self.cavity_indexes = []
+
+	def getCavityIndexes(self, lattice = None):
+		"""
+		Returns the list of [(RF cavity, index of its first node)] in the order of nodes.
+		Without the lattice it returns the list found for the lattice of the cache by the
+		start method.
+		"""
+		if(lattice == None): return self.cavity_indexes
+		cavity_indexes = []
+		#---- id(RF cavity): True
+		cavities = {}
+		for (ind,node) in enumerate(lattice.getNodes()):
+			if(not isinstance(node,AbstractRF_Gap)): continue
+			rf_cavity = node.getRF_Cavity()
+			if(cavities.has_key(id(rf_cavity))): continue
+			cavities[id(rf_cavity)] = True
+			cavity_indexes.append((rf_cavity,ind))
+		return cavity_indexes
+
+	def getCavityValues(self, rf_cavity):
+		"""
+		Returns the tuple with the (phase, Amp, frequency) parameters of the RF cavity.
+		"""
+		paramsDict = rf_cavity.getParamsDict()
+		return (paramsDict.get("phase"),paramsDict.get("Amp"),paramsDict.get("frequency"))
+
+	def getStartIndex(self, lattice, bunch):
+		"""
+		Returns the index of the node from which the design bunch tracking should
+		be performed. It is 0 if the cache is empty, the lattice or the initial
+		design bunch are different, the index of the first node of the first
+		changed RF cavity, or the number of nodes if nothing was changed.
+		"""
+		if(self.start_bunch_dict == None or self.final_state == None): return 0
+		nodes = lattice.getNodes()
+		if(len(nodes) != len(self.nodes)): return 0
+		for (node,node_cached) in zip(nodes,self.nodes):
+			if(not node is node_cached): return 0
+		if(_bunchToDict(bunch) != self.start_bunch_dict): return 0
+		for (rf_cavity,ind,counter,values) in self.cavity_counters:
+			if(rf_cavity.getChangeCounter() != counter): return ind
+			if(self.getCavityValues(rf_cavity) != values): return ind
+		return len(nodes)
+
+	def start(self, lattice, bunch):
+		"""
+		Cleans the cache and remembers the lattice nodes, the RF cavities with
+		the indexes of their first nodes, and the initial design bunch.
+		"""
+		self.clean()
+		self.nodes = list(lattice.getNodes())
+		self.cavity_indexes = self.getCavityIndexes(lattice)
+		self.start_bunch_dict = _bunchToDict(bunch)
+
+	def keepState(self, index, bunch, paramsDict):
+		""" Keeps the design bunch and the path length at the entrance of the node. """
+		bunch_cached = Bunch()
+		bunch.copyEmptyBunchTo(bunch_cached)
+		self.states[index] = (bunch_cached,paramsDict["path_length"])
+
+	def keepFinalState(self, lattice, bunch, paramsDict):
+		"""
+		Keeps the design bunch and the path length at the end of the lattice,
+		and the change counters and the parameters of the RF cavities.
+		"""
+		bunch_cached = Bunch()
+		bunch.copyEmptyBunchTo(bunch_cached)
+		self.final_state = (bunch_cached,paramsDict["path_length"])
+		self.cavity_counters = []
+		for (rf_cavity,ind) in self.cavity_indexes:
+			self.cavity_counters.append((rf_cavity,ind,rf_cavity.getChangeCounter(),self.getCavityValues(rf_cavity)))
+
+	def restoreState(self, index, bunch, paramsDict):
+		"""
+		Restores the design bunch and the path length at the entrance of the node
+		with the index, or at the end of the lattice if there is no state for the index.
+		"""
+		(bunch_cached,path_length) = self.final_state
+		if(self.states.has_key(index)):
+			(bunch_cached,path_length) = self.states[index]
+		bunch_cached.copyEmptyBunchTo(bunch)
+		paramsDict["path_length"] = path_length
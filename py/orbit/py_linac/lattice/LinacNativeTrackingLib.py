@@ -0,0 +1,297 @@
+"""
+This module includes the LinacNativeRun class and the functions that lower the
+contiguous runs of the linac lattice nodes (drifts, quads, dipole correctors,
+and BaseRF_Gap nodes) into the C++ instruction list. The bunch is tracked through
+the run in C++ without calling the python track methods of the nodes.
+The aperture, phase aperture, and energy aperture child nodes of these nodes
+are lowered into the aperture instructions, so the particles are checked in
+the same C++ pass, and the lost particles are moved to the lost bunch right
+after the aperture only when there are losses.
+The instruction list is created again only when the change counters of
+the nodes, their child nodes, or RF cavities are changed.
+"""
+
+import math
+
+# import acc. nodes
+from LinacAccNodes import Drift, Quad, DCorrectorH, DCorrectorV
+from LinacAccNodes import TiltElement, FringeField
+
+# import the linac specific tracking module to check the node's tracker
+import linac_tracking
+
+# import the C++ instruction list and the RF gap models
+from linac import LinacInstructionList
+from linac import BaseRfGap, BaseRfGap_slow, MatrixRfGap, RfGapTTF, RfGapTTF_slow
+
+class LinacNativeRun:
+	"""
+	The run of the first level lattice nodes with indexes between index_start
+	and index_stop inclusive that are tracked by the C++ instruction list.
+	The tags of the instructions are the indexes of the nodes in the lattice.
+	"""
+	def __init__(self, nodes, index_start, index_stop):
+		self.nodes = nodes[index_start:index_stop+1]
+		self.index_start = index_start
+		self.index_stop = index_stop
+		self.versions = []
+		self.instructions = LinacInstructionList()
+		#---- (node index, RF gap) for RF gaps in the order of instructions
+		self.rf_gaps = []
+		#---- the polynomials of RF gaps are used by the C++ instructions by reference
+		self.polynomials = []
+		#---- (node index, aperture node) for apertures in the order of instructions
+		self.apertures = []
+		self.lower()
+
+	def lower(self):
+		"""
+		Creates the instruction list from the current parameters of the nodes.
+		"""
+		self.instructions.clean()
+		self.versions = []
+		self.rf_gaps = []
+		self.polynomials = []
+		self.apertures = []
+		for (ind,node) in enumerate(self.nodes):
+			self.versions.append(getNativeVersion(node))
+			self._lowerNode(self.index_start + ind,node)
+
+	def isUpToDate(self, nodes, index_start, index_stop):
+		"""
+		Returns True if the nodes of the lattice with indexes between index_start
+		and index_stop are the same, and their change counters have not been changed
+		after the lowering.
+		"""
+		for ind in range(index_start,index_stop+1):
+			ind_run = ind - self.index_start
+			node = nodes[ind]
+			if(not node is self.nodes[ind_run]): return False
+			if(getNativeVersion(node) != self.versions[ind_run]): return False
+		return True
+
+	def trackBunch(self, bunch, paramsDict, index_start, index_stop):
+		"""
+		Tracks the bunch through the nodes with indexes between index_start and
+		index_stop inclusive. It returns the index of the node where the tracking
+		was stopped (the TTF RF gap with the beta outside of the polynomials' limits),
+		or -1 if all nodes were tracked. The path length, RF gaps' phases, and
+		numbers of lost particles of the apertures are updated in the same way
+		as for python level tracking.
+		"""
+		lostbunch = None
+		if(paramsDict.has_key("lostbunch")): lostbunch = paramsDict["lostbunch"]
+		ind_stopped = self.instructions.trackBunch(bunch,index_start,index_stop,lostbunch)
+		ind_last = index_stop
+		if(ind_stopped >= 0): ind_last = ind_stopped - 1
+		phases = self.instructions.getRfGapPhases()
+		for (gap_ind,(ind,rf_gap)) in enumerate(self.rf_gaps):
+			if(ind >= index_start and ind <= ind_last):
+				rf_gap.setGapPhase(phases[gap_ind])
+		losses = self.instructions.getApertureLosses()
+		for (aprt_ind,(ind,aprt_node)) in enumerate(self.apertures):
+			if(ind >= index_start and ind <= ind_last):
+				aprt_node.lost_particles_n = losses[aprt_ind]
+		path_length = paramsDict["path_length"]
+		for node in self.nodes[index_start-self.index_start:ind_last-self.index_start+1]:
+			path_length += node.getLength()
+		paramsDict["path_length"] = path_length
+		if(ind_last >= index_start):
+			paramsDict["node"] = self.nodes[ind_last-self.index_start]
+		return ind_stopped
+
+	def _lowerNode(self, tag, node):
+		"""
+		Adds the instructions for the node and its child nodes in the same order
+		as they are tracked by the trackActions method of the node.
+		"""
+		for (place,part_index,place_in_part) in _getChildPlaces(node):
+			if(place == node.BODY and place_in_part == node.AFTER):
+				self._lowerPart(tag,node,part_index)
+			self._lowerChildren(tag,node.getChildNodes(place,part_index,place_in_part))
+
+	def _lowerPart(self, tag, node, part_index):
+		"""
+		Adds the instructions for the part of the node.
+		"""
+		useLinacTracker = int(node.tracking_module is linac_tracking)
+		if(isinstance(node,Drift)):
+			self.instructions.addDrift(tag,node.getLength(part_index),useLinacTracker)
+			return
+		if(isinstance(node,Quad)):
+			self.instructions.addQuad(tag,node.getLength(part_index),node.getParam("dB/dr"),useLinacTracker)
+			return
+		if(isinstance(node,DCorrectorH) or isinstance(node,DCorrectorV)):
+			BL = node.getParam("B")*node.getParam("effLength")/node.getnParts()
+			(BLx,BLy) = (BL,0.)
+			if(isinstance(node,DCorrectorV)): (BLx,BLy) = (0.,BL)
+			self.instructions.addKick(tag,BLx,BLy,useLinacTracker)
+			return
+		#---- the BaseRF_Gap node
+		rfCavity = node.getRF_Cavity()
+		rf_ampl = rfCavity.getAmp()
+		cppGapModel = node.cppGapModel
+		E0 = node.getParam("E0L")*rf_ampl
+		if(isinstance(cppGapModel,MatrixRfGap) or isinstance(cppGapModel,BaseRfGap) or isinstance(cppGapModel,BaseRfGap_slow)):
+			E0 = node.getParam("E0TL")*rf_ampl
+		phase0 = rfCavity.getPhase() + node.getParam("mode")*math.pi
+		polys = (node.polyT,node.polyS,node.polyTp,node.polySp)
+		self.polynomials.append(polys)
+		self.instructions.addRfGap(tag,cppGapModel,rfCavity.getFrequency(),E0,phase0,
+			rfCavity.getDesignArrivalTime(),node.getParam("beta_min"),node.getParam("beta_max"),
+			polys[0],polys[1],polys[2],polys[3])
+		self.rf_gaps.append((tag,node))
+
+	def _lowerChildren(self, tag, children):
+		"""
+		Adds the instructions for the tilt and aperture child nodes.
+		The unused fringe field nodes are skipped.
+		"""
+		#---- the import is here to avoid the circular import of the lattice module
+		from LinacApertureNodes import LinacPhaseApertureNode, LinacEnergyApertureNode
+		for child in children:
+			if(child.__class__ == TiltElement):
+				if(child.getTiltAngle() != 0.):
+					self.instructions.addRotation(tag,child.getTiltAngle())
+				continue
+			if(child.__class__ == LinacPhaseApertureNode):
+				(minPhase,maxPhase) = child.getMinMaxPhase()
+				self.instructions.addPhaseAperture(tag,child.getRfFrequency(),minPhase,maxPhase,child.getPosition())
+				self.apertures.append((tag,child))
+			elif(child.__class__ == LinacEnergyApertureNode):
+				(minEnergy,maxEnergy) = child.getMinMaxEnergy()
+				self.instructions.addEnergyAperture(tag,minEnergy,maxEnergy,child.getPosition())
+				self.apertures.append((tag,child))
+			elif(child.__class__ in _getApertureClasses()):
+				self.instructions.addAperture(tag,child.shape,child.a,child.b,child.c,child.d,child.getPosition())
+				self.apertures.append((tag,child))
+
+#----------------------------------------------------------------
+# Functions that define which nodes can be tracked by the C++ instruction list
+#----------------------------------------------------------------
+
+def getNativeVersion(node):
+	"""
+	Returns the sum of the parameters change counters of the node, its child nodes,
+	and the RF cavity of the RF gap. The counters are only increased by the setters,
+	so the sum is changed after any change of the parameters used by the instruction
+	list. The changes made directly inside the parameters dictionaries or the lists
+	of parameters are not detected.
+	"""
+	version = node.getParamsChangeCounter()
+	for child in node.getAllChildren():
+		version += child.getParamsChangeCounter()
+	if(node.isRFGap()):
+		rfCavity = node.getRF_Cavity()
+		if(rfCavity != None): version += rfCavity.getParamsChangeCounter()
+	return version
+
+def getNativeSignature(node):
+	"""
+	Returns the tuple with all parameters of the node that are used by the
+	instruction list, or None if the node cannot be tracked by the instruction list.
+	The node cannot be tracked if it has child nodes except the tilt, aperture,
+	and unused fringe field nodes, if a quad has multipole components, or if
+	the RF cavity of the RF gap was not set up by the design bunch tracking.
+	"""
+	#---- the import is here to avoid the circular import of the lattice module
+	from LinacRfGapNodes import BaseRF_Gap
+	node_class = node.__class__
+	if(not node_class in (Drift,Quad,DCorrectorH,DCorrectorV,BaseRF_Gap)): return None
+	children = _getChildrenSignature(node)
+	if(children == None): return None
+	tracker = node.tracking_module
+	part_lengths = tuple([node.getLength(ind) for ind in range(node.getnParts())])
+	if(node_class == Drift):
+		return (node_class,tracker,part_lengths,children)
+	if(node_class == BaseRF_Gap):
+		if(node.getnParts() != 1): return None
+		cppGapModel = node.cppGapModel
+		if(not cppGapModel.__class__ in (BaseRfGap,BaseRfGap_slow,MatrixRfGap,RfGapTTF,RfGapTTF_slow)): return None
+		rfCavity = node.getRF_Cavity()
+		if(rfCavity == None or not rfCavity.isDesignSetUp()): return None
+		return (node_class,tracker,children,cppGapModel,node.getLength(),
+			node.getParam("E0TL"),node.getParam("E0L"),node.getParam("mode"),
+			node.getParam("beta_min"),node.getParam("beta_max"),
+			node.polyT,node.polyS,node.polyTp,node.polySp,
+			rfCavity.getFrequency(),rfCavity.getPhase(),rfCavity.getAmp(),
+			rfCavity.getDesignArrivalTime())
+	if(node_class == Quad):
+		if(len(node.getParam("poles")) != 0): return None
+		return (node_class,tracker,part_lengths,children,node.getParam("dB/dr"))
+	return (node_class,tracker,part_lengths,children,node.getParam("B"),node.getParam("effLength"))
+
+def _getApertureClasses():
+	"""
+	Returns the tuple with classes of the aperture nodes that can be lowered
+	into the aperture instructions. The phase and energy aperture nodes are
+	lowered into the phase and energy aperture instructions.
+	"""
+	#---- the import is here to avoid the circular import of the lattice module
+	from LinacApertureNodes import LinacApertureNode, CircleLinacApertureNode
+	from LinacApertureNodes import EllipseLinacApertureNode, RectangleLinacApertureNode
+	from LinacApertureNodes import LinacPhaseApertureNode, LinacEnergyApertureNode
+	return (LinacApertureNode,CircleLinacApertureNode,EllipseLinacApertureNode,RectangleLinacApertureNode,
+		LinacPhaseApertureNode,LinacEnergyApertureNode)
+
+def _getChildPlaces(node):
+	"""
+	Returns the list of (place,part_index,place_in_part) for the child nodes
+	of the node in the tracking order.
+	"""
+	places = [(node.ENTRANCE,0,node.BEFORE),]
+	for part_index in range(node.getnParts()):
+		places.append((node.BODY,part_index,node.BEFORE))
+		places.append((node.BODY,part_index,node.AFTER))
+	places.append((node.EXIT,0,node.BEFORE))
+	return places
+
+def _getChildrenSignature(node):
+	"""
+	Returns the tuple with parameters of the tilt and aperture child nodes
+	in the tracking order, or None if the node has other child nodes or
+	the fringe field nodes are used.
+	"""
+	#---- the import is here to avoid the circular import of the lattice module
+	from LinacApertureNodes import LinacPhaseApertureNode, LinacEnergyApertureNode
+	aperture_classes = _getApertureClasses()
+	signature = []
+	for (place,part_index,place_in_part) in _getChildPlaces(node):
+		for child in node.getChildNodes(place,part_index,place_in_part):
+			if(len(child.getAllChildren()) != 0): return None
+			child_class = child.__class__
+			if(child_class == TiltElement):
+				signature.append((place,part_index,place_in_part,child,child.getTiltAngle()))
+			elif(child_class == FringeField):
+				if(child.getUsage()): return None
+			elif(child_class == LinacPhaseApertureNode):
+				signature.append((place,part_index,place_in_part,child,
+					child.getRfFrequency(),child.getMinMaxPhase(),child.getPosition()))
+			elif(child_class == LinacEnergyApertureNode):
+				signature.append((place,part_index,place_in_part,child,
+					child.getMinMaxEnergy(),child.getPosition()))
+			elif(child_class in aperture_classes):
+				signature.append((place,part_index,place_in_part,child,
+					child.shape,child.a,child.b,child.c,child.d,child.getPosition()))
+			else:
+				return None
+	return tuple(signature)
+
+def lowerNativeRuns(nodes, index_start, index_stop):
+	"""
+	Returns the list of LinacNativeRun instances for all contiguous runs of nodes
+	that can be tracked by the instruction list between index_start and index_stop
+	inclusive.
+	"""
+	runs = []
+	ind = index_start
+	while(ind <= index_stop):
+		if(getNativeSignature(nodes[ind]) == None):
+			ind += 1
+			continue
+		ind_stop = ind
+		while(ind_stop + 1 <= index_stop and getNativeSignature(nodes[ind_stop + 1]) != None):
+			ind_stop += 1
+		runs.append(LinacNativeRun(nodes,ind,ind_stop))
+		ind = ind_stop + 1
+	return runs
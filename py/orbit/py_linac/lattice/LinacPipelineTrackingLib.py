@@ -0,0 +1,243 @@
+"""
+This module includes the LinacPipelineTracker class. It splits the linac lattice
+into segments by node indexes and assigns each segment to the group of CPUs
+(the pipeline stage). The bunches are streamed through the stages: the stage
+tracks the bunch through its segment and sends the whole bunch to the next
+stage, then it starts to track the next bunch. The local part of the bunch is
+transferred between stages as one MPI_DOUBLE message per CPU packed in C++
+by the sendBunchMPI and recvBunchMPI methods of the Bunch.
+"""
+
+import os
+import sys
+
+#---- MPI module function and classes
+import orbit_mpi
+from orbit_mpi import mpi_comm
+from orbit_mpi import mpi_datatype
+from orbit_mpi import mpi_op
+
+# import the utilities
+from orbit.utils import orbitFinalize
+
+# import orbit Bunch
+from bunch import Bunch
+
+class LinacPipelineTracker:
+	"""
+	The pipeline tracker for the linac lattice. The CPUs of the communicator are
+	divided into nStages equal groups. The CPUs of the group (stage) track the bunches
+	through the sub-lattice with nodes from the index_boundaries[stage-1] to
+	index_boundaries[stage]-1. By default the lattice is divided into segments with
+	equal numbers of nodes. Inside the stage the bunch is distributed between CPUs
+	of the stage's communicator, and the CPU with the rank i in the stage sends
+	its part of the bunch to the CPU with the same rank in the next stage.
+	The RF cavities should be set up by the trackDesignBunch method of the lattice
+	on all CPUs before the tracking. The bunches on all CPUs should have the same
+	particles' attributes, and the lattice nodes should not add or remove the
+	particles' attributes of the bunch, because the bunch is transferred between
+	stages as coordinates and attributes' values only. The attributes' names of
+	the bunch_template are compared over all CPUs in the constructor (or of the
+	first bunch in the first trackBunches call if there is no template), and
+	the bunches are checked against them before and after each segment.
+	"""
+	#---- the MPI tags for the bunch transfer
+	forward_tag = 711
+	backward_tag = 712
+
+	def __init__(self, accLattice, nStages, index_boundaries = None, comm = mpi_comm.MPI_COMM_WORLD, bunch_template = None):
+		self.accLattice = accLattice
+		self.comm = comm
+		self.nStages = nStages
+		size = orbit_mpi.MPI_Comm_size(comm)
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		if(nStages < 1 or size % nStages != 0):
+			msg = "LinacPipelineTracker constructor. The number of CPUs should be divisible by the number of stages!"
+			msg = msg + os.linesep
+			msg = msg + "Number of CPUs =" + str(size)
+			msg = msg + os.linesep
+			msg = msg + "Number of stages =" + str(nStages)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		self.stage_size = size/nStages
+		self.stage = rank/self.stage_size
+		self.stage_rank = rank % self.stage_size
+		self.stage_comm = orbit_mpi.MPI_Comm_split(comm,self.stage,rank)
+		nNodes = len(accLattice.getNodes())
+		if(index_boundaries == None):
+			index_boundaries = []
+			for ind in range(1,nStages):
+				index_boundaries.append((nNodes*ind)/nStages)
+		index_boundaries = list(index_boundaries)
+		if(len(index_boundaries) != nStages - 1 or sorted(index_boundaries) != index_boundaries or
+			(nStages > 1 and (index_boundaries[0] < 1 or index_boundaries[nStages-2] > nNodes - 1))):
+			msg = "LinacPipelineTracker constructor. Wrong indexes of the stages' boundaries!"
+			msg = msg + os.linesep
+			msg = msg + "index_boundaries =" + str(index_boundaries)
+			msg = msg + os.linesep
+			msg = msg + "Number of nodes in the lattice =" + str(nNodes)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		self.index_starts = [0,] + index_boundaries
+		self.index_stops = [ind - 1 for ind in index_boundaries] + [nNodes - 1,]
+		self.segment_lattice = accLattice.getSubLattice(self.index_starts[self.stage],self.index_stops[self.stage])
+		#---- the lost bunches on this CPU for each bunch index
+		self.lost_bunches = []
+		#---- the sorted names of the particles' attributes that are the same on all CPUs
+		self.part_attr_names = None
+		if(bunch_template != None):
+			self._setPartAttrNames(bunch_template)
+
+	def getStage(self):
+		""" Returns the index of the pipeline stage of this CPU. """
+		return self.stage
+
+	def getStageComm(self):
+		""" Returns the MPI communicator of the stage of this CPU. """
+		return self.stage_comm
+
+	def getSegmentLattice(self):
+		""" Returns the sub-lattice tracked by the stage of this CPU. """
+		return self.segment_lattice
+
+	def getStageIndexes(self, stage = None):
+		""" Returns the (index_start,index_stop) of the lattice nodes for the stage. """
+		if(stage == None): stage = self.stage
+		return (self.index_starts[stage],self.index_stops[stage])
+
+	def getLostBunches(self):
+		"""
+		Returns the list of bunches with the particles lost in the segment of this CPU's
+		stage. The list index is the index of the bunch.
+		"""
+		return self.lost_bunches
+
+	def trackBunches(self, bunches, return_to_first_stage = True):
+		"""
+		Tracks the bunches through the lattice. The list of bunches should have the same
+		length on all CPUs. On the CPUs of the first stage the bunches have the particles,
+		and on the other CPUs they are used as the templates only. If return_to_first_stage
+		is True the tracked bunches are sent back to the CPUs of the first stage, and
+		the bunches on other CPUs are not changed. Otherwise the tracked bunches will be
+		on the CPUs of the last stage.
+		"""
+		nBunches = len(bunches)
+		if(nBunches == 0): return
+		if(self.part_attr_names == None):
+			self._setPartAttrNames(bunches[0])
+		#---- one collective check of all bunches before the streaming
+		n_wrong = 0
+		for ind in range(nBunches):
+			if(sorted(bunches[ind].getPartAttrNames()) != self.part_attr_names): n_wrong += 1
+		n_wrong = orbit_mpi.MPI_Allreduce(n_wrong,mpi_datatype.MPI_INT,mpi_op.MPI_SUM,self.comm)
+		if(n_wrong > 0):
+			msg = "LinacPipelineTracker.trackBunches(...). The bunches have different particles' attributes!"
+			msg = msg + os.linesep
+			msg = msg + "They should have the attributes =" + str(self.part_attr_names)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		last_stage = self.nStages - 1
+		self.lost_bunches = [None]*nBunches
+		tracked_bunches = [None]*nBunches
+		for ind in range(nBunches):
+			bunch = Bunch()
+			if(self.stage == 0):
+				bunches[ind].copyBunchTo(bunch)
+			else:
+				bunches[ind].copyEmptyBunchTo(bunch)
+				self._recvBunch(bunch,self.stage - 1,LinacPipelineTracker.forward_tag)
+			bunch.setMPIComm(self.stage_comm)
+			lostbunch = Bunch()
+			bunch.copyEmptyBunchTo(lostbunch)
+			paramsDict = {}
+			paramsDict["lostbunch"] = lostbunch
+			self.segment_lattice.trackBunch(bunch,paramsDict)
+			self.lost_bunches[ind] = lostbunch
+			self._checkPartAttrNames(bunch,ind)
+			if(self.stage < last_stage):
+				self._sendBunch(bunch,self.stage + 1,LinacPipelineTracker.forward_tag)
+			else:
+				tracked_bunches[ind] = bunch
+		#---- now the tracked bunches are on the last stage
+		if(return_to_first_stage and last_stage > 0):
+			if(self.stage == last_stage):
+				for bunch in tracked_bunches:
+					self._sendBunch(bunch,0,LinacPipelineTracker.backward_tag)
+			if(self.stage == 0):
+				for bunch in bunches:
+					self._recvBunch(bunch,last_stage,LinacPipelineTracker.backward_tag)
+			return
+		if(self.stage == last_stage):
+			for ind in range(nBunches):
+				comm_local = bunches[ind].getMPIComm()
+				bunches[ind].deleteAllParticles()
+				tracked_bunches[ind].copyBunchTo(bunches[ind])
+				bunches[ind].setMPIComm(comm_local)
+
+	def _setPartAttrNames(self, bunch):
+		"""
+		Keeps the sorted names of the particles' attributes of the bunch. It is a collective
+		operation, and it stops if the names are different on the CPUs of the communicator.
+		"""
+		names = sorted(bunch.getPartAttrNames())
+		names_txt = "attributes:" + " ".join(names)
+		names_txt_0 = orbit_mpi.MPI_Bcast(names_txt,mpi_datatype.MPI_CHAR,0,self.comm)
+		n_wrong = 0
+		if(names_txt != names_txt_0): n_wrong = 1
+		n_wrong = orbit_mpi.MPI_Allreduce(n_wrong,mpi_datatype.MPI_INT,mpi_op.MPI_SUM,self.comm)
+		if(n_wrong > 0):
+			msg = "LinacPipelineTracker. The bunches have different particles' attributes on CPUs!"
+			msg = msg + os.linesep
+			msg = msg + "The attributes on the CPU with rank=0 =" + str(names_txt_0[len("attributes:"):].split())
+			msg = msg + os.linesep
+			msg = msg + "Number of CPUs with other attributes =" + str(n_wrong)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		self.part_attr_names = names
+
+	def _checkPartAttrNames(self, bunch, bunch_index):
+		"""
+		Stops if the nodes of the segment changed the particles' attributes of the bunch.
+		It is a local check, so the message is printed on this CPU too.
+		"""
+		names = sorted(bunch.getPartAttrNames())
+		if(names == self.part_attr_names): return
+		(index_start,index_stop) = self.getStageIndexes()
+		msg = "LinacPipelineTracker. The lattice nodes changed the particles' attributes of the bunch!"
+		msg = msg + os.linesep
+		msg = msg + "Stage =" + str(self.stage) + " nodes' indexes =" + str((index_start,index_stop))
+		msg = msg + os.linesep
+		msg = msg + "Bunch index =" + str(bunch_index)
+		msg = msg + os.linesep
+		msg = msg + "Attributes before =" + str(self.part_attr_names) + " after =" + str(names)
+		msg = msg + os.linesep
+		msg = msg + "The pipeline cannot transfer the new attributes between stages."
+		msg = msg + os.linesep
+		msg = msg + "Stop."
+		msg = msg + os.linesep
+		sys.stderr.write(msg)
+		orbitFinalize(msg)
+
+	def _sendBunch(self, bunch, stage, tag):
+		"""
+		Sends the local part of the bunch as one message to the CPU with the same
+		rank in the stage.
+		"""
+		dest = stage*self.stage_size + self.stage_rank
+		bunch.sendBunchMPI(dest,tag,self.comm)
+
+	def _recvBunch(self, bunch, stage, tag):
+		"""
+		Receives the local part of the bunch from the CPU with the same rank
+		in the stage. The particles and the synchronous particle of the bunch are replaced.
+		"""
+		source = stage*self.stage_size + self.stage_rank
+		bunch.recvBunchMPI(source,tag,self.comm)
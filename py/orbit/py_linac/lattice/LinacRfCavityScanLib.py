@@ -0,0 +1,134 @@
+"""
+This module includes the RF_CavityScanner class. It performs the phase and amplitude
+scans of the RF cavity by tracking one probe bunch through the cavity's RF gaps.
+Each probe particle represents one phase point of the scan. Its longitudinal
+coordinate is shifted by the phase offset relative to the cavity phase, so all
+phase points are tracked in one pass through the lattice section of the cavity.
+The mapping of the phase offset to the longitudinal coordinate is exact at the
+first RF gap only. The synchronous particle stays at the reference cavity phase,
+so at the next gaps the phases of the probe particles follow their arrival
+times relative to this synchronous particle. They are close, but not equal, to
+the phases that the setPhase(...) scan with the design tracking would give
+for multi-gap cavities with the large energy gain.
+"""
+
+import os
+import math
+
+#---- MPI module function and classes
+import orbit_mpi
+from orbit_mpi import mpi_comm
+
+# import the utilities
+from orbit.utils import orbitFinalize, phaseNearTargetPhase
+from orbit.utils import speed_of_light
+
+# import orbit Bunch
+from bunch import Bunch
+
+class RF_CavityScanner:
+	"""
+	The RF cavity scanner. The scan is performed for the cavity phases in the phase array
+	and the cavity amplitudes in the amplitude array. For each amplitude the scanner
+	tracks one probe bunch with one particle per phase point through the nodes of the
+	lattice from the first to the last RF gap of the cavity. The probe bunch has
+	the zero macro-size, so the space charge nodes do not affect the probe particles.
+	The cavity should be set up by the trackDesignBunch method of the lattice before
+	the scan. The phase and amplitude of the cavity are restored after the scan.
+	The probe particles see the scanned phases exactly at the first RF gap only,
+	see the module description.
+	All phases are in radians, the energies are in GeV.
+	"""
+	def __init__(self, accLattice, rf_cavity):
+		self.accLattice = accLattice
+		self.rf_cavity = rf_cavity
+		self.index_start = -1
+		self.index_stop = -1
+		nodes = accLattice.getNodes()
+		for rf_gap in rf_cavity.getRF_GapNodes():
+			if(not rf_gap in nodes):
+				msg = "RF_CavityScanner constructor. The RF gap is not a first level node of the lattice!"
+				msg = msg + os.linesep
+				msg = msg + "RF Cavity =" + rf_cavity.getName()
+				msg = msg + os.linesep
+				msg = msg + "RF Gap =" + rf_gap.getName()
+				msg = msg + os.linesep
+				msg = msg + "Stop."
+				msg = msg + os.linesep
+				orbitFinalize(msg)
+			ind = nodes.index(rf_gap)
+			if(self.index_start < 0 or ind < self.index_start): self.index_start = ind
+			if(self.index_stop < 0 or ind > self.index_stop): self.index_stop = ind
+		if(self.index_start < 0):
+			orbitFinalize("RF_CavityScanner constructor. The RF cavity "+rf_cavity.getName()+" does not have RF gaps. Stop.")
+
+	def getRF_Cavity(self):
+		""" Returns the scanned RF cavity. """
+		return self.rf_cavity
+
+	def getLatticeIndexes(self):
+		""" Returns the (index_start,index_stop) of the lattice nodes tracked during the scan. """
+		return (self.index_start,self.index_stop)
+
+	def scan(self, bunch_in, phase_arr, amp_arr = None):
+		"""
+		Performs the scan. The synchronous particle of the bunch_in defines the energy
+		and the arrival time at the entrance of the first RF gap, and the bunch_in
+		is not changed. It returns the list [[eKin_out(phase) for phase in phase_arr]
+		for amp in amp_arr] and the list with the same structure with the phases
+		of the probe particles at the exit of the last RF gap. If the probe particle
+		was lost the values are None. If amp_arr is None the current cavity
+		amplitude is used.
+		"""
+		phase_init = self.rf_cavity.getPhase()
+		amp_init = self.rf_cavity.getAmp()
+		if(amp_arr == None): amp_arr = [amp_init,]
+		eKin_res_arr = []
+		phase_res_arr = []
+		for amp in amp_arr:
+			self.rf_cavity.setAmp(amp)
+			(eKin_arr,phase_out_arr) = self._scanPhases(bunch_in,phase_arr,phase_init)
+			eKin_res_arr.append(eKin_arr)
+			phase_res_arr.append(phase_out_arr)
+		self.rf_cavity.setPhase(phase_init)
+		self.rf_cavity.setAmp(amp_init)
+		return (eKin_res_arr,phase_res_arr)
+
+	def _scanPhases(self, bunch_in, phase_arr, phase_ref):
+		"""
+		Tracks the probe bunch for all phases in the phase_arr. The cavity phase is set
+		to the reference phase, and the phase offsets are transformed into the
+		longitudinal coordinates of the probe particles.
+		"""
+		self.rf_cavity.setPhase(phase_ref)
+		frequency = self.rf_cavity.getFrequency()
+		bunch = Bunch()
+		bunch_in.copyEmptyBunchTo(bunch)
+		bunch.setMPIComm(mpi_comm.MPI_COMM_SELF)
+		bunch.macroSize(0.)
+		bunch.addPartAttr("ParticleIdNumber")
+		syncPart = bunch.getSyncParticle()
+		beta_in = syncPart.beta()
+		#---- the later arrival (negative z) is equivalent to the larger cavity phase
+		phase_to_z = - speed_of_light*beta_in/(2.0*math.pi*frequency)
+		for ind in range(len(phase_arr)):
+			delta_phase = phaseNearTargetPhase(phase_arr[ind] - phase_ref,0.)
+			bunch.addParticle(0.,0.,0.,0.,phase_to_z*delta_phase,0.)
+			bunch.partAttrValue("ParticleIdNumber",ind,0,ind)
+		paramsDict = {}
+		lostbunch = Bunch()
+		bunch.copyEmptyBunchTo(lostbunch)
+		paramsDict["lostbunch"] = lostbunch
+		self.accLattice.trackBunch(bunch,paramsDict,None,self.index_start,self.index_stop)
+		eKin_arr = [None]*len(phase_arr)
+		phase_out_arr = [None]*len(phase_arr)
+		syncPart = bunch.getSyncParticle()
+		eKin_sync = syncPart.kinEnergy()
+		z_to_phase = - 2.0*math.pi*frequency/(speed_of_light*syncPart.beta())
+		phase_sync = 2.0*math.pi*frequency*syncPart.time()
+		for ind in range(bunch.getSize()):
+			if(bunch.flag(ind) == 0): continue
+			part_id = int(bunch.partAttrValue("ParticleIdNumber",ind,0))
+			eKin_arr[part_id] = eKin_sync + bunch.dE(ind)
+			phase_out_arr[part_id] = phaseNearTargetPhase(phase_sync + z_to_phase*bunch.z(ind),0.)
+		return (eKin_arr,phase_out_arr)
@@ -30,6 +30,12 @@ from LinacAccNodes import Drift, BaseLinacNode
 from linac import BaseRfGap, MatrixRfGap, RfGapTTF, RfGapThreePointTTF
 from linac import BaseRfGap_slow, RfGapTTF_slow, RfGapThreePointTTF_slow
 
+# from linac import the C++ tracker through all parts of the axis field RF gap
+from linac import AxisFieldRfGap
+
+# import the actions container to check the actions performed for the node
+from orbit.lattice import AccActionsContainer
+
 # The abstract RF gap import
 from LinacAccNodes import AbstractRF_Gap
 
@@ -124,6 +130,7 @@ class BaseRF_Gap(AbstractRF_Gap):
 		By default it is Matrix RF Gap model which is a linear transport matrix.
 		"""
 		self.cppGapModel = cppGapModel
+		self.increaseParamsChangeCounter()
 	
 	def initialize(self):
 		"""
@@ -172,9 +179,10 @@ class BaseRF_Gap(AbstractRF_Gap):
 	
 	def setGapPhase(self, gap_phase):
 		"""
-		Sets the rf gap phase.
+		Sets the rf gap phase. The phase is a result of the tracking,
+		so it does not increase the parameters change counter.
 		"""
-		self.setParam("gap_phase",gap_phase)
+		self.getParamsDict()["gap_phase"] = gap_phase
 
 	def getGapPhase(self):
 		"""
@@ -467,8 +475,12 @@ class AxisFieldRF_Gap(AbstractRF_Gap):
 		#---- The position of the particle during the run. 
 		#---- It is used for the path length accounting.
 		self.part_pos = 0.
+		#---- The index of the last part that has been tracked already
+		self.part_index_stop = -1
 		#---- The RF gap model - three points model
 		self.cppGapModel = RfGapThreePointTTF()
+		#---- The C++ tracker through the parts of the gap
+		self.cppAxisFieldTracker = AxisFieldRfGap()
 
 	def setLinacTracker(self, switch = True):
 		"""
@@ -591,59 +603,36 @@ class AxisFieldRF_Gap(AbstractRF_Gap):
 		#-----------------------------------------
 		nParts = self.getnParts()
 		index = self.getActivePartIndex()
-		part_length = self.getLength(index)		
+		#---- the parts could be already tracked together with the first one
+		if(index == 0): self.part_index_stop = -1
+		if(index <= self.part_index_stop): return
+		index_stop = index
+		if(index == 0 and self.__canTrackAllParts(paramsDict)): index_stop = nParts - 1
+		self.part_index_stop = index_stop
+		part_lengths = [self.getLength(ind) for ind in range(index,index_stop+1)]
 		bunch = paramsDict["bunch"]		
-		syncPart = bunch.getSyncParticle()	
-		eKin_in = syncPart.kinEnergy()
 		E0L = 1.0e+9*self.getParam("E0L")
 		modePhase = self.baserf_gap.getParam("mode")*math.pi
 		frequency = rfCavity.getFrequency()	
 		rf_ampl = rfCavity.getAmp()
-		arrival_time = syncPart.time()
 		designArrivalTime = rfCavity.getDesignArrivalTime()
 		phase_shift = rfCavity.getPhase() - rfCavity.getDesignPhase()
 		phase = rfCavity.getFirstGapEtnrancePhase() + phase_shift
-		#----------------------------------------
-		phase = math.fmod(frequency*(arrival_time - designArrivalTime)*2.0*math.pi + phase,2.0*math.pi)		
 		if(index == 0):
 			self.part_pos = self.z_min 
-			self.gap_phase_vs_z_arr = [[self.part_pos,phase],]
-		zm = self.part_pos
-		z0 = zm + part_length/2
-		zp = z0 + part_length/2
-		Em = E0L*rf_ampl*self.axis_field_func.getY(zm)
-		E0 = E0L*rf_ampl*self.axis_field_func.getY(z0)
-		Ep = E0L*rf_ampl*self.axis_field_func.getY(zp)			
-		#---- advance the particle position
-		self.tracking_module.drift(bunch,part_length/2)
-		self.part_pos += part_length/2	
-		#call rf gap model to track the bunch
-		time_middle_gap = syncPart.time() - arrival_time
-		delta_phase = math.fmod(2*math.pi*time_middle_gap*frequency,2.0*math.pi)
-		self.gap_phase_vs_z_arr.append([self.part_pos,phase+delta_phase])
-		#---- this part is the debugging ---START---
-		#eKin_out = syncPart.kinEnergy()
-		#s  = "debug pos[mm]= %7.2f "%(self.part_pos*1000.)
-		#s += " ekin= %9.6f"%(syncPart.kinEnergy()*1000.)
-		#s += " phase = %9.2f "%(phaseNearTargetPhaseDeg((phase+delta_phase)*180./math.pi,0.))
-		#s += " dE= %9.6f "%((eKin_out-eKin_in)*1000.)		
-		#print s
-		#---- this part is the debugging ---STOP---
-		self.cppGapModel.trackBunch(bunch,part_length/2,Em,E0,Ep,frequency,phase+delta_phase+modePhase)
-		self.tracking_module.drift(bunch,part_length/2)
-		#---- advance the particle position
-		self.part_pos += part_length/2
-		time_middle_gap = syncPart.time() - arrival_time
-		delta_phase = math.fmod(2*math.pi*time_middle_gap*frequency,2.0*math.pi)
-		self.gap_phase_vs_z_arr.append([self.part_pos,phase+delta_phase])
-		#---- this part is the debugging ---START---
-		#eKin_out = syncPart.kinEnergy()
-		#s  = "debug pos[mm]= %7.2f "%(self.part_pos*1000.)
-		#s += " ekin= %9.6f"%(syncPart.kinEnergy()*1000.)
-		#s += " phase = %9.2f "%(phaseNearTargetPhaseDeg((phase+delta_phase)*180./math.pi,0.))
-		#s += " dE= %9.6f "%((eKin_out-eKin_in)*1000.)
-		#print s
-		#---- this part is the debugging ---STOP---
+		#---- the drifts, phases, and RF kicks for all parts are calculated in C++
+		useLinacTracker = int(self.tracking_module is linac_tracking)
+		pos_phase_arr = self.cppAxisFieldTracker.trackBunch(bunch,self.cppGapModel,useLinacTracker,
+			self.axis_field_func,E0L*rf_ampl,frequency,phase,modePhase,designArrivalTime,
+			self.part_pos,part_lengths)
+		if(index == 0):
+			self.gap_phase_vs_z_arr = []
+		else:
+			pos_phase_arr = pos_phase_arr[1:]
+		for (pos,phase_gap) in pos_phase_arr:
+			self.gap_phase_vs_z_arr.append([pos,phase_gap])
+		self.part_pos = pos_phase_arr[len(pos_phase_arr)-1][0]
+		index = index_stop
 		#---- Calculate the phase at the center
 		if(index == (nParts - 1)):
 			pos_old = self.gap_phase_vs_z_arr[0][0]			
@@ -670,6 +659,16 @@ class AxisFieldRF_Gap(AbstractRF_Gap):
 					[pos,phase_gap1] = self.gap_phase_vs_z_arr[ind-1]				
 					self.gap_phase_vs_z_arr[ind][1] = phaseNearTargetPhase(phase_gap,phase_gap1)
 
+	def __canTrackAllParts(self, paramsDict):
+		"""
+		Returns True if all parts of the gap can be tracked by one C++ call at the 
+		first part. It is possible if there are no child nodes inside the gap, and
+		the tracking is the only action for the body of the node.
+		"""
+		if(len(self.getBodyChildren()) != 0): return False
+		if(not paramsDict.has_key("actions")): return False
+		return (len(paramsDict["actions"].getActions(AccActionsContainer.BODY)) == 1)
+
 	def trackDesign(self, paramsDict):
 		"""
 		The method is tracking the design synchronous particle through the RF Gap.
@@ -0,0 +1,272 @@
+"""
+This module includes the LinacTrackingState class. It keeps the snapshot of the
+tracking state of the linac lattice at the boundary between the first level nodes:
+the bunch, the RF cavities' parameters defined by the design bunch tracking, the
+RF gaps' phases, the content of the paramsDict, and the states of the nodes that
+accumulate data during the tracking. The state can be kept in memory or saved to
+the file, and it is used to resume the tracking from the node with the saved index.
+"""
+
+import os
+import copy
+import pickle
+
+#---- MPI module function and classes
+import orbit_mpi
+
+# import the utilities
+from orbit.utils import orbitFinalize
+
+# import acc. nodes
+from LinacAccNodes import AbstractRF_Gap
+
+# import orbit Bunch
+from bunch import Bunch
+
+class LinacTrackingState:
+	"""
+	The snapshot of the linac tracking state. The node index is the index of the first
+	node in the lattice that was not tracked yet. The states of the nodes are collected
+	from all nodes on all levels that have getTrackingState() and setTrackingState(state)
+	methods. The state should be restored into the same lattice (the same structure).
+	"""
+	#---- the keys of the paramsDict that are set by the lattice itself
+	skip_keys = ["bunch","node","parentNode","lattice","actions","stop tracking"]
+
+	def __init__(self, node_index = 0):
+		self.node_index = node_index
+		self.bunch = None
+		self.rf_cavity_states = []
+		self.rf_gap_phases = []
+		self.params_dict = {}
+		self.node_states = {}
+
+	def getNodeIndex(self):
+		""" Returns the index of the node from which the tracking should be resumed. """
+		return self.node_index
+
+	def getBunch(self):
+		""" Returns the copy of the bunch kept in this state. """
+		return self.bunch
+
+	def collect(self, lattice, bunch, paramsDict = None):
+		"""
+		Collects the state of the lattice, the bunch, and the paramsDict.
+		The bunch and the Bunch instances in the paramsDict are copied.
+		"""
+		self.bunch = Bunch()
+		bunch.copyBunchTo(self.bunch)
+		self.rf_cavity_states = []
+		for rf_cavity in lattice.getRF_Cavities():
+			cav_state = (rf_cavity.getParamsDict().copy(),
+				rf_cavity.getFirstGapEtnrancePhase(),
+				rf_cavity.getFirstGapEtnranceDesignPhase())
+			self.rf_cavity_states.append(cav_state)
+		self.rf_gap_phases = []
+		for rf_gap in lattice.getRF_Gaps():
+			self.rf_gap_phases.append(rf_gap.getGapPhase())
+		self.params_dict = {}
+		if(paramsDict != None):
+			for key in paramsDict.keys():
+				if(key in LinacTrackingState.skip_keys): continue
+				self.params_dict[key] = _copyValue(paramsDict[key])
+		self.node_states = {}
+		for (ind,node) in enumerate(_getAllNodes(lattice)):
+			if(hasattr(node,"getTrackingState")):
+				self.node_states[ind] = copy.deepcopy(node.getTrackingState())
+
+	def restore(self, lattice, bunch, paramsDict = None):
+		"""
+		Restores the state of the lattice, the bunch, and the paramsDict.
+		The content of the bunch is replaced by the copy of the saved bunch.
+		"""
+		rf_cavities = lattice.getRF_Cavities()
+		rf_gaps = lattice.getRF_Gaps()
+		nodes = _getAllNodes(lattice)
+		if(len(rf_cavities) != len(self.rf_cavity_states) or len(rf_gaps) != len(self.rf_gap_phases)):
+			msg = "LinacTrackingState.restore(...) - The lattice structure is different!"
+			msg = msg + os.linesep
+			msg = msg + "The numbers of RF cavities or RF gaps do not match."
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		if(self.bunch == None):
+			orbitFinalize("LinacTrackingState.restore(...) - The state does not have the bunch. Stop.")
+		for (rf_cavity,cav_state) in zip(rf_cavities,self.rf_cavity_states):
+			(params_dict,entr_phase,entr_design_phase) = cav_state
+			rf_cavity.updateParamsDict(params_dict)
+			rf_cavity.setFirstGapEtnrancePhase(entr_phase)
+			rf_cavity.setFirstGapEtnranceDesignPhase(entr_design_phase)
+		for (rf_gap,gap_phase) in zip(rf_gaps,self.rf_gap_phases):
+			rf_gap.setGapPhase(gap_phase)
+		bunch.deleteAllParticles()
+		self.bunch.copyBunchTo(bunch)
+		if(paramsDict != None):
+			for key in self.params_dict.keys():
+				paramsDict[key] = _copyValue(self.params_dict[key])
+		for ind in self.node_states.keys():
+			nodes[ind].setTrackingState(copy.deepcopy(self.node_states[ind]))
+		return self.node_index
+
+	def save(self, file_name):
+		"""
+		Saves the state into the file. The bunches are converted to the plain data with
+		the exact coordinates values. In the case of several CPUs each CPU writes
+		its own file with the rank suffix. The values in the paramsDict and the
+		nodes' states should be picklable.
+		"""
+		data_dict = {}
+		data_dict["node_index"] = self.node_index
+		data_dict["bunch"] = _bunchToDict(self.bunch)
+		data_dict["rf_cavity_states"] = self.rf_cavity_states
+		data_dict["rf_gap_phases"] = self.rf_gap_phases
+		params_dict = {}
+		bunch_keys = []
+		for key in self.params_dict.keys():
+			value = self.params_dict[key]
+			if(isinstance(value,Bunch)):
+				value = _bunchToDict(value)
+				bunch_keys.append(key)
+			params_dict[key] = value
+		data_dict["params_dict"] = params_dict
+		data_dict["params_dict_bunch_keys"] = bunch_keys
+		data_dict["node_states"] = self.node_states
+		fl_out = open(_rankFileName(file_name,self.bunch),"wb")
+		try:
+			pickle.dump(data_dict,fl_out,pickle.HIGHEST_PROTOCOL)
+		except (pickle.PicklingError,TypeError), exc:
+			fl_out.close()
+			msg = "LinacTrackingState.save(file_name) - Cannot save the state!"
+			msg = msg + os.linesep
+			msg = msg + "The paramsDict or the nodes' states have values that cannot be pickled."
+			msg = msg + os.linesep
+			msg = msg + str(exc)
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		fl_out.close()
+
+	def read(self, file_name, bunch):
+		"""
+		Reads the state from the file. The bunch is used as a template for the
+		MPI communicator and it is not changed.
+		"""
+		fl_in = open(_rankFileName(file_name,bunch),"rb")
+		data_dict = pickle.load(fl_in)
+		fl_in.close()
+		self.node_index = data_dict["node_index"]
+		self.bunch = Bunch()
+		bunch.copyEmptyBunchTo(self.bunch)
+		_dictToBunch(data_dict["bunch"],self.bunch)
+		self.rf_cavity_states = data_dict["rf_cavity_states"]
+		self.rf_gap_phases = data_dict["rf_gap_phases"]
+		self.params_dict = data_dict["params_dict"]
+		for key in data_dict["params_dict_bunch_keys"]:
+			b = Bunch()
+			bunch.copyEmptyBunchTo(b)
+			_dictToBunch(self.params_dict[key],b)
+			self.params_dict[key] = b
+		self.node_states = data_dict["node_states"]
+
+#----------------------------------------------------------------
+# Functions that are used by the LinacTrackingState class
+#----------------------------------------------------------------
+
+def _getAllNodes(lattice):
+	"""
+	Returns the list of all nodes of the lattice on all levels in the fixed order.
+	"""
+	nodes = []
+	def addNodes(node_arr):
+		for node in node_arr:
+			nodes.append(node)
+			addNodes(node.getAllChildren())
+	addNodes(lattice.getNodes())
+	return nodes
+
+def _copyValue(value):
+	"""
+	Returns the copy of the value from the paramsDict. The bunches are copied
+	by the copyBunchTo method, the objects that cannot be copied are returned as is.
+	"""
+	if(isinstance(value,Bunch)):
+		b = Bunch()
+		value.copyBunchTo(b)
+		return b
+	try:
+		return copy.deepcopy(value)
+	except (TypeError,copy.Error):
+		return value
+
+def _rankFileName(file_name,bunch):
+	"""
+	Returns the file name with the rank suffix if the bunch is distributed between CPUs.
+	"""
+	comm = bunch.getMPIComm()
+	if(orbit_mpi.MPI_Comm_size(comm) == 1): return file_name
+	return file_name + "_" + str(orbit_mpi.MPI_Comm_rank(comm))
+
+def _bunchToDict(bunch):
+	"""
+	Returns the dictionary with the exact content of the local part of the bunch.
+	The dead particles are not included.
+	"""
+	bunch_dict = {}
+	double_attrs = {}
+	for name in bunch.bunchAttrDoubleNames():
+		double_attrs[name] = bunch.bunchAttrDouble(name)
+	int_attrs = {}
+	for name in bunch.bunchAttrIntNames():
+		int_attrs[name] = bunch.bunchAttrInt(name)
+	bunch_dict["bunch_attr_double"] = double_attrs
+	bunch_dict["bunch_attr_int"] = int_attrs
+	syncPart = bunch.getSyncParticle()
+	bunch_dict["sync_part"] = (syncPart.pVector(),syncPart.rVector(),syncPart.time())
+	part_attr_dicts = bunch.getPartAttrDicts()
+	bunch_dict["part_attr_dicts"] = part_attr_dicts
+	coords = []
+	part_attrs = {}
+	for name in part_attr_dicts.keys():
+		part_attrs[name] = []
+	for ind in range(bunch.getSize()):
+		if(bunch.flag(ind) == 0): continue
+		coords.append((bunch.x(ind),bunch.xp(ind),bunch.y(ind),bunch.yp(ind),bunch.z(ind),bunch.dE(ind)))
+		for name in part_attr_dicts.keys():
+			vals = []
+			for attr_ind in range(bunch.getPartAttrSize(name)):
+				vals.append(bunch.partAttrValue(name,ind,attr_ind))
+			part_attrs[name].append(vals)
+	bunch_dict["coords"] = coords
+	bunch_dict["part_attrs"] = part_attrs
+	return bunch_dict
+
+def _dictToBunch(bunch_dict,bunch):
+	"""
+	Replaces the content of the bunch by the data from the dictionary
+	created by the _bunchToDict function.
+	"""
+	bunch.deleteAllParticles()
+	bunch.removeAllPartAttr()
+	double_attrs = bunch_dict["bunch_attr_double"]
+	for name in double_attrs.keys():
+		bunch.bunchAttrDouble(name,double_attrs[name])
+	int_attrs = bunch_dict["bunch_attr_int"]
+	for name in int_attrs.keys():
+		bunch.bunchAttrInt(name,int_attrs[name])
+	(pVector,rVector,time) = bunch_dict["sync_part"]
+	syncPart = bunch.getSyncParticle()
+	syncPart.pVector(pVector)
+	syncPart.rVector(rVector)
+	syncPart.time(time)
+	part_attr_dicts = bunch_dict["part_attr_dicts"]
+	for name in part_attr_dicts.keys():
+		bunch.addPartAttr(name,part_attr_dicts[name])
+	for (x,xp,y,yp,z,dE) in bunch_dict["coords"]:
+		bunch.addParticle(x,xp,y,yp,z,dE)
+	part_attrs = bunch_dict["part_attrs"]
+	for name in part_attrs.keys():
+		for (ind,vals) in enumerate(part_attrs[name]):
+			for (attr_ind,val) in enumerate(vals):
+				bunch.partAttrValue(name,ind,attr_ind,val)
@@ -13,6 +13,11 @@ import math
 import sys
 import os
 
+#---- MPI module function and classes
+import orbit_mpi
+from orbit_mpi import mpi_datatype
+from orbit_mpi import mpi_op
+
 # import the finalization function 
 from orbit.utils import orbitFinalize
 
@@ -25,6 +30,8 @@ import orbit_utils
 from orbit_utils import bunch_utils_functions
 from bunch_utils_functions import copyCoordsToInitCoordsAttr
 from bunch_utils_functions import transportMtrxFromInitCoords
+from bunch_utils_functions import transportMtrxSumsFromInitCoords
+from bunch_utils_functions import transportMtrxFromSums
 
 from orbit_utils import Matrix
 
@@ -50,6 +57,8 @@ class LinacTrMatrixGenNode(MarkerLinacNode):
 		self.relativistic_gamma = 0.
 		#--------------------------------------
 		self.trMtrx = Matrix(7,7)
+		#---- local sums for the accumulation mode of the controller
+		self.trMtrxSums = None
 		#--------------------------------------
 		self.trMatricesController.addNode(self)		
 
@@ -94,7 +103,13 @@ class LinacTrMatrixGenNode(MarkerLinacNode):
 			self.trMtrx.unit()
 			copyCoordsToInitCoordsAttr(bunch)
 		else:
-			transportMtrxFromInitCoords(bunch,self.trMtrx,self.use_twiss_weight_x,self.use_twiss_weight_y,self.use_twiss_weight_z)
+			use_twiss = self.use_twiss_weight_x + self.use_twiss_weight_y + self.use_twiss_weight_z
+			if(self.trMatricesController.getAccumulationMode() and use_twiss == 0):
+				#---- the matrix will be calculated by the controller
+				self.trMtrxSums = transportMtrxSumsFromInitCoords(bunch)
+				self.trMatricesController.setMPIComm(bunch.getMPIComm())
+			else:
+				transportMtrxFromInitCoords(bunch,self.trMtrx,self.use_twiss_weight_x,self.use_twiss_weight_y,self.use_twiss_weight_z)
 
 	def trackDesign(self, paramsDict):
 		"""
@@ -177,6 +192,53 @@ class LinacTrMatricesContrioller:
 	"""
 	def __init__(self):
 		self.trMatrxNodes = []
+		self.accumulation_mode = False
+		self.mpi_comm = None
+		
+	def setAccumulationMode(self, switch = True):
+		"""
+		Sets the accumulation mode. In this mode the nodes without Twiss weights 
+		keep only the local sums during the tracking, and the transport matrices 
+		are calculated by the calculateTransportMatrices() method after the tracking 
+		with one MPI reduction for all nodes.
+		"""
+		self.accumulation_mode = switch
+		
+	def getAccumulationMode(self):
+		"""
+		Returns True if the controller is in the accumulation mode.
+		"""
+		return self.accumulation_mode
+		
+	def setMPIComm(self, mpi_comm):
+		"""
+		Sets the MPI communicator of the tracked bunch. It is used by the 
+		calculateTransportMatrices() method.
+		"""
+		self.mpi_comm = mpi_comm
+		
+	def calculateTransportMatrices(self):
+		"""
+		Calculates the transport matrices for all nodes with the sums accumulated 
+		during the tracking in the accumulation mode. The sums for all nodes are 
+		packed into one array and summed over CPUs in one MPI call.
+		It returns the number of calculated matrices.
+		"""
+		nodes = []
+		sums_arr = []
+		for node in self.trMatrxNodes:
+			if(node.trMtrxSums != None):
+				nodes.append(node)
+				sums_arr += list(node.trMtrxSums)
+		if(len(nodes) == 0): return 0
+		if(self.mpi_comm != None):
+			sums_arr = orbit_mpi.MPI_Allreduce(sums_arr,mpi_datatype.MPI_DOUBLE,mpi_op.MPI_SUM,self.mpi_comm)
+		sums_size = len(sums_arr)/len(nodes)
+		for ind in range(len(nodes)):
+			node = nodes[ind]
+			transportMtrxFromSums(sums_arr[ind*sums_size:(ind+1)*sums_size],node.getTransportMatrix())
+			node.trMtrxSums = None
+		return len(nodes)
 		
 	def getCount(self):
 		return len(self.trMatrxNodes)
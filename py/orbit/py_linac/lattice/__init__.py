@@ -3,10 +3,17 @@
 ##
 ## Classes:
 ## - LinacAcclattice       - Class. The linac lattice.
+## - LinacTrackingState    - Class. The snapshot of the tracking state at the node boundary.
 ## - LinacAccNodes         - Module. Collection of the linac accelerator nodes: drifts, quads, RF gaps etc..
 ## - LinacRfGapNodes       - Module. Collection of RF Gap models
+## - LinacNativeTrackingLib - Module. Lowering of node runs into the C++ instruction lists.
+## - LinacDesignCacheLib  - Module. Cache of the design bunch states at the RF cavities' entrances.
+## - LinacPipelineTracker - Class. Segment-parallel tracking of bunches through the pipeline of CPU groups.
+## - RF_CavityScanner     - Class. The phase and amplitude scans of RF cavities in one pass.
 
 from LinacAccLatticeLib import LinacAccLattice, RF_Cavity, Sequence
+from LinacTrackingStateLib import LinacTrackingState
+from LinacPipelineTrackingLib import LinacPipelineTracker
 
 from LinacAccNodes import BaseLinacNode, LinacNode, LinacMagnetNode
 from LinacAccNodes import MarkerLinacNode, Drift, Quad, AbstractRF_Gap, Bend
@@ -36,6 +43,8 @@ from LinacAccLatticeFunc import getAllMagnetsInLattice
 from LinacTransportMatrixGenNodes import LinacTrMatrixGenNode
 from LinacTransportMatrixGenNodes import LinacTrMatricesContrioller
 
+from LinacRfCavityScanLib import RF_CavityScanner
+
 from LinacDiagnosticsNodes import LinacBPM
 
 __all__ = []
@@ -63,6 +72,8 @@ __all__.append("LinacEnergyApertureNode")
 
 __all__.append("RF_Cavity")
 __all__.append("Sequence")
+__all__.append("LinacTrackingState")
+__all__.append("LinacPipelineTracker")
 
 __all__.append("LinacStructureTree")
 __all__.append("LinacStructureSeq")
@@ -86,5 +97,7 @@ __all__.append("getAllMagnetsInLattice")
 __all__.append("LinacTrMatrixGenNode")
 __all__.append("LinacTrMatricesContrioller")
 
+__all__.append("RF_CavityScanner")
+
 __all__.append("LinacBPM")
 
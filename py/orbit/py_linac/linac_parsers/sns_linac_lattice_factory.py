@@ -10,6 +10,11 @@ The SNS Linac Lattice Factory uses a predefined set of Linac Acc Elements.
 import os
 import sys
 import math
+import hashlib
+
+import orbit_mpi
+from orbit_mpi import mpi_comm
+from orbit_mpi import mpi_datatype
 
 # import the XmlDataAdaptor XML parser
 from orbit.utils.xml import XmlDataAdaptor
@@ -67,6 +72,68 @@ class SNS_LinacLatticeFactory():
 		acc_da = XmlDataAdaptor.adaptorForFile(xml_file_name)
 		return self.getLinacAccLatticeFromDA(names,acc_da)
 	
+	def getLinacAccLatticeCached(self,names,xml_file_name,cache_file_name = None):
+		"""
+		Returns the linac accelerator lattice for specified sequence names and for a specified XML file.
+		The parsed XML structure is kept in the binary cache file (by default it is the XML 
+		file name with the '.cache' suffix) together with the XML file hash. The cache is used
+		if the XML file has not been changed. Only CPU with rank 0 reads the XML or the cache 
+		file, and the parsed structure is broadcast to all other CPUs as a binary string.
+		"""
+		if(len(names) < 1):
+			msg = "The SNS_LinacLatticeFactory method getLinacAccLatticeCached(names,xml_file_name): you have to specify the names array!"
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+		if(cache_file_name == None):
+			cache_file_name = xml_file_name + ".cache"
+		comm = mpi_comm.MPI_COMM_WORLD
+		rank = orbit_mpi.MPI_Comm_rank(comm)
+		binary_string = ""
+		if(rank == 0):
+			fl_in = open(xml_file_name,"rb")
+			xml_hash = hashlib.md5(fl_in.read()).hexdigest()
+			fl_in.close()
+			binary_string = self._readLatticeCache(cache_file_name,xml_hash)
+			if(binary_string == None):
+				acc_da = XmlDataAdaptor.adaptorForFile(xml_file_name)
+				binary_string = acc_da.makeBinaryString()
+				self._writeLatticeCache(cache_file_name,xml_hash,binary_string)
+		binary_string = orbit_mpi.MPI_Bcast(binary_string,mpi_datatype.MPI_CHAR,0,comm)
+		acc_da = XmlDataAdaptor.adaptorForBinaryString(binary_string)
+		return self.getLinacAccLatticeFromDA(names,acc_da)
+
+	def _readLatticeCache(self,cache_file_name,xml_hash):
+		"""
+		Returns the binary string with the parsed XML structure from the cache file
+		or None if the file does not exist or it was created for another XML file.
+		"""
+		if(not os.path.isfile(cache_file_name)): return None
+		fl_in = open(cache_file_name,"rb")
+		header = fl_in.readline().strip()
+		binary_string = fl_in.read()
+		fl_in.close()
+		if(header != self._makeLatticeCacheHeader(xml_hash)): return None
+		return binary_string
+
+	def _makeLatticeCacheHeader(self,xml_hash):
+		""" Returns the header line of the cache file with the format version and the XML hash. """
+		return "XmlDataAdaptor_binary_v"+str(XmlDataAdaptor.getBinaryVersion())+" "+xml_hash
+
+	def _writeLatticeCache(self,cache_file_name,xml_hash,binary_string):
+		"""
+		Writes the XML file hash and the binary string into the cache file.
+		If the file cannot be written the cache is not used.
+		"""
+		try:
+			fl_out = open(cache_file_name,"wb")
+			fl_out.write(self._makeLatticeCacheHeader(xml_hash)+"\n")
+			fl_out.write(binary_string)
+			fl_out.close()
+		except IOError:
+			print "SNS_LinacLatticeFactory: cannot write the lattice cache file=",cache_file_name
+
 	def getLinacAccLatticeFromDA(self,names,acc_da):
 		"""
 		Returns the linac accelerator lattice for specified sequence names.
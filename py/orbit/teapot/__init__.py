@@ -19,6 +19,10 @@ from teapot import TPB
 
 from teapot_matrix_lattice import TEAPOT_MATRIX_Lattice
 
+from teapot_taylor_map import TaylorMapTEAPOT
+from teapot_taylor_map import makeTaylorMapNode
+from teapot_taylor_map import replaceSectionsWithTaylorMaps
+
 __all__ = []
 __all__.append("TEAPOT_Lattice")
 __all__.append("BaseTEAPOT")
@@ -34,4 +38,7 @@ __all__.append("FringeFieldTEAPOT")
 __all__.append("TiltTEAPOT")
 __all__.append("TPB")
 __all__.append("TEAPOT_MATRIX_Lattice")
+__all__.append("TaylorMapTEAPOT")
+__all__.append("makeTaylorMapNode")
+__all__.append("replaceSectionsWithTaylorMaps")
 
@@ -131,6 +131,13 @@ class TEAPOT_Lattice(AccLattice):
 		self.trackActions(actionContainer,paramsDict)
 		actionContainer.removeAction(track, AccActionsContainer.BODY)
 
+	def trackBunches(self, bunches, paramsDict = {}, actionContainer = None, bunchParamsDicts = None):
+		"""
+		It tracks the list of bunches through the lattice in one traversal.
+		"""
+		paramsDict["useCharge"] = self.useCharge
+		AccLattice.trackBunches(self,bunches,paramsDict,actionContainer,bunchParamsDicts)
+
 	def setUseRealCharge(self, useCharge = 1):
 		""" If useCharge != 1 the trackBunch(...) method will assume the charge = +1 """ 
 		self.useCharge = useCharge
@@ -257,6 +264,13 @@ class TEAPOT_Ring(AccLattice):
 		self.trackActions(actionContainer,paramsDict)
 		actionContainer.removeAction(track, AccActionsContainer.BODY)
 		
+	def trackBunches(self, bunches, paramsDict = {}, actionContainer = None, bunchParamsDicts = None):
+		"""
+		It tracks the list of bunches through the lattice in one traversal.
+		"""
+		paramsDict["useCharge"] = self.useCharge
+		AccLattice.trackBunches(self,bunches,paramsDict,actionContainer,bunchParamsDicts)
+
 	def setUseRealCharge(self, useCharge = 1):
 		""" If useCharge != 1 the trackBunch(...) method will assume the charge = +1 """ 
 		self.useCharge = useCharge
@@ -0,0 +1,186 @@
+"""
+The Taylor map nodes for TEAPOT lattices. The TaylorMapTEAPOT node replaces
+the section of the TEAPOT lattice by the truncated power series map of the
+chosen order. The map is generated by tracking the test particles through
+the section and fitting the coefficients of the polynomials. The sections
+with collective effects (space charge, impedances etc.), diagnostics, and
+RF cavities should not be replaced by maps, because these nodes depend on
+the bunch or time.
+"""
+import os
+import math
+
+#import bunch
+from bunch import Bunch
+
+# import the function that finalizes the execution
+from orbit.utils import orbitFinalize
+
+# import general accelerator elements and lattice
+from orbit.lattice import AccLattice, AccNode, AccActionsContainer
+
+# import C++ Taylor map class
+from orbit.teapot_base import TaylorMap
+
+from orbit.teapot import BaseTEAPOT, RingRFTEAPOT
+from orbit.teapot.teapot import TiltTEAPOT, FringeFieldTEAPOT, BunchWrapTEAPOT
+
+class TaylorMapTEAPOT(BaseTEAPOT):
+	"""
+	The node that tracks the bunch through the Taylor map of the lattice section.
+	The synchronous particle time is advanced by the time of flight through
+	the section that was calculated during the map generation.
+	"""
+	def __init__(self, taylor_map, name = "taylor map no name"):
+		BaseTEAPOT.__init__(self,name)
+		self.setType("taylor map teapot")
+		self.taylor_map = taylor_map
+		self.addParam("time_of_flight",0.)
+		self.addParam("map_parent_nodes",[])
+
+	def getTaylorMap(self):
+		""" Returns the TaylorMap instance. """
+		return self.taylor_map
+
+	def getParentNodes(self):
+		""" Returns the list of TEAPOT nodes replaced by this map. """
+		return self.getParam("map_parent_nodes")
+
+	def getSymplecticError(self, coords = (0.,0.,0.,0.,0.,0.)):
+		""" Returns the symplecticity error of the map at the point (x,xp,y,yp,z,dE). """
+		return self.taylor_map.getSymplecticError(*coords)
+
+	def track(self, paramsDict):
+		"""
+		The TaylorMapTEAPOT class implementation of the AccNodeBunchTracker class track(probe) method.
+		"""
+		bunch = paramsDict["bunch"]
+		self.taylor_map.trackBunch(bunch)
+		syncPart = bunch.getSyncParticle()
+		syncPart.time(syncPart.time() + self.getParam("time_of_flight"))
+
+def _isMappableNode(node):
+	"""
+	Returns True if the node is a TEAPOT node without RF and without child
+	nodes except the tilt, fringe field, and ring bunch wrap nodes.
+	"""
+	if(not isinstance(node,BaseTEAPOT)): return False
+	if(isinstance(node,RingRFTEAPOT) or isinstance(node,TaylorMapTEAPOT)): return False
+	for child in node.getAllChildren():
+		if(isinstance(child,TiltTEAPOT) or isinstance(child,FringeFieldTEAPOT)): continue
+		if(isinstance(child,BunchWrapTEAPOT)): continue
+		return False
+	return True
+
+def _hasBunchWrap(nodes):
+	"""
+	Returns True if one of the nodes has the bunch wrap child node (TEAPOT_Ring nodes).
+	"""
+	for node in nodes:
+		for child in node.getAllChildren():
+			if(isinstance(child,BunchWrapTEAPOT)): return True
+	return False
+
+def _checkTEAPOTLattice(teapot_lattice, func_name):
+	"""
+	Stops the execution if the lattice is not the AccLattice instance
+	(TEAPOT_Lattice, TEAPOT_Ring etc.).
+	"""
+	if(not isinstance(teapot_lattice,AccLattice)):
+		msg = "orbit.teapot." + func_name + "(...) needs the TEAPOT_Lattice or TEAPOT_Ring instance."
+		msg = msg + os.linesep
+		msg = msg + "Stop."
+		msg = msg + os.linesep
+		orbitFinalize(msg)
+
+def makeTaylorMapNode(teapot_lattice, bunch, index_start, index_stop, order = 2, steps = None, name = None):
+	"""
+	Generates the TaylorMapTEAPOT node for the nodes of the lattice
+	(TEAPOT_Lattice, TEAPOT_Ring or other AccLattice with TEAPOT nodes) with
+	indexes between index_start and index_stop inclusive. The bunch defines
+	the synchronous particle and it is not changed. The steps are the
+	amplitudes (x,xp,y,yp,z,dE/Ekin) of the test particles, they should be
+	close to the beam size in the section.
+	"""
+	_checkTEAPOTLattice(teapot_lattice,"makeTaylorMapNode")
+	nodes = teapot_lattice.getNodes()[index_start:index_stop+1]
+	if(len(nodes) == 0):
+		orbitFinalize("orbit.teapot.makeTaylorMapNode(...) the section does not have nodes.")
+	for node in nodes:
+		if(not isinstance(node,BaseTEAPOT)):
+			msg = "orbit.teapot.makeTaylorMapNode(...) the section should include the TEAPOT nodes only!"
+			msg = msg + os.linesep
+			msg = msg + "Name of node=" + node.getName()
+			msg = msg + os.linesep
+			msg = msg + "Type of node=" + node.getType()
+			msg = msg + os.linesep
+			msg = msg + "Stop."
+			msg = msg + os.linesep
+			orbitFinalize(msg)
+	taylor_map = TaylorMap(order)
+	if(steps != None):
+		for ind in range(6):
+			taylor_map.setStep(ind,steps[ind])
+	test_bunch = Bunch()
+	lost_bunch = Bunch()
+	bunch.copyEmptyBunchTo(test_bunch)
+	bunch.copyEmptyBunchTo(lost_bunch)
+	taylor_map.initBunch(test_bunch)
+	time_start = test_bunch.getSyncParticle().time()
+	paramsDict = {}
+	paramsDict["bunch"] = test_bunch
+	paramsDict["lostbunch"] = lost_bunch
+	paramsDict["useCharge"] = 1
+	if(hasattr(teapot_lattice,"getUseRealCharge")):
+		paramsDict["useCharge"] = teapot_lattice.getUseRealCharge()
+
+	def track(paramsDict):
+		node = paramsDict["node"]
+		node.track(paramsDict)
+
+	accContainer = AccActionsContainer("Taylor Map Generation")
+	accContainer.addAction(track, AccActionsContainer.BODY)
+	teapot_lattice.trackActions(accContainer,paramsDict,index_start,index_stop)
+	taylor_map.calculateMap(test_bunch)
+	if(name == None):
+		name = nodes[0].getName() + "_" + nodes[len(nodes)-1].getName() + "_map"
+	map_node = TaylorMapTEAPOT(taylor_map,name)
+	length = 0.
+	for node in nodes:
+		length += node.getLength()
+	map_node.setLength(length)
+	map_node.setParam("time_of_flight",test_bunch.getSyncParticle().time() - time_start)
+	map_node.setParam("map_parent_nodes",nodes)
+	return map_node
+
+def replaceSectionsWithTaylorMaps(teapot_lattice, bunch, order = 2, steps = None):
+	"""
+	Replaces all sequences of TEAPOT nodes between the nodes with collective
+	effects, diagnostics or RF (any child nodes except the tilt and fringe
+	field ones) by the TaylorMapTEAPOT nodes. The lattice is changed in place.
+	For the TEAPOT_Ring lattice the map node gets the bunch wrap child node
+	like the nodes it replaces. Returns the list of the map nodes.
+	"""
+	_checkTEAPOTLattice(teapot_lattice,"replaceSectionsWithTaylorMaps")
+	nodes = teapot_lattice.getNodes()
+	new_nodes = []
+	map_nodes = []
+	ind = 0
+	n_nodes = len(nodes)
+	while(ind < n_nodes):
+		if(not _isMappableNode(nodes[ind])):
+			new_nodes.append(nodes[ind])
+			ind += 1
+			continue
+		ind_stop = ind
+		while(ind_stop + 1 < n_nodes and _isMappableNode(nodes[ind_stop + 1])):
+			ind_stop += 1
+		map_node = makeTaylorMapNode(teapot_lattice,bunch,ind,ind_stop,order,steps)
+		if(_hasBunchWrap(nodes[ind:ind_stop+1])):
+			map_node.addChildNode(BunchWrapTEAPOT(map_node.getName()+"_bunch_wrap"),AccNode.BODY)
+		new_nodes.append(map_node)
+		map_nodes.append(map_node)
+		ind = ind_stop + 1
+	teapot_lattice.setNodes(new_nodes)
+	teapot_lattice.initialize()
+	return map_nodes
@@ -4,8 +4,10 @@
 
 import teapot_base as TPB
 from teapot_base import MatrixGenerator
+from teapot_base import TaylorMap
 
 __all__ = []
 __all__.append("TPB")
 __all__.append("MatrixGenerator")
+__all__.append("TaylorMap")
 
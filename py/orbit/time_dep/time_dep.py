@@ -21,6 +21,7 @@ class TIME_DEP_Lattice(TEAPOT_Lattice):
 		self.__latticeDict = {}
 		self.__TDNodeDict = {}
 		self.__turns = 1
+		self.__strengthTable = []
 		
 	def setLatticeOrder(self):
 		"""
@@ -62,37 +63,114 @@ class TIME_DEP_Lattice(TEAPOT_Lattice):
 			node = NodeDict[i]
 			waveform = node.getParam("waveform")			
 			waveform.calc(time)		
-			waveformType = waveform.getType()
-			if waveformType == "kicker waveform":
-				if node.getType() == "kick teapot":
-					self.setParam(node,"kx",waveform.getKx())
-					self.setParam(node,"ky",waveform.getKy())
-				else: print "No kicker waveform added. Please check node type."
-			elif waveformType == "magnet waveform":				
-				strength = waveform.getStrength()				
-				if node.getType() == "multipole teapot":		
-					self.setParam(node,"kls",strength)
-				elif node.getType() == "quad teapot":
-					self.setParam(node,"kls",strength)
-					self.setParam(node,"kq",strength)
-				elif node.getType() == "solenoid teapot":
-					self.setParam(node,"B",strength)
-				else: print "No magnet waveform added. Please check node type."				
+			updates = self.__getWaveformUpdates(node,waveform)
+			if len(updates) == 0:
+				waveformType = waveform.getType()
+				if waveformType == "kicker waveform":
+					print "No kicker waveform added. Please check node type."
+				elif waveformType == "magnet waveform":
+					print "No magnet waveform added. Please check node type."
+			for (Kparam,strength) in updates:
+				self.setParam(node,Kparam,strength)
 
 	def setParam(self, node, Kparam, strength):
 		if node.hasParam(Kparam):	
 			paramval = node.getParam(Kparam)
+			node.setParam(Kparam,self.__scaleParam(Kparam,paramval,strength))
+
+	def __scaleParam(self, Kparam, paramval, strength):
+		"""
+		Returns the parameter value multiplied by the strength.
+		"""
+		if Kparam == "kls":
+			newparamval = []
+			for i in range(len(paramval)):
+				newparamval.append(paramval[i]*strength)
+			return newparamval
+		return paramval*strength
+
+	def __getWaveformUpdates(self, node, waveform):
+		"""
+		Returns the list of (Kparam,strength) pairs that the waveform
+		sets to the node. The waveform calc(time) should be called before.
+		"""
+		waveformType = waveform.getType()
+		if waveformType == "kicker waveform":
+			if node.getType() == "kick teapot":
+				return [("kx",waveform.getKx()),("ky",waveform.getKy())]
+		elif waveformType == "magnet waveform":
+			strength = waveform.getStrength()
+			if node.getType() == "multipole teapot":
+				return [("kls",strength),]
+			elif node.getType() == "quad teapot":
+				return [("kls",strength),("kq",strength)]
+			elif node.getType() == "solenoid teapot":
+				return [("B",strength),]
+		return []
+
+	def compileTimeDepStrength(self, times):
+		"""
+		Samples all time dependent nodes' waveforms at the times
+		(one time per turn) and keeps the resulting parameter values
+		in the table. The nodes' parameters are not changed.
+		After that trackBunchTurns(...) applies the table values for
+		each turn instead of calling waveforms during tracking.
+		The times should be the same as the ones the bunch will have,
+		and the waveforms should not be used in other places after
+		this call, because their state has been already advanced.
+		"""
+		NodeDict = self.__TDNodeDict
+		paramsDicts = {}
+		values = {}
+		for TPName in NodeDict.keys():
+			node = NodeDict[TPName]
+			paramsDicts[TPName] = node.getParamsDict()
+			values[TPName] = {}
+		self.__strengthTable = []
+		for time in times:
+			turnUpdates = []
+			for TPName in NodeDict.keys():
+				node = NodeDict[TPName]
+				paramsDict = paramsDicts[TPName]
+				nodeValues = values[TPName]
+				waveform = node.getParam("waveform")
+				waveform.calc(time)
+				for (Kparam,strength) in self.__getWaveformUpdates(node,waveform):
+					if(not paramsDict.has_key(Kparam)): continue
+					if(not nodeValues.has_key(Kparam)):
+						nodeValues[Kparam] = paramsDict[Kparam]
+					paramval = self.__scaleParam(Kparam,nodeValues[Kparam],strength)
+					nodeValues[Kparam] = paramval
+					turnUpdates.append((paramsDict,Kparam,paramval))
+			self.__strengthTable.append(turnUpdates)
+
+	def clearTimeDepStrengthTable(self):
+		"""
+		Removes the table created by compileTimeDepStrength(...).
+		"""
+		self.__strengthTable = []
+
+	def getTimeDepStrengthTableSize(self):
+		"""
+		Returns the number of turns in the time dependent strength table.
+		"""
+		return len(self.__strengthTable)
+
+	def applyTimeDepStrength(self, turn):
+		"""
+		Sets the parameters for the turn index from the table
+		created by compileTimeDepStrength(...).
+		"""
+		for (paramsDict,Kparam,paramval) in self.__strengthTable[turn]:
 			if Kparam == "kls":
-				newparamval = []
-				for i in range(len(paramval)):					
-					newparamval.append(paramval[i]*strength)
-				paramval = newparamval
-			else:paramval = paramval*strength
-			node.setParam(Kparam,paramval)
+				paramval = paramval[:]
+			paramsDict[Kparam] = paramval
 
 	def trackBunchTurns(self, bunch):
 		"""
 		It tracks the bunch through the lattice with multi-turn.
+		If the strength table was created by compileTimeDepStrength(...)
+		the parameters are taken from the table for the turns it covers.
 		"""
 		turns = self.__turns
 		#start
@@ -100,7 +178,10 @@ class TIME_DEP_Lattice(TEAPOT_Lattice):
 			self.trackBunch(bunch)	
 			syncPart = bunch.getSyncParticle()
 			time = syncPart.time()
-			self.setTimeDepStrength(time)
+			if(i < len(self.__strengthTable)):
+				self.applyTimeDepStrength(i)
+			else:
+				self.setTimeDepStrength(time)
 			print "debug trackBunchTurns time",time,"in",i,"turn"
 		#getsublattice
 		#sublattice.trackBunch(bunch)
@@ -14,12 +14,14 @@ class ParamsDictObject:
 		Constructor. Object that has a parameters dictionary.
 		"""
 		self.__paramsDict = {}
+		self.__paramsChangeCounter = 0
 
 	def addParam(self, key, value):
 		"""
 		Method. Adds a parameter to the object.
 		"""
 		self.__paramsDict[key] = value
+		self.__paramsChangeCounter += 1
 		
 	def removeParam(self, key):
 		"""
@@ -27,12 +29,14 @@ class ParamsDictObject:
 		"""
 		if(self.__paramsDict.has_key(key)):
 			del  self.__paramsDict[key]
+			self.__paramsChangeCounter += 1
 
 	def setParam(self, key, value):
 		"""
 		Method. Sets a parameter to the object.
 		"""
 		self.__paramsDict[key] = value
+		self.__paramsChangeCounter += 1
 
 	def setParamsDict(self, params):
 		"""
@@ -40,12 +44,31 @@ class ParamsDictObject:
 		dictionary for this element.
 		"""
 		self.__paramsDict = params
+		self.__paramsChangeCounter += 1
 
 	def updateParamsDict(self, params):
 		"""
 		Method. Updates the dictionary with external dictionary data.
 		"""
 		self.__paramsDict.update(params)
+		self.__paramsChangeCounter += 1
+
+	def increaseParamsChangeCounter(self):
+		"""
+		Method. Increases the counter of the parameters changes. The subclasses
+		call it when they change the data that are kept outside of the 
+		parameters dictionary.
+		"""
+		self.__paramsChangeCounter += 1
+
+	def getParamsChangeCounter(self):
+		"""
+		Method. Returns the counter of the parameters changes. It is increased
+		by addParam, removeParam, setParam, setParamsDict, updateParamsDict,
+		and increaseParamsChangeCounter methods. The changes of the values 
+		inside the dictionary made directly are not counted.
+		"""
+		return self.__paramsChangeCounter
 
 	def getParam(self, key):
 		"""
@@ -46,6 +46,7 @@ the examples listed above should provide an overview and foundation.
 
 import types
 import os
+import cPickle
 
 #import python XML DOM parser for pretty printing only!
 #Bevare: xml.dom.minidom has a memory leak! 2015.10.08
@@ -56,6 +57,9 @@ import xml.etree.ElementTree as ET
 
 from orbit.utils import NamedObject, ParamsDictObject
 
+# the version of the binary representation of the XmlDataAdaptor tree
+XML_DATA_ADAPTOR_BINARY_VERSION = 1
+
 class XmlDataAdaptor(NamedObject,ParamsDictObject):
 	def __init__(self, name = "root"):
 		"""
@@ -223,12 +227,69 @@ class XmlDataAdaptor(NamedObject,ParamsDictObject):
 		
 	@staticmethod	
 	def adaptorForFile(file_name):
-		""" returns the new data adaptor created from the input file """
-		et = ET.parse(file_name)
-		root = et.getroot()
-		xml_root_adaptor = XmlDataAdaptor(root.tag)
-		XmlDataAdaptor._makeDataAdaptor(xml_root_adaptor,root)
+		""" 
+		Returns the new data adaptor created from the input file.
+		The file is parsed in one pass, and the XML elements are 
+		released as soon as their data adaptors are created.
+		"""
+		xml_root_adaptor = None
+		adaptors_stack = []
+		for (event,element) in ET.iterparse(file_name,events = ("start","end")):
+			if(event == "start"):
+				if(len(adaptors_stack) == 0):
+					data_adaptor = XmlDataAdaptor(element.tag)
+					xml_root_adaptor = data_adaptor
+				else:
+					data_adaptor = adaptors_stack[-1].createChild(element.tag)
+				for [key,value] in element.items():
+					data_adaptor.setValue(key,value)
+				adaptors_stack.append(data_adaptor)
+			else:
+				adaptors_stack.pop()
+				element.clear()
 		return xml_root_adaptor
+
+	def makeBinaryString(self):
+		""" 
+		Returns the binary string with the content of the data adaptor tree.
+		It can be stored in a file or sent to other CPUs.
+		"""
+		return cPickle.dumps((XML_DATA_ADAPTOR_BINARY_VERSION,self._makeTuple()),cPickle.HIGHEST_PROTOCOL)
+
+	@staticmethod	
+	def getBinaryVersion():
+		""" returns the version of the binary string format """
+		return XML_DATA_ADAPTOR_BINARY_VERSION
+
+	def _makeTuple(self):
+		""" returns the (name,[(attribute,value),...],[child tuples]) tuple """
+		attr_val_arr = []
+		for attribute in self.attributes():
+			attr_val_arr.append((attribute,self.getParam(attribute)))
+		children = []
+		for adaptor_child in self.data_adaptors:
+			children.append(adaptor_child._makeTuple())
+		return (self.getName(),attr_val_arr,children)
+
+	@staticmethod	
+	def adaptorForBinaryString(binary_string):
+		""" 
+		Returns the new data adaptor created from the binary string made by makeBinaryString().
+		It returns None if the string was made by the different version of the XmlDataAdaptor.
+		"""
+		(version,adaptor_tuple) = cPickle.loads(binary_string)
+		if(version != XML_DATA_ADAPTOR_BINARY_VERSION): return None
+		return XmlDataAdaptor._makeDataAdaptorFromTuple(adaptor_tuple)
+
+	@staticmethod	
+	def _makeDataAdaptorFromTuple(adaptor_tuple):
+		(name,attr_val_arr,children) = adaptor_tuple
+		data_adaptor = XmlDataAdaptor(name)
+		for (attribute,value) in attr_val_arr:
+			data_adaptor.setParam(attribute,value)
+		for child_tuple in children:
+			data_adaptor.data_adaptors.append(XmlDataAdaptor._makeDataAdaptorFromTuple(child_tuple))
+		return data_adaptor
 		
 	@staticmethod	
 	def _makeDataAdaptor(data_adaptor,dom_node):
@@ -0,0 +1,92 @@
+/**
+   This class tracks the bunch through the sequence of parts of the RF gap
+   described by the RF field on the axis. The field in each part is defined
+   by three points at the start, in the middle, and at the end of the part,
+   and the RfGapThreePointTTF model is used for the thin RF gap in the middle.
+*/
+
+#include <iostream>
+#include <cmath>
+
+#include "Bunch.hh"
+#include "OrbitConst.hh"
+#include "AxisFieldRfGap.hh"
+#include "RfGapThreePointTTF.hh"
+#include "RfGapThreePointTTF_slow.hh"
+#include "linac_tracking.hh"
+#include "teapotbase.hh"
+
+using namespace OrbitUtils;
+
+
+// Constructor
+AxisFieldRfGap::AxisFieldRfGap(): CppPyWrapper(NULL)
+{
+}
+
+// Destructor
+AxisFieldRfGap::~AxisFieldRfGap()
+{
+}
+
+/** Tracks the bunch through the half of the part as a drift. */
+static void axis_field_gap_drift(Bunch* bunch, double length, int useLinacTracker)
+{
+	if(useLinacTracker){
+		linac_tracking::linac_drift(bunch,length);
+	} else {
+		teapot_base::drift(bunch,length);
+	}
+}
+
+/**
+    Tracks the Bunch through the parts of the RF gap. For each part the phase
+    at the entrance is defined by the arrival time of the synchronous particle,
+    and the phase in the middle by the time of flight from the entrance
+    of the part. Fields are in V/m, the RF frequency in Hz, and phases are in radians.
+*/
+void AxisFieldRfGap::trackBunch(Bunch* bunch, int useSlowModel, int useLinacTracker,
+	OrbitUtils::Function* axis_field, double E0L,
+	double frequency, double phase, double modePhase, double designArrivalTime,
+	double z_start, vector<double>& part_lengths,
+	vector<double>& pos_arr, vector<double>& phase_arr)
+{
+	SyncPart* syncPart = bunch->getSyncPart();
+	double two_pi = 2.0*OrbitConst::PI;
+	double part_pos = z_start;
+	pos_arr.clear();
+	phase_arr.clear();
+	int nParts = (int) part_lengths.size();
+	for(int ind = 0; ind < nParts; ind++){
+		double part_length = part_lengths[ind];
+		double arrival_time = syncPart->getTime();
+		double phase_in = fmod(frequency*(arrival_time - designArrivalTime)*two_pi + phase,two_pi);
+		if(ind == 0){
+			pos_arr.push_back(part_pos);
+			phase_arr.push_back(phase_in);
+		}
+		double zm = part_pos;
+		double z0 = zm + part_length/2;
+		double zp = z0 + part_length/2;
+		double Em = E0L*axis_field->getY(zm);
+		double E0 = E0L*axis_field->getY(z0);
+		double Ep = E0L*axis_field->getY(zp);
+		//---- advance the particle position
+		axis_field_gap_drift(bunch,part_length/2,useLinacTracker);
+		part_pos += part_length/2;
+		double delta_phase = fmod(two_pi*(syncPart->getTime() - arrival_time)*frequency,two_pi);
+		pos_arr.push_back(part_pos);
+		phase_arr.push_back(phase_in + delta_phase);
+		if(useSlowModel){
+			RfGapThreePointTTF_slow::trackBunch(bunch,part_length/2,Em,E0,Ep,frequency,phase_in + delta_phase + modePhase);
+		} else {
+			RfGapThreePointTTF::trackBunch(bunch,part_length/2,Em,E0,Ep,frequency,phase_in + delta_phase + modePhase);
+		}
+		axis_field_gap_drift(bunch,part_length/2,useLinacTracker);
+		//---- advance the particle position
+		part_pos += part_length/2;
+		delta_phase = fmod(two_pi*(syncPart->getTime() - arrival_time)*frequency,two_pi);
+		pos_arr.push_back(part_pos);
+		phase_arr.push_back(phase_in + delta_phase);
+	}
+}
@@ -0,0 +1,49 @@
+//This class tracks the bunch through the parts of the RF gap with the axis field.
+#ifndef AXIS_FIELD_RF_GAP_H
+#define AXIS_FIELD_RF_GAP_H
+
+#include "orbit_mpi.hh"
+
+#include <vector>
+
+#include "Bunch.hh"
+#include "OU_Function.hh"
+#include "CppPyWrapper.hh"
+
+using namespace std;
+
+/**
+  This class tracks the bunch through the sequence of parts of the RF gap
+  described by the RF field on the axis. Each part is represented by the drift,
+  the thin RF gap of the RfGapThreePointTTF (or RfGapThreePointTTF_slow) model,
+  and the drift. It performs the same calculations as the python AxisFieldRF_Gap
+  class does for each part, but for all parts in one call.
+*/
+
+class AxisFieldRfGap: public OrbitUtils::CppPyWrapper
+{
+public:
+
+	/** Constructor for the axis field RF gap tracker. */
+	AxisFieldRfGap();
+
+	/** Destructor */
+	virtual ~AxisFieldRfGap();
+
+	/**
+	  Tracks the Bunch through the parts of the RF gap with lengths from the part_lengths
+	  array starting from the position z_start of the axis field. The E0L parameter is
+	  the amplitude of the field multiplied by the cavity amplitude in V. The phase
+	  at the entrance of each part is fmod(2*pi*f*(t - designArrivalTime) + phase,2*pi).
+	  The modePhase is added to the phase of the RF gap model only.
+	  The positions and phases at the entrance, in the middle, and at the end of parts
+	  are stored in the pos_arr and phase_arr arrays (the entrance one only for the first part).
+	*/
+	static void trackBunch(Bunch* bunch, int useSlowModel, int useLinacTracker,
+	                       OrbitUtils::Function* axis_field, double E0L,
+	                       double frequency, double phase, double modePhase, double designArrivalTime,
+	                       double z_start, vector<double>& part_lengths,
+	                       vector<double>& pos_arr, vector<double>& phase_arr);
+};
+
+#endif
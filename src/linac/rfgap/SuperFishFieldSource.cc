@@ -30,7 +30,14 @@ SuperFishFieldSource::SuperFishFieldSource(): BaseFieldSource()
 	grid2D_H  = new Grid2D(3,3);
 	
 	avg_ez_field = 0.;
-
+	
+	use_cell_coeff = 0;
+	nz_cell = 0;
+	nr_cell = 0;
+	z_min_cell = 0.;
+	r_min_cell = 0.;
+	dz_cell = 1.;
+	dr_cell = 1.;
 }
 
 // Destructor
@@ -103,7 +110,82 @@ void SuperFishFieldSource::setGrid2D_Fields(Grid2D* grid2D_Ez_in,Grid2D* grid2D_
 		avg_ez_field += fabs(grid2D_Ez->getValueOnGrid(i,0));
 	}
 	avg_ez_field /=grid2D_Ez->getSizeX();
+	
+	calculateCellCoefficients();
 }	
+
+/** 
+   Calculates the interpolation coefficients for all grid cells. The Grid2D class
+   uses the 3x3 points quadratic scheme with weights W(f) = a + b*f + c*f^2 for each
+   direction, so the value in the cell around the grid point (iz,ir) is a polynomial
+   sum_{p,q} C[p][q]*fz^p*fr^q. The 9 coefficients are calculated for each field.
+	 The coefficients will be used only if Ez, Er, and H grids have the same geometry.
+*/
+void SuperFishFieldSource::calculateCellCoefficients()
+{
+	use_cell_coeff = 0;
+	cell_coeff_arr.clear();
+	Grid2D* grids[3] = {grid2D_Ez, grid2D_Er, grid2D_H};
+	nz_cell = grid2D_Ez->getSizeX();
+	nr_cell = grid2D_Ez->getSizeY();
+	if(nz_cell < 3 || nr_cell < 3) return;
+	for(int k = 1; k < 3; k++){
+		if(grids[k]->getSizeX() != nz_cell || grids[k]->getSizeY() != nr_cell) return;
+		if(grids[k]->getMinX() != grid2D_Ez->getMinX() || grids[k]->getMaxX() != grid2D_Ez->getMaxX()) return;
+		if(grids[k]->getMinY() != grid2D_Ez->getMinY() || grids[k]->getMaxY() != grid2D_Ez->getMaxY()) return;
+	}
+	z_min_cell = grid2D_Ez->getMinX();
+	r_min_cell = grid2D_Ez->getMinY();
+	dz_cell = grid2D_Ez->getStepX();
+	dr_cell = grid2D_Ez->getStepY();
+	
+	//weights W[a] = poly[a][0] + poly[a][1]*f + poly[a][2]*f^2 for the points -1, 0, +1
+	double poly[3][3] = {{0.125,-0.5,0.5},{0.75,0.,-1.0},{0.125,0.5,0.5}};
+	
+	cell_coeff_arr.resize(nz_cell*nr_cell*27,0.);
+	for(int iz = 1; iz < nz_cell - 1; iz++){
+		for(int ir = 1; ir < nr_cell - 1; ir++){
+			double* coeff = &cell_coeff_arr[(iz*nr_cell + ir)*27];
+			for(int k = 0; k < 3; k++){
+				for(int a = 0; a < 3; a++){
+					for(int b = 0; b < 3; b++){
+						double val = grids[k]->getValueOnGrid(iz + a - 1,ir + b - 1);
+						for(int p = 0; p < 3; p++){
+							for(int q = 0; q < 3; q++){
+								coeff[9*k + 3*p + q] += poly[a][p]*poly[b][q]*val;
+							}
+						}
+					}
+				}
+			}
+		}
+	}
+	use_cell_coeff = 1;
+}
+
+/** Returns the Ez, Er, and H grid values from the cell coefficients. */
+void SuperFishFieldSource::getCellValues(double z, double r, double& ez, double& er, double& h)
+{
+	int iz  = int((z - z_min_cell)/dz_cell + 0.5);
+	if(iz < 1) iz = 1;
+	if(iz > (nz_cell - 2)) iz = nz_cell - 2;
+	double fz = (z - (z_min_cell + iz*dz_cell))/dz_cell;
+	int ir  = int((r - r_min_cell)/dr_cell + 0.5);
+	if(ir < 1) ir = 1;
+	if(ir > (nr_cell - 2)) ir = nr_cell - 2;
+	double fr = (r - (r_min_cell + ir*dr_cell))/dr_cell;
+	double* c = &cell_coeff_arr[(iz*nr_cell + ir)*27];
+	double vals[3];
+	for(int k = 0; k < 3; k++, c += 9){
+		double h0 = c[0] + fr*(c[1] + fr*c[2]);
+		double h1 = c[3] + fr*(c[4] + fr*c[5]);
+		double h2 = c[6] + fr*(c[7] + fr*c[8]);
+		vals[k] = h0 + fz*(h1 + fz*h2);
+	}
+	ez = vals[0];
+	er = vals[1];
+	h  = vals[2];
+}
 	
 /** 
   Returns components of the electric and magnetic fields.
@@ -203,6 +285,80 @@ void SuperFishFieldSource::getElectricMagneticField(
 	
 }
 
+/** 
+  Returns the electric and magnetic fields for the array of points with coordinates
+	r_arr[3*i+k] and times t_arr[i]. The results are in e_arr[3*i+k] and h_arr[3*i+k].
+	The cases are the same as in the getElectricMagneticField(...) method, but the grid
+	cell lookup is done once per point for all fields, and the transformation from
+	the cylindrical to the Cartesian coordinates is done in the same loop.
+*/
+void SuperFishFieldSource::getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+		double* e_arr, double* h_arr)
+{
+	if(use_cell_coeff == 0){
+		BaseFieldSource::getElectricMagneticFieldArr(nPoints,r_arr,t_arr,e_arr,h_arr);
+		return;
+	}
+	
+	double omega = 2.0*OrbitConst::PI*rf_frequency;
+	double b_coeff = - z_direction*OrbitConst::permeability*amplitude;
+	double ez_coeff = z_direction*amplitude;
+	if(symm == 1){
+		b_coeff = - OrbitConst::permeability*amplitude;
+		ez_coeff = amplitude;
+	}
+	double z_max = grid2D_Ez->getMaxX();
+	double z_min = grid2D_Ez->getMinX();
+	double r_max = grid2D_Ez->getMaxY();
+	
+	double x, y, z_in, z, r, phase, cos_phi, sin_phi;
+	double ez, er, h, E_r, B;
+	
+	for(int i = 0; i < nPoints; i++){
+		double* rv = r_arr + 3*i;
+		double* e  = e_arr + 3*i;
+		double* b  = h_arr + 3*i;
+		e[0] = 0.; e[1] = 0.; e[2] = 0.;
+		b[0] = 0.; b[1] = 0.; b[2] = 0.;
+		
+		x = rv[0];
+		y = rv[1];
+		z_in = rv[2];
+		r = sqrt(x*x + y*y);
+		
+		if(symm == 1){
+			z = fabs(z_in);
+			if(z > z_max || r > r_max) continue;
+		} else {
+			if(z_in > z_max || z_in < z_min || r > r_max) continue;
+			if(z_direction > 0){
+				z = z_in;
+			} else {
+				z = 2.*field_center_pos - z_in;
+			}
+		}
+		
+		phase = omega*(t_arr[i] + time_init) + field_phase;
+		cos_phi = cos(phase);
+		
+		getCellValues(z,r,ez,er,h);
+		
+		e[2] = ez_coeff*ez*cos_phi;
+		
+		if(r == 0.) continue;
+		
+		sin_phi = sin(phase);
+		E_r = amplitude*er*cos_phi;
+		if(symm == 1 && z_in < 0.) E_r = - E_r;
+		B = b_coeff*h*sin_phi;
+		
+		e[0] = E_r*x/r;
+		e[1] = E_r*y/r;
+		b[0] = - B*y/r;
+		b[1] =   B*x/r;
+	}
+}
+
 /** Returns the field phase. */
 double SuperFishFieldSource::getPhase(){
 	return field_phase;
@@ -11,6 +11,7 @@
 
 #include <cstdlib>
 #include <cmath>
+#include <vector>
 
 #include "BaseFieldSource.hh"
 #include "Grid2D.hh"
@@ -33,6 +34,14 @@ public:
 			double& E_x, double& E_y, double& E_z,
 			double& H_x, double& H_y, double& H_z);
 	
+	/** 
+	   Returns the electric and magnetic fields for the array of points.
+	   It uses the precomputed interpolation coefficients of the grid cells
+	   for Ez, Er, and H fields at once.
+	*/
+	void getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+			double* e_arr, double* h_arr);
+	
 
   /** Sets the field phase. */
 	void setPhase(double phase);
@@ -97,11 +106,20 @@ public:
 	/** Sets the Ez, Er, and H fields. */
 	void setGrid2D_Fields(Grid2D* grid2D_Ez_in,Grid2D* grid2D_Er_in,Grid2D* grid2D_H_in);
 	
+	/** 
+	   Calculates the interpolation coefficients for all grid cells. It is called
+	   by setGrid2D_Fields(...) and after changes of the grids' values.
+	*/
+	void calculateCellCoefficients();
+	
   private:
 		
 		/** Delete all Grid2D grids. */
 		void deleteGrids();
 		
+		/** Returns the Ez, Er, and H grid values from the cell coefficients. */
+		void getCellValues(double z, double r, double& ez, double& er, double& h);
+		
 		//grids 2D for Ez, Er, and H
 		Grid2D* grid2D_Ez;
 		Grid2D* grid2D_Er;
@@ -133,6 +151,13 @@ public:
 		//the initial time
 		double time_init;
 		
+		//interpolation coefficients of Ez, Er, and H for each grid cell
+		//they are used only if all grids have the same geometry
+		std::vector<double> cell_coeff_arr;
+		int use_cell_coeff;
+		int nz_cell, nr_cell;
+		double z_min_cell, r_min_cell, dz_cell, dr_cell;
+		
 };
 
 #endif
@@ -0,0 +1,176 @@
+#include "orbit_mpi.hh"
+#include "pyORBIT_Object.hh"
+
+#include "wrap_AxisFieldRfGap.hh"
+#include "wrap_linacmodule.hh"
+#include "wrap_bunch.hh"
+
+#include <iostream>
+
+#include "wrap_utils.hh"
+#include "AxisFieldRfGap.hh"
+#include "OU_Function.hh"
+
+using namespace OrbitUtils;
+
+namespace wrap_linac{
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+	//---------------------------------------------------------
+	//Python AxisFieldRfGap class definition
+	//---------------------------------------------------------
+
+	//constructor for python class wrapping AxisFieldRfGap instance
+	//It never will be called directly
+	static PyObject* AxisFieldRfGap_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+	{
+		pyORBIT_Object* self;
+		self = (pyORBIT_Object *) type->tp_alloc(type, 0);
+		self->cpp_obj = NULL;
+		return (PyObject *) self;
+	}
+
+  //initializator for python  AxisFieldRfGap class
+  //this is implementation of the __init__ method
+  static int AxisFieldRfGap_init(pyORBIT_Object *self, PyObject *args, PyObject *kwds){
+		self->cpp_obj = new AxisFieldRfGap();
+		((AxisFieldRfGap*) self->cpp_obj)->setPyWrapper((PyObject*) self);
+		return 0;
+  }
+
+	//trackBunch(bunch, cppGapModel, useLinacTracker, axis_field, E0L, frequency, phase, modePhase, designArrivalTime, z_start, part_lengths)
+	//It returns the tuple with (pos,phase) pairs
+  static PyObject* AxisFieldRfGap_trackBunch(PyObject *self, PyObject *args){
+		PyObject* pyBunch;
+		PyObject* pyGapModel;
+		PyObject* pyFunction;
+		PyObject* pyPartLengths;
+		int useLinacTracker;
+		double E0L, frequency, phase, modePhase, designArrivalTime, z_start;
+		if(!PyArg_ParseTuple(args,"OOiOddddddO:trackBunch",&pyBunch,&pyGapModel,&useLinacTracker,&pyFunction,
+			                   &E0L,&frequency,&phase,&modePhase,&designArrivalTime,&z_start,&pyPartLengths)){
+			ORBIT_MPI_Finalize("PyAxisFieldRfGap - trackBunch(bunch, cppGapModel, useLinacTracker, axis_field, E0L, frequency, phase, modePhase, designArrivalTime, z_start, part_lengths) - parameters are needed.");
+		}
+		PyObject* pyORBIT_Bunch_Type = wrap_orbit_bunch::getBunchType("Bunch");
+		if(!PyObject_IsInstance(pyBunch,pyORBIT_Bunch_Type)){
+			ORBIT_MPI_Finalize("PyAxisFieldRfGap - trackBunch(...) - first param. should be a Bunch.");
+		}
+		int useSlowModel = -1;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("RfGapThreePointTTF"))) useSlowModel = 0;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("RfGapThreePointTTF_slow"))) useSlowModel = 1;
+		if(useSlowModel < 0){
+			ORBIT_MPI_Finalize("PyAxisFieldRfGap - trackBunch(...) - the RF gap model should be RfGapThreePointTTF or RfGapThreePointTTF_slow.");
+		}
+		PyObject* pyORBIT_Function_Type = wrap_orbit_utils::getOrbitUtilsType("Function");
+		if(!PyObject_IsInstance(pyFunction,pyORBIT_Function_Type)){
+			ORBIT_MPI_Finalize("PyAxisFieldRfGap - trackBunch(...) - the axis field should be a Function.");
+		}
+		if(!PySequence_Check(pyPartLengths)){
+			ORBIT_MPI_Finalize("PyAxisFieldRfGap - trackBunch(...) - the part lengths should be a list or tuple.");
+		}
+		vector<double> part_lengths;
+		int nParts = PySequence_Size(pyPartLengths);
+		for(int i = 0; i < nParts; i++){
+			PyObject* pyVal = PySequence_GetItem(pyPartLengths,i);
+			part_lengths.push_back(PyFloat_AsDouble(pyVal));
+			Py_DECREF(pyVal);
+		}
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object*)pyBunch)->cpp_obj;
+		Function* cpp_function = (Function*) ((pyORBIT_Object*)pyFunction)->cpp_obj;
+		vector<double> pos_arr;
+		vector<double> phase_arr;
+		AxisFieldRfGap::trackBunch(cpp_bunch,useSlowModel,useLinacTracker,cpp_function,E0L,
+		                           frequency,phase,modePhase,designArrivalTime,
+		                           z_start,part_lengths,pos_arr,phase_arr);
+		int nPoints = (int) pos_arr.size();
+		PyObject* resTuple = PyTuple_New(nPoints);
+		for(int i = 0; i < nPoints; i++){
+			PyTuple_SetItem(resTuple,i,Py_BuildValue("(dd)",pos_arr[i],phase_arr[i]));
+		}
+		return resTuple;
+  }
+
+  //-----------------------------------------------------
+  //destructor for python AxisFieldRfGap class (__del__ method).
+  //-----------------------------------------------------
+  static void AxisFieldRfGap_del(pyORBIT_Object* self){
+		AxisFieldRfGap* cpp_AxisFieldRfGap = (AxisFieldRfGap*) self->cpp_obj;
+		delete cpp_AxisFieldRfGap;
+		self->ob_type->tp_free((PyObject*)self);
+  }
+
+	// defenition of the methods of the python AxisFieldRfGap wrapper class
+	// they will be vailable from python level
+  static PyMethodDef AxisFieldRfGapClassMethods[] = {
+		{ "trackBunch",     AxisFieldRfGap_trackBunch,    METH_VARARGS,"tracks the Bunch through the parts of the axis field RF gap."},
+    {NULL}
+  };
+
+	// defenition of the memebers of the python AxisFieldRfGap wrapper class
+	// they will be vailable from python level
+	static PyMemberDef AxisFieldRfGapClassMembers [] = {
+		{NULL}
+	};
+
+	//new python AxisFieldRfGap wrapper type definition
+	static PyTypeObject pyORBIT_AxisFieldRfGap_Type = {
+		PyObject_HEAD_INIT(NULL)
+		0, /*ob_size*/
+		"AxisFieldRfGap", /*tp_name*/
+		sizeof(pyORBIT_Object), /*tp_basicsize*/
+		0, /*tp_itemsize*/
+		(destructor) AxisFieldRfGap_del , /*tp_dealloc*/
+		0, /*tp_print*/
+		0, /*tp_getattr*/
+		0, /*tp_setattr*/
+		0, /*tp_compare*/
+		0, /*tp_repr*/
+		0, /*tp_as_number*/
+		0, /*tp_as_sequence*/
+		0, /*tp_as_mapping*/
+		0, /*tp_hash */
+		0, /*tp_call*/
+		0, /*tp_str*/
+		0, /*tp_getattro*/
+		0, /*tp_setattro*/
+		0, /*tp_as_buffer*/
+		Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+		"The AxisFieldRfGap python wrapper", /* tp_doc */
+		0, /* tp_traverse */
+		0, /* tp_clear */
+		0, /* tp_richcompare */
+		0, /* tp_weaklistoffset */
+		0, /* tp_iter */
+		0, /* tp_iternext */
+		AxisFieldRfGapClassMethods, /* tp_methods */
+		AxisFieldRfGapClassMembers, /* tp_members */
+		0, /* tp_getset */
+		0, /* tp_base */
+		0, /* tp_dict */
+		0, /* tp_descr_get */
+		0, /* tp_descr_set */
+		0, /* tp_dictoffset */
+		(initproc) AxisFieldRfGap_init, /* tp_init */
+		0, /* tp_alloc */
+		AxisFieldRfGap_new, /* tp_new */
+	};
+
+	//--------------------------------------------------
+	//Initialization function of the pyAxisFieldRfGap class
+	//It will be called from linac module initialization
+	//--------------------------------------------------
+  void initAxisFieldRfGap(PyObject* module){
+		if (PyType_Ready(&pyORBIT_AxisFieldRfGap_Type) < 0) return;
+		Py_INCREF(&pyORBIT_AxisFieldRfGap_Type);
+		PyModule_AddObject(module, "AxisFieldRfGap", (PyObject *)&pyORBIT_AxisFieldRfGap_Type);
+	}
+
+#ifdef __cplusplus
+}
+#endif
+
+//end of namespace wrap_linac
+}
@@ -0,0 +1,18 @@
+#ifndef WRAP_AXIS_FIELD_RF_GAP_H
+#define WRAP_AXIS_FIELD_RF_GAP_H
+
+#include "Python.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+  namespace wrap_linac{
+    void initAxisFieldRfGap(PyObject* module);
+  }
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
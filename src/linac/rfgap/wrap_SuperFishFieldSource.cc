@@ -97,6 +97,15 @@ extern "C" {
 		return Py_BuildValue("(OOO)",pyGrid2D_Ez,pyGrid2D_Er,pyGrid2D_H);		
 	}		
 
+	//calculateCellCoefficients() recalculates the interpolation coefficients of the grid cells.
+  static PyObject* SuperFishFieldSource_calculateCellCoefficients(PyObject *self, PyObject *args){
+    pyORBIT_Object* pySuperFishFieldSource = (pyORBIT_Object*) self;
+		SuperFishFieldSource* cpp_SuperFishFieldSource = (SuperFishFieldSource*) pySuperFishFieldSource->cpp_obj;
+		cpp_SuperFishFieldSource->calculateCellCoefficients();
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+
 	//setFrequency(frequency) sets the RF frequency.
   static PyObject* SuperFishFieldSource_setFrequency(PyObject *self, PyObject *args){
     pyORBIT_Object* pySuperFishFieldSource = (pyORBIT_Object*) self;
@@ -266,6 +275,7 @@ extern "C" {
   static PyMethodDef SuperFishFieldSourceClassMethods[] = {
 		{ "setGrid2D_Fields",         SuperFishFieldSource_setGrid2D_Fields,           METH_VARARGS,"sets Grid2D instances with Ez, Er, H fields."},
 		{ "getGrid2D_Fields",         SuperFishFieldSource_getGrid2D_Fields,           METH_VARARGS,"returns Grid2D instances with Ez, Er, H fields."},
+		{ "calculateCellCoefficients",SuperFishFieldSource_calculateCellCoefficients,  METH_VARARGS,"recalculates the cell interpolation coefficients after changes of the grids."},
 		{ "getElectricMagneticField", SuperFishFieldSource_getElectricMagneticField,   METH_VARARGS,"returns Ex,Ey,Ez, Bx,By,Bz field components."},
 		{ "getFrequency",             SuperFishFieldSource_getFrequency,               METH_VARARGS,"get RF frequency."},
 		{ "setFrequency",             SuperFishFieldSource_setFrequency,               METH_VARARGS,"set RF frequency."},
@@ -0,0 +1,388 @@
+/////////////////////////////////////////////////////////////////////////////
+//
+// FILE NAME
+//   LinacInstructionList.cc
+//
+// DESCRIPTION
+//   The list of the elementary tracking instructions for a run of linac
+//   nodes (drifts, quads, dipole correctors, and simple RF gaps) and
+//   their apertures, phase apertures, and energy apertures. The instructions call the same TEAPOT or linac tracking functions
+//   and RF gap models as the python track methods of the linac nodes.
+//
+/////////////////////////////////////////////////////////////////////////////
+
+#include <cmath>
+
+#include "OrbitConst.hh"
+#include "SyncPart.hh"
+#include "ParticleAttributes.hh"
+
+#include "LinacInstructionList.hh"
+#include "linac_tracking.hh"
+#include "teapotbase.hh"
+
+#include "BaseRfGap.hh"
+#include "BaseRfGap_slow.hh"
+#include "MatrixRfGap.hh"
+#include "RfGapTTF.hh"
+#include "RfGapTTF_slow.hh"
+
+using namespace OrbitUtils;
+
+// Constructor
+LinacInstructionList::LinacInstructionList(): CppPyWrapper(NULL)
+{
+}
+
+// Destructor
+LinacInstructionList::~LinacInstructionList()
+{
+}
+
+/** Removes all instructions. */
+void LinacInstructionList::clean()
+{
+	instructions.clear();
+	rfGapIndexes.clear();
+	rfGapPhases.clear();
+	apertureIndexes.clear();
+}
+
+/** Returns the number of instructions. */
+int LinacInstructionList::getSize()
+{
+	return (int) instructions.size();
+}
+
+/** Adds the instruction to the list. */
+LinacInstruction& LinacInstructionList::addInstruction(int type, int tag)
+{
+	LinacInstruction instr;
+	instr.type = type;
+	instr.tag = tag;
+	instr.useLinacTracker = 0;
+	instr.gapModel = -1;
+	instr.shape = 0;
+	instr.nLost = 0;
+	for(int i = 0; i < 8; i++){
+		instr.params[i] = 0.;
+	}
+	for(int i = 0; i < 4; i++){
+		instr.polys[i] = NULL;
+	}
+	instructions.push_back(instr);
+	return instructions.back();
+}
+
+/** Adds the drift with the length. */
+void LinacInstructionList::addDrift(int tag, double length, int useLinacTracker)
+{
+	LinacInstruction& instr = addInstruction(DRIFT,tag);
+	instr.useLinacTracker = useLinacTracker;
+	instr.params[0] = length;
+}
+
+/** Adds the one part of the quad with the length and the field gradient dB/dr [T/m]. */
+void LinacInstructionList::addQuad(int tag, double length, double dB_dr, int useLinacTracker)
+{
+	LinacInstruction& instr = addInstruction(QUAD,tag);
+	instr.useLinacTracker = useLinacTracker;
+	instr.params[0] = length;
+	instr.params[1] = dB_dr;
+}
+
+/** Adds the rotation in the x-y plane (the tilt of the element). */
+void LinacInstructionList::addRotation(int tag, double angle)
+{
+	LinacInstruction& instr = addInstruction(ROTATE,tag);
+	instr.params[0] = angle;
+}
+
+/** Adds the dipole kick. The parameters are field*length [T*m] for x and y directions. */
+void LinacInstructionList::addKick(int tag, double BLx, double BLy, int useLinacTracker)
+{
+	LinacInstruction& instr = addInstruction(KICK,tag);
+	instr.useLinacTracker = useLinacTracker;
+	instr.params[0] = BLx;
+	instr.params[1] = BLy;
+}
+
+/** Adds the RF gap. */
+void LinacInstructionList::addRfGap(int tag, int gapModel, double frequency, double E0, double phase0,
+	double designArrivalTime, double beta_min, double beta_max,
+	OrbitUtils::Polynomial* Tttf, OrbitUtils::Polynomial* Sttf,
+	OrbitUtils::Polynomial* Tpttf, OrbitUtils::Polynomial* Spttf)
+{
+	LinacInstruction& instr = addInstruction(RF_GAP,tag);
+	instr.gapModel = gapModel;
+	instr.params[0] = frequency;
+	instr.params[1] = E0;
+	instr.params[2] = phase0;
+	instr.params[3] = designArrivalTime;
+	instr.params[4] = beta_min;
+	instr.params[5] = beta_max;
+	instr.polys[0] = Tttf;
+	instr.polys[1] = Sttf;
+	instr.polys[2] = Tpttf;
+	instr.polys[3] = Spttf;
+	rfGapIndexes.push_back((int) instructions.size() - 1);
+	rfGapPhases.push_back(0.);
+}
+
+/** Adds the aperture with the same parameters as the Aperture class. */
+void LinacInstructionList::addAperture(int tag, int shape, double a, double b, double c, double d, double pos)
+{
+	LinacInstruction& instr = addInstruction(APERTURE,tag);
+	instr.shape = shape;
+	instr.params[0] = a;
+	instr.params[1] = b;
+	instr.params[2] = c;
+	instr.params[3] = d;
+	instr.params[4] = pos;
+	apertureIndexes.push_back((int) instructions.size() - 1);
+}
+
+/** Adds the phase aperture with the same parameters as the PhaseAperture class. */
+void LinacInstructionList::addPhaseAperture(int tag, double frequency, double minPhase, double maxPhase, double pos)
+{
+	LinacInstruction& instr = addInstruction(PHASE_APERTURE,tag);
+	instr.params[0] = frequency;
+	instr.params[1] = minPhase;
+	instr.params[2] = maxPhase;
+	instr.params[4] = pos;
+	apertureIndexes.push_back((int) instructions.size() - 1);
+}
+
+/** Adds the energy aperture with the same parameters as the EnergyAperture class. */
+void LinacInstructionList::addEnergyAperture(int tag, double minEnergy, double maxEnergy, double pos)
+{
+	LinacInstruction& instr = addInstruction(ENERGY_APERTURE,tag);
+	instr.params[1] = minEnergy;
+	instr.params[2] = maxEnergy;
+	instr.params[4] = pos;
+	apertureIndexes.push_back((int) instructions.size() - 1);
+}
+
+/** Returns the number of RF gaps instructions. */
+int LinacInstructionList::getNumberOfRfGaps()
+{
+	return (int) rfGapIndexes.size();
+}
+
+/** Returns the RF gap phase calculated during the last tracking for the RF gap with the index. */
+double LinacInstructionList::getRfGapPhase(int index)
+{
+	return rfGapPhases[index];
+}
+
+/** Returns the number of aperture instructions. */
+int LinacInstructionList::getNumberOfApertures()
+{
+	return (int) apertureIndexes.size();
+}
+
+/** Returns the number of particles lost during the last tracking on the aperture with the index. */
+int LinacInstructionList::getApertureLoss(int index)
+{
+	return instructions[apertureIndexes[index]].nLost;
+}
+
+/** Tracks the bunch through the instructions with tags between tag_start and tag_stop. */
+int LinacInstructionList::trackBunch(Bunch* bunch, Bunch* lostbunch, int tag_start, int tag_stop)
+{
+	SyncPart* syncPart = bunch->getSyncPart();
+	int nInstr = (int) instructions.size();
+	int gap_count = 0;
+	//the aperture instructions need the bunch without dead particles
+	if(apertureIndexes.size() > 0) bunch->compress();
+	for(int i = 0; i < nInstr; i++){
+		LinacInstruction& instr = instructions[i];
+		if(instr.type == RF_GAP) gap_count++;
+		if(instr.tag < tag_start) continue;
+		if(instr.tag > tag_stop) break;
+		if(instr.type == APERTURE || instr.type == PHASE_APERTURE || instr.type == ENERGY_APERTURE){
+			//the lost particles should not be tracked by the next instructions
+			checkAperture(bunch,instr);
+			if(instr.nLost > 0) moveLostParticles(bunch,lostbunch,instr);
+			continue;
+		}
+		if(instr.type == DRIFT){
+			if(instr.useLinacTracker){
+				linac_tracking::linac_drift(bunch,instr.params[0]);
+			} else {
+				teapot_base::drift(bunch,instr.params[0]);
+			}
+			continue;
+		}
+		if(instr.type == QUAD){
+			trackQuad(bunch,instr);
+			continue;
+		}
+		if(instr.type == ROTATE){
+			teapot_base::rotatexy(bunch,instr.params[0]);
+			continue;
+		}
+		if(instr.type == KICK){
+			// dp/p = Q*c*B*L/p p in GeV/c c = 2.99792*10^8/10^9
+			double momentum = syncPart->getMomentum();
+			double kx = instr.params[0]*0.299792/momentum;
+			double ky = instr.params[1]*0.299792/momentum;
+			if(instr.useLinacTracker){
+				linac_tracking::kick(bunch,kx,ky,0.,1);
+			} else {
+				teapot_base::kick(bunch,kx,ky,0.,1);
+			}
+			continue;
+		}
+		if(instr.type == RF_GAP){
+			if(!trackRfGap(bunch,instr)) return instr.tag;
+			rfGapPhases[gap_count-1] = instr.params[6];
+		}
+	}
+	return -1;
+}
+
+/** Marks the particles outside of the aperture, phase aperture, or energy aperture as dead. */
+void LinacInstructionList::checkAperture(Bunch* bunch, LinacInstruction& instr)
+{
+	double a = instr.params[0];
+	double b = instr.params[1];
+	double c = instr.params[2];
+	double d = instr.params[3];
+	int shape = instr.shape;
+	int nParts = bunch->getSize();
+	double** coord = bunch->coordArr();
+	int nLost = 0;
+	if(instr.type == PHASE_APERTURE){
+		//the same conditions as in the PhaseAperture class, the phases are in degrees
+		double beta = bunch->getSyncPart()->getBeta();
+		double lambda = OrbitConst::c*beta/instr.params[0];
+		double z_to_phase_coeff = - 360./lambda;
+		for(int ind = 0; ind < nParts; ind++){
+			if(bunch->flag(ind) == 0) continue;
+			double phase = coord[ind][4]*z_to_phase_coeff;
+			if(phase < b || phase > c){
+				bunch->deleteParticleFast(ind);
+				nLost++;
+			}
+		}
+		instr.nLost = nLost;
+		return;
+	}
+	if(instr.type == ENERGY_APERTURE){
+		//the same conditions as in the EnergyAperture class
+		for(int ind = 0; ind < nParts; ind++){
+			if(bunch->flag(ind) == 0) continue;
+			if(coord[ind][5] < b || coord[ind][5] > c){
+				bunch->deleteParticleFast(ind);
+				nLost++;
+			}
+		}
+		instr.nLost = nLost;
+		return;
+	}
+	for(int ind = 0; ind < nParts; ind++){
+		if(bunch->flag(ind) == 0) continue;
+		//the same conditions as in the Aperture class
+		bool isLost = false;
+		if(shape == 1){
+			isLost = (pow(coord[ind][0] - c,2) + pow(coord[ind][2] - d,2) >= a*a);
+		} else if(shape == 2){
+			isLost = (pow(coord[ind][0] - c,2)/(a*a) + pow(coord[ind][2] - d,2)/(b*b) >= 1.);
+		} else if(shape == 3){
+			isLost = (fabs(coord[ind][0] - c) >= a || fabs(coord[ind][2] - d) >= b);
+		}
+		if(isLost){
+			bunch->deleteParticleFast(ind);
+			nLost++;
+		}
+	}
+	instr.nLost = nLost;
+}
+
+/** Moves the particles marked by the aperture instruction into the lost bunch. */
+void LinacInstructionList::moveLostParticles(Bunch* bunch, Bunch* lostbunch, LinacInstruction& instr)
+{
+	if(lostbunch == NULL){
+		bunch->moveDeadParticlesTo(NULL);
+		return;
+	}
+	lostbunch->compress();
+	if(lostbunch->hasParticleAttributes("LostParticleAttributes") <= 0){
+		std::map<std::string,double> params_dict;
+		lostbunch->addParticleAttributes("LostParticleAttributes",params_dict);
+	}
+	if(bunch->hasParticleAttributes("ParticleIdNumber") > 0 && lostbunch->hasParticleAttributes("ParticleIdNumber") <= 0){
+		std::map<std::string,double> params_dict;
+		lostbunch->addParticleAttributes("ParticleIdNumber",params_dict);
+	}
+	if(bunch->hasParticleAttributes("macrosize") > 0 && lostbunch->hasParticleAttributes("macrosize") <= 0){
+		std::map<std::string,double> params_dict;
+		lostbunch->addParticleAttributes("macrosize",params_dict);
+	}
+	//only the PhaseAperture class keeps the initial coordinates of the lost particles
+	if(instr.type == PHASE_APERTURE && bunch->hasParticleAttributes("ParticleInitialCoordinates") > 0 &&
+		lostbunch->hasParticleAttributes("ParticleInitialCoordinates") <= 0){
+		std::map<std::string,double> params_dict;
+		lostbunch->addParticleAttributes("ParticleInitialCoordinates",params_dict);
+	}
+	lostbunch->setMacroSize(bunch->getMacroSize());
+	int nLostStart = lostbunch->getSize();
+	bunch->moveDeadParticlesTo(lostbunch);
+	ParticleAttributes* lostPartAttr = lostbunch->getParticleAttributes("LostParticleAttributes");
+	for(int ind = nLostStart, n = lostbunch->getSize(); ind < n; ind++){
+		lostPartAttr->attValue(ind, 0) = instr.params[4];
+	}
+}
+
+/** Tracks the bunch through one quad part by using the 3-sub-parts TEAPOT algorithm. */
+void LinacInstructionList::trackQuad(Bunch* bunch, LinacInstruction& instr)
+{
+	// B*rho = 3.335640952*momentum [T*m] if momentum in GeV/c
+	double momentum = bunch->getSyncPart()->getMomentum();
+	double kq = instr.params[1]/(3.335640952*momentum);
+	double step = instr.params[0];
+	if(instr.useLinacTracker){
+		linac_tracking::linac_quad1(bunch,step/4,kq,1);
+		linac_tracking::linac_quad2(bunch,step/4);
+		linac_tracking::linac_quad2(bunch,step/4);
+		linac_tracking::linac_quad1(bunch,step/2,kq,1);
+		linac_tracking::linac_quad2(bunch,step/4);
+		linac_tracking::linac_quad2(bunch,step/4);
+		linac_tracking::linac_quad1(bunch,step/4,kq,1);
+	} else {
+		teapot_base::quad1(bunch,step/4,kq,1);
+		teapot_base::quad2(bunch,step/4);
+		teapot_base::quad2(bunch,step/4);
+		teapot_base::quad1(bunch,step/2,kq,1);
+		teapot_base::quad2(bunch,step/4);
+		teapot_base::quad2(bunch,step/4);
+		teapot_base::quad1(bunch,step/4,kq,1);
+	}
+}
+
+/** Tracks the bunch through the RF gap. Returns false if the beta is outside the TTF range. */
+bool LinacInstructionList::trackRfGap(Bunch* bunch, LinacInstruction& instr)
+{
+	SyncPart* syncPart = bunch->getSyncPart();
+	double frequency = instr.params[0];
+	double E0 = instr.params[1];
+	double phase = fmod(frequency*(syncPart->getTime() - instr.params[3])*2.0*OrbitConst::PI + instr.params[2],2.0*OrbitConst::PI);
+	if(instr.gapModel == RF_GAP_TTF || instr.gapModel == RF_GAP_TTF_SLOW){
+		double beta = syncPart->getBeta();
+		if(beta < instr.params[4] || beta > instr.params[5]) return false;
+	}
+	instr.params[6] = phase;
+	if(instr.gapModel == BASE_RF_GAP){
+		BaseRfGap::trackBunch(bunch,frequency,E0,phase);
+	} else if(instr.gapModel == BASE_RF_GAP_SLOW){
+		BaseRfGap_slow::trackBunch(bunch,frequency,E0,phase);
+	} else if(instr.gapModel == MATRIX_RF_GAP){
+		MatrixRfGap::trackBunch(bunch,frequency,E0,phase);
+	} else if(instr.gapModel == RF_GAP_TTF){
+		RfGapTTF::trackBunch(bunch,frequency,E0,phase,instr.polys[0],instr.polys[1],instr.polys[2],instr.polys[3]);
+	} else if(instr.gapModel == RF_GAP_TTF_SLOW){
+		RfGapTTF_slow::trackBunch(bunch,frequency,E0,phase,instr.polys[0],instr.polys[1],instr.polys[2],instr.polys[3]);
+	}
+	return true;
+}
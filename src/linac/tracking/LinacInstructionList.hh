@@ -0,0 +1,168 @@
+/////////////////////////////////////////////////////////////////////////////
+//
+// FILE NAME
+//   LinacInstructionList.hh
+//
+// DESCRIPTION
+//   The list of the elementary tracking instructions for a run of linac
+//   nodes (drifts, quads, dipole correctors, and simple RF gaps) and
+//   the aperture, phase aperture, and energy aperture child nodes of these nodes.
+//   The list is created from the python level from the parameters of the
+//   nodes, and then the bunch is tracked through the whole run in C++
+//   without calling the python track methods of the nodes.
+//   Each instruction has a tag (the index of the lattice node), and the
+//   tracking can be performed for the range of tags.
+//   The particles lost on an aperture instruction are moved to the lost
+//   bunch right after this instruction if there were losses, as in the
+//   checkBunch methods of the aperture classes.
+//
+/////////////////////////////////////////////////////////////////////////////
+
+#ifndef LINAC_INSTRUCTION_LIST_H
+#define LINAC_INSTRUCTION_LIST_H
+
+#include <vector>
+
+#include "Bunch.hh"
+#include "CppPyWrapper.hh"
+#include "OU_Polynomial.hh"
+
+/**
+	The instruction of the linac instruction list.
+	The meaning of the parameters depends on the instruction type.
+*/
+struct LinacInstruction
+{
+	int type;
+	int tag;
+	int useLinacTracker;
+	int gapModel;
+	int shape;
+	int nLost;
+	double params[8];
+	OrbitUtils::Polynomial* polys[4];
+};
+
+class LinacInstructionList: public OrbitUtils::CppPyWrapper
+{
+public:
+
+	/** The types of the instructions. */
+	static const int DRIFT = 0;
+	static const int QUAD = 1;
+	static const int ROTATE = 2;
+	static const int KICK = 3;
+	static const int RF_GAP = 4;
+	static const int APERTURE = 5;
+	static const int PHASE_APERTURE = 6;
+	static const int ENERGY_APERTURE = 7;
+
+	/** The RF gap models that can be used in the instruction list. */
+	static const int BASE_RF_GAP = 0;
+	static const int BASE_RF_GAP_SLOW = 1;
+	static const int MATRIX_RF_GAP = 2;
+	static const int RF_GAP_TTF = 3;
+	static const int RF_GAP_TTF_SLOW = 4;
+
+	/** Constructor of the empty instruction list. */
+	LinacInstructionList();
+
+	/** Destructor */
+	virtual ~LinacInstructionList();
+
+	/** Removes all instructions. */
+	void clean();
+
+	/** Returns the number of instructions. */
+	int getSize();
+
+	/** Adds the drift with the length. */
+	void addDrift(int tag, double length, int useLinacTracker);
+
+	/** Adds the one part of the quad with the length and the field gradient dB/dr [T/m]. */
+	void addQuad(int tag, double length, double dB_dr, int useLinacTracker);
+
+	/** Adds the rotation in the x-y plane (the tilt of the element). */
+	void addRotation(int tag, double angle);
+
+	/** Adds the dipole kick. The parameters are field*length [T*m] for x and y directions. */
+	void addKick(int tag, double BLx, double BLy, int useLinacTracker);
+
+	/**
+		Adds the RF gap. The gap phase is calculated from the arrival time of the
+		synchronous particle: phase = fmod(2*pi*f*(t - designArrivalTime) + phase0,2*pi).
+		The E0 parameter is E0TL or E0L (for TTF models) multiplied by the cavity amplitude.
+		The beta limits and the polynomials are used by the TTF models only.
+	*/
+	void addRfGap(int tag, int gapModel, double frequency, double E0, double phase0,
+	              double designArrivalTime, double beta_min, double beta_max,
+	              OrbitUtils::Polynomial* Tttf, OrbitUtils::Polynomial* Sttf,
+	              OrbitUtils::Polynomial* Tpttf, OrbitUtils::Polynomial* Spttf);
+
+	/**
+		Adds the aperture with the same parameters as the Aperture class:
+		shape = 1 - circle, 2 - ellipse, 3 - rectangle, (a,b) are the sizes,
+		(c,d) are the x and y offsets, and pos is the position of the lost particles.
+	*/
+	void addAperture(int tag, int shape, double a, double b, double c, double d, double pos);
+
+	/**
+		Adds the phase aperture with the same parameters as the PhaseAperture class:
+		the RF frequency in Hz, the min and max phases in degrees, and the position.
+	*/
+	void addPhaseAperture(int tag, double frequency, double minPhase, double maxPhase, double pos);
+
+	/**
+		Adds the energy aperture with the same parameters as the EnergyAperture class:
+		the min and max energy deviations in GeV and the position.
+	*/
+	void addEnergyAperture(int tag, double minEnergy, double maxEnergy, double pos);
+
+	/**
+		Tracks the bunch through the instructions with tags between tag_start
+		and tag_stop inclusive. It returns -1 if all instructions were performed,
+		or the tag of the TTF RF gap instruction where the synchronous particle beta
+		is outside the [beta_min,beta_max] range. This instruction and the following
+		ones are not performed in this case. The particles lost on the apertures
+		are moved to the lostbunch (it could be NULL).
+	*/
+	int trackBunch(Bunch* bunch, Bunch* lostbunch, int tag_start, int tag_stop);
+
+	/** Returns the number of RF gaps instructions. */
+	int getNumberOfRfGaps();
+
+	/** Returns the RF gap phase calculated during the last tracking for the RF gap with the index. */
+	double getRfGapPhase(int index);
+
+	/** Returns the number of aperture instructions. */
+	int getNumberOfApertures();
+
+	/** Returns the number of particles lost during the last tracking on the aperture with the index. */
+	int getApertureLoss(int index);
+
+private:
+
+	/** Adds the instruction to the list. */
+	LinacInstruction& addInstruction(int type, int tag);
+
+	/** Tracks the bunch through one quad part. */
+	void trackQuad(Bunch* bunch, LinacInstruction& instr);
+
+	/** Tracks the bunch through the RF gap. Returns false if the beta is outside the TTF range. */
+	bool trackRfGap(Bunch* bunch, LinacInstruction& instr);
+
+	/** Marks the particles outside of the aperture, phase aperture, or energy aperture as dead. */
+	void checkAperture(Bunch* bunch, LinacInstruction& instr);
+
+	/** Moves the particles marked by the aperture instruction into the lost bunch. */
+	void moveLostParticles(Bunch* bunch, Bunch* lostbunch, LinacInstruction& instr);
+
+private:
+
+	std::vector<LinacInstruction> instructions;
+	std::vector<int> rfGapIndexes;
+	std::vector<double> rfGapPhases;
+	std::vector<int> apertureIndexes;
+};
+
+#endif  //LINAC_INSTRUCTION_LIST_H
@@ -0,0 +1,329 @@
+#include "orbit_mpi.hh"
+#include "pyORBIT_Object.hh"
+
+#include "wrap_LinacInstructionList.hh"
+#include "wrap_linacmodule.hh"
+#include "wrap_bunch.hh"
+
+#include <iostream>
+
+#include "wrap_utils.hh"
+#include "LinacInstructionList.hh"
+#include "OU_Polynomial.hh"
+
+using namespace OrbitUtils;
+
+namespace wrap_linac{
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+	//---------------------------------------------------------
+	//Python LinacInstructionList class definition
+	//---------------------------------------------------------
+
+	//constructor for python class wrapping LinacInstructionList instance
+	//It never will be called directly
+	static PyObject* LinacInstructionList_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+	{
+		pyORBIT_Object* self;
+		self = (pyORBIT_Object *) type->tp_alloc(type, 0);
+		self->cpp_obj = NULL;
+		return (PyObject *) self;
+	}
+
+  //initializator for python  LinacInstructionList class
+  //this is implementation of the __init__ method
+  static int LinacInstructionList_init(pyORBIT_Object *self, PyObject *args, PyObject *kwds){
+		self->cpp_obj = new LinacInstructionList();
+		((LinacInstructionList*) self->cpp_obj)->setPyWrapper((PyObject*) self);
+		return 0;
+  }
+
+	//clean() - removes all instructions
+  static PyObject* LinacInstructionList_clean(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		cpp_InstrList->clean();
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//getSize() - returns the number of instructions
+  static PyObject* LinacInstructionList_getSize(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		return Py_BuildValue("i",cpp_InstrList->getSize());
+  }
+
+	//addDrift(tag, length, useLinacTracker)
+  static PyObject* LinacInstructionList_addDrift(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag, useLinacTracker;
+		double length;
+		if(!PyArg_ParseTuple(args,"idi:addDrift",&tag,&length,&useLinacTracker)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addDrift(tag, length, useLinacTracker) - parameters are needed.");
+		}
+		cpp_InstrList->addDrift(tag,length,useLinacTracker);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addQuad(tag, length, dB_dr, useLinacTracker)
+  static PyObject* LinacInstructionList_addQuad(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag, useLinacTracker;
+		double length, dB_dr;
+		if(!PyArg_ParseTuple(args,"iddi:addQuad",&tag,&length,&dB_dr,&useLinacTracker)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addQuad(tag, length, dB_dr, useLinacTracker) - parameters are needed.");
+		}
+		cpp_InstrList->addQuad(tag,length,dB_dr,useLinacTracker);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addRotation(tag, angle)
+  static PyObject* LinacInstructionList_addRotation(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag;
+		double angle;
+		if(!PyArg_ParseTuple(args,"id:addRotation",&tag,&angle)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addRotation(tag, angle) - parameters are needed.");
+		}
+		cpp_InstrList->addRotation(tag,angle);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addKick(tag, BLx, BLy, useLinacTracker)
+  static PyObject* LinacInstructionList_addKick(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag, useLinacTracker;
+		double BLx, BLy;
+		if(!PyArg_ParseTuple(args,"iddi:addKick",&tag,&BLx,&BLy,&useLinacTracker)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addKick(tag, BLx, BLy, useLinacTracker) - parameters are needed.");
+		}
+		cpp_InstrList->addKick(tag,BLx,BLy,useLinacTracker);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addRfGap(tag, cppGapModel, frequency, E0, phase0, designArrivalTime, beta_min, beta_max, polyT, polyS, polyTp, polySp)
+	//The polynomials are not copied, the python level should keep the references to them.
+  static PyObject* LinacInstructionList_addRfGap(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag;
+		PyObject* pyGapModel;
+		PyObject* pyPolyT;
+		PyObject* pyPolyS;
+		PyObject* pyPolyTP;
+		PyObject* pyPolySP;
+		double frequency, E0, phase0, designArrivalTime, beta_min, beta_max;
+		if(!PyArg_ParseTuple(args,"iOddddddOOOO:addRfGap",&tag,&pyGapModel,&frequency,&E0,&phase0,
+			                   &designArrivalTime,&beta_min,&beta_max,&pyPolyT,&pyPolyS,&pyPolyTP,&pyPolySP)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addRfGap(tag, cppGapModel, frequency, E0, phase0, designArrivalTime, beta_min, beta_max, TTFs TSTpSp) - parameters are needed.");
+		}
+		int gapModel = -1;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("BaseRfGap"))) gapModel = LinacInstructionList::BASE_RF_GAP;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("BaseRfGap_slow"))) gapModel = LinacInstructionList::BASE_RF_GAP_SLOW;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("MatrixRfGap"))) gapModel = LinacInstructionList::MATRIX_RF_GAP;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("RfGapTTF"))) gapModel = LinacInstructionList::RF_GAP_TTF;
+		if(PyObject_IsInstance(pyGapModel,getLinacType("RfGapTTF_slow"))) gapModel = LinacInstructionList::RF_GAP_TTF_SLOW;
+		if(gapModel < 0){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addRfGap(...) - the RF gap model should be BaseRfGap, BaseRfGap_slow, MatrixRfGap, RfGapTTF, or RfGapTTF_slow.");
+		}
+		PyObject* pyORBIT_Polynomial_Type = wrap_orbit_utils::getOrbitUtilsType("Polynomial");
+		if(!PyObject_IsInstance(pyPolyT,pyORBIT_Polynomial_Type) || !PyObject_IsInstance(pyPolyS,pyORBIT_Polynomial_Type) ||
+			 !PyObject_IsInstance(pyPolyTP,pyORBIT_Polynomial_Type) || !PyObject_IsInstance(pyPolySP,pyORBIT_Polynomial_Type)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addRfGap(...) - the last parameters should be a Polynomial.");
+		}
+		Polynomial* cpp_polyT = (Polynomial*) ((pyORBIT_Object*)pyPolyT)->cpp_obj;
+		Polynomial* cpp_polyS = (Polynomial*) ((pyORBIT_Object*)pyPolyS)->cpp_obj;
+		Polynomial* cpp_polyTp = (Polynomial*) ((pyORBIT_Object*)pyPolyTP)->cpp_obj;
+		Polynomial* cpp_polySp = (Polynomial*) ((pyORBIT_Object*)pyPolySP)->cpp_obj;
+		cpp_InstrList->addRfGap(tag,gapModel,frequency,E0,phase0,designArrivalTime,beta_min,beta_max,
+		                        cpp_polyT,cpp_polyS,cpp_polyTp,cpp_polySp);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addAperture(tag, shape, a, b, c, d, pos)
+  static PyObject* LinacInstructionList_addAperture(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag, shape;
+		double a, b, c, d, pos;
+		if(!PyArg_ParseTuple(args,"iiddddd:addAperture",&tag,&shape,&a,&b,&c,&d,&pos)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addAperture(tag, shape, a, b, c, d, pos) - parameters are needed.");
+		}
+		if(shape < 1 || shape > 3){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addAperture(tag, shape, a, b, c, d, pos) - shape should be 1, 2, or 3.");
+		}
+		cpp_InstrList->addAperture(tag,shape,a,b,c,d,pos);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addPhaseAperture(tag, frequency, minPhase, maxPhase, pos)
+  static PyObject* LinacInstructionList_addPhaseAperture(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag;
+		double frequency, minPhase, maxPhase, pos;
+		if(!PyArg_ParseTuple(args,"idddd:addPhaseAperture",&tag,&frequency,&minPhase,&maxPhase,&pos)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addPhaseAperture(tag, frequency, minPhase, maxPhase, pos) - parameters are needed.");
+		}
+		cpp_InstrList->addPhaseAperture(tag,frequency,minPhase,maxPhase,pos);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//addEnergyAperture(tag, minEnergy, maxEnergy, pos)
+  static PyObject* LinacInstructionList_addEnergyAperture(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int tag;
+		double minEnergy, maxEnergy, pos;
+		if(!PyArg_ParseTuple(args,"iddd:addEnergyAperture",&tag,&minEnergy,&maxEnergy,&pos)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - addEnergyAperture(tag, minEnergy, maxEnergy, pos) - parameters are needed.");
+		}
+		cpp_InstrList->addEnergyAperture(tag,minEnergy,maxEnergy,pos);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+	//trackBunch(bunch, tag_start, tag_stop[, lostbunch]) - returns -1 or the tag of the RF gap where the tracking stopped
+  static PyObject* LinacInstructionList_trackBunch(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		PyObject* pyBunch;
+		PyObject* pyLostBunch = NULL;
+		int tag_start, tag_stop;
+		if(!PyArg_ParseTuple(args,"Oii|O:trackBunch",&pyBunch,&tag_start,&tag_stop,&pyLostBunch)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - trackBunch(bunch, tag_start, tag_stop[, lostbunch]) - parameters are needed.");
+		}
+		PyObject* pyORBIT_Bunch_Type = wrap_orbit_bunch::getBunchType("Bunch");
+		if(!PyObject_IsInstance(pyBunch,pyORBIT_Bunch_Type)){
+			ORBIT_MPI_Finalize("PyLinacInstructionList - trackBunch(bunch, tag_start, tag_stop[, lostbunch]) - first param. should be a Bunch.");
+		}
+		Bunch* cpp_lostbunch = NULL;
+		if(pyLostBunch != NULL && pyLostBunch != Py_None){
+			if(!PyObject_IsInstance(pyLostBunch,pyORBIT_Bunch_Type)){
+				ORBIT_MPI_Finalize("PyLinacInstructionList - trackBunch(bunch, tag_start, tag_stop[, lostbunch]) - lostbunch should be a Bunch.");
+			}
+			cpp_lostbunch = (Bunch*) ((pyORBIT_Object*)pyLostBunch)->cpp_obj;
+		}
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object*)pyBunch)->cpp_obj;
+		return Py_BuildValue("i",cpp_InstrList->trackBunch(cpp_bunch,cpp_lostbunch,tag_start,tag_stop));
+  }
+
+	//getRfGapPhases() - returns the tuple with RF gaps' phases calculated during the last tracking
+  static PyObject* LinacInstructionList_getRfGapPhases(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int nGaps = cpp_InstrList->getNumberOfRfGaps();
+		PyObject* resTuple = PyTuple_New(nGaps);
+		for(int i = 0; i < nGaps; i++){
+			PyTuple_SetItem(resTuple,i,Py_BuildValue("d",cpp_InstrList->getRfGapPhase(i)));
+		}
+		return resTuple;
+  }
+
+	//getApertureLosses() - returns the tuple with numbers of particles lost on apertures during the last tracking
+  static PyObject* LinacInstructionList_getApertureLosses(PyObject *self, PyObject *args){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) ((pyORBIT_Object*) self)->cpp_obj;
+		int nApertures = cpp_InstrList->getNumberOfApertures();
+		PyObject* resTuple = PyTuple_New(nApertures);
+		for(int i = 0; i < nApertures; i++){
+			PyTuple_SetItem(resTuple,i,Py_BuildValue("i",cpp_InstrList->getApertureLoss(i)));
+		}
+		return resTuple;
+  }
+
+  //-----------------------------------------------------
+  //destructor for python LinacInstructionList class (__del__ method).
+  //-----------------------------------------------------
+  static void LinacInstructionList_del(pyORBIT_Object* self){
+		LinacInstructionList* cpp_InstrList = (LinacInstructionList*) self->cpp_obj;
+		delete cpp_InstrList;
+		self->ob_type->tp_free((PyObject*)self);
+  }
+
+	// defenition of the methods of the python LinacInstructionList wrapper class
+	// they will be vailable from python level
+  static PyMethodDef LinacInstructionListClassMethods[] = {
+		{ "clean",          LinacInstructionList_clean,          METH_VARARGS,"removes all instructions"},
+		{ "getSize",        LinacInstructionList_getSize,        METH_VARARGS,"returns the number of instructions"},
+		{ "addDrift",       LinacInstructionList_addDrift,       METH_VARARGS,"adds the drift addDrift(tag,length,useLinacTracker)"},
+		{ "addQuad",        LinacInstructionList_addQuad,        METH_VARARGS,"adds the quad part addQuad(tag,length,dB_dr,useLinacTracker)"},
+		{ "addRotation",    LinacInstructionList_addRotation,    METH_VARARGS,"adds the x-y rotation addRotation(tag,angle)"},
+		{ "addKick",        LinacInstructionList_addKick,        METH_VARARGS,"adds the dipole kick addKick(tag,BLx,BLy,useLinacTracker)"},
+		{ "addRfGap",       LinacInstructionList_addRfGap,       METH_VARARGS,"adds the RF gap addRfGap(tag,cppGapModel,frequency,E0,phase0,designArrivalTime,beta_min,beta_max,polyT,polyS,polyTp,polySp)"},
+		{ "addAperture",    LinacInstructionList_addAperture,    METH_VARARGS,"adds the aperture addAperture(tag,shape,a,b,c,d,pos)"},
+		{ "addPhaseAperture",  LinacInstructionList_addPhaseAperture,  METH_VARARGS,"adds the phase aperture addPhaseAperture(tag,frequency,minPhase,maxPhase,pos)"},
+		{ "addEnergyAperture", LinacInstructionList_addEnergyAperture, METH_VARARGS,"adds the energy aperture addEnergyAperture(tag,minEnergy,maxEnergy,pos)"},
+		{ "trackBunch",     LinacInstructionList_trackBunch,     METH_VARARGS,"tracks the Bunch through the instructions trackBunch(bunch,tag_start,tag_stop[,lostbunch])"},
+		{ "getRfGapPhases", LinacInstructionList_getRfGapPhases, METH_VARARGS,"returns the tuple with RF gaps' phases from the last tracking"},
+		{ "getApertureLosses", LinacInstructionList_getApertureLosses, METH_VARARGS,"returns the tuple with numbers of lost particles on apertures from the last tracking"},
+    {NULL}
+  };
+
+	// defenition of the memebers of the python LinacInstructionList wrapper class
+	// they will be vailable from python level
+	static PyMemberDef LinacInstructionListClassMembers [] = {
+		{NULL}
+	};
+
+	//new python LinacInstructionList wrapper type definition
+	static PyTypeObject pyORBIT_LinacInstructionList_Type = {
+		PyObject_HEAD_INIT(NULL)
+		0, /*ob_size*/
+		"LinacInstructionList", /*tp_name*/
+		sizeof(pyORBIT_Object), /*tp_basicsize*/
+		0, /*tp_itemsize*/
+		(destructor) LinacInstructionList_del , /*tp_dealloc*/
+		0, /*tp_print*/
+		0, /*tp_getattr*/
+		0, /*tp_setattr*/
+		0, /*tp_compare*/
+		0, /*tp_repr*/
+		0, /*tp_as_number*/
+		0, /*tp_as_sequence*/
+		0, /*tp_as_mapping*/
+		0, /*tp_hash */
+		0, /*tp_call*/
+		0, /*tp_str*/
+		0, /*tp_getattro*/
+		0, /*tp_setattro*/
+		0, /*tp_as_buffer*/
+		Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+		"The LinacInstructionList python wrapper", /* tp_doc */
+		0, /* tp_traverse */
+		0, /* tp_clear */
+		0, /* tp_richcompare */
+		0, /* tp_weaklistoffset */
+		0, /* tp_iter */
+		0, /* tp_iternext */
+		LinacInstructionListClassMethods, /* tp_methods */
+		LinacInstructionListClassMembers, /* tp_members */
+		0, /* tp_getset */
+		0, /* tp_base */
+		0, /* tp_dict */
+		0, /* tp_descr_get */
+		0, /* tp_descr_set */
+		0, /* tp_dictoffset */
+		(initproc) LinacInstructionList_init, /* tp_init */
+		0, /* tp_alloc */
+		LinacInstructionList_new, /* tp_new */
+	};
+
+	//--------------------------------------------------
+	//Initialization function of the pyLinacInstructionList class
+	//It will be called from linac module initialization
+	//--------------------------------------------------
+  void initLinacInstructionList(PyObject* module){
+		if (PyType_Ready(&pyORBIT_LinacInstructionList_Type) < 0) return;
+		Py_INCREF(&pyORBIT_LinacInstructionList_Type);
+		PyModule_AddObject(module, "LinacInstructionList", (PyObject *)&pyORBIT_LinacInstructionList_Type);
+	}
+
+#ifdef __cplusplus
+}
+#endif
+
+//end of namespace wrap_linac
+}
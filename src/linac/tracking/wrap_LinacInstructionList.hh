@@ -0,0 +1,18 @@
+#ifndef WRAP_LINAC_INSTRUCTION_LIST_H
+#define WRAP_LINAC_INSTRUCTION_LIST_H
+
+#include "Python.h"
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+  namespace wrap_linac{
+    void initLinacInstructionList(PyObject* module);
+  }
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
@@ -9,7 +9,9 @@
 #include "wrap_SuperFishFieldSource.hh"
 #include "wrap_RfGapThreePointTTF.hh"
 #include "wrap_RfGapThreePointTTF_slow.hh"
+#include "wrap_AxisFieldRfGap.hh"
 #include "wrap_linac_tracking.hh"
+#include "wrap_LinacInstructionList.hh"
 
 static PyMethodDef linacmoduleMethods[] = { {NULL,NULL} };
 
@@ -29,6 +31,8 @@ extern "C" {
 		 wrap_linac::initSuperFishFieldSource(module);
 		 wrap_linac::initRfGapThreePointTTF(module);
 		 wrap_linac::initRfGapThreePointTTF_slow(module);
+		 wrap_linac::initAxisFieldRfGap(module);
+		 wrap_linac::initLinacInstructionList(module);
 		 //initialization of the linac tracking module
 		 wrap_linac_tracking::initlinactracking();
 	 }
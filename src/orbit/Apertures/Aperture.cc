@@ -44,8 +44,9 @@ Aperture::Aperture(int shape, double a, double b, double c, double d, double pos
 void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 	         
   //Removes particle if located outside aperture from main bunch and adds it to the lost bunch.
+	//The lost particles are marked as dead first, and then they are moved 
+	//into the lost bunch with their attributes in one pass.
 
-	int j = 1, coll_flag = 0, lastArg, trackit;
 	double a = a_;
 	double b = b_;
 	double c = c_;
@@ -54,19 +55,11 @@ void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
        
 	bunch->compress();
 	if(lostbunch != NULL) lostbunch->compress();
-	double m_size = 0.;
 	int nParts = bunch->getSize();
 	double** coord = bunch->coordArr();
 	
-	
 	ParticleAttributes* lostPartAttr = NULL;
 	
-	ParticleAttributes* partIdNumbAttr = NULL;
-	ParticleAttributes* partIdNumbInitAttr = NULL;
-	
-	ParticleAttributes* partMacroAttr = NULL;
-	ParticleAttributes* partMacroInitAttr = NULL;	
-	
 	if(lostbunch != NULL) {
 		if(lostbunch->hasParticleAttributes("LostParticleAttributes") <= 0){
 			std::map<std::string,double> params_dict;
@@ -74,22 +67,17 @@ void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 		}
 		lostPartAttr = lostbunch->getParticleAttributes("LostParticleAttributes");
 		
-		
 		if(bunch->hasParticleAttributes("ParticleIdNumber") > 0){
-			partIdNumbInitAttr = bunch->getParticleAttributes("ParticleIdNumber");
 			if(lostbunch->hasParticleAttributes("ParticleIdNumber") <= 0){
 				std::map<std::string,double> params_dict;
 				lostbunch->addParticleAttributes("ParticleIdNumber",params_dict);
-				partIdNumbAttr = lostbunch->getParticleAttributes("ParticleIdNumber");
 			}	
 		}
 		
 		if(bunch->hasParticleAttributes("macrosize") > 0){
-			partMacroInitAttr = bunch->getParticleAttributes("macrosize");
 			if(lostbunch->hasParticleAttributes("macrosize") <= 0){
 				std::map<std::string,double> params_dict;
 				lostbunch->addParticleAttributes("macrosize",params_dict);
-				partMacroAttr = lostbunch->getParticleAttributes("macrosize");
 			}	
 		}	
 		
@@ -98,19 +86,9 @@ void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 	
 	// shape = 1              ===circular aperture===
 	if(shape == 1){
+		double a2 = pow(a, 2);
 	  for (int count = 0; count < nParts; count++){
-	  	if((pow((coord[count][0]-c), 2) + pow((coord[count][2]-d), 2)) >= pow(a, 2)){
-	  		if(lostbunch != NULL) {
-	  			lostbunch->addParticle(coord[count][0], coord[count][1], coord[count][2], coord[count][3], coord[count][4], coord[count][5]);
-	  			//pos_ is a position in lattice where particle is lost
-	  			lostPartAttr->attValue(lostbunch->getSize() - 1, 0) = pos_;
-	  			if(partIdNumbAttr != NULL){
-	  				partIdNumbAttr->attValue(lostbunch->getSize() - 1, 0) = partIdNumbInitAttr->attValue(count,0);
-	  			}
-	  			if(partMacroAttr != NULL){
-	  				partMacroAttr->attValue(lostbunch->getSize() - 1, 0) = partMacroInitAttr->attValue(count,0);
-	  			}
-	  		}
+	  	if((pow((coord[count][0]-c), 2) + pow((coord[count][2]-d), 2)) >= a2){
 	  		bunch->deleteParticleFast(count);
 	  	}
 	  }
@@ -120,17 +98,6 @@ void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 	if(shape == 2){
 	  for (int count = 0; count < nParts; count++){
 	  	if((pow((coord[count][0]-c), 2)/pow(a,2) + pow((coord[count][2]-d), 2)/pow(b,2)) >= 1){
-	  		if(lostbunch != NULL) {
-	  			lostbunch->addParticle(coord[count][0], coord[count][1], coord[count][2], coord[count][3], coord[count][4], coord[count][5]);
-	  			//pos_ is a position in lattice where particle is lost
-	  			lostPartAttr->attValue(lostbunch->getSize() - 1, 0) = pos_;
-	  			if(partIdNumbAttr != NULL){
-	  				partIdNumbAttr->attValue(lostbunch->getSize() - 1, 0) = partIdNumbInitAttr->attValue(count,0);
-	  			}
-	  			if(partMacroAttr != NULL){
-	  				partMacroAttr->attValue(lostbunch->getSize() - 1, 0) = partMacroInitAttr->attValue(count,0);
-	  			}
-	  		}
 	  		bunch->deleteParticleFast(count);
 	  	}
 	  }
@@ -140,24 +107,21 @@ void Aperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 	if(shape == 3){
 	  for (int count = 0; count < nParts; count++){
 	  	if((abs((coord[count][0])-c)>=a)||(abs((coord[count][2]-d))>=b)){
-	  		if(lostbunch != NULL) {
-	  			lostbunch->addParticle(coord[count][0], coord[count][1], coord[count][2], coord[count][3], coord[count][4], coord[count][5]);
-	  			//pos_ is a position in lattice where particle is lost
-	  			lostPartAttr->attValue(lostbunch->getSize() - 1, 0) = pos_;
-	  			if(partIdNumbAttr != NULL){
-	  				partIdNumbAttr->attValue(lostbunch->getSize() - 1, 0) = partIdNumbInitAttr->attValue(count,0);
-	  			}
-	  			if(partMacroAttr != NULL){
-	  				partMacroAttr->attValue(lostbunch->getSize() - 1, 0) = partMacroInitAttr->attValue(count,0);
-	  			}
-	  		}
 	  		bunch->deleteParticleFast(count);
 	  	}
 	  }
 	}
-				
-	//Update synchronous particle, compress bunch
-	bunch->compress();
+	
+	//move the lost particles to the lost bunch and compress bunch
+	int nLostStart = 0;
+	if(lostbunch != NULL) nLostStart = lostbunch->getSize();
+	bunch->moveDeadParticlesTo(lostbunch);
+	if(lostbunch != NULL) {
+		//pos_ is a position in lattice where particle is lost
+		for(int ind = nLostStart, n = lostbunch->getSize(); ind < n; ind++){
+			lostPartAttr->attValue(ind, 0) = pos_;
+		}
+	}
 }
 
 void Aperture::setPosition(double position){
@@ -101,21 +101,11 @@ void PhaseAperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 
 	bunch->compress();
 	if(lostbunch != NULL) lostbunch->compress();
-	double m_size = 0.;
 	int nParts = bunch->getSize();
 	double** coord = bunch->coordArr();
 	
 	ParticleAttributes* lostPartAttr = NULL;
 	
-	ParticleAttributes* partIdNumbAttr = NULL;
-	ParticleAttributes* partIdNumbInitAttr = NULL;
-	
-	ParticleAttributes* partMacroAttr = NULL;
-	ParticleAttributes* partMacroInitAttr = NULL;	
-	
-	ParticleAttributes* partInitCoordsAttr = NULL;
-	ParticleAttributes* partInitCoordsInitAttr = NULL;		
-	
 	if(lostbunch != NULL) {
 		if(lostbunch->hasParticleAttributes("LostParticleAttributes") <= 0){
 			std::map<std::string,double> params_dict;
@@ -125,29 +115,23 @@ void PhaseAperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 		
 		
 		if(bunch->hasParticleAttributes("ParticleIdNumber") > 0){
-			partIdNumbInitAttr = bunch->getParticleAttributes("ParticleIdNumber");
 			if(lostbunch->hasParticleAttributes("ParticleIdNumber") <= 0){
 				std::map<std::string,double> params_dict;
 				lostbunch->addParticleAttributes("ParticleIdNumber",params_dict);
-				partIdNumbAttr = lostbunch->getParticleAttributes("ParticleIdNumber");
 			}	
 		}
 		
 		if(bunch->hasParticleAttributes("macrosize") > 0){
-			partMacroInitAttr = bunch->getParticleAttributes("macrosize");
 			if(lostbunch->hasParticleAttributes("macrosize") <= 0){
 				std::map<std::string,double> params_dict;
 				lostbunch->addParticleAttributes("macrosize",params_dict);
-				partMacroAttr = lostbunch->getParticleAttributes("macrosize");
 			}	
 		}	
 		
 		if(bunch->hasParticleAttributes("ParticleInitialCoordinates") > 0){
-			partInitCoordsInitAttr = bunch->getParticleAttributes("ParticleInitialCoordinates");
 			if(lostbunch->hasParticleAttributes("ParticleInitialCoordinates") <= 0){
 				std::map<std::string,double> params_dict;
 				lostbunch->addParticleAttributes("ParticleInitialCoordinates",params_dict);
-				partInitCoordsAttr = lostbunch->getParticleAttributes("ParticleInitialCoordinates");
 			}	
 		}			
 		
@@ -164,28 +148,20 @@ void PhaseAperture::checkBunch(Bunch* bunch, Bunch* lostbunch){
 		z = coord[count][4];
 		phase = z*z_to_phase_coeff;
 		if(phase < minPhase_ || phase > maxPhase_){
-			if(lostbunch != NULL) {
-				lostbunch->addParticle(coord[count][0], coord[count][1], coord[count][2], coord[count][3], coord[count][4], coord[count][5]);
-				//pos_ is a position in lattice where particle is lost
-				lostPartAttr->attValue(lostbunch->getSize() - 1, 0) = pos_;
-				if(partIdNumbAttr != NULL){
-					partIdNumbAttr->attValue(lostbunch->getSize() - 1, 0) = partIdNumbInitAttr->attValue(count,0);
-				}
-				if(partMacroAttr != NULL){
-					partMacroAttr->attValue(lostbunch->getSize() - 1, 0) = partMacroInitAttr->attValue(count,0);
-				}
-				if(partInitCoordsInitAttr != NULL){
-					for(int init_ind = 0; init_ind < 6; init_ind++){
-					  partInitCoordsAttr->attValue(lostbunch->getSize() - 1,init_ind) = partInitCoordsInitAttr->attValue(count,init_ind);
-					}
-				}
-			}
 			bunch->deleteParticleFast(count);
 		}
 	}
 	
-	//Update synchronous particle, compress bunch
-	bunch->compress();
+	//move the lost particles to the lost bunch and compress bunch
+	int nLostStart = 0;
+	if(lostbunch != NULL) nLostStart = lostbunch->getSize();
+	bunch->moveDeadParticlesTo(lostbunch);
+	if(lostbunch != NULL) {
+		//pos_ is a position in lattice where particle is lost
+		for(int ind = nLostStart, n = lostbunch->getSize(); ind < n; ind++){
+			lostPartAttr->attValue(ind, 0) = pos_;
+		}
+	}
 }
 
 	
@@ -51,8 +51,9 @@ Bunch::Bunch(): CppPyWrapper(NULL)
 
   arrFlag = new int[nTotalSize];
   arrCoord = new double*[nTotalSize];
+  arrCoordBlock = new double[nTotalSize*nDim];
   for(int i=0; i < nTotalSize; i++){
-    arrCoord[i] = new double[nDim];
+    arrCoord[i] = arrCoordBlock + i*nDim;
   }
 
   //for MPI
@@ -78,11 +79,9 @@ Bunch::Bunch(): CppPyWrapper(NULL)
 
 Bunch::~Bunch()
 {
-  for(int i=0; i < nTotalSize; i++){
-    delete [] arrCoord[i];
-  }
   delete [] arrFlag;
   delete [] arrCoord;
+  delete [] arrCoordBlock;
 
   if(attrCntrSize > 0 && attributesSize>0 ){
 		for(int i=0; i < nTotalSize; i++){
@@ -449,6 +448,9 @@ int Bunch::flag(int index){   return arrFlag[index];}
 
 double* Bunch::coordPartArr(int index){ return arrCoord[index];}
 double** Bunch::coordArr(){ return arrCoord;}
+double* Bunch::coordBlock(){ return arrCoordBlock;}
+
+int Bunch::getCoordDim(){ return nDim;}
 
 ///////////////////////////////////////////////////////////////////////////
 // NAME
@@ -508,32 +510,29 @@ void Bunch::resize()
 
   int* tmp_arrFlag     = new int    [nTotalSize];
   double** tmp_arrCoord    = new double*[nTotalSize];
-
-  if(nOldTotalSize <= nTotalSize){
-    for(int i = nOldTotalSize; i < nTotalSize; i++){
-      tmp_arrCoord[i]    = new double[nDim];
-    }
-
-    for(int i=0; i < nOldTotalSize; i++){
-      tmp_arrFlag[i]     = arrFlag[i];
-      tmp_arrCoord[i]    = arrCoord[i];
-    }
+  double* tmp_arrCoordBlock = new double[nTotalSize*nDim];
+
+  //the coordinates are kept in one contiguous block, so the rows
+  //arrCoord[i] are always in the memory order of particles' indexes
+  int nCopy = nOldTotalSize;
+  if(nCopy > nTotalSize) nCopy = nTotalSize;
+  for(int i=0; i < nCopy; i++){
+    tmp_arrFlag[i] = arrFlag[i];
   }
-  else{
-    for(int i=0; i < nTotalSize; i++){
-      tmp_arrFlag[i] = arrFlag[i];
-      tmp_arrCoord[i]    = arrCoord[i];
-    }
-    for(int i = nTotalSize; i < nOldTotalSize; i++){
-      delete [] arrCoord[i];
-    }
+  for(int i=0, n = nCopy*nDim; i < n; i++){
+    tmp_arrCoordBlock[i] = arrCoordBlock[i];
+  }
+  for(int i=0; i < nTotalSize; i++){
+    tmp_arrCoord[i] = tmp_arrCoordBlock + i*nDim;
   }
 
   delete [] arrFlag;
   delete [] arrCoord;
+  delete [] arrCoordBlock;
 
   arrFlag     = tmp_arrFlag;
   arrCoord    = tmp_arrCoord;
+  arrCoordBlock = tmp_arrCoordBlock;
 
   //attributes resize
   if(attrCntrSize > 0 && attributesSize > 0){
@@ -730,9 +729,9 @@ void Bunch::compress()
 
     if(uppInd < nNew){
       count++;
-      tmp = arrCoord[lowInd];
-      arrCoord[lowInd] = arrCoord[uppInd];
-      arrCoord[uppInd] = tmp;
+      for(int k = 0; k < nDim; k++){
+        arrCoord[lowInd][k] = arrCoord[uppInd][k];
+      }
       tmp_flag = arrFlag[lowInd];
       arrFlag[lowInd] = arrFlag[uppInd];
       arrFlag[uppInd] = tmp_flag;
@@ -841,6 +840,397 @@ int Bunch::getSizeGlobalFromMemory()
 }
 
 
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::moveDeadParticlesTo
+//
+// DESCRIPTION
+//    removes the dead macro-particles (marked by deleteParticleFast) from
+//    the bunch and appends them to the target bunch. The particles'
+//    attributes that exist in both bunches are copied. The target bunch
+//    could be NULL, and in this case the dead particles are just removed.
+//    This is a stable compaction - the alive and moved macro-particles
+//    keep their order.
+//
+// RETURNS
+//    the number of removed macro-particles
+//
+///////////////////////////////////////////////////////////////////////////
+
+int Bunch::moveDeadParticlesTo(Bunch* bunch_target)
+{
+  if(bunch_target == this){
+    if(rank_MPI == 0){
+      std::cerr << "Bunch::moveDeadParticlesTo(bunch_target)" << std::endl
+                << "The target bunch cannot be the same as the source bunch!" << std::endl
+                << "Stop." << std::endl;
+    }
+    ORBIT_MPI_Finalize();
+  }
+  if(needOfCompress == 0) return 0;
+
+  //the attributes' shifts and sizes for the attributes in both bunches
+  std::vector<int> attrShiftArr;
+  std::vector<int> attrShiftTargetArr;
+  std::vector<int> attrSizeArr;
+  if(bunch_target != NULL){
+    bunch_target->compress();
+    std::map<std::string,ParticleAttributes*>::iterator pos;
+    for (pos = attrCntrMap.begin(); pos != attrCntrMap.end(); ++pos) {
+      if(bunch_target->hasParticleAttributes(pos->first) <= 0) continue;
+      ParticleAttributes* attr = pos->second;
+      ParticleAttributes* attrTarget = bunch_target->getParticleAttributes(pos->first);
+      if(attr->getAttSize() != attrTarget->getAttSize()) continue;
+      attrShiftArr.push_back(attr->getAttrShift());
+      attrShiftTargetArr.push_back(attrTarget->getAttrShift());
+      attrSizeArr.push_back(attr->getAttSize());
+    }
+  }
+  int nAttrCommon = attrSizeArr.size();
+
+  int nMoved = 0;
+  int nAlive = 0;
+  double* tmp;
+  for(int i = 0; i < nNew; i++){
+    if(arrFlag[i] == 0){
+      if(bunch_target != NULL){
+        double* arr = arrCoord[i];
+        int ind = bunch_target->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
+        for(int k = 0; k < nAttrCommon; k++){
+          double* attrArr = arrAttr[i] + attrShiftArr[k];
+          double* attrArrTarget = bunch_target->arrAttr[ind] + attrShiftTargetArr[k];
+          for(int j = 0, nj = attrSizeArr[k]; j < nj; j++){
+            attrArrTarget[j] = attrArr[j];
+          }
+        }
+      }
+      nMoved++;
+      continue;
+    }
+    if(i != nAlive){
+      for(int k = 0; k < nDim; k++){
+        arrCoord[nAlive][k] = arrCoord[i][k];
+      }
+      arrFlag[nAlive] = 1;
+      arrFlag[i] = 0;
+      if(attributesSize > 0){
+        tmp = arrAttr[nAlive];
+        arrAttr[nAlive] = arrAttr[i];
+        arrAttr[i] = tmp;
+      }
+    }
+    nAlive++;
+  }
+  nSize = nAlive;
+  nNew = nAlive;
+
+  //compression is done
+  needOfCompress = 0;
+
+  resize();
+  return nMoved;
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::reorderParticles
+//
+// DESCRIPTION
+//    reorders the macro-particles. The new particle with index i will be
+//    the old particle with index index_arr[i]. The coordinates are copied
+//    inside the contiguous coordinates block, so the memory order follows
+//    the new order. For attributes only the pointers to the rows are moved.
+//
+///////////////////////////////////////////////////////////////////////////
+
+void Bunch::reorderParticles(std::vector<int>& index_arr)
+{
+  compress();
+  if(((int) index_arr.size()) != nSize){
+    if(rank_MPI == 0){
+      std::cerr << "Bunch::reorderParticles(index_arr)" << std::endl
+                << "The size of the index array is not equal to the bunch size!" << std::endl
+                << "index array size =" << index_arr.size() << " bunch size =" << nSize << std::endl
+                << "Stop." << std::endl;
+    }
+    ORBIT_MPI_Finalize();
+  }
+  std::vector<double> tmpCoordVect(arrCoordBlock,arrCoordBlock+nSize*nDim);
+  for(int i = 0; i < nSize; i++){
+    double* arr = &tmpCoordVect[index_arr[i]*nDim];
+    for(int k = 0; k < nDim; k++){
+      arrCoord[i][k] = arr[k];
+    }
+  }
+  if(attributesSize > 0){
+    std::vector<double*> tmpAttrVect(arrAttr,arrAttr+nSize);
+    for(int i = 0; i < nSize; i++){
+      arrAttr[i] = tmpAttrVect[index_arr[i]];
+    }
+  }
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::getLoadImbalance
+//
+// DESCRIPTION
+//    returns the relative load imbalance (n_max - n_avg)/n_avg where
+//    n_max and n_avg are the maximal and average numbers of the
+//    macro-particles on CPUs of the "Local" MPI communicator
+//
+///////////////////////////////////////////////////////////////////////////
+
+double Bunch::getLoadImbalance()
+{
+  compress();
+  if(size_MPI == 1) return 0.;
+  int nSizeMax = 0;
+  ORBIT_MPI_Allreduce(&nSize,&nSizeMax,1,MPI_INT,MPI_MAX,pyComm_Local->comm);
+  getSizeGlobal();
+  if(sizeGlobal == 0) return 0.;
+  double nSizeAvg = ((double) sizeGlobal)/size_MPI;
+  return (nSizeMax - nSizeAvg)/nSizeAvg;
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::balanceLoad
+//
+// DESCRIPTION
+//    moves macro-particles between CPUs of the "Local" MPI communicator
+//    if the load imbalance is bigger than the threshold. After balancing
+//    all CPUs have the same number of macro-particles (+-1).
+//    The CPUs with more particles than the target number send the
+//    contiguous blocks of particles from the end of the bunch to the CPUs
+//    with less particles. The coordinates and all particles' attributes
+//    are moved. The transfers are ordered by the sender and the receiver
+//    indexes, so the blocking send and receive calls cannot deadlock.
+//
+// RETURNS
+//    the number of moved macro-particles for all CPUs
+//
+///////////////////////////////////////////////////////////////////////////
+
+int Bunch::balanceLoad(double imbalance_threshold)
+{
+  compress();
+  if(size_MPI == 1) return 0;
+
+  int buff_index0 = 0;
+  int buff_index1 = 0;
+  int* nSizeArr     = BufferStore::getBufferStore()->getFreeIntArr(buff_index0,size_MPI);
+  int* nSizeArr_MPI = BufferStore::getBufferStore()->getFreeIntArr(buff_index1,size_MPI);
+  for(int i=0; i<size_MPI;i++){
+    nSizeArr[i]=0;
+    if(i==rank_MPI){nSizeArr[i]=nSize;}
+  }
+  ORBIT_MPI_Allreduce(nSizeArr,nSizeArr_MPI,size_MPI,
+		MPI_INT,MPI_SUM,pyComm_Local->comm);
+
+  //at this point all CPUs know about number of macro-particles on each CPU
+  //and they will make the same decisions
+  std::vector<int> deltaArr(size_MPI);
+  int nSizeMax = 0;
+  sizeGlobal = 0;
+  for(int i=0; i<size_MPI;i++){
+    sizeGlobal += nSizeArr_MPI[i];
+    if(nSizeArr_MPI[i] > nSizeMax) nSizeMax = nSizeArr_MPI[i];
+  }
+  int nTarget = sizeGlobal/size_MPI;
+  int nRest = sizeGlobal % size_MPI;
+  for(int i=0; i<size_MPI;i++){
+    deltaArr[i] = nSizeArr_MPI[i] - nTarget;
+    if(i < nRest) deltaArr[i] -= 1;
+  }
+  BufferStore::getBufferStore()->setUnusedIntArr(buff_index0);
+  BufferStore::getBufferStore()->setUnusedIntArr(buff_index1);
+
+  if(sizeGlobal == 0) return 0;
+  double nSizeAvg = ((double) sizeGlobal)/size_MPI;
+  if((nSizeMax - nSizeAvg)/nSizeAvg <= imbalance_threshold) return 0;
+
+  //the list of transfers (from,to,count)
+  std::vector<int> trFromArr;
+  std::vector<int> trToArr;
+  std::vector<int> trCountArr;
+  int i_from = 0;
+  int i_to = 0;
+  while(true){
+    while(i_from < size_MPI && deltaArr[i_from] <= 0){i_from++;}
+    while(i_to < size_MPI && deltaArr[i_to] >= 0){i_to++;}
+    if(i_from == size_MPI || i_to == size_MPI) break;
+    int nCount = deltaArr[i_from];
+    if(-deltaArr[i_to] < nCount) nCount = -deltaArr[i_to];
+    trFromArr.push_back(i_from);
+    trToArr.push_back(i_to);
+    trCountArr.push_back(nCount);
+    deltaArr[i_from] -= nCount;
+    deltaArr[i_to] += nCount;
+  }
+
+  int nDimAndAttr = nDim + attributesSize;
+  int nMoved = 0;
+  int iTail = nSize;
+  MPI_Status statusMPI;
+  for(int itr = 0, ntr = trCountArr.size(); itr < ntr; itr++){
+    int nCount = trCountArr[itr];
+    nMoved += nCount;
+    if(trFromArr[itr] != rank_MPI && trToArr[itr] != rank_MPI) continue;
+    int buff_index2 = 0;
+    double* dump_arr = BufferStore::getBufferStore()->getFreeDoubleArr(buff_index2,nCount*nDimAndAttr);
+    if(trFromArr[itr] == rank_MPI){
+      int j_start = iTail - nCount;
+      packParticles(j_start, iTail, dump_arr);
+      for(int j = j_start; j < iTail; j++){
+        deleteParticleFast(j);
+      }
+      iTail = j_start;
+      ORBIT_MPI_Send(dump_arr, nCount*nDimAndAttr, MPI_DOUBLE, trToArr[itr],
+				1113, pyComm_Local->comm);
+    }
+    else {
+      ORBIT_MPI_Recv(dump_arr, nCount*nDimAndAttr, MPI_DOUBLE, trFromArr[itr],
+				1113, pyComm_Local->comm, &statusMPI);
+      unpackParticles(nCount, dump_arr);
+    }
+    BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index2);
+  }
+  compress();
+  return nMoved;
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::packParticles
+//
+// DESCRIPTION
+//    writes the coordinates and all particles' attributes of the
+//    macro-particles with indexes i_start <= i < i_stop into the array.
+//    Each macro-particle takes (nDim + attributesSize) doubles.
+//
+///////////////////////////////////////////////////////////////////////////
+
+void Bunch::packParticles(int i_start, int i_stop, double* dump_arr)
+{
+  int nDimAndAttr = nDim + attributesSize;
+  for(int j = i_start; j < i_stop; j++){
+    double* arr = dump_arr + (nDimAndAttr)*(j - i_start);
+    for(int k = 0; k < nDim; k++){
+      arr[k] = arrCoord[j][k];
+    }
+    for(int k = 0; k < attributesSize; k++){
+      arr[nDim + k] = getParticleAttributeVal(j,k);
+    }
+  }
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::unpackParticles
+//
+// DESCRIPTION
+//    adds nParts macro-particles with coordinates and attributes from
+//    the array created by the packParticles method
+//
+///////////////////////////////////////////////////////////////////////////
+
+void Bunch::unpackParticles(int nParts, double* dump_arr)
+{
+  int nDimAndAttr = nDim + attributesSize;
+  for(int j = 0; j < nParts; j++){
+    double* arr = dump_arr + (nDimAndAttr)*j;
+    int part_index = addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
+    for(int k = 0; k < attributesSize; k++){
+      getParticleAttributeVal(part_index,k) = arr[nDim + k];
+    }
+  }
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::sendBunchMPI
+//
+// DESCRIPTION
+//    sends the local part of the bunch (the synchronous particle and
+//    the alive macro-particles with all particles' attributes) to
+//    the CPU with the rank_dest in the communicator as one MPI_DOUBLE
+//    message. The header of the message has the number of particles,
+//    the number of doubles per particle, the time, the coordinates,
+//    and the momentum of the synchronous particle.
+//
+///////////////////////////////////////////////////////////////////////////
+
+void Bunch::sendBunchMPI(int rank_dest, int tag, pyORBIT_MPI_Comm* pyComm)
+{
+  compress();
+  int nDimAndAttr = nDim + attributesSize;
+  int nHeader = 9;
+  int buff_index = 0;
+  double* dump_arr = BufferStore::getBufferStore()->getFreeDoubleArr(buff_index,nHeader + nSize*nDimAndAttr);
+  dump_arr[0] = (double) nSize;
+  dump_arr[1] = (double) nDimAndAttr;
+  dump_arr[2] = syncPart->getTime();
+  dump_arr[3] = syncPart->getX();
+  dump_arr[4] = syncPart->getY();
+  dump_arr[5] = syncPart->getZ();
+  dump_arr[6] = syncPart->getPX();
+  dump_arr[7] = syncPart->getPY();
+  dump_arr[8] = syncPart->getPZ();
+  packParticles(0, nSize, dump_arr + nHeader);
+  ORBIT_MPI_Send(dump_arr, nHeader + nSize*nDimAndAttr, MPI_DOUBLE, rank_dest,
+		tag, pyComm->comm);
+  BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index);
+}
+
+///////////////////////////////////////////////////////////////////////////
+// NAME
+//
+//    Bunch::recvBunchMPI
+//
+// DESCRIPTION
+//    receives the message created by the sendBunchMPI method from
+//    the CPU with the rank_source in the communicator. All macro-particles
+//    of this bunch are replaced by the received ones, and the synchronous
+//    particle is updated. The bunch should have the same particles'
+//    attributes as the sender bunch.
+//
+///////////////////////////////////////////////////////////////////////////
+
+void Bunch::recvBunchMPI(int rank_source, int tag, pyORBIT_MPI_Comm* pyComm)
+{
+  int nDimAndAttr = nDim + attributesSize;
+  int nHeader = 9;
+  MPI_Status statusMPI;
+  int nCount = 0;
+  ORBIT_MPI_Probe(rank_source, tag, pyComm->comm, &statusMPI);
+  ORBIT_MPI_Get_count(&statusMPI, MPI_DOUBLE, &nCount);
+  int buff_index = 0;
+  double* dump_arr = BufferStore::getBufferStore()->getFreeDoubleArr(buff_index,nCount);
+  ORBIT_MPI_Recv(dump_arr, nCount, MPI_DOUBLE, rank_source,
+		tag, pyComm->comm, &statusMPI);
+  int nParts = (int) dump_arr[0];
+  if(((int) dump_arr[1]) != nDimAndAttr || nCount != nHeader + nParts*nDimAndAttr){
+    BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index);
+    ORBIT_MPI_Finalize("Bunch::recvBunchMPI - the sender bunch has different particles' attributes. Stop.");
+  }
+  deleteAllParticles();
+  syncPart->setTime(dump_arr[2]);
+  syncPart->setXYZ(dump_arr[3],dump_arr[4],dump_arr[5]);
+  syncPart->setPXYZ(dump_arr[6],dump_arr[7],dump_arr[8]);
+  unpackParticles(nParts, dump_arr + nHeader);
+  BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index);
+  compress();
+}
+
 //returns total number of macro particles, alive and dead
 int Bunch::getTotalCount()
 {
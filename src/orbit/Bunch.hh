@@ -79,13 +79,29 @@ public:
   //returns the pointer to the 6D coordinates array
   //the values order is : x,px,y,py,z,pz
 	//This can speed up operations with coordinates
+	//The pointer is valid until the next resize of the bunch.
   double* coordPartArr(int index);
 
   //returns the pointer to the [NumbOfPart][6D] coordinates array
   //the values order is : [index][x,px,y,py,z,pz]
 	//This can speed up operations with coordinates
+	//The rows point into the coordBlock() array. The resize of the bunch
+	//(e.g. in addParticle) reallocates the block, so the row pointers
+	//and the array itself kept by the caller become invalid after it.
+	//The rows should not be reassigned (e.g. swapped for sorting).
   double** coordArr();
 
+  //returns the pointer to the contiguous [NumbOfPart*nDim] coordinates array
+  //where nDim = getCoordDim(). The coordinates of the particle with index i
+  //start at i*nDim. The rows of the coordArr() array point into this array,
+  //so both can be used. It is an array of structures, not the separate
+  //arrays for each coordinate.
+	//The pointer is valid until the next resize of the bunch.
+  double* coordBlock();
+
+  //returns the number of coordinates of one particle (the stride in coordBlock())
+  int getCoordDim();
+
 	//wrap longitudinal coordinates assuming the certain ring length
 	void ringwrap(double ring_length);
 
@@ -107,6 +123,18 @@ public:
 	//removes the dead particles from bunch.
   void compress();
 
+  //removes the dead macro-particles (marked by deleteParticleFast) from the bunch
+  //in one pass and appends them to the end of the target bunch (if it is not NULL)
+  //with the values of all particles' attributes that both bunches have
+  //the order of the alive and moved macro-particles is preserved
+  //it returns the number of removed macro-particles
+  int moveDeadParticlesTo(Bunch* bunch_target);
+
+  //reorders the macro-particles (coordinates and attributes together)
+  //the new particle with index i will be the old one with index index_arr[i]
+  //the index_arr should be a permutation of 0...(getSize()-1)
+  void reorderParticles(std::vector<int>& index_arr);
+
   double getMass();                // GeV
   double getClassicalRadius();     // m
   double getCharge();              // sign and value in abs(e-charge) only
@@ -129,6 +157,23 @@ public:
 	//it does not call any MPI functions, so it is fast
   int getSizeGlobalFromMemory();
 
+  //returns the relative load imbalance (n_max - n_avg)/n_avg of the numbers
+  //of macro-particles on CPUs of the internal "Local" MPI communicator
+  double getLoadImbalance();
+
+  //moves macro-particles with all attributes from the CPUs with more particles
+  //to the CPUs with less particles if the load imbalance is above the threshold
+  //it returns the number of moved macro-particles (the same for all CPUs)
+  int balanceLoad(double imbalance_threshold);
+
+  //sends the synchronous particle and the macro-particles with all attributes
+  //of the local part of the bunch to the CPU with rank_dest as one message
+  void sendBunchMPI(int rank_dest, int tag, pyORBIT_MPI_Comm* pyComm);
+
+  //replaces the synchronous particle and the macro-particles of the bunch
+  //by the ones sent by the sendBunchMPI method from the CPU with rank_source
+  void recvBunchMPI(int rank_source, int tag, pyORBIT_MPI_Comm* pyComm);
+
   //returns total number of macro particles, alive and dead
   int getTotalCount();
 
@@ -218,6 +263,11 @@ private:
   //User is not supposed to use this method directly.
   double& getParticleAttributeVal(int ind, int attr_ind);
 
+  //packing and unpacking of the coordinates and attributes of the particles
+  //into the array with (nDim + attributesSize) doubles per particle
+  void packParticles(int i_start, int i_stop, double* dump_arr);
+  void unpackParticles(int nParts, double* dump_arr);
+
 protected:
 
   double** arrAttr;
@@ -245,6 +295,9 @@ protected:
   int* arrFlag;
   double** arrCoord;
 
+  //contiguous storage for coordinates, arrCoord[i] = arrCoordBlock + i*nDim
+  double* arrCoordBlock;
+
   //need of compress
   int needOfCompress;
 
@@ -30,6 +30,14 @@ BunchTwissAnalysis::BunchTwissAnalysis(): CppPyWrapper(NULL)
 		}	
 	}
 		
+	min_arr = (double* ) malloc (6*sizeof(double));
+	max_arr = (double* ) malloc (6*sizeof(double));
+	for(int i = 0; i < 6; i++){
+		min_arr[i] = 0.;
+		max_arr[i] = 0.;
+	}
+	extrema_calculated = 0;
+	
 	count = 0;
 	_order = 0;
 	
@@ -43,14 +51,23 @@ BunchTwissAnalysis::~BunchTwissAnalysis()
 	free(corr_arr);
 	free(avg_arr_MPI);
 	free(corr_arr_MPI);
+	free(min_arr);
+	free(max_arr);
 }
 
 /** Performs the Twiss analysis of the bunch */		
 void BunchTwissAnalysis::analyzeBunch(Bunch* bunch){
+	analyzeBunch(bunch,0);
+}
+
+/** Performs the Twiss analysis of the bunch and (optionally) finds the extrema of coordinates */		
+void BunchTwissAnalysis::analyzeBunch(Bunch* bunch, int extremaflag){
 	
 	//initialization
 	for(int i = 0; i < 6; i++){
 		avg_arr[i] = 0.;
+		min_arr[i] = DBL_MAX;
+		max_arr[i] = -DBL_MAX;
 	}
 	
 	for(int i = 0; i < 6; i++){
@@ -66,35 +83,52 @@ void BunchTwissAnalysis::analyzeBunch(Bunch* bunch){
 	int nParts = bunch->getSize();
 	count += nParts;
 	double** part_coord_arr = bunch->coordArr();
+	double* coord_arr = NULL;
 	int has_msize = bunch->hasParticleAttributes("macrosize");
 	if(has_msize > 0){
 		ParticleMacroSize* macroSizeAttr = (ParticleMacroSize*) bunch->getParticleAttributes("macrosize");
 		double m_size = 0.;
 		for(int ip = 0; ip < nParts; ip++){
+			coord_arr = part_coord_arr[ip];
 			m_size = macroSizeAttr->macrosize(ip);
 			total_macrosize += m_size;
 			for(int i = 0; i < 6; i++){
-				avg_arr[i] += m_size*part_coord_arr[ip][i];
+				avg_arr[i] += m_size*coord_arr[i];
 			}
 			
 			for(int i = 0; i < 6; i++){
 				for(int j = 0; j < i+1; j++){
-					corr_arr[i+6*j] += m_size*part_coord_arr[ip][i]*part_coord_arr[ip][j];
+					corr_arr[i+6*j] += m_size*coord_arr[i]*coord_arr[j];
 				}	
-			}			
+			}
+			
+			if(extremaflag > 0){
+				for(int i = 0; i < 6; i++){
+					if(coord_arr[i] < min_arr[i]) min_arr[i] = coord_arr[i];
+					if(coord_arr[i] > max_arr[i]) max_arr[i] = coord_arr[i];
+				}
+			}
 		}	
 	} else {
 		m_size = 1.0;
 		for(int ip = 0; ip < nParts; ip++){
+			coord_arr = part_coord_arr[ip];
 			for(int i = 0; i < 6; i++){
-				avg_arr[i] += part_coord_arr[ip][i];
+				avg_arr[i] += coord_arr[i];
 			}
 			
 			for(int i = 0; i < 6; i++){
 				for(int j = 0; j < i+1; j++){
-					corr_arr[i+6*j] += part_coord_arr[ip][i]*part_coord_arr[ip][j];
+					corr_arr[i+6*j] += coord_arr[i]*coord_arr[j];
 				}	
-			}	
+			}
+			
+			if(extremaflag > 0){
+				for(int i = 0; i < 6; i++){
+					if(coord_arr[i] < min_arr[i]) min_arr[i] = coord_arr[i];
+					if(coord_arr[i] > max_arr[i]) max_arr[i] = coord_arr[i];
+				}
+			}
 		}
 		total_macrosize += nParts*m_size;	
 		for(int i = 0; i < 6; i++){
@@ -107,16 +141,37 @@ void BunchTwissAnalysis::analyzeBunch(Bunch* bunch){
 		}				
 	}	
 	
-	int count_MPI = 0;
-	ORBIT_MPI_Allreduce(&count,&count_MPI,1,MPI_INT,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
-	count = count_MPI;
-	
-	double total_macrosize_MPI = 0.;
-	ORBIT_MPI_Allreduce(&total_macrosize,&total_macrosize_MPI,1,MPI_DOUBLE,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
-	total_macrosize = total_macrosize_MPI;
-	
-	ORBIT_MPI_Allreduce(avg_arr,avg_arr_MPI,6,MPI_DOUBLE,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
-	ORBIT_MPI_Allreduce(corr_arr,corr_arr_MPI,36,MPI_DOUBLE,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
+	//all sums are packed into one array to perform only one MPI reduction:
+	//[count, total_macrosize, avg[6], corr[lower triangle 21]]
+	double buff_arr[29];
+	double buff_arr_MPI[29];
+	buff_arr[0] = (double) count;
+	buff_arr[1] = total_macrosize;
+	int ind = 2;
+	for(int i = 0; i < 6; i++){
+		buff_arr[ind] = avg_arr[i];
+		ind++;
+	}
+	for(int i = 0; i < 6; i++){
+		for(int j = 0; j < i+1; j++){
+			buff_arr[ind] = corr_arr[i+6*j];
+			ind++;
+		}
+	}
+	ORBIT_MPI_Allreduce(buff_arr,buff_arr_MPI,29,MPI_DOUBLE,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
+	count = (int) (buff_arr_MPI[0] + 0.5);
+	total_macrosize = buff_arr_MPI[1];
+	ind = 2;
+	for(int i = 0; i < 6; i++){
+		avg_arr_MPI[i] = buff_arr_MPI[ind];
+		ind++;
+	}
+	for(int i = 0; i < 6; i++){
+		for(int j = 0; j < i+1; j++){
+			corr_arr_MPI[i+6*j] = buff_arr_MPI[ind];
+			ind++;
+		}
+	}
 	
 	if(fabs(total_macrosize) > 0.){
 		for(int i = 0; i < 6; i++){
@@ -131,6 +186,22 @@ void BunchTwissAnalysis::analyzeBunch(Bunch* bunch){
 		}	
 	}
 	
+	//the minima are negated to use the MPI_MAX operation for both minima and maxima
+	if(extremaflag > 0){
+		double extrema_arr[12];
+		double extrema_arr_MPI[12];
+		for(int i = 0; i < 6; i++){
+			extrema_arr[i] = - min_arr[i];
+			extrema_arr[i+6] = max_arr[i];
+		}
+		ORBIT_MPI_Allreduce(extrema_arr,extrema_arr_MPI,12,MPI_DOUBLE,MPI_MAX,bunch->getMPI_Comm_Local()->comm);
+		for(int i = 0; i < 6; i++){
+			min_arr[i] = - extrema_arr_MPI[i];
+			max_arr[i] = extrema_arr_MPI[i+6];
+		}
+	}
+	extrema_calculated = extremaflag;
+	
 	SyncPart* syncPart = bunch->getSyncPart();	
 	
 	bunch_momentum = syncPart->getMomentum();
@@ -226,6 +297,24 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 		
 	bunch->compress();
 	total_macrosize = 0.;
+	
+	//the dispersion and beta terms do not depend on the particle
+	double dispersion_x = getDispersion(0);
+	if(emitnormflag > 0){
+		xbetaterm = sqrt(getBeta(0)*getEmittance(0));
+		ybetaterm = sqrt(getBeta(1)*getEmittance(1));
+	}
+	else{
+		xbetaterm = sqrt(getBeta(0));
+		ybetaterm = sqrt(getBeta(1));
+	}
+	double powXbeta [order+1];
+	double powYbeta [order+1];
+	for(i = 0; i < order+1; i++){
+		powXbeta[i] = pow(xbetaterm, double(i));
+		powYbeta[i] = pow(ybetaterm, double(i));
+	}
+	
 	if(has_msize > 0){
 		ParticleMacroSize* macroSizeAttr = (ParticleMacroSize*) bunch->getParticleAttributes("macrosize");
 		double m_size = 0.;
@@ -235,16 +324,7 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 			total_macrosize += m_size;
 			
 			if (dispersionflag > 0) {
-				dispterm = getDispersion(0) * part_coord_arr[ip][5] / (bunch_kinenergy + bunch_mass) / (bunch_beta*bunch_beta);
-			}
-			
-			if(emitnormflag > 0){
-				xbetaterm = sqrt(getBeta(0)*getEmittance(0));
-				ybetaterm = sqrt(getBeta(1)*getEmittance(1));
-			}
-			else{
-				xbetaterm = sqrt(getBeta(0));
-				ybetaterm = sqrt(getBeta(1));
+				dispterm = dispersion_x * part_coord_arr[ip][5] / (bunch_kinenergy + bunch_mass) / (bunch_beta*bunch_beta);
 			}
 			
 			for(i = 0; i < _order; i++)
@@ -255,7 +335,7 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 			
 			for(j = 0; j<_order; j++)
 				for(i=0 ; i< _order+1-j; i++){
-					momentXY[i][j] += momX[i]/pow(xbetaterm, double(i)) * momY[j]/pow(ybetaterm, double(j));
+					momentXY[i][j] += momX[i]/powXbeta[i] * momY[j]/powYbeta[j];
 					momentXY[i][j] += momX[i] * momY[j];
 				}
 		}
@@ -265,16 +345,7 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 		for(int ip = 0; ip < nParts; ip++){
 			
 			if (dispersionflag > 0) {
-				dispterm = getDispersion(0) * part_coord_arr[ip][5] / (bunch_kinenergy + bunch_mass) / (bunch_beta*bunch_beta);
-			}
-			
-			if(emitnormflag > 0){
-				xbetaterm = sqrt(getBeta(0)*getEmittance(0));
-				ybetaterm = sqrt(getBeta(1)*getEmittance(1));
-			}
-			else{
-				xbetaterm = sqrt(getBeta(0));
-				ybetaterm = sqrt(getBeta(1));
+				dispterm = dispersion_x * part_coord_arr[ip][5] / (bunch_kinenergy + bunch_mass) / (bunch_beta*bunch_beta);
 			}
 			
 			for(i = 0; i < _order; i++)
@@ -285,7 +356,7 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 			
 			for(j = 0; j<_order; j++)
 				for(i=0 ; i< _order+1-j; i++)
-					momentXY[i][j] += momX[i]/pow(xbetaterm, double(i)) * momY[j]/pow(ybetaterm, double(j));
+					momentXY[i][j] += momX[i]/powXbeta[i] * momY[j]/powYbeta[j];
 					momentXY[i][j] += momX[i] * momY[j];
 			
 		}
@@ -294,12 +365,9 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 		
 	}
 	
-	ORBIT_MPI_Allreduce(&total_macrosize,&total_macrosize_MPI,1,MPI_DOUBLE,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
-	total_macrosize = total_macrosize_MPI;	
-	
-	//if( nMPIsize_ > 1){
-	double* buff_0 = (double *) malloc (sizeof(double)*(_order+1)*(_order+1));
-	double* buff_1 = (double *) malloc (sizeof(double)*(_order+1)*(_order+1));
+	//the total macrosize is reduced together with moments
+	double* buff_0 = (double *) malloc (sizeof(double)*((_order+1)*(_order+1)+1));
+	double* buff_1 = (double *) malloc (sizeof(double)*((_order+1)*(_order+1)+1));
 	int count = 0;
 	for(j=0; j<_order+1; j++){
 		for(i=0 ; i< _order+1-j; i++){
@@ -307,10 +375,10 @@ void BunchTwissAnalysis::computeBunchMoments(Bunch* bunch, int order, int disper
 			count++;
 			}
 	}
+	buff_0[count] = total_macrosize;
 	
-	//MPI_Allreduce(buff_0, buff_1, count, MPI_DOUBLE,MPI_SUM,MPI_COMM_WORLD);
-	
-	ORBIT_MPI_Allreduce(buff_0, buff_1, count, MPI_DOUBLE, MPI_SUM, bunch->getMPI_Comm_Local()->comm);
+	ORBIT_MPI_Allreduce(buff_0, buff_1, count+1, MPI_DOUBLE, MPI_SUM, bunch->getMPI_Comm_Local()->comm);
+	total_macrosize = buff_1[count];
 		
 	count = 0;
 	for(j=0; j<_order+1; j++){
@@ -358,6 +426,18 @@ double BunchTwissAnalysis::getAverage(int ic){
 	return avg_arr[ic];
 }
 
+/** Returns the minimal value for coordinate with index ic */
+double BunchTwissAnalysis::getMinimum(int ic){
+	if(ic < 0 || ic > 5 || extrema_calculated == 0) return 0.;
+	return min_arr[ic];
+}
+
+/** Returns the maximal value for coordinate with index ic */
+double BunchTwissAnalysis::getMaximum(int ic){
+	if(ic < 0 || ic > 5 || extrema_calculated == 0) return 0.;
+	return max_arr[ic];
+}
+
 /** Returns the total number of analysed macroparticles */
 int BunchTwissAnalysis::getGlobalCount(){
 	return count;
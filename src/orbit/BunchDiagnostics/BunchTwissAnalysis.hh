@@ -26,12 +26,21 @@ class BunchTwissAnalysis: public OrbitUtils::CppPyWrapper
 		/** Performs the Twiss analysis of the bunch */
 		void analyzeBunch(Bunch* bunch);
 		
+		/** Performs the Twiss analysis of the bunch and finds the extrema of coordinates if extremaflag > 0 */
+		void analyzeBunch(Bunch* bunch, int extremaflag);
+		
 		/** Returns the centered correlation <(x-<x>)*(y-<y>)> = <x*y> - <x>*<y> */
 		double getCorrelation(int ic, int jc);
 		
 		/** Returns the average value for coordinate with index ic */
 		double getAverage(int ic);
 		
+		/** Returns the minimal value for coordinate with index ic. The extrema should be requested in analyzeBunch. */
+		double getMinimum(int ic);
+		
+		/** Returns the maximal value for coordinate with index ic. The extrema should be requested in analyzeBunch. */
+		double getMaximum(int ic);
+		
 		/** Returns the total number of analysed macroparticles */
 		int getGlobalCount();
 		
@@ -95,6 +104,13 @@ class BunchTwissAnalysis: public OrbitUtils::CppPyWrapper
 		    It is excessive because <x*y> = <y*x> etc.*/
 		double* corr_arr;
 		double* corr_arr_MPI;
+		
+		/** arrays with minimal and maximal values for 6D coordinates */
+		double* min_arr;
+		double* max_arr;
+		
+		/** it is 1 if the extrema were calculated during the last analysis */
+		int extrema_calculated;
 	
 		/** array with XY Moments */
 		double** momentXY;
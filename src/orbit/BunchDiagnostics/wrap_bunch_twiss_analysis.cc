@@ -38,15 +38,16 @@ extern "C" {
   static PyObject* BunchTwissAnalysis_analyzeBunch(PyObject *self, PyObject *args){
 	  BunchTwissAnalysis* cpp_BunchTwissAnalysis = (BunchTwissAnalysis*)((pyORBIT_Object*) self)->cpp_obj;
 		PyObject* pyBunch;
-		if(!PyArg_ParseTuple(args,"O:analyzeBunch",&pyBunch)){
-			ORBIT_MPI_Finalize("BunchTwissAnalysis - analyzeBunch(Bunch* bunch) - parameter are needed.");
+		int extremaflag = 0;
+		if(!PyArg_ParseTuple(args,"O|i:analyzeBunch",&pyBunch,&extremaflag)){
+			ORBIT_MPI_Finalize("BunchTwissAnalysis - analyzeBunch(Bunch* bunch[, int extremaflag]) - parameter are needed.");
 		}
 		PyObject* pyORBIT_Bunch_Type = wrap_orbit_bunch::getBunchType("Bunch");
 		if(!PyObject_IsInstance(pyBunch,pyORBIT_Bunch_Type)){
 			ORBIT_MPI_Finalize("BunchTwissAnalysis - analyzeBunch(Bunch* bunch) - method needs a Bunch.");
 		}
 		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object*)pyBunch)->cpp_obj;
-		cpp_BunchTwissAnalysis->analyzeBunch(cpp_bunch);
+		cpp_BunchTwissAnalysis->analyzeBunch(cpp_bunch,extremaflag);
 		Py_INCREF(Py_None);
 		return Py_None;
   }
@@ -103,6 +104,26 @@ extern "C" {
     return Py_BuildValue("d",cpp_BunchTwissAnalysis->getAverage(ic));
   }		
 	
+	/** Returns the minimal value for coordinate with index ic */
+  static PyObject* BunchTwissAnalysis_getMinimum(PyObject *self, PyObject *args){
+	  BunchTwissAnalysis* cpp_BunchTwissAnalysis = (BunchTwissAnalysis*)((pyORBIT_Object*) self)->cpp_obj;
+	  int ic;
+		if(!PyArg_ParseTuple(	args,"i:",&ic)){
+			error("pyBunchTwissAnalysis.getMinimum(ic) - parameter is needed");
+		}
+    return Py_BuildValue("d",cpp_BunchTwissAnalysis->getMinimum(ic));
+  }		
+	
+	/** Returns the maximal value for coordinate with index ic */
+  static PyObject* BunchTwissAnalysis_getMaximum(PyObject *self, PyObject *args){
+	  BunchTwissAnalysis* cpp_BunchTwissAnalysis = (BunchTwissAnalysis*)((pyORBIT_Object*) self)->cpp_obj;
+	  int ic;
+		if(!PyArg_ParseTuple(	args,"i:",&ic)){
+			error("pyBunchTwissAnalysis.getMaximum(ic) - parameter is needed");
+		}
+    return Py_BuildValue("d",cpp_BunchTwissAnalysis->getMaximum(ic));
+  }		
+	
 	/** Returns the total number of analysed macroparticles */
   static PyObject* BunchTwissAnalysis_getGlobalCount(PyObject *self, PyObject *args){
 	  BunchTwissAnalysis* cpp_BunchTwissAnalysis = (BunchTwissAnalysis*)((pyORBIT_Object*) self)->cpp_obj;
@@ -255,11 +276,13 @@ extern "C" {
 	// defenition of the methods of the python BunchTwissAnalysis wrapper class
 	// they will be vailable from python level
   static PyMethodDef BunchTwissAnalysisClassMethods[] = {
-		{ "analyzeBunch",			BunchTwissAnalysis_analyzeBunch,			METH_VARARGS,"Performs the Twiss analysis of the bunch."},
+		{ "analyzeBunch",			BunchTwissAnalysis_analyzeBunch,			METH_VARARGS,"Performs the Twiss analysis of the bunch. analyzeBunch(bunch[,extremaflag]) - with extremaflag=1 the extrema are found too."},
 		{ "computeBunchMoments",	BunchTwissAnalysis_computeBunchMoments,		METH_VARARGS,"Returns the XY moments of the beam up to a prescribed order"},
  		{ "getCorrelation",			BunchTwissAnalysis_getCorrelation,    		METH_VARARGS,"Returns the centered correlation <(x-<x>)*(y-<y>)> = <x*y> - <x>*<y> for coordinates with indeces (ic,jc)"},
 		{ "getBunchMoment",			BunchTwissAnalysis_getBunchMoment,    		METH_VARARGS,"Returns the (i,j) xy moment of the beam"},
  		{ "getAverage",			 	BunchTwissAnalysis_getAverage,       		METH_VARARGS,"Returns the average value for coordinate with index ic"},		
+ 		{ "getMinimum",			 	BunchTwissAnalysis_getMinimum,       		METH_VARARGS,"Returns the minimal value for coordinate with index ic (extrema should be requested in analyzeBunch)"},		
+ 		{ "getMaximum",			 	BunchTwissAnalysis_getMaximum,       		METH_VARARGS,"Returns the maximal value for coordinate with index ic (extrema should be requested in analyzeBunch)"},		
  		{ "getGlobalCount",			BunchTwissAnalysis_getGlobalCount,    		METH_VARARGS,"Returns the total number of analysed macroparticles"},		
  		{ "getGlobalMacrosize", 	BunchTwissAnalysis_getGlobalMacrosize,		METH_VARARGS,"Returns the total macrosize"},		
 		{ "getEmittance",			BunchTwissAnalysis_getEmittance,   			METH_VARARGS,"Returns the emittance for index 0,1,2 - x,y,z planes"},		
@@ -130,6 +130,66 @@ void StraightRotationXY(Bunch* bunch, double anglexy)
   }
 }
 
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//   StraightRotationXYDisplacement
+//
+// DESCRIPTION
+//   Performs X-Y coordinate rotation followed by the generalized
+//   coordinate displacement in one pass. Any sequence of
+//   StraightRotationXY and CoordDisplacement transformations
+//   can be composed into this one.
+//
+// PARAMETERS
+//   anglexy
+//   dx, dxp, dy, dyp, dz, dE
+//
+///////////////////////////////////////////////////////////////////////////
+
+void StraightRotationXYDisplacement(Bunch* bunch, double anglexy,
+                                    double dx, double dxp,
+                                    double dy, double dyp,
+                                    double dz, double dE)
+{
+
+  double xtemp, xptemp, ytemp, yptemp;
+  double cs = cos(anglexy);
+  double sn = sin(anglexy);
+
+  //coordinate array [part. index][x,xp,y,yp,z,dE]
+  double** arr = bunch->coordArr();
+
+  if(anglexy == 0.)
+  {
+    for(int i = 0; i < bunch->getSize(); i++)
+    {
+      arr[i][0] += dx;
+      arr[i][1] += dxp;
+      arr[i][2] += dy;
+      arr[i][3] += dyp;
+      arr[i][4] += dz;
+      arr[i][5] += dE;
+    }
+    return;
+  }
+
+  for(int i = 0; i < bunch->getSize(); i++)
+  {
+    xtemp  = arr[i][0];
+    xptemp = arr[i][1];
+    ytemp  = arr[i][2];
+    yptemp = arr[i][3];
+
+    arr[i][0] =  cs * xtemp  + sn * ytemp  + dx;
+    arr[i][1] =  cs * xptemp + sn * yptemp + dxp;
+    arr[i][2] = -sn * xtemp  + cs * ytemp  + dy;
+    arr[i][3] = -sn * xptemp + cs * yptemp + dyp;
+    arr[i][4] += dz;
+    arr[i][5] += dE;
+  }
+}
+
 ///////////////////////////////////////////////////////////////////////////
 //
 // NAME
@@ -28,6 +28,10 @@ namespace error_base
                          double dz, double dE);
   void LongDisplacement(Bunch* bunch, double ds);
   void StraightRotationXY(Bunch* bunch, double anglexy);
+  void StraightRotationXYDisplacement(Bunch* bunch, double anglexy,
+                                      double dx, double dxp,
+                                      double dy, double dyp,
+                                      double dz, double dE);
   void StraightRotationXSI(Bunch* bunch, double anglexsi, double length);
   void StraightRotationXSF(Bunch* bunch, double anglexsf, double length);
   void StraightRotationYSI(Bunch* bunch, double angleysi, double length);
@@ -68,6 +68,22 @@ extern "C"
     return Py_None;
   }
 
+  // XY rotate and displace the coordinates of a bunch
+  static PyObject* wrap_StraightRotationXYDisplacement(PyObject *self, PyObject *args)
+  {
+    PyObject* pyBunch;
+    double anglexy, dx, dxp, dy, dyp, dz, dE;
+    if(!PyArg_ParseTuple(args, "Oddddddd:StraightRotationXYDisplacement",
+                         &pyBunch, &anglexy, &dx, &dxp, &dy, &dyp, &dz, &dE))
+    {
+      error("errorbase - StraightRotationXYDisplacement - cannot parse arguments!");
+    }
+    Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) pyBunch)->cpp_obj;
+    error_base::StraightRotationXYDisplacement(cpp_bunch, anglexy, dx, dxp, dy, dyp, dz, dE);
+    Py_INCREF(Py_None);
+    return Py_None;
+  }
+
   // XS rotate a bunch entering element
   static PyObject* wrap_StraightRotationXSI(PyObject *self, PyObject *args)
   {
@@ -353,6 +369,7 @@ extern "C"
     {"CoordDisplacement",   wrap_CoordDisplacement,   METH_VARARGS, "Displace the coordinates of a bunch"},
     {"LongDisplacement",    wrap_LongDisplacement,    METH_VARARGS, "Longitudinally displace a bunch"},
     {"StraightRotationXY",  wrap_StraightRotationXY,  METH_VARARGS, "XY rotate a bunch"},
+    {"StraightRotationXYDisplacement", wrap_StraightRotationXYDisplacement, METH_VARARGS, "XY rotate and displace the coordinates of a bunch"},
     {"StraightRotationXSI", wrap_StraightRotationXSI, METH_VARARGS, "XS rotate a bunch entering element"},
     {"StraightRotationXSF", wrap_StraightRotationXSF, METH_VARARGS, "XS rotate a bunch leaving element"},
     {"StraightRotationYSI", wrap_StraightRotationYSI, METH_VARARGS, "YS rotate a bunch entering element"},
@@ -34,6 +34,7 @@ LImpedance::LImpedance(double length,
   _length        = length;
   _nMacrosMin    = nMacrosMin;
   _nBins         = nBins;
+  _useExactKick  = 0;
   zGrid          = new Grid1D(_nBins, _length);
 
   _fftmagnitude  = new double[_nBins / 2];
@@ -54,6 +55,17 @@ LImpedance::LImpedance(double length,
   _in   = (fftw_complex *) fftw_malloc(_nBins * sizeof(fftw_complex));
   _out  = (fftw_complex *) fftw_malloc(_nBins * sizeof(fftw_complex));
   _plan = fftw_plan_dft_1d(_nBins, _in,  _out, FFTW_FORWARD, FFTW_ESTIMATE);
+
+  _nKickGrid = 4 * _nBins;
+  _kickGrid  = new double[_nKickGrid + 1];
+  for(int i = 0; i <= _nKickGrid; i++)
+  {
+    _kickGrid[i] = 0.0;
+  }
+  _kickIn   = (fftw_complex *) fftw_malloc(_nKickGrid * sizeof(fftw_complex));
+  _kickOut  = (fftw_complex *) fftw_malloc(_nKickGrid * sizeof(fftw_complex));
+  _kickPlan = fftw_plan_dft_1d(_nKickGrid, _kickIn, _kickOut,
+                               FFTW_BACKWARD, FFTW_ESTIMATE);
 }
 
 
@@ -75,6 +87,10 @@ LImpedance::~LImpedance()
   fftw_free(_in);
   fftw_free(_out);
   fftw_destroy_plan(_plan);
+  delete[] _kickGrid;
+  fftw_free(_kickIn);
+  fftw_free(_kickOut);
+  fftw_destroy_plan(_kickPlan);
 }
 
 
@@ -84,6 +100,18 @@ void LImpedance::assignImpedanceValue(int n, double real, double imag)
 }
 
 
+void LImpedance::setUseExactKick(int useExactKick)
+{
+  _useExactKick = useExactKick;
+}
+
+
+int LImpedance::getUseExactKick()
+{
+  return _useExactKick;
+}
+
+
 void LImpedance::trackBunch(Bunch* bunch)
 {
   int nPartsGlobal = bunch->getSizeGlobal();
@@ -146,6 +174,8 @@ void LImpedance::trackBunch(Bunch* bunch)
 
   double kick, angle, position;
 
+  if(_useExactKick == 0) _prepareKickGrid();
+
 // Convert particle longitudinal coordinate to phi
 
   double philocal;
@@ -163,7 +193,15 @@ void LImpedance::trackBunch(Bunch* bunch)
   if(philocal < -OrbitConst::PI) philocal += 2 * OrbitConst::PI;
   if(philocal >  OrbitConst::PI) philocal -= 2 * OrbitConst::PI;
 
-  double dE = _kick(philocal) * (-1e-9) *
+  if(_useExactKick == 0)
+  {
+    kick = _kickFromGrid(philocal);
+  }
+  else
+  {
+    kick = _kick(philocal);
+  }
+  double dE = kick * (-1e-9) *
               bunch->getCharge() * charge2current;
   coords[j][5] += dE;
   }
@@ -203,3 +241,80 @@ double LImpedance::_kick(double angle)
   }
   return kick;
 }
+
+
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//    LImpedance::_prepareKickGrid
+//
+// DESCRIPTION
+//    Builds the kick waveform of _kick(angle) on the uniform grid
+//    of _nKickGrid points over one period by the backward FFT of
+//    the impedance weighted harmonics 2 * F(n) * n * Z(n).
+//    The spectrum is zero padded, so the grid is oversampled
+//    relative to the bins.
+//
+// PARAMETERS
+//    None
+//
+// RETURNS
+//    Nothing
+//
+///////////////////////////////////////////////////////////////////////////
+
+void LImpedance::_prepareKickGrid()
+{
+  double amp, phase;
+
+  for(int i = 0; i < _nKickGrid; i++)
+  {
+    _kickIn[i][0] = 0.;
+    _kickIn[i][1] = 0.;
+  }
+
+  for(int n = 1; n < _nBins / 2; n++)
+  {
+    amp   = 2 * _fftmagnitude[n] * _z[n];
+    phase = _fftphase[n] + _chi[n];
+    _kickIn[n][0] = amp * cos(phase);
+    _kickIn[n][1] = amp * sin(phase);
+  }
+
+  fftw_execute(_kickPlan);
+
+  for(int i = 0; i < _nKickGrid; i++)
+  {
+    _kickGrid[i] = _kickOut[i][0];
+  }
+  _kickGrid[_nKickGrid] = _kickGrid[0];
+}
+
+
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//    LImpedance::_kickFromGrid
+//
+// DESCRIPTION
+//    Returns the longitudinal impedance kick to a macroparticle
+//    linearly interpolated from the waveform grid. The grid point
+//    i corresponds to angle = -PI + 2 * PI * i / _nKickGrid.
+//
+// PARAMETERS
+//    angle - the phase angle of the particle (rad)
+//
+// RETURNS
+//    kick
+//
+///////////////////////////////////////////////////////////////////////////
+
+double LImpedance::_kickFromGrid(double angle)
+{
+  double x = (angle + OrbitConst::PI) / (2 * OrbitConst::PI);
+  x = (x - floor(x)) * _nKickGrid;
+  int ind = (int) x;
+  if(ind >= _nKickGrid) ind = _nKickGrid - 1;
+  double frac = x - ind;
+  return _kickGrid[ind] + frac * (_kickGrid[ind + 1] - _kickGrid[ind]);
+}
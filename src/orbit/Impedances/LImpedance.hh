@@ -42,14 +42,29 @@ public:
       machine impedance for index n**/
   void assignImpedanceValue(int n, double real, double imag);
 
+  /** Sets the flag to use the exact sum over the harmonics for each
+      particle (1) instead of the interpolation from the waveform grid (0) **/
+  void setUseExactKick(int useExactKick);
+
+  /** Returns the flag to use the exact sum over the harmonics **/
+  int getUseExactKick();
+
   /** Routine for calculating the kick to the particle **/
   double _kick(double angle);
 
+  /** Builds the kick waveform on the grid by the inverse FFT
+      of the impedance weighted spectrum **/
+  void _prepareKickGrid();
+
+  /** Returns the kick interpolated from the waveform grid **/
+  double _kickFromGrid(double angle);
+
 
 //private:
   double _length;
   int _nMacrosMin;
   int _nBins;
+  int _useExactKick;
 
 //protected:
   Grid1D* zGrid;
@@ -66,6 +81,13 @@ public:
   fftw_plan _plan;
   fftw_complex* _in;
   fftw_complex* _out;
+
+  //kick waveform grid (oversampled by zero padding)
+  int _nKickGrid;
+  double* _kickGrid;
+  fftw_plan _kickPlan;
+  fftw_complex* _kickIn;
+  fftw_complex* _kickOut;
 };
 //end of LIMPEDANCE_H
 #endif
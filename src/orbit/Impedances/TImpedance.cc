@@ -37,6 +37,7 @@ TImpedance::TImpedance(double length,
   _nBins        = nBins;
   _useX         = useX;
   _useY         = useY;
+  _useExactKick = 0;
   zGrid         = new Grid1D(_nBins, _length);
 
   _qX = 0.0;
@@ -93,6 +94,19 @@ TImpedance::TImpedance(double length,
   _in   = (fftw_complex *) fftw_malloc(_nBins * sizeof(fftw_complex));
   _out  = (fftw_complex *) fftw_malloc(_nBins * sizeof(fftw_complex));
   _plan = fftw_plan_dft_1d(_nBins, _in,  _out, FFTW_FORWARD, FFTW_ESTIMATE);
+
+  _nKickGrid     = 4 * _nBins;
+  _kickGridPlus  = new std::complex<double>[_nKickGrid + 1];
+  _kickGridMinus = new std::complex<double>[_nKickGrid + 1];
+  for(int i = 0; i <= _nKickGrid; i++)
+  {
+    _kickGridPlus[i]  = std::complex<double>(0.0, 0.0);
+    _kickGridMinus[i] = std::complex<double>(0.0, 0.0);
+  }
+  _kickIn   = (fftw_complex *) fftw_malloc(_nKickGrid * sizeof(fftw_complex));
+  _kickOut  = (fftw_complex *) fftw_malloc(_nKickGrid * sizeof(fftw_complex));
+  _kickPlan = fftw_plan_dft_1d(_nKickGrid, _kickIn, _kickOut,
+                               FFTW_BACKWARD, FFTW_ESTIMATE);
 }
 
 TImpedance::~TImpedance()
@@ -127,6 +141,12 @@ TImpedance::~TImpedance()
   fftw_free(_in);
   fftw_free(_out);
   fftw_destroy_plan(_plan);
+
+  delete[] _kickGridPlus;
+  delete[] _kickGridMinus;
+  fftw_free(_kickIn);
+  fftw_free(_kickOut);
+  fftw_destroy_plan(_kickPlan);
 }
 
 ///////////////////////////////////////////////////////////////////////////
@@ -223,6 +243,49 @@ void TImpedance::assignImpedanceY(int n,
   _zYImped_nminus[n] = std::complex<double>(realm, imagm);
 }
 
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//   TImpedance::setUseExactKick
+//
+// DESCRIPTION
+//   Sets the flag to use the exact sum over the harmonics for each
+//   particle instead of the interpolation from the waveform grids
+//
+// PARAMETERS
+//   useExactKick - 1 for the exact sum, 0 for the waveform grids
+//
+// RETURNS
+//   Nothing
+//
+///////////////////////////////////////////////////////////////////////////
+
+void TImpedance::setUseExactKick(int useExactKick)
+{
+  _useExactKick = useExactKick;
+}
+
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//   TImpedance::getUseExactKick
+//
+// DESCRIPTION
+//   Returns the flag to use the exact sum over the harmonics
+//
+// PARAMETERS
+//   None
+//
+// RETURNS
+//   useExactKick
+//
+///////////////////////////////////////////////////////////////////////////
+
+int TImpedance::getUseExactKick()
+{
+  return _useExactKick;
+}
+
 ///////////////////////////////////////////////////////////////////////////
 //
 // NAME
@@ -304,7 +367,14 @@ void TImpedance::trackBunch(Bunch* bunch)
     for(i = 0; i < bunch->getSize(); i++)
     {
       macrophase = twopi * (part_coord_arr[i][4] - zmin) / _length;
-      part_coord_arr[i][1] += _kick(macrophase);
+      if(_useExactKick == 0)
+      {
+        part_coord_arr[i][1] += _kickFromGrid(macrophase);
+      }
+      else
+      {
+        part_coord_arr[i][1] += _kick(macrophase);
+      }
     }
   }
   // end X dimension
@@ -329,7 +399,14 @@ void TImpedance::trackBunch(Bunch* bunch)
     for(i = 0; i < bunch->getSize(); i++)
     {
       macrophase = twopi * (part_coord_arr[i][4] - zmin) / _length;
-      part_coord_arr[i][3] += _kick(macrophase);
+      if(_useExactKick == 0)
+      {
+        part_coord_arr[i][3] += _kickFromGrid(macrophase);
+      }
+      else
+      {
+        part_coord_arr[i][3] += _kick(macrophase);
+      }
     }
   }
   // end Y dimension
@@ -408,6 +485,8 @@ void TImpedance::_prepareToKick()
     _FFTResult2[n] = std::complex<double>(_out[n][0], _out[n][1])
                      / double(_nBins);
   }
+
+  if(_useExactKick == 0) _prepareKickGrid();
 }
 
 ///////////////////////////////////////////////////////////////////////////
@@ -475,3 +554,123 @@ double TImpedance::_kick(double macrophase)
   // the - sign above gives instability for positive real Zminus
 }
 
+
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//   TImpedance::_prepareKickGrid()
+//
+// DESCRIPTION
+//   Builds the waveforms
+//     Plus(phi)  = sum_n (F1(n) - i*F2(n)) * Zplus(n)  * exp(i*n*phi)
+//     Minus(phi) = sum_n (F1(n) + i*F2(n)) * Zminus(n) * exp(i*n*phi)
+//   on the uniform grid of _nKickGrid points over one period by
+//   backward FFTs. The upper half modes have negative mode numbers
+//   as in _kick(macrophase). The spectra are zero padded, so the
+//   grids are oversampled relative to the bins.
+//
+// PARAMETERS
+//   None
+//
+// RETURNS
+//   Nothing
+//
+///////////////////////////////////////////////////////////////////////////
+
+void TImpedance::_prepareKickGrid()
+{
+  int n, i, ind;
+  std::complex<double> sqrtm1 = std::complex<double>(0, 1);
+  std::complex<double> harm;
+
+  // the grid for the +q term
+
+  for(i = 0; i < _nKickGrid; i++)
+  {
+    _kickIn[i][0] = 0.;
+    _kickIn[i][1] = 0.;
+  }
+  for(n = 0; n < _nBins; n++)
+  {
+    ind = n;
+    if(n >= _nBins / 2) ind = n - _nBins + _nKickGrid;
+    harm = (_FFTResult1[n] - sqrtm1 * _FFTResult2[n]) * _zImped_nplus[n];
+    _kickIn[ind][0] = std::real(harm);
+    _kickIn[ind][1] = std::imag(harm);
+  }
+  fftw_execute(_kickPlan);
+  for(i = 0; i < _nKickGrid; i++)
+  {
+    _kickGridPlus[i] = std::complex<double>(_kickOut[i][0], _kickOut[i][1]);
+  }
+  _kickGridPlus[_nKickGrid] = _kickGridPlus[0];
+
+  // the grid for the -q term
+
+  for(i = 0; i < _nKickGrid; i++)
+  {
+    _kickIn[i][0] = 0.;
+    _kickIn[i][1] = 0.;
+  }
+  for(n = 0; n < _nBins; n++)
+  {
+    ind = n;
+    if(n >= _nBins / 2) ind = n - _nBins + _nKickGrid;
+    harm = (_FFTResult1[n] + sqrtm1 * _FFTResult2[n]) * _zImped_nminus[n];
+    _kickIn[ind][0] = std::real(harm);
+    _kickIn[ind][1] = std::imag(harm);
+  }
+  fftw_execute(_kickPlan);
+  for(i = 0; i < _nKickGrid; i++)
+  {
+    _kickGridMinus[i] = std::complex<double>(_kickOut[i][0], _kickOut[i][1]);
+  }
+  _kickGridMinus[_nKickGrid] = _kickGridMinus[0];
+}
+
+///////////////////////////////////////////////////////////////////////////
+//
+// NAME
+//   TImpedance::_kickFromGrid(macrophase)
+//
+// DESCRIPTION
+//   Returns the transverse kick to a macroparticle. The mode sums
+//   are interpolated from the waveform grids, and the betatron
+//   factors exp(+-i*(q*macrophase + delta)) are applied directly.
+//   The result is the same as _kick(macrophase) up to the
+//   interpolation error.
+//
+// PARAMETERS
+//   macrophase - the phase macrophase of the particle (rad)
+//
+// RETURNS
+//   Transverse kick
+//
+///////////////////////////////////////////////////////////////////////////
+
+double TImpedance::_kickFromGrid(double macrophase)
+{
+  double twopi = 2.0 * OrbitConst::PI;
+
+  double x = macrophase / twopi;
+  x = (x - floor(x)) * _nKickGrid;
+  int ind = (int) x;
+  if(ind >= _nKickGrid) ind = _nKickGrid - 1;
+  double frac = x - ind;
+
+  std::complex<double> sumPlus = _kickGridPlus[ind] +
+    frac * (_kickGridPlus[ind + 1] - _kickGridPlus[ind]);
+  std::complex<double> sumMinus = _kickGridMinus[ind] +
+    frac * (_kickGridMinus[ind + 1] - _kickGridMinus[ind]);
+
+  // delta is betatron phase advance from all previous turns
+
+  double phase = _q * macrophase + _Turns * twopi * _q;
+  double cosPh = cos(phase);
+  double sinPh = sin(phase);
+
+  double coeff = -(std::imag(sumPlus)  * cosPh + std::real(sumPlus)  * sinPh +
+                   std::imag(sumMinus) * cosPh - std::real(sumMinus) * sinPh);
+
+  return (-_charge2TKick * coeff / 2.);
+}
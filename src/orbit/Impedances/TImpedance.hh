@@ -65,14 +65,29 @@ public:
   /** Does FFTs in preparation for kick **/
   void _prepareToKick();
 
+  /** Sets the flag to use the exact sum over the harmonics for each
+      particle (1) instead of the interpolation from the waveform grids (0) **/
+  void setUseExactKick(int useExactKick);
+
+  /** Returns the flag to use the exact sum over the harmonics **/
+  int getUseExactKick();
+
   /** Routine for calculating the transverse kick to the particle **/
   double _kick(double macrophase);
 
+  /** Builds the kick waveforms on the grid by the inverse FFTs
+      of the impedance weighted spectra **/
+  void _prepareKickGrid();
+
+  /** Returns the transverse kick interpolated from the waveform grids **/
+  double _kickFromGrid(double macrophase);
+
   double _length;
   int _nMacrosMin;
   int _nBins;
   int _useX;
   int _useY;
+  int _useExactKick;
 
   double _qX;
   double _alphaX;
@@ -108,6 +123,14 @@ public:
   fftw_complex* _in;
   fftw_complex* _out;
   fftw_plan _plan;
+
+  //kick waveform grids (oversampled by zero padding)
+  int _nKickGrid;
+  std::complex<double>* _kickGridPlus;
+  std::complex<double>* _kickGridMinus;
+  fftw_complex* _kickIn;
+  fftw_complex* _kickOut;
+  fftw_plan _kickPlan;
 };
 //end of TIMPEDANCE_H
 #endif
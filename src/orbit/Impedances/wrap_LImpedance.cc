@@ -134,6 +134,42 @@ extern "C"
     return Py_None;  
   }
 
+  //-----------------------------------------------------
+  // setUseExactKick(int).
+  // Sets the flag to use the exact sum over the harmonics
+  //-----------------------------------------------------
+
+  static PyObject* LImpedance_setUseExactKick(PyObject *self,
+                                              PyObject *args)
+  {
+    pyORBIT_Object* pyLImpedance = (pyORBIT_Object*) self;
+    LImpedance* cpp_LImpedance = (LImpedance*) pyLImpedance->cpp_obj;
+
+    int useExactKick = 0;
+
+    if(!PyArg_ParseTuple(args, "i:arguments", &useExactKick))
+    {
+      ORBIT_MPI_Finalize("PyLImpedance - setUseExactKick(0 or 1) - method needs a parameter.");
+    }
+    cpp_LImpedance->setUseExactKick(useExactKick);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+  }
+
+  //-----------------------------------------------------
+  // getUseExactKick().
+  // Returns the flag to use the exact sum over the harmonics
+  //-----------------------------------------------------
+
+  static PyObject* LImpedance_getUseExactKick(PyObject *self,
+                                              PyObject *args)
+  {
+    pyORBIT_Object* pyLImpedance = (pyORBIT_Object*) self;
+    LImpedance* cpp_LImpedance = (LImpedance*) pyLImpedance->cpp_obj;
+    return Py_BuildValue("i", cpp_LImpedance->getUseExactKick());
+  }
+
   //-----------------------------------------------------
   //  trackBunchBunch(Bunch* bunch)
   //-----------------------------------------------------
@@ -187,6 +223,10 @@ extern "C"
      "assigns overall impedance - assignImpedance(Z))"},
     {"assignImpedanceValue",  LImpedance_assignImpedanceValue, METH_VARARGS,
      "assigns impedance for the nth mode - assignImpedanceValue(n, real, imag)"},
+    {"setUseExactKick",  LImpedance_setUseExactKick, METH_VARARGS,
+     "sets the flag to use the exact sum over harmonics (1) instead of the waveform grid (0) - setUseExactKick(0 or 1)"},
+    {"getUseExactKick",  LImpedance_getUseExactKick, METH_VARARGS,
+     "returns the flag to use the exact sum over harmonics - getUseExactKick()"},
     {"trackBunch", LImpedance_trackBunch, METH_VARARGS,
      "trackBunch tracks the bunch - trackBunch(pyBunch)"},
     {NULL}
@@ -258,6 +258,42 @@ extern "C"
     return Py_None;  
   }
 
+  //-----------------------------------------------------
+  // setUseExactKick(int).
+  // Sets the flag to use the exact sum over the harmonics
+  //-----------------------------------------------------
+
+  static PyObject* TImpedance_setUseExactKick(PyObject *self,
+                                              PyObject *args)
+  {
+    pyORBIT_Object* pyTImpedance = (pyORBIT_Object*) self;
+    TImpedance* cpp_TImpedance = (TImpedance*) pyTImpedance->cpp_obj;
+
+    int useExactKick = 0;
+
+    if(!PyArg_ParseTuple(args, "i:arguments", &useExactKick))
+    {
+      ORBIT_MPI_Finalize("PyTImpedance - setUseExactKick(0 or 1) - method needs a parameter.");
+    }
+    cpp_TImpedance->setUseExactKick(useExactKick);
+
+    Py_INCREF(Py_None);
+    return Py_None;
+  }
+
+  //-----------------------------------------------------
+  // getUseExactKick().
+  // Returns the flag to use the exact sum over the harmonics
+  //-----------------------------------------------------
+
+  static PyObject* TImpedance_getUseExactKick(PyObject *self,
+                                              PyObject *args)
+  {
+    pyORBIT_Object* pyTImpedance = (pyORBIT_Object*) self;
+    TImpedance* cpp_TImpedance = (TImpedance*) pyTImpedance->cpp_obj;
+    return Py_BuildValue("i", cpp_TImpedance->getUseExactKick());
+  }
+
   //-----------------------------------------------------
   //  trackBunchBunch(Bunch* bunch)
   //-----------------------------------------------------
@@ -315,6 +351,10 @@ extern "C"
      "assigns horizontal impedance for the nth mode - assignImpedanceX(n, realp, imagp, realm, imagm)"},
     {"assignImpedanceY",  TImpedance_assignImpedanceY, METH_VARARGS,
      "assigns vertical impedance for the nth mode - assignImpedanceY(n, realp, imagp, realm, imagm)"},
+    {"setUseExactKick",  TImpedance_setUseExactKick, METH_VARARGS,
+     "sets the flag to use the exact sum over harmonics (1) instead of the waveform grids (0) - setUseExactKick(0 or 1)"},
+    {"getUseExactKick",  TImpedance_getUseExactKick, METH_VARARGS,
+     "returns the flag to use the exact sum over harmonics - getUseExactKick()"},
     {"trackBunch", TImpedance_trackBunch, METH_VARARGS,
      "trackBunch tracks the bunch - trackBunch(pyBunch)"},
     {NULL}
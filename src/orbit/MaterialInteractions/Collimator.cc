@@ -91,6 +91,7 @@ void Collimator::collimateBunch(Bunch* bunch, Bunch* lostbunch){
 	double m_size = 0.;
 	int nParts = bunch->getSize();
 	double** part_coord_arr = bunch->coordArr();
+	lostPositions.clear();
 	
 	for(int ip = 0; ip < nParts; ip++){
 		
@@ -220,9 +221,18 @@ void Collimator::collimateBunch(Bunch* bunch, Bunch* lostbunch){
 		}
 	}
 	
-	//Update synchronous particle, compress bunch
-	
-	bunch->compress();
+	//Move lost particles to the lost bunch, update synchronous particle, compress bunch
+	int nLostStart = 0;
+	if(lostbunch != NULL) nLostStart = lostbunch->getSize();
+	bunch->moveDeadParticlesTo(lostbunch);
+	if(lostbunch != NULL && lostbunch->hasParticleAttributes("LostParticleAttributes") > 0) {
+		ParticleAttributes* lostPartAttr = lostbunch->getParticleAttributes("LostParticleAttributes");
+		for(int ind = 0, n = lostPositions.size(); ind < n; ind++){
+			//absolute position in lattice where particle is lost
+			lostPartAttr->attValue(nLostStart + ind, 0) = lostPositions[ind];
+		}
+	}
+	lostPositions.clear();
 	double newtime = syncPart->getTime() + length/( syncPart->getBeta()*OrbitConst::c );
 	syncPart->setTime(newtime);
 }
@@ -740,7 +750,8 @@ void Collimator::takeStep(Bunch* bunch, Bunch* lostbunch, double* coords, SyncPa
 //   Collimator::loseParticle
 //
 // DESCRIPTION
-//   Lose the particle from the alive bunch and add it to the lost bunch
+//   Lose the particle from the alive bunch. It will be moved to the lost 
+//   bunch with all other lost particles at the end of collimateBunch(...)
 //
 // PARAMETERS
 //	 coords: particle coordinates
@@ -756,14 +767,8 @@ void Collimator::takeStep(Bunch* bunch, Bunch* lostbunch, double* coords, SyncPa
 ///////////////////////////////////////////////////////////////////////////
 	
 void Collimator::loseParticle(Bunch* bunch, Bunch* lostbunch, int ip, int& nLost, int& coll_flag, double& zrl){
-	double** coords = bunch->coordArr();
-	lostbunch->addParticle(coords[ip][0], coords[ip][1], coords[ip][2], coords[ip][3], coords[ip][4], coords[ip][5]);
-	if (lostbunch->hasParticleAttributes("LostParticleAttributes") > 0) {
-		lostbunch->getParticleAttributes("LostParticleAttributes")->attValue(lostbunch->getSize() - 1, 0) = pos_ + (length_ - zrl); //absolute position in lattice where particle is lost
-	}
-	if (lostbunch->hasParticleAttributes("ParticleIdNumber") > 0) {
-		lostbunch->getParticleAttributes("ParticleIdNumber")->attValue(lostbunch->getSize() - 1, 0) = bunch->getParticleAttributes("ParticleIdNumber")->attValue(ip,0);
-	}
+	//absolute position in lattice where particle is lost
+	lostPositions.push_back(pos_ + (length_ - zrl));
 	bunch->deleteParticleFast(ip);
 	nLost++;
 	coll_flag = 0;
@@ -54,7 +54,8 @@ private:
 	/** take a step inside the collimator with MCS and ionization energy loss */
 	void takeStep(Bunch* bunch, Bunch* lostbunch, double* coords, SyncPart* syncpart, double z, double a, double density, long& idum, double stepsize, double& zrl, double& rl, int& coll_flag, int ip);
 	
-	/** delete the particle from the main bunch and add it to the lost particles bunch. */
+	/** mark the particle as dead in the main bunch and remember the position where it is lost. 
+	    The dead particles are moved to the lost particles bunch at the end of collimateBunch(...) */
 	void loseParticle(Bunch* bunch, Bunch* lostbunch, int ip, int& nLost, int& coll_flag, double& zrl);
 
 protected:
@@ -62,6 +63,9 @@ protected:
 	//Counters	
 	int nHits;
 	int nLost;
+	
+	//The positions where particles are lost during one collimateBunch(...) call
+	std::vector<double> lostPositions;
 
 	//Collimator parameters
 	double length_, density_fac_, a_, b_, c_, d_, angle_, pos_;
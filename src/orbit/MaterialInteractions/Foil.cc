@@ -305,8 +305,8 @@ void Foil::traverseFoilFullScatter(Bunch* bunch, Bunch* lostbunch){
 		}
 	}
 	
-	//Update synchronous particle, compress bunch
-	bunch->compress();
+	//Move lost particles to the lost bunch, update synchronous particle, compress bunch
+	bunch->moveDeadParticlesTo(lostbunch);
 	double newtime = syncPart->getTime() + length/( syncPart->getBeta()*OrbitConst::c );
 	syncPart->setTime(newtime);
 }
@@ -560,7 +560,8 @@ void Foil::takeStep(Bunch* bunch, Bunch* lostbunch, double* coords, SyncPart* sy
 //   Foil::loseParticle
 //
 // DESCRIPTION
-//   Lose the particle from the alive bunch and add it to the lost bunch
+//   Lose the particle from the alive bunch. It will be moved to the lost 
+//   bunch with all other lost particles at the end of traverseFoilFullScatter(...)
 //
 // PARAMETERS
 //	 coords: particle coordinates
@@ -577,8 +578,6 @@ void Foil::takeStep(Bunch* bunch, Bunch* lostbunch, double* coords, SyncPart* sy
 	
 void Foil::loseParticle(Bunch* bunch, Bunch* lostbunch, int ip, int& nLost, int& foil_flag, double& zrl){
 
-	double** coords = bunch->coordArr();
-	lostbunch->addParticle(coords[ip][0], coords[ip][1], coords[ip][2], coords[ip][3], coords[ip][4], coords[ip][5]);
 	bunch->deleteParticleFast(ip);
 	nLost++;
 	foil_flag = 0;
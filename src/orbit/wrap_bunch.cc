@@ -177,6 +177,27 @@ namespace wrap_orbit_bunch{
     return Py_None;
   }
 
+  //removes the dead macro-particles (marked by deleteParticleFast) from the Bunch
+  //and appends them to the target bunch (if it is specified) with the particles' attributes
+  //this is implementation of the moveDeadParticlesTo([target_bunch]) method
+  static PyObject* Bunch_moveDeadParticlesTo(PyObject *self, PyObject *args){
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) self)->cpp_obj;
+		PyObject* pyBunchTarget = NULL;
+    //NO NEW OBJECT CREATED BY PyArg_ParseTuple! NO NEED OF Py_DECREF()
+    if(!PyArg_ParseTuple(	args,"|O:moveDeadParticlesTo",&pyBunchTarget)){
+      error("PyBunch - moveDeadParticlesTo([target_bunch]) - the parameter should be a bunch");
+    }
+		Bunch* cpp_bunch_target = NULL;
+		if(pyBunchTarget != NULL && pyBunchTarget != Py_None){
+			PyObject* pyORBIT_Bunch_Type = getBunchType("Bunch");
+			if(!PyObject_IsInstance(pyBunchTarget,pyORBIT_Bunch_Type)){
+				error("PyBunch - moveDeadParticlesTo([target_bunch]) - the parameter is not a bunch");
+			}
+			cpp_bunch_target = (Bunch*) ((pyORBIT_Object *) pyBunchTarget)->cpp_obj;
+		}
+    return Py_BuildValue("i",cpp_bunch->moveDeadParticlesTo(cpp_bunch_target));
+  }
+
   //---------------------------------------------------------------
   //
   // related to the macro-particles' coordinates
@@ -1057,6 +1078,74 @@ namespace wrap_orbit_bunch{
     return Py_BuildValue("i",cpp_bunch->getSizeGlobalFromMemory());
   }
 
+  //returns the relative load imbalance (n_max - n_avg)/n_avg over all CPUs
+  //this is implementation of the "getLoadImbalance()" method
+  static PyObject* Bunch_getLoadImbalance(PyObject *self, PyObject *args){
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) self)->cpp_obj;	
+    return Py_BuildValue("d",cpp_bunch->getLoadImbalance());
+  }
+
+  //moves macro-particles between CPUs if the load imbalance is above the threshold
+  //returns the number of moved macro-particles
+  //this is implementation of the "balanceLoad([imbalance_threshold])" method
+  static PyObject* Bunch_balanceLoad(PyObject *self, PyObject *args){
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) self)->cpp_obj;	
+    double imbalance_threshold = 0.;
+		//NO NEW OBJECT CREATED BY PyArg_ParseTuple! //NO NEED OF Py_DECREF()
+		if(!PyArg_ParseTuple(	args,"|d:balanceLoad",&imbalance_threshold)){
+			error("PyBunch - balanceLoad([imbalance_threshold]) - the threshold should be a number");
+		}
+    return Py_BuildValue("i",cpp_bunch->balanceLoad(imbalance_threshold));
+  }
+
+  //sends the local part of the bunch to the CPU as one MPI message
+  //this is implementation of the "sendBunchMPI(rank_dest,tag[,mpi_comm])" method
+  static PyObject* Bunch_sendBunchMPI(PyObject *self, PyObject *args){
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) self)->cpp_obj;
+		int rank_dest = 0;
+		int tag = 0;
+		PyObject* pyMPIComm = NULL;
+		//NO NEW OBJECT CREATED BY PyArg_ParseTuple! //NO NEED OF Py_DECREF()
+		if(!PyArg_ParseTuple(	args,"ii|O:sendBunchMPI",&rank_dest,&tag,&pyMPIComm)){
+			error("PyBunch - sendBunchMPI(rank_dest,tag[,mpi_comm]) - cannot parse arguments!");
+		}
+		pyORBIT_MPI_Comm* pyComm = cpp_bunch->getMPI_Comm_Local();
+		if(pyMPIComm != NULL){
+			PyObject* py_mpi_comm_type = wrap_orbit_mpi_comm::getMPI_CommType("MPI_Comm");
+			if((!PyObject_IsInstance(pyMPIComm,py_mpi_comm_type))){
+				error("PyBunch - sendBunchMPI(rank_dest,tag[,mpi_comm]) - the last parameter is not MPI_Comm");
+			}
+			pyComm = (pyORBIT_MPI_Comm*) pyMPIComm;
+		}
+		cpp_bunch->sendBunchMPI(rank_dest,tag,pyComm);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
+  //replaces the particles of the bunch by the ones sent by sendBunchMPI
+  //this is implementation of the "recvBunchMPI(rank_source,tag[,mpi_comm])" method
+  static PyObject* Bunch_recvBunchMPI(PyObject *self, PyObject *args){
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object *) self)->cpp_obj;
+		int rank_source = 0;
+		int tag = 0;
+		PyObject* pyMPIComm = NULL;
+		//NO NEW OBJECT CREATED BY PyArg_ParseTuple! //NO NEED OF Py_DECREF()
+		if(!PyArg_ParseTuple(	args,"ii|O:recvBunchMPI",&rank_source,&tag,&pyMPIComm)){
+			error("PyBunch - recvBunchMPI(rank_source,tag[,mpi_comm]) - cannot parse arguments!");
+		}
+		pyORBIT_MPI_Comm* pyComm = cpp_bunch->getMPI_Comm_Local();
+		if(pyMPIComm != NULL){
+			PyObject* py_mpi_comm_type = wrap_orbit_mpi_comm::getMPI_CommType("MPI_Comm");
+			if((!PyObject_IsInstance(pyMPIComm,py_mpi_comm_type))){
+				error("PyBunch - recvBunchMPI(rank_source,tag[,mpi_comm]) - the last parameter is not MPI_Comm");
+			}
+			pyComm = (pyORBIT_MPI_Comm*) pyMPIComm;
+		}
+		cpp_bunch->recvBunchMPI(rank_source,tag,pyComm);
+		Py_INCREF(Py_None);
+		return Py_None;
+  }
+
   //returns the number of all macro-particles - alive, dead, new
   //this is implementation of the "getTotalCount()" method
   static PyObject* Bunch_getTotalCount(PyObject *self, PyObject *args){
@@ -1204,6 +1293,7 @@ namespace wrap_orbit_bunch{
     { "deleteParticleFast",             Bunch_deleteParticleFast            ,METH_VARARGS,"Removes macro-particle from the bunch very fast"},
     { "deleteAllParticles",             Bunch_deleteAllParticles            ,METH_VARARGS,"Removes all macro-particles from the bunch"},
     { "compress",                       Bunch_compress                      ,METH_VARARGS,"Compress the bunch"},
+    { "moveDeadParticlesTo",            Bunch_moveDeadParticlesTo           ,METH_VARARGS,"Removes dead macro-particles and appends them to the target bunch. Usage: moveDeadParticlesTo([target_bunch])"},
     { "x",                              Bunch_x                             ,METH_VARARGS,"Set x(index,value) or get x(index) coordinate"},
     { "y",                              Bunch_y                             ,METH_VARARGS,"Set y(index,value) or get y(index) coordinate"},
     { "z",                              Bunch_z                             ,METH_VARARGS,"Set z(index,value) or get z(index) coordinate"},
@@ -1243,6 +1333,10 @@ namespace wrap_orbit_bunch{
     { "getSize",                        Bunch_getSize                       ,METH_VARARGS,"Returns number of macro-particles"},
     { "getSizeGlobal",                  Bunch_getSizeGlobal                 ,METH_VARARGS,"Returns number of macro-particles in all CPUs"},
     { "getSizeGlobalFromMemory",        Bunch_getSizeGlobalFromMemory       ,METH_VARARGS,"Returns number of macro-particles in all CPUs from memory"},
+    { "getLoadImbalance",               Bunch_getLoadImbalance              ,METH_VARARGS,"Returns the relative load imbalance (n_max - n_avg)/n_avg over all CPUs"},
+    { "balanceLoad",                    Bunch_balanceLoad                   ,METH_VARARGS,"Moves macro-particles between CPUs if imbalance > threshold. Usage: balanceLoad([imbalance_threshold])"},
+    { "sendBunchMPI",                   Bunch_sendBunchMPI                  ,METH_VARARGS,"Sends the local part of the bunch as one message. Usage: sendBunchMPI(rank_dest,tag[,mpi_comm])"},
+    { "recvBunchMPI",                   Bunch_recvBunchMPI                  ,METH_VARARGS,"Replaces the particles by the ones sent by sendBunchMPI. Usage: recvBunchMPI(rank_source,tag[,mpi_comm])"},
     { "getTotalCount",                  Bunch_getTotalCount                 ,METH_VARARGS,"Returns number of all particles - alive,dead,new"},
     { "getCapacity",                    Bunch_getCapacity                   ,METH_VARARGS,"Returns the capacity of the bunch-contaiter"},
     { "dumpBunch",                      Bunch_dumpBunch                     ,METH_VARARGS,"Prints the bunch info into a standart output stream or file"},
@@ -5,6 +5,7 @@
 #include "BufferStore.hh"
 
 #include <iostream>
+#include <vector>
 
 using namespace OrbitUtils;
 
@@ -137,6 +138,43 @@ void Grid2D::binBunch(Bunch* bunch, int ind0, int ind1){
 	}
 }
 
+/** Sorts the macro-particles of the Bunch according to the grid cells of X and Y coordinates. */
+void Grid2D::sortBunch(Bunch* bunch){
+	this->sortBunch(bunch,0,2);
+}
+
+/** Sorts the macro-particles of the Bunch according to the grid cells 
+    defined by coordinate indexes ind0 and ind1. After sorting the binning
+    and interpolation access the grid sequentially. It is a counting sort
+    by the cell index, so the order inside the cell is preserved.
+  */	
+void Grid2D::sortBunch(Bunch* bunch, int ind0, int ind1){
+	bunch->compress();
+	int nParts = bunch->getSize();
+	if(nParts < 2) return;
+	double** part_coord_arr = bunch->coordArr();
+	int nCells = xSize_*ySize_;
+	std::vector<int> key_arr(nParts);
+	std::vector<int> count_arr(nCells+1,0);
+	int iX, iY;
+	double xFract, yFract;
+	for(int i = 0; i < nParts; i++){
+		getIndAndFracX(part_coord_arr[i][ind0],iX,xFract);
+		getIndAndFracY(part_coord_arr[i][ind1],iY,yFract);
+		key_arr[i] = iX*ySize_ + iY;
+		count_arr[key_arr[i]+1] += 1;
+	}
+	for(int ic = 0; ic < nCells; ic++){
+		count_arr[ic+1] += count_arr[ic];
+	}
+	std::vector<int> index_arr(nParts);
+	for(int i = 0; i < nParts; i++){
+		index_arr[count_arr[key_arr[i]]] = i;
+		count_arr[key_arr[i]] += 1;
+	}
+	bunch->reorderParticles(index_arr);
+}
+
 /** Bins the value into the 2D grid */	
 void Grid2D::binValue(double value, double x, double y){
 	if(x < xMin_ || x > xMax_ || y < yMin_ || y > yMax_) return;
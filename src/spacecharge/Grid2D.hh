@@ -65,6 +65,15 @@ public:
 	/** Bins the value into the 2D grid */	
 	void binValue(double value, double x, double y);	
 	
+	/** Sorts the macro-particles of the Bunch according to the grid cells of X and Y coordinates. */
+	void sortBunch(Bunch* bunch);
+	
+	/** Sorts the macro-particles of the Bunch according to the grid cells 
+	    defined by coordinate indexes ind0 and ind1. It makes the binning 
+	    and interpolation memory access sequential. 
+	*/
+	void sortBunch(Bunch* bunch, int ind0, int ind1);
+	
 	/** Does a bilinear binning scheme on the bunch using X and Y coordinates */
 	void binBunchBilinear(Bunch* bunch);
 	
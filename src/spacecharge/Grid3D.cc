@@ -14,6 +14,7 @@
 //
 ///////////////////////////////////////////////////////////////////////////
 #include <iostream>
+#include <vector>
 
 #include "ParticleMacroSize.hh"
 #include "BufferStore.hh"
@@ -303,6 +304,41 @@ void Grid3D::binBunch(Bunch* bunch,double lambda){
 }
 
 
+/** Sorts the macro-particles of the Bunch according to the grid cells. 
+    After sorting the binning and interpolation access the grid sequentially. 
+    It is a counting sort by the cell index, so the order inside the cell 
+    is preserved.
+*/
+void Grid3D::sortBunch(Bunch* bunch){
+	bunch->compress();
+	int nParts = bunch->getSize();
+	if(nParts < 2) return;
+	double** part_coord_arr = bunch->coordArr();
+	int nCells = nZ_*nX_*nY_;
+	std::vector<int> key_arr(nParts);
+	std::vector<int> count_arr(nCells+1,0);
+	int iX, iY, iZ;
+	double xFrac, yFrac, zFrac;
+	for(int i = 0; i < nParts; i++){
+		getGridIndAndFrac(part_coord_arr[i][0], iX, xFrac, 
+			part_coord_arr[i][2], iY, yFrac,
+			part_coord_arr[i][4], iZ, zFrac);
+		if(iZ < 0) iZ = 0;
+		if(iZ > nZ_ - 1) iZ = nZ_ - 1;
+		key_arr[i] = (iZ*nX_ + iX)*nY_ + iY;
+		count_arr[key_arr[i]+1] += 1;
+	}
+	for(int ic = 0; ic < nCells; ic++){
+		count_arr[ic+1] += count_arr[ic];
+	}
+	std::vector<int> index_arr(nParts);
+	for(int i = 0; i < nParts; i++){
+		index_arr[count_arr[key_arr[i]]] = i;
+		count_arr[key_arr[i]] += 1;
+	}
+	bunch->reorderParticles(index_arr);
+}
+
 /** Bins the Bunch into the 3D grid. If bunch has a macrosize particle attribute it will be used. */	
 void Grid3D::binBunch(Bunch* bunch){
 	longWrapping = 0;
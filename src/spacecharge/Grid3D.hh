@@ -142,6 +142,11 @@ public:
   /** Bins the value onto grid */
   void binValue(double macroSize, double x, double y, double z);
 	
+  /** Sorts the macro-particles of the Bunch according to the grid cells. 
+	    It makes the binning and interpolation memory access sequential. 
+	*/
+  void sortBunch(Bunch* bunch);
+	
   /** Calculates gradient of Arr3D. gradX = gradient_x(Arr3D), and so on */
   void calcGradient(double x,double& gradX,
 	      double y,double& gradY,
@@ -42,9 +42,23 @@ public:
         machine impedance for index n**/
 	void assignImpedanceValue(int n, double real, double imag);
 
+	/** Sets the flag to use the exact sum over the harmonics for each
+	    particle (1) instead of the interpolation from the waveform grid (0) **/
+	void setUseExactKick(int useExactKick_in);
+
+	/** Returns the flag to use the exact sum over the harmonics **/
+	int getUseExactKick();
+
 	/** Routine for calculating the kick to the particle **/
 	double _kick(double angle);
 
+	/** Builds the kick waveform on the grid by the inverse FFT
+	    of the impedance weighted spectrum **/
+	void _prepareKickGrid();
+
+	/** Returns the kick interpolated from the waveform grid **/
+	double _kickFromGrid(double angle);
+
 
 //private:
 	double b_a;
@@ -52,6 +66,7 @@ public:
 	int nBins;
 	int nMacrosMin;
 	int useSpaceCharge;
+	int useExactKick;
 
 //protected:
 	Grid1D* zGrid;
@@ -70,6 +85,13 @@ public:
 	fftw_complex* _in;
 	fftw_complex* _out;
 
+	//kick waveform grid (oversampled by zero padding)
+	int _nKickGrid;
+	double* _kickGrid;
+	fftw_plan _kickPlan;
+	fftw_complex* _kickIn;
+	fftw_complex* _kickOut;
+
 	//fftw_complex* _zImped_n;
 
 };
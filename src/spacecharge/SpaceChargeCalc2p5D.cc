@@ -30,6 +30,8 @@ SpaceChargeCalc2p5D::SpaceChargeCalc2p5D(int xSize, int ySize, int zSize, double
 	phiGrid = new Grid2D(xSize, ySize);
 	zGrid = new Grid1D(zSize);	
 	bunchExtremaCalc = new BunchExtremaCalculator();
+	sortPeriod = 0;
+	sortCount = 0;
 }
 
 SpaceChargeCalc2p5D::SpaceChargeCalc2p5D(int xSize, int ySize, int zSize): CppPyWrapper(NULL)
@@ -40,6 +42,8 @@ SpaceChargeCalc2p5D::SpaceChargeCalc2p5D(int xSize, int ySize, int zSize): CppPy
 	phiGrid = new Grid2D(xSize, ySize);
 	zGrid = new Grid1D(zSize);
 	bunchExtremaCalc = new BunchExtremaCalculator();		
+	sortPeriod = 0;
+	sortCount = 0;
 }
 
 SpaceChargeCalc2p5D::~SpaceChargeCalc2p5D(){
@@ -74,6 +78,15 @@ Grid1D* SpaceChargeCalc2p5D::getLongGrid(){
 	return zGrid;
 }
 
+void SpaceChargeCalc2p5D::setSortingPeriod(int sortPeriod_in){
+	sortPeriod = sortPeriod_in;
+	sortCount = 0;
+}
+
+int SpaceChargeCalc2p5D::getSortingPeriod(){
+	return sortPeriod;
+}
+
 void SpaceChargeCalc2p5D::trackBunch(Bunch* bunch, double length, BaseBoundary2D* boundary){
 
 	int nPartsGlobal = bunch->getSizeGlobal();
@@ -220,6 +233,12 @@ void SpaceChargeCalc2p5D::bunchAnalysis(Bunch* bunch, double& totalMacrosize, Ba
 	rhoGrid->setZero();
 	zGrid->setZero();
 	
+	//sort macro-particles according to the grid cells to make binning cache friendly
+	if(sortPeriod > 0){
+		if(sortCount % sortPeriod == 0) rhoGrid->sortBunch(bunch);
+		sortCount++;
+	}
+	
 	rhoGrid->binBunch(bunch);
 	zGrid->binBunch(bunch);
 	
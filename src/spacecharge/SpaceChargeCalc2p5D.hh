@@ -49,6 +49,12 @@ public:
 	/** Returns the 1D grid with a longitudinal density. **/
 	Grid1D* getLongGrid();	
 	
+	/** Sets the period (in trackBunch calls) of the bunch sorting according to the grid cells. 0 means no sorting. */
+	void setSortingPeriod(int sortPeriod_in);
+	
+	/** Returns the period (in trackBunch calls) of the bunch sorting according to the grid cells. */
+	int getSortingPeriod();
+	
 private:
 	/** Analyses the bunch and does bining. */
  void bunchAnalysis(Bunch* bunch, double& totalMacrosize, BaseBoundary2D* boundary); 
@@ -61,6 +67,11 @@ protected:
 	OrbitUtils::BunchExtremaCalculator* bunchExtremaCalc;
 	
 	double xy_ratio;
+	
+	//The period (in trackBunch calls) of sorting macro-particles according to 
+	//the grid cells. Sorting makes the grid memory access sequential. 0 - no sorting.
+	int sortPeriod;
+	int sortCount;
 };
 //end of SC_SPACECHARGE_CALC_2P5D_H
 #endif
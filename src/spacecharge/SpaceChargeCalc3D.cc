@@ -56,6 +56,10 @@ SpaceChargeCalc3D::SpaceChargeCalc3D(int xSize, int ySize, int zSize): CppPyWrap
 	// The frequency of the bunch arrivals in Hz. It defines by the RFQ frequency.
 	// The non-zero is setup by default to avoid division on zero
 	frequency_ = 402.5e+6;
+	
+	//no sorting of macro-particles by default
+	sortPeriod = 0;
+	sortCount = 0;
 }
 
 SpaceChargeCalc3D::~SpaceChargeCalc3D(){
@@ -236,6 +240,11 @@ void SpaceChargeCalc3D::bunchAnalysis(Bunch* bunch){
 	
 	//bin rho&z Bunch to the Grid
 	rhoGrid->setZero();
+	//sort macro-particles according to the grid cells to make binning cache friendly
+	if(sortPeriod > 0){
+		if(sortCount % sortPeriod == 0) rhoGrid->sortBunch(bunch);
+		sortCount++;
+	}
 	rhoGrid->binBunch(bunch);
 	rhoGrid->synchronizeMPI(bunch->getMPI_Comm_Local());
 	
@@ -311,6 +320,11 @@ void SpaceChargeCalc3D::wrappedBunchAnalysis(Bunch* bunch){
 	
 	//bin rho&z Bunch to the Grid
 	rhoGrid->setZero();
+	//sort macro-particles according to the grid cells to make binning cache friendly
+	if(sortPeriod > 0){
+		if(sortCount % sortPeriod == 0) rhoGrid->sortBunch(bunch);
+		sortCount++;
+	}
 	rhoGrid->binBunch(bunch,lambda);
 	rhoGrid->synchronizeMPI(bunch->getMPI_Comm_Local());
 	
@@ -342,4 +356,17 @@ double SpaceChargeCalc3D::getRatioLimit()
 	return ratio_limit;
 }
 
+/** Sets the period (in trackBunch calls) of the bunch sorting according to the grid cells. */
+void SpaceChargeCalc3D::setSortingPeriod(int sortPeriod_in)
+{
+	sortPeriod = sortPeriod_in;
+	sortCount = 0;
+}
+
+/** Returns the period (in trackBunch calls) of the bunch sorting according to the grid cells. */
+int SpaceChargeCalc3D::getSortingPeriod()
+{
+	return sortPeriod;
+}
+
 
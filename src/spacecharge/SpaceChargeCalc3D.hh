@@ -53,6 +53,12 @@ public:
 	/** Returns the ratio limit for the shape change and Green Function recalculations. */
 	double getRatioLimit();
 	
+	/** Sets the period (in trackBunch calls) of the bunch sorting according to the grid cells. 0 means no sorting. */
+	void setSortingPeriod(int sortPeriod_in);
+	
+	/** Returns the period (in trackBunch calls) of the bunch sorting according to the grid cells. */
+	int getSortingPeriod();
+	
 	/** Set number of bunches from both sides for space charge calculations */
 	void setNumberOfExternalBunches(int nBunches);
 
@@ -94,6 +100,11 @@ protected:
 	
 	//The frequency of the bunch arrivals in Hz. It defines by the RFQ frequency.
 	double frequency_;
+	
+	//The period (in trackBunch calls) of sorting macro-particles according to 
+	//the grid cells. Sorting makes the grid memory access sequential. 0 - no sorting.
+	int sortPeriod;
+	int sortCount;
 };
 //end of SC_SPACECHARGE_CALC_3D_H
 #endif
@@ -270,6 +270,30 @@ extern "C" {
     return Py_None;	
 	}		
 		
+	//sortBunch(Bunch* bunch, [ind0,ind1]), by default ind0 = 0, ind1 = 2 (XY) plane
+  static PyObject* Grid2D_sortBunch(PyObject *self, PyObject *args){
+    pyORBIT_Object* pyGrid2D = (pyORBIT_Object*) self;
+		Grid2D* cpp_Grid2D = (Grid2D*) pyGrid2D->cpp_obj;
+		PyObject* pyBunch;
+		int ind0 = -1;
+		int ind1 = -1;
+		if(!PyArg_ParseTuple(args,"O|ii:sortBunch",&pyBunch,&ind0,&ind1)){
+			ORBIT_MPI_Finalize("PyGrid2D - sortBunch(Bunch* bunch, [ind0,ind1]) - parameter are needed.");
+		}
+		PyObject* pyORBIT_Bunch_Type = wrap_orbit_bunch::getBunchType("Bunch");
+		if(!PyObject_IsInstance(pyBunch,pyORBIT_Bunch_Type)){
+			ORBIT_MPI_Finalize("PyGrid2D - sortBunch(Bunch* bunch, [ind0,ind1]) - method needs a Bunch.");
+		}
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object*)pyBunch)->cpp_obj;
+		if(ind0 < 0 || ind1 < 0 || ind0 > 5 || ind1 > 5){
+		  cpp_Grid2D->sortBunch(cpp_bunch);
+		} else {
+			cpp_Grid2D->sortBunch(cpp_bunch,ind0,ind1);
+		}
+		Py_INCREF(Py_None);
+    return Py_None;	
+	}		
+		
 	//binBunchBilinear(Bunch* bunch, [ind0,ind1]), by default ind0 = 0, ind1 = 2 (XY) plane
   static PyObject* Grid2D_binBunchBilinear(PyObject *self, PyObject *args){
     pyORBIT_Object* pyGrid2D = (pyORBIT_Object*) self;
@@ -381,6 +405,7 @@ extern "C" {
 		{ "binValue",             Grid2D_binValue,             METH_VARARGS,"bins the value into the 2D mesh"},
 		{ "binValueBilinear",     Grid2D_binValueBilinear,     METH_VARARGS,"bins the value into the 2D mesh bi-linearly"},
 		{ "binBunch",             Grid2D_binBunch,             METH_VARARGS,"bins the Bunch instance into the 2D mesh (XY plane by default)"},
+		{ "sortBunch",            Grid2D_sortBunch,            METH_VARARGS,"sorts the Bunch macro-particles according to the 2D mesh cells (XY plane by default)"},
 		{ "binBunchBilinear",     Grid2D_binBunchBilinear,     METH_VARARGS,"bins the Bunch instance into the 2D mesh bi-linearly (XY plane by default)"},
 		{ "calcGradient",         Grid2D_calcGradient,         METH_VARARGS,"returns gradient as (gx,gy) for point (x,y) calculated by 9-points weighting scheme"},
 		{ "calcGradientBilinear", Grid2D_calcGradientBilinear, METH_VARARGS,"returns gradient as (gx,gy) for point (x,y) calculated bi-linerly"},
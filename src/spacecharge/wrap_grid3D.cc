@@ -282,6 +282,24 @@ extern "C" {
     return Py_None;	
 	}			
 	
+	//sortBunch(Bunch* bunch)
+  static PyObject* Grid3D_sortBunch(PyObject *self, PyObject *args){
+    pyORBIT_Object* pyGrid3D = (pyORBIT_Object*) self;
+		Grid3D* cpp_Grid3D = (Grid3D*) pyGrid3D->cpp_obj;
+		PyObject* pyBunch;
+		if(!PyArg_ParseTuple(args,"O:sortBunch",&pyBunch)){
+			ORBIT_MPI_Finalize("PyGrid3D - sortBunch(Bunch* bunch) - parameter is needed.");
+		}
+		PyObject* pyORBIT_Bunch_Type = wrap_orbit_bunch::getBunchType("Bunch");
+		if(!PyObject_IsInstance(pyBunch,pyORBIT_Bunch_Type)){
+			ORBIT_MPI_Finalize("PyGrid3D - sortBunch(Bunch* bunch) - method needs a Bunch.");
+		}
+		Bunch* cpp_bunch = (Bunch*) ((pyORBIT_Object*)pyBunch)->cpp_obj;
+		cpp_Grid3D->sortBunch(cpp_bunch);
+		Py_INCREF(Py_None);
+    return Py_None;	
+	}			
+	
 	//binValue(double value, double x, double y, double z)
   static PyObject* Grid3D_binValue(PyObject *self, PyObject *args){
     pyORBIT_Object* pyGrid3D = (pyORBIT_Object*) self;
@@ -342,6 +360,7 @@ extern "C" {
 		{ "getMaxZ",        Grid3D_getMaxZ,        METH_VARARGS,"returns the max grid point in Z dir."},
 		{ "binValue",       Grid3D_binValue,       METH_VARARGS,"bins the value into the 3D mesh"},
 		{ "binBunch",       Grid3D_binBunch,       METH_VARARGS,"bins the Bunch into the 3D mesh"},
+		{ "sortBunch",      Grid3D_sortBunch,      METH_VARARGS,"sorts the Bunch macro-particles according to the 3D mesh cells"},
 		{ "calcGradient",   Grid3D_calcGradient,   METH_VARARGS,"returns gradient as (gx,gy,gz) for point (x,y,z)"},
 		{ "longWrapping",   Grid3D_longWrapping,   METH_VARARGS,"set/get isWrapping variable defining long. wrapping policy"},
 		{ "synchronizeMPI", Grid3D_synchronizeMPI, METH_VARARGS,"synchronize through the MPI communicator"},		
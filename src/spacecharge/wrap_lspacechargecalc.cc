@@ -114,6 +114,27 @@ extern "C"
 	}
 
 	
+	//setUseExactKick(int). Sets the flag to use the exact sum over the harmonics instead of the waveform grid
+	static PyObject* LSpaceChargeCalc_setUseExactKick(PyObject *self, PyObject *args){
+		pyORBIT_Object* pyLSpaceChargeCalc = (pyORBIT_Object*) self;
+		LSpaceChargeCalc* cpp_LSpaceChargeCalc = (LSpaceChargeCalc*) pyLSpaceChargeCalc->cpp_obj;
+		int useExactKick = 0;
+		if(!PyArg_ParseTuple(args,"i:arguments",&useExactKick)){
+			ORBIT_MPI_Finalize("PyLSpaceChargeCalc - setUseExactKick(0 or 1) - method needs a parameter.");
+		}
+		cpp_LSpaceChargeCalc->setUseExactKick(useExactKick);
+		Py_INCREF(Py_None);
+		return Py_None;
+	}
+	
+	//getUseExactKick(). Returns the flag to use the exact sum over the harmonics
+	static PyObject* LSpaceChargeCalc_getUseExactKick(PyObject *self, PyObject *args){
+		pyORBIT_Object* pyLSpaceChargeCalc = (pyORBIT_Object*) self;
+		LSpaceChargeCalc* cpp_LSpaceChargeCalc = (LSpaceChargeCalc*) pyLSpaceChargeCalc->cpp_obj;
+		return Py_BuildValue("i",cpp_LSpaceChargeCalc->getUseExactKick());
+	}
+
+	
 //trackBunchBunch(Bunch* bunch)
   static PyObject* LSpaceChargeCalc_trackBunch(PyObject *self, PyObject *args){
 		int nVars = PyTuple_Size(args);
@@ -153,6 +174,8 @@ extern "C"
 		{ "trackBunch",  LSpaceChargeCalc_trackBunch, METH_VARARGS,"trackBunch the bunch - trackBunch(pyBunch)"},
 		{ "assignImpedanceValue",  LSpaceChargeCalc_assignImpedanceValue, METH_VARARGS,"assigne the impedance for the ith mode - assignImpedanceValue(i,real,imag)"},
 		{ "assignImpedance",  assignImpedance, METH_VARARGS,"assigne the impedance for the ith mode - assignImpedance(Z))"},
+		{ "setUseExactKick",  LSpaceChargeCalc_setUseExactKick, METH_VARARGS,"sets the flag to use the exact sum over harmonics (1) instead of the waveform grid (0) - setUseExactKick(0 or 1)"},
+		{ "getUseExactKick",  LSpaceChargeCalc_getUseExactKick, METH_VARARGS,"returns the flag to use the exact sum over harmonics - getUseExactKick()"},
 		{NULL}
   };
   
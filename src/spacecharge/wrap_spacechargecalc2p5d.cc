@@ -156,6 +156,25 @@ extern "C" {
 		Py_INCREF(Py_None);
 		return Py_None;  
   }
+	
+	//setSortingPeriod(int period) sets the period of the bunch sorting according to the grid cells. 0 - no sorting
+  static PyObject* SpaceChargeCalc2p5D_setSortingPeriod(PyObject *self, PyObject *args){
+		pyORBIT_Object* pySpaceChargeCalc2p5D = (pyORBIT_Object*) self;
+		SpaceChargeCalc2p5D* cpp_SpaceChargeCalc2p5D = (SpaceChargeCalc2p5D*) pySpaceChargeCalc2p5D->cpp_obj;
+		int sortPeriod;
+		if(!PyArg_ParseTuple(args,"i:setSortingPeriod",&sortPeriod)){
+			ORBIT_MPI_Finalize("PySpaceChargeCalc2p5D.setSortingPeriod(period) - method needs a parameter.");
+		}
+		cpp_SpaceChargeCalc2p5D->setSortingPeriod(sortPeriod);
+		return Py_BuildValue("i",sortPeriod);
+  }	
+	
+	//getSortingPeriod() returns the period of the bunch sorting according to the grid cells
+  static PyObject* SpaceChargeCalc2p5D_getSortingPeriod(PyObject *self, PyObject *args){
+		pyORBIT_Object* pySpaceChargeCalc2p5D = (pyORBIT_Object*) self;
+		SpaceChargeCalc2p5D* cpp_SpaceChargeCalc2p5D = (SpaceChargeCalc2p5D*) pySpaceChargeCalc2p5D->cpp_obj;
+		return Py_BuildValue("i",cpp_SpaceChargeCalc2p5D->getSortingPeriod());
+  }		
 
   //-----------------------------------------------------
   //destructor for python SpaceChargeCalc2p5D class (__del__ method).
@@ -175,6 +194,8 @@ extern "C" {
 		{ "getRhoGrid",  SpaceChargeCalc2p5D_getRhoGrid, METH_VARARGS,"returns the Grid2D with a space charge density"},
 		{ "getPhiGrid",  SpaceChargeCalc2p5D_getPhiGrid, METH_VARARGS,"returns the Grid2D with a space charge potential"},
 		{ "getLongGrid", SpaceChargeCalc2p5D_getLongGrid, METH_VARARGS,"returns the Grid1D with a longitudinal space charge density"},
+		{ "setSortingPeriod", SpaceChargeCalc2p5D_setSortingPeriod, METH_VARARGS,"sets the period of the bunch sorting according to the grid cells. 0 - no sorting."},
+		{ "getSortingPeriod", SpaceChargeCalc2p5D_getSortingPeriod, METH_VARARGS,"returns the period of the bunch sorting according to the grid cells."},
 		{NULL}
   };
   
@@ -154,6 +154,25 @@ extern "C" {
 		return Py_BuildValue("d",ratioLimit);;
   }		
 	
+	//setSortingPeriod(int period) sets the period of the bunch sorting according to the grid cells. 0 - no sorting
+  static PyObject* SpaceChargeCalc3D_setSortingPeriod(PyObject *self, PyObject *args){
+		pyORBIT_Object* pySpaceChargeCalc3D = (pyORBIT_Object*) self;
+		SpaceChargeCalc3D* cpp_SpaceChargeCalc3D = (SpaceChargeCalc3D*) pySpaceChargeCalc3D->cpp_obj;
+		int sortPeriod;
+		if(!PyArg_ParseTuple(args,"i:setSortingPeriod",&sortPeriod)){
+			ORBIT_MPI_Finalize("PySpaceChargeCalc3D.setSortingPeriod(period) - method needs a parameter.");
+		}
+		cpp_SpaceChargeCalc3D->setSortingPeriod(sortPeriod);
+		return Py_BuildValue("i",sortPeriod);
+  }	
+	
+	//getSortingPeriod() returns the period of the bunch sorting according to the grid cells
+  static PyObject* SpaceChargeCalc3D_getSortingPeriod(PyObject *self, PyObject *args){
+		pyORBIT_Object* pySpaceChargeCalc3D = (pyORBIT_Object*) self;
+		SpaceChargeCalc3D* cpp_SpaceChargeCalc3D = (SpaceChargeCalc3D*) pySpaceChargeCalc3D->cpp_obj;
+		return Py_BuildValue("i",cpp_SpaceChargeCalc3D->getSortingPeriod());
+  }		
+	
   //-----------------------------------------------------
   //destructor for python SpaceChargeCalc3D class (__del__ method).
   //-----------------------------------------------------
@@ -175,6 +194,8 @@ extern "C" {
 		{ "getPhiGrid",     SpaceChargeCalc3D_getPhiGrid,    METH_VARARGS,"returns the Grid3D with a space charge potential"},
 		{ "setRatioLimit",	SpaceChargeCalc3D_setRatioLimit, METH_VARARGS,"sets the ratio change of x to y and x to z to recalculate Green Functions."},
 		{ "getRatioLimit",	SpaceChargeCalc3D_getRatioLimit, METH_VARARGS,"returns the ratio change of x to y and x to z to recalculate Green Functions."},
+		{ "setSortingPeriod",	SpaceChargeCalc3D_setSortingPeriod, METH_VARARGS,"sets the period of the bunch sorting according to the grid cells. 0 - no sorting."},
+		{ "getSortingPeriod",	SpaceChargeCalc3D_getSortingPeriod, METH_VARARGS,"returns the period of the bunch sorting according to the grid cells."},
 		{NULL}
   };
   
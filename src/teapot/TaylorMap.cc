@@ -0,0 +1,398 @@
+/////////////////////////////////////////////////////////////////////////////
+//
+// FILE NAME
+//   TaylorMap.cc
+//
+// DESCRIPTION
+//   Truncated power series (Taylor) map of the 6D phase space.
+//   The test particles are distributed inside the box defined by the
+//   steps around the reference (zero) orbit. After tracking through
+//   the lattice section the coefficients of all monomials up to the
+//   order of the map are found by the least squares fit in the scaled
+//   variables x[i]/step[i]. The monomials are generated in the graded
+//   order, and each monomial is the product of the parent monomial and
+//   one coordinate, so the evaluation needs one multiplication per
+//   monomial.
+//
+/////////////////////////////////////////////////////////////////////////////
+#include "orbit_mpi.hh"
+#include "TaylorMap.hh"
+#include "Random.hh"
+
+#include <cmath>
+
+using namespace OrbitUtils;
+
+namespace teapot_base
+{
+    TaylorMap::TaylorMap(int order_in)
+    {
+        order = order_in;
+        if(order < 1) order = 1;
+
+        //the constant term
+        parentMonoArr.push_back(-1);
+        parentVarArr.push_back(-1);
+        for(int k = 0; k < 6; k++) powerArr.push_back(0);
+        std::vector<int> lastVarArr;
+        lastVarArr.push_back(0);
+
+        int ind_start = 0;
+        int ind_stop = 1;
+        for(int deg = 1; deg <= order; deg++)
+        {
+            for(int m = ind_start; m < ind_stop; m++)
+            {
+                for(int v = lastVarArr[m]; v < 6; v++)
+                {
+                    parentMonoArr.push_back(m);
+                    parentVarArr.push_back(v);
+                    lastVarArr.push_back(v);
+                    for(int k = 0; k < 6; k++) powerArr.push_back(powerArr[m*6+k]);
+                    powerArr[powerArr.size() - 6 + v] += 1;
+                }
+            }
+            ind_start = ind_stop;
+            ind_stop = parentMonoArr.size();
+        }
+        nMono = parentMonoArr.size();
+        nTestParts = 2*nMono + 1;
+
+        //the identity map, the linear monomials have indexes 1-6
+        coeffArr.resize(6*nMono,0.);
+        for(int j = 0; j < 6; j++)
+        {
+            coeffArr[j*nMono + 1 + j] = 1.0;
+            fitErrArr[j] = 0.;
+        }
+        monoArr.resize(nMono,0.);
+
+        step_arr_init[0] = 0.001;
+        step_arr_init[1] = 0.0001;
+        step_arr_init[2] = 0.001;
+        step_arr_init[3] = 0.0001;
+        step_arr_init[4] = 0.001;
+        step_arr_init[5] = 0.001;
+        for(int i = 0; i < 6; i++)
+        {
+            step_arr[i] = step_arr_init[i];
+        }
+        dp_p_coeff = 1.0;
+    }
+
+    TaylorMap::~TaylorMap()
+    {
+    }
+
+    int TaylorMap::getOrder(){ return order;}
+
+    int TaylorMap::getNumberOfMonomials(){ return nMono;}
+
+    int TaylorMap::getNumberOfTestParticles(){ return nTestParts;}
+
+    int TaylorMap::getMonomialPower(int mono_index, int coord_index)
+    {
+        return powerArr[mono_index*6 + coord_index];
+    }
+
+    double& TaylorMap::coeff(int coord_index, int mono_index)
+    {
+        return coeffArr[coord_index*nMono + mono_index];
+    }
+
+    double& TaylorMap::step(int index)
+    {
+        return step_arr_init[index];
+    }
+
+    double TaylorMap::getFitError(int coord_index)
+    {
+        return fitErrArr[coord_index];
+    }
+
+    void TaylorMap::initBunch(Bunch* bunch)
+    {
+        for(int i = 0; i < 6; i++)
+        {
+            step_arr[i] = step_arr_init[i];
+        }
+        SyncPart* syncPart = bunch->getSyncPart();
+        step_arr[5] = syncPart->getEnergy() * step_arr[5];
+        dp_p_coeff = 1.0 / (syncPart->getMomentum() * syncPart->getBeta());
+        //the sequence is the same on all CPUs
+        long idum = -7919;
+        testCoordArr.resize(6*nTestParts);
+        for(int k = 0; k < 6; k++) testCoordArr[k] = 0.;
+        for(int i = 1; i < nTestParts; i++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                testCoordArr[i*6+k] = step_arr[k]*(2.0*Random::ran1(idum) - 1.0);
+            }
+        }
+        bunch->deleteAllParticles();
+        for(int i = 0; i < nTestParts; i++)
+        {
+            double* arr = &testCoordArr[i*6];
+            bunch->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
+        }
+        bunch->compress();
+    }
+
+    void TaylorMap::calculateMap(Bunch* bunch)
+    {
+        bunch->compress();
+        if(bunch->getSize() != nTestParts || ((int) testCoordArr.size()) != 6*nTestParts)
+        {
+            ORBIT_MPI_Finalize("TaylorMap::calculateMap: Bunch should have all test macro-particles. Call initBunch and do not lose particles.");
+        }
+        double** coord_arr = bunch->coordArr();
+
+        //normal equations of the least squares problem in scaled variables
+        std::vector<double> mtrxArr(nMono*nMono,0.);
+        std::vector<double> rhsArr(nMono*6,0.);
+        std::vector<double> scaleArr(nMono,1.0);
+        for(int m = 1; m < nMono; m++)
+        {
+            scaleArr[m] = scaleArr[parentMonoArr[m]]*step_arr[parentVarArr[m]];
+        }
+        double u[6];
+        for(int i = 0; i < nTestParts; i++)
+        {
+            for(int k = 0; k < 6; k++) u[k] = testCoordArr[i*6+k]/step_arr[k];
+            calculateMonomials(u);
+            for(int a = 0; a < nMono; a++)
+            {
+                double mono_a = monoArr[a];
+                double* row = &mtrxArr[a*nMono];
+                for(int b = 0; b < nMono; b++)
+                {
+                    row[b] += mono_a*monoArr[b];
+                }
+                for(int j = 0; j < 6; j++)
+                {
+                    rhsArr[a*6+j] += mono_a*coord_arr[i][j];
+                }
+            }
+        }
+
+        //Gauss elimination with partial pivoting
+        for(int c = 0; c < nMono; c++)
+        {
+            int ind_max = c;
+            for(int r = c+1; r < nMono; r++)
+            {
+                if(fabs(mtrxArr[r*nMono+c]) > fabs(mtrxArr[ind_max*nMono+c])) ind_max = r;
+            }
+            if(fabs(mtrxArr[ind_max*nMono+c]) < 1.0e-12*nTestParts)
+            {
+                ORBIT_MPI_Finalize("TaylorMap::calculateMap: The fit matrix is singular.");
+            }
+            if(ind_max != c)
+            {
+                for(int b = 0; b < nMono; b++)
+                {
+                    double tmp = mtrxArr[c*nMono+b];
+                    mtrxArr[c*nMono+b] = mtrxArr[ind_max*nMono+b];
+                    mtrxArr[ind_max*nMono+b] = tmp;
+                }
+                for(int j = 0; j < 6; j++)
+                {
+                    double tmp = rhsArr[c*6+j];
+                    rhsArr[c*6+j] = rhsArr[ind_max*6+j];
+                    rhsArr[ind_max*6+j] = tmp;
+                }
+            }
+            double pivot = mtrxArr[c*nMono+c];
+            for(int r = c+1; r < nMono; r++)
+            {
+                double f = mtrxArr[r*nMono+c]/pivot;
+                if(f == 0.) continue;
+                for(int b = c; b < nMono; b++)
+                {
+                    mtrxArr[r*nMono+b] -= f*mtrxArr[c*nMono+b];
+                }
+                for(int j = 0; j < 6; j++)
+                {
+                    rhsArr[r*6+j] -= f*rhsArr[c*6+j];
+                }
+            }
+        }
+        for(int r = nMono-1; r >= 0; r--)
+        {
+            for(int j = 0; j < 6; j++)
+            {
+                double sum = rhsArr[r*6+j];
+                for(int b = r+1; b < nMono; b++)
+                {
+                    sum -= mtrxArr[r*nMono+b]*rhsArr[b*6+j];
+                }
+                rhsArr[r*6+j] = sum/mtrxArr[r*nMono+r];
+            }
+        }
+
+        //coefficients in the real variables
+        for(int j = 0; j < 6; j++)
+        {
+            for(int m = 0; m < nMono; m++)
+            {
+                coeffArr[j*nMono+m] = rhsArr[m*6+j]/scaleArr[m];
+            }
+        }
+
+        //residuals
+        double coord_out[6];
+        for(int j = 0; j < 6; j++) fitErrArr[j] = 0.;
+        for(int i = 0; i < nTestParts; i++)
+        {
+            transform(&testCoordArr[i*6],coord_out);
+            for(int j = 0; j < 6; j++)
+            {
+                double err = fabs(coord_out[j] - coord_arr[i][j]);
+                if(err > fitErrArr[j]) fitErrArr[j] = err;
+            }
+        }
+    }
+
+    void TaylorMap::calculateMonomials(double* coord)
+    {
+        double* mono = &monoArr[0];
+        const int* parentMono = &parentMonoArr[0];
+        const int* parentVar = &parentVarArr[0];
+        mono[0] = 1.0;
+        for(int m = 1; m < nMono; m++)
+        {
+            mono[m] = mono[parentMono[m]]*coord[parentVar[m]];
+        }
+    }
+
+    void TaylorMap::transform(double* coord_in, double* coord_out)
+    {
+        calculateMonomials(coord_in);
+        const double* mono = &monoArr[0];
+        for(int j = 0; j < 6; j++)
+        {
+            const double* c = &coeffArr[j*nMono];
+            double sum = 0.;
+            for(int m = 0; m < nMono; m++)
+            {
+                sum += c[m]*mono[m];
+            }
+            coord_out[j] = sum;
+        }
+    }
+
+    void TaylorMap::trackBunch(Bunch* bunch)
+    {
+        bunch->compress();
+        double** arr = bunch->coordArr();
+        double coord_out[6];
+        for(int i = 0, n = bunch->getSize(); i < n; i++)
+        {
+            transform(arr[i],coord_out);
+            for(int j = 0; j < 6; j++)
+            {
+                arr[i][j] = coord_out[j];
+            }
+        }
+    }
+
+    void TaylorMap::jacobian(double* coord, double jac[6][6])
+    {
+        //powers of coordinates [k][n] = coord[k]^n
+        std::vector<double> pwArr(6*(order+1));
+        for(int k = 0; k < 6; k++)
+        {
+            pwArr[k*(order+1)] = 1.0;
+            for(int n = 1; n <= order; n++)
+            {
+                pwArr[k*(order+1)+n] = pwArr[k*(order+1)+n-1]*coord[k];
+            }
+        }
+        for(int j = 0; j < 6; j++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                jac[j][k] = 0.;
+            }
+        }
+        for(int m = 1; m < nMono; m++)
+        {
+            const int* pw = &powerArr[m*6];
+            for(int k = 0; k < 6; k++)
+            {
+                if(pw[k] == 0) continue;
+                double val = pw[k];
+                for(int l = 0; l < 6; l++)
+                {
+                    int p = pw[l];
+                    if(l == k) p -= 1;
+                    val *= pwArr[l*(order+1)+p];
+                }
+                for(int j = 0; j < 6; j++)
+                {
+                    jac[j][k] += coeffArr[j*nMono+m]*val;
+                }
+            }
+        }
+    }
+
+    void TaylorMap::calculateJacobian(double* coord, Matrix* mtrx)
+    {
+        if(mtrx->rows() < 6 || mtrx->columns() < 6)
+        {
+            ORBIT_MPI_Finalize("TaylorMap::calculateJacobian: Matrix should be at least 6x6.");
+        }
+        double jac[6][6];
+        jacobian(coord,jac);
+        double** arr = mtrx->getArray();
+        for(int j = 0; j < 6; j++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                arr[j][k] = jac[j][k];
+            }
+        }
+    }
+
+    double TaylorMap::getSymplecticError(double* coord)
+    {
+        double jac[6][6];
+        jacobian(coord,jac);
+        //the (z,dE) pair is replaced by the (z,dp/p) canonical pair
+        double scale[6] = {1.,1.,1.,1.,1.,dp_p_coeff};
+        for(int j = 0; j < 6; j++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                jac[j][k] *= scale[j]/scale[k];
+            }
+        }
+        //S*J where S is the block diagonal [[0,1],[-1,0]] matrix
+        double sj[6][6];
+        for(int p = 0; p < 3; p++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                sj[2*p][k] = jac[2*p+1][k];
+                sj[2*p+1][k] = -jac[2*p][k];
+            }
+        }
+        double err = 0.;
+        for(int j = 0; j < 6; j++)
+        {
+            for(int k = 0; k < 6; k++)
+            {
+                double val = 0.;
+                for(int l = 0; l < 6; l++)
+                {
+                    val += jac[l][j]*sj[l][k];
+                }
+                if(j/2 == k/2 && k == j + 1) val -= 1.0;
+                if(j/2 == k/2 && j == k + 1) val += 1.0;
+                if(fabs(val) > err) err = fabs(val);
+            }
+        }
+        return err;
+    }
+}  //end of namespace teapot_base
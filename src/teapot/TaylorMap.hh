@@ -0,0 +1,97 @@
+/////////////////////////////////////////////////////////////////////////////
+//
+// FILE NAME
+//   TaylorMap.hh
+//
+// DESCRIPTION
+//   Truncated power series (Taylor) map of the 6D phase space.
+//   The map is generated from the tracking of the test bunch through
+//   the lattice section, and it can be used to track the bunch through
+//   this section with one polynomial evaluation per particle.
+//
+/////////////////////////////////////////////////////////////////////////////
+#ifndef TEAPOT_BASE_TAYLOR_MAP_H
+#define TEAPOT_BASE_TAYLOR_MAP_H
+
+#include <vector>
+
+#include "Bunch.hh"
+#include "Matrix.hh"
+
+using namespace OrbitUtils;
+
+namespace teapot_base
+{
+    class TaylorMap
+    {
+        public:
+            TaylorMap(int order);
+            ~TaylorMap();
+
+            int getOrder();
+            int getNumberOfMonomials();
+            int getNumberOfTestParticles();
+
+            /** Returns the power of the coordinate with coord_index in the monomial. */
+            int getMonomialPower(int mono_index, int coord_index);
+
+            /** Returns the reference to the coefficient of the monomial for the output coordinate. */
+            double& coeff(int coord_index, int mono_index);
+
+            /** Returns the reference to the amplitude of the test particles coordinate.
+                For dE it is relative to the kinetic energy. */
+            double& step(int index);
+
+            /** Replaces the particles in the bunch with the test particles. */
+            void initBunch(Bunch* bunch);
+
+            /** Fits the coefficients of the map by the tracked test bunch. */
+            void calculateMap(Bunch* bunch);
+
+            /** Returns the maximal absolute fit residual for the coordinate. */
+            double getFitError(int coord_index);
+
+            /** Transforms the coordinates of all particles in the bunch by the map. */
+            void trackBunch(Bunch* bunch);
+
+            /** Transforms the 6D coordinates of one particle. */
+            void transform(double* coord_in, double* coord_out);
+
+            /** Calculates the 6x6 Jacobian of the map at the point. */
+            void calculateJacobian(double* coord, Matrix* mtrx);
+
+            /** Returns the maximal element of (J^T*S*J - S) at the point.
+                The dE is replaced by the canonical dp/p for this check. */
+            double getSymplecticError(double* coord);
+
+        private:
+            void calculateMonomials(double* coord);
+            void jacobian(double* coord, double jac[6][6]);
+
+        private:
+            int order;
+            int nMono;
+            int nTestParts;
+
+            //monomial m = monomial parentMonoArr[m] * x[parentVarArr[m]]
+            std::vector<int> parentMonoArr;
+            std::vector<int> parentVarArr;
+            std::vector<int> powerArr;
+
+            //coefficients [coord_index*nMono + mono_index]
+            std::vector<double> coeffArr;
+            std::vector<double> monoArr;
+
+            //initial coordinates of the test particles
+            std::vector<double> testCoordArr;
+
+            double fitErrArr[6];
+            double step_arr[6];
+            double step_arr_init[6];
+
+            //dE to dp/p coefficient for the symplecticity check
+            double dp_p_coeff;
+    };
+}  //end of namespace teapot_base
+
+#endif  //TEAPOT_BASE_TAYLOR_MAP_H
@@ -170,19 +170,23 @@ void drift(Bunch* bunch, double length)
     double gamma2i = 1.0 / (syncPart->getGamma() * syncPart->getGamma());
     double dp_p_coeff = 1.0 / (syncPart->getMomentum() * syncPart->getBeta());
 
-    //coordinate array [part. index][x,xp,y,yp,z,dE]
-    double** arr = bunch->coordArr();
+    //contiguous coordinate array [part. index*nDim + (x,xp,y,yp,z,dE)]
+    //the loop goes over memory with the constant stride
+    double* coord = bunch->coordBlock();
+    int nDim = bunch->getCoordDim();
+    int nParts = bunch->getSize();
 
-    for(int i = 0; i < bunch->getSize(); i++)
+    for(int i = 0; i < nParts; i++)
     {
-        dp_p = arr[i][5] * dp_p_coeff;
+        double* arr = coord + nDim*i;
+        dp_p = arr[5] * dp_p_coeff;
         KNL  = 1.0 / (1.0 + dp_p);
-        arr[i][0] += KNL * length * arr[i][1];
-        arr[i][2] += KNL * length * arr[i][3];
-        phifac = (arr[i][1] * arr[i][1] + arr[i][3] * arr[i][3] +
+        arr[0] += KNL * length * arr[1];
+        arr[2] += KNL * length * arr[3];
+        phifac = (arr[1] * arr[1] + arr[3] * arr[3] +
                   dp_p * dp_p * gamma2i) / 2.0;
         phifac = (phifac * KNL - dp_p * gamma2i) * KNL;
-        arr[i][4] -= length * phifac;
+        arr[4] -= length * phifac;
     }
 }
 	
@@ -0,0 +1,329 @@
+#include "orbit_mpi.hh"
+#include "pyORBIT_Object.hh"
+
+#include "wrap_taylor_map.hh"
+#include "wrap_teapotbase.hh"
+#include "wrap_bunch.hh"
+#include "wrap_utils.hh"
+
+#include <iostream>
+
+#include "TaylorMap.hh"
+
+using namespace OrbitUtils;
+using namespace teapot_base;
+using namespace wrap_teapotbase;
+
+namespace wrap_teapotbase_taylor_map
+{
+    void error(const char* msg){ ORBIT_MPI_Finalize(msg); }
+
+#ifdef __cplusplus
+extern "C"
+{
+#endif
+
+    //---------------------------------------------------------
+    //Python TaylorMap class definition
+    //---------------------------------------------------------
+
+    //Constructor for python class wrapping TaylorMap instance
+    //It never will be called directly
+    static PyObject* TaylorMap_new(PyTypeObject *type,
+                                   PyObject *args, PyObject *kwds)
+    {
+        pyORBIT_Object* self;
+        self = (pyORBIT_Object *) type->tp_alloc(type, 0);
+        self->cpp_obj = NULL;
+        return (PyObject *) self;
+    }
+
+    //Initializator for python  TaylorMap class (implementation of the __init__ )
+    //TaylorMap([order = 2])
+    static int TaylorMap_init(pyORBIT_Object *self,
+                              PyObject *args, PyObject *kwds)
+    {
+        int order = 2;
+        if(!PyArg_ParseTuple(args,"|i:__init__",&order))
+        {
+            error("PyTaylorMap - TaylorMap([order]) - constructor needs an integer order.");
+        }
+        self->cpp_obj = new TaylorMap(order);
+        return 0;
+    }
+
+    //-----------------------------------------------------
+    //Destructor for python TaylorMap class (__del__ method).
+    //-----------------------------------------------------
+    static void TaylorMap_del(pyORBIT_Object* self)
+    {
+        delete ((TaylorMap*)self->cpp_obj);
+        self->ob_type->tp_free((PyObject*)self);
+    }
+
+    //Returns the order of the map
+    static PyObject* TaylorMap_getOrder(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        return Py_BuildValue("i",cpp_TaylorMap->getOrder());
+    }
+
+    //Returns the number of monomials in each coordinate polynomial
+    static PyObject* TaylorMap_getNumberOfMonomials(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        return Py_BuildValue("i",cpp_TaylorMap->getNumberOfMonomials());
+    }
+
+    //Returns the number of test particles created by initBunch(bunch)
+    static PyObject* TaylorMap_getNumberOfTestParticles(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        return Py_BuildValue("i",cpp_TaylorMap->getNumberOfTestParticles());
+    }
+
+    //Returns the tuple with powers of (x,xp,y,yp,z,dE) in the monomial
+    static PyObject* TaylorMap_getMonomialPowers(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        int m;
+        if(!PyArg_ParseTuple(args,"i:getMonomialPowers",&m))
+        {
+            error("PyTaylorMap - getMonomialPowers(mono_index) - parameter is needed.");
+        }
+        if(m < 0 || m >= cpp_TaylorMap->getNumberOfMonomials())
+        {
+            error("PyTaylorMap - getMonomialPowers(mono_index) - wrong monomial index.");
+        }
+        return Py_BuildValue("(iiiiii)",
+                             cpp_TaylorMap->getMonomialPower(m,0),cpp_TaylorMap->getMonomialPower(m,1),
+                             cpp_TaylorMap->getMonomialPower(m,2),cpp_TaylorMap->getMonomialPower(m,3),
+                             cpp_TaylorMap->getMonomialPower(m,4),cpp_TaylorMap->getMonomialPower(m,5));
+    }
+
+    //Sets or returns the coefficient of the monomial for the coordinate
+    static PyObject* TaylorMap_coeff_get_set(PyObject *self, PyObject *args)
+    {
+        int nVars = PyTuple_Size(args);
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        int j, m;
+        double val = 0.;
+        if(!PyArg_ParseTuple(args,"ii|d:coefficient",&j,&m,&val))
+        {
+            error("PyTaylorMap - getCoefficient/setCoefficient(coord_index,mono_index[,value]) - something is missing.");
+        }
+        if(j < 0 || j > 5 || m < 0 || m >= cpp_TaylorMap->getNumberOfMonomials())
+        {
+            error("PyTaylorMap - getCoefficient/setCoefficient(coord_index,mono_index[,value]) - wrong index.");
+        }
+        if(nVars == 3)
+        {
+            cpp_TaylorMap->coeff(j,m) = val;
+        }
+        return Py_BuildValue("d",cpp_TaylorMap->coeff(j,m));
+    }
+
+    //Sets or returns the amplitude of the test particles coordinate
+    static PyObject* TaylorMap_step_get_set(PyObject *self, PyObject *args)
+    {
+        int nVars = PyTuple_Size(args);
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        int i;
+        double val = 0.;
+        if(!PyArg_ParseTuple(args,"i|d:step",&i,&val))
+        {
+            error("PyTaylorMap - getStep/setStep(i[,value]) - something is missing.");
+        }
+        if(i > 5 || i < 0)
+        {
+            error("PyTaylorMap - getStep/setStep(i[,value]) - wrong i:0-5.");
+        }
+        if(nVars == 2)
+        {
+            cpp_TaylorMap->step(i) = val;
+        }
+        return Py_BuildValue("d",cpp_TaylorMap->step(i));
+    }
+
+    //Parses the Bunch from the arguments
+    static Bunch* TaylorMap_parseBunch(PyObject *args, const char* msg)
+    {
+        PyObject *pyIn;
+        if(!PyArg_ParseTuple(args,"O",&pyIn))
+        {
+            error(msg);
+        }
+        PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+        if(!PyObject_IsInstance(pyIn,pyBunchType))
+        {
+            error(msg);
+        }
+        return (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+    }
+
+    //  initBunch(bunch) - replaces particles by the test particles
+    static PyObject* TaylorMap_initBunch(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        Bunch* bunch = TaylorMap_parseBunch(args,"PyTaylorMap - initBunch(Bunch) - input parameter is wrong.");
+        cpp_TaylorMap->initBunch(bunch);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    //  calculateMap(bunch) - fits the map by the tracked test particles
+    static PyObject* TaylorMap_calculateMap(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        Bunch* bunch = TaylorMap_parseBunch(args,"PyTaylorMap - calculateMap(Bunch) - input parameter is wrong.");
+        cpp_TaylorMap->calculateMap(bunch);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    //  trackBunch(bunch) - transforms the bunch coordinates by the map
+    static PyObject* TaylorMap_trackBunch(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        Bunch* bunch = TaylorMap_parseBunch(args,"PyTaylorMap - trackBunch(Bunch) - input parameter is wrong.");
+        cpp_TaylorMap->trackBunch(bunch);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    //  getFitError(coord_index) - returns the max abs residual of the fit
+    static PyObject* TaylorMap_getFitError(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        int j;
+        if(!PyArg_ParseTuple(args,"i:getFitError",&j) || j < 0 || j > 5)
+        {
+            error("PyTaylorMap - getFitError(coord_index) - wrong parameter.");
+        }
+        return Py_BuildValue("d",cpp_TaylorMap->getFitError(j));
+    }
+
+    //  getJacobian(Matrix[,x,xp,y,yp,z,dE]) - the Jacobian at the point (zero by default)
+    static PyObject* TaylorMap_getJacobian(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        PyObject *pyInM;
+        double coord[6] = {0.,0.,0.,0.,0.,0.};
+        if(!PyArg_ParseTuple(args,"O|dddddd:getJacobian",&pyInM,
+                             &coord[0],&coord[1],&coord[2],&coord[3],&coord[4],&coord[5]))
+        {
+            error("PyTaylorMap - getJacobian(Matrix[,x,xp,y,yp,z,dE]) - input parameters are needed.");
+        }
+        PyObject* pyORBIT_Matrix_Type = wrap_orbit_utils::getOrbitUtilsType("Matrix");
+        if(!PyObject_IsInstance(pyInM,pyORBIT_Matrix_Type))
+        {
+            error("PyTaylorMap - getJacobian(Matrix[,x,xp,y,yp,z,dE]) - input parameter is not a Matrix.");
+        }
+        cpp_TaylorMap->calculateJacobian(coord,(Matrix*) ((pyORBIT_Object*) pyInM)->cpp_obj);
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+
+    //  getSymplecticError([x,xp,y,yp,z,dE]) - max of |J^T*S*J - S| at the point
+    static PyObject* TaylorMap_getSymplecticError(PyObject *self, PyObject *args)
+    {
+        TaylorMap* cpp_TaylorMap = (TaylorMap*) ((pyORBIT_Object*) self)->cpp_obj;
+        double coord[6] = {0.,0.,0.,0.,0.,0.};
+        if(!PyArg_ParseTuple(args,"|dddddd:getSymplecticError",
+                             &coord[0],&coord[1],&coord[2],&coord[3],&coord[4],&coord[5]))
+        {
+            error("PyTaylorMap - getSymplecticError([x,xp,y,yp,z,dE]) - wrong parameters.");
+        }
+        return Py_BuildValue("d",cpp_TaylorMap->getSymplecticError(coord));
+    }
+
+    // Definition of methods of the python TaylorMap wrapper class
+    // They will be vailable from python level
+    static PyMethodDef TaylorMapClassMethods[] =
+    {
+        { "getOrder",                 TaylorMap_getOrder                 ,METH_VARARGS, "Returns the order of the map"},
+        { "getNumberOfMonomials",     TaylorMap_getNumberOfMonomials     ,METH_VARARGS, "Returns the number of monomials"},
+        { "getNumberOfTestParticles", TaylorMap_getNumberOfTestParticles ,METH_VARARGS, "Returns the number of test particles"},
+        { "getMonomialPowers",        TaylorMap_getMonomialPowers        ,METH_VARARGS, "Returns powers of coordinates in the monomial"},
+        { "getCoefficient",           TaylorMap_coeff_get_set            ,METH_VARARGS, "Returns coefficient(coord_index,mono_index)"},
+        { "setCoefficient",           TaylorMap_coeff_get_set            ,METH_VARARGS, "Sets coefficient(coord_index,mono_index,value)"},
+        { "getStep",                  TaylorMap_step_get_set             ,METH_VARARGS, "Returns step(i)"},
+        { "setStep",                  TaylorMap_step_get_set             ,METH_VARARGS, "Sets the new value to step(i)"},
+        { "initBunch",                TaylorMap_initBunch                ,METH_VARARGS, "Replaces particles in the bunch by the test particles"},
+        { "calculateMap",             TaylorMap_calculateMap             ,METH_VARARGS, "Calculates the map from the tracked test bunch"},
+        { "trackBunch",               TaylorMap_trackBunch               ,METH_VARARGS, "Tracks the bunch through the map"},
+        { "getFitError",              TaylorMap_getFitError              ,METH_VARARGS, "Returns the max fit residual for the coordinate"},
+        { "getJacobian",              TaylorMap_getJacobian              ,METH_VARARGS, "Calculates the Jacobian matrix at the point"},
+        { "getSymplecticError",       TaylorMap_getSymplecticError       ,METH_VARARGS, "Returns the symplecticity error at the point"},
+        {NULL}
+    };
+
+    // Definition of the memebers of the python TaylorMap wrapper class
+    // They will be vailable from python level
+    static PyMemberDef TaylorMapClassMembers [] =
+    {
+        {NULL}
+    };
+
+    //New python TaylorMap wrapper type definition
+    static PyTypeObject pyORBIT_TaylorMap_Type =
+    {
+        PyObject_HEAD_INIT(NULL)
+        0, /*ob_size*/
+        "TaylorMap", /*tp_name*/
+        sizeof(pyORBIT_Object), /*tp_basicsize*/
+        0, /*tp_itemsize*/
+        (destructor) TaylorMap_del , /*tp_dealloc*/
+        0, /*tp_print*/
+        0, /*tp_getattr*/
+        0, /*tp_setattr*/
+        0, /*tp_compare*/
+        0, /*tp_repr*/
+        0, /*tp_as_number*/
+        0, /*tp_as_sequence*/
+        0, /*tp_as_mapping*/
+        0, /*tp_hash */
+        0, /*tp_call*/
+        0, /*tp_str*/
+        0, /*tp_getattro*/
+        0, /*tp_setattro*/
+        0, /*tp_as_buffer*/
+        Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /*tp_flags*/
+        "The TaylorMap python wrapper", /* tp_doc */
+        0, /* tp_traverse */
+        0, /* tp_clear */
+        0, /* tp_richcompare */
+        0, /* tp_weaklistoffset */
+        0, /* tp_iter */
+        0, /* tp_iternext */
+        TaylorMapClassMethods, /* tp_methods */
+        TaylorMapClassMembers, /* tp_members */
+        0, /* tp_getset */
+        0, /* tp_base */
+        0, /* tp_dict */
+        0, /* tp_descr_get */
+        0, /* tp_descr_set */
+        0, /* tp_dictoffset */
+        (initproc) TaylorMap_init, /* tp_init */
+        0, /* tp_alloc */
+        TaylorMap_new, /* tp_new */
+    };
+
+    //--------------------------------------------------
+    //Initialization function of the pyTaylorMap class
+    //It will be called from teapot_base wrapper initialization
+    //--------------------------------------------------
+    void initTaylorMap(PyObject* module)
+    {
+        if (PyType_Ready(&pyORBIT_TaylorMap_Type) < 0) return;
+        Py_INCREF(&pyORBIT_TaylorMap_Type);
+        PyModule_AddObject(module, "TaylorMap",
+                           (PyObject *)&pyORBIT_TaylorMap_Type);
+    }
+
+#ifdef __cplusplus
+}
+#endif
+
+//end of namespace wrap_teapotbase_taylor_map
+}
@@ -0,0 +1,21 @@
+#ifndef WRAP_TAYLOR_MAP_H
+#define WRAP_TAYLOR_MAP_H
+
+#include "Python.h"
+
+#ifdef __cplusplus
+extern "C"
+{
+#endif
+
+namespace wrap_teapotbase_taylor_map
+{
+    void initTaylorMap(PyObject* module);
+}
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
+
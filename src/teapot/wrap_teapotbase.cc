@@ -7,6 +7,7 @@
 
 #include "wrap_teapotbase.hh"
 #include "wrap_matrix_generator.hh"
+#include "wrap_taylor_map.hh"
 
 namespace wrap_teapotbase
 {
@@ -520,6 +521,7 @@ extern "C"
         d = PyModule_GetDict(m);
         teapot_base::init_factorial();
         wrap_teapotbase_matrix_generator::initMatrixGenerator(m);
+        wrap_teapotbase_taylor_map::initTaylorMap(m);
     }
 
     PyObject* getBaseTEAPOTType(char* name)
@@ -40,6 +40,10 @@ RungeKuttaTracker::RungeKuttaTracker(double lengthIn){
 	
 	t_step = 0.;
 	
+	//particles are integrated in blocks with fixed step by default
+	blockSize = 64;
+	adaptiveStep = 0;
+	
 	//set a*x + b*y + c*z + d = 0 equations for entrance and exit planes
 	plEntrV = new double[4];
 	plExitV = new double[4];
@@ -105,6 +109,27 @@ double RungeKuttaTracker::getLength(){
 	return length;
 }
 
+/** It sets the number of particles that are integrated together. */
+void RungeKuttaTracker::setBlockSize(int blockSize){
+	if(blockSize < 1) blockSize = 1;
+	this->blockSize = blockSize;
+}
+
+/** It returns the number of particles that are integrated together. */
+int RungeKuttaTracker::getBlockSize(){
+	return blockSize;
+}
+
+/** It switches on (1) or off (0) the adaptive step size control for particles. */
+void RungeKuttaTracker::setAdaptiveStep(int adaptiveStep){
+	this->adaptiveStep = adaptiveStep;
+}
+
+/** It returns 1 if the adaptive step size control is on and 0 otherwise. */
+int RungeKuttaTracker::getAdaptiveStep(){
+	return adaptiveStep;
+}
+
 /** It sets (a*x+b*y+c*z+d=0) coefficients for the entrance plane. */
 void RungeKuttaTracker::setEntrPlane(double a, double b, double c, double d){
 	plEntrV[0] = a;
@@ -174,7 +199,7 @@ void RungeKuttaTracker::trackBunch(Bunch* bunch, BaseFieldSource* fieldSource, E
 	y_init_vct[4] = syncPart->getPY();
 	y_init_vct[5] = syncPart->getPZ();
 	//this is a time when synch particle crosses the entrance plane
-	double t_sync_final = 0.;
+	t_sync_final = 0.;
 	double t_previous_final = 0.;
 	double y_sync_final_vct[6];
 	//step size definition from synch. particle
@@ -263,207 +288,74 @@ void RungeKuttaTracker::trackBunch(Bunch* bunch, BaseFieldSource* fieldSource, E
 	//move from x, x', y, y', z, dE to x,px,y,py,z,pz 
 	bunch->compress();
 	double** partCoordArr = bunch->coordArr();
-	double p_start_vct[3];
-	double r_start_vct[3];
-	double p_final_vct[3];
-	double r_final_vct[3];
-	double nx_start_vct[3];
-	double ny_start_vct[3];
-	double nx_final_vct[3];
-	double ny_final_vct[3];
-	double p_sync_start_vct[3];
-	double p_norm_sync_start_vct[3];
-	double p_sync_final_vct[3];
-	double p_norm_sync_final_vct[3];
-	double r_sync_start_vct[3];	
-	double r_sync_final_vct[3];	
-	double v_vct[3];
 	//set up start parameters for syncPart
-	double v_sync_start = c_light*syncPart->getBeta();
-	double beta_sync_start = syncPart->getBeta();
-	double energy_sync_start = syncPart->getEnergy();
-	double pSyncPart_start = syncPart->getMomentum();	
+	v_sync_start = c_light*syncPart->getBeta();
+	beta_sync_start = syncPart->getBeta();
+	energy_sync_start = syncPart->getEnergy();
+	pSyncPart_start = syncPart->getMomentum();	
 	nx_start_vct[0] = syncPart->getNormalXX();
 	nx_start_vct[1] = syncPart->getNormalXY();
 	nx_start_vct[2] = syncPart->getNormalXZ();
 	ny_start_vct[0] = syncPart->getNormalYX();
 	ny_start_vct[1] = syncPart->getNormalYY();
 	ny_start_vct[2] = syncPart->getNormalYZ();
-	//std::cerr<<"debug orts nx="<< nx_start_vct[0] <<" " << nx_start_vct[1] <<" " << nx_start_vct[2]<<" "  <<std::endl;
-	//std::cerr<<"debug orts ny="<< ny_start_vct[0] <<" " << ny_start_vct[1] <<" " << ny_start_vct[2]<<" "  <<std::endl;
-	p_sync_start_vct[0] = syncPart->getPX();
-	p_sync_start_vct[1] = syncPart->getPY();
-	p_sync_start_vct[2] = syncPart->getPZ();	
-	p_norm_sync_start_vct[0] = p_sync_start_vct[0]/pSyncPart_start;
-	p_norm_sync_start_vct[1] = p_sync_start_vct[1]/pSyncPart_start;
-	p_norm_sync_start_vct[2] = p_sync_start_vct[2]/pSyncPart_start;
+	p_norm_sync_start_vct[0] = syncPart->getPX()/pSyncPart_start;
+	p_norm_sync_start_vct[1] = syncPart->getPY()/pSyncPart_start;
+	p_norm_sync_start_vct[2] = syncPart->getPZ()/pSyncPart_start;
 	r_sync_start_vct[0] = syncPart->getX();
 	r_sync_start_vct[1] = syncPart->getY();
 	r_sync_start_vct[2] = syncPart->getZ();	
 	//set up the new SyncParticle coordinates
 	syncPart->setXYZ(y_sync_final_vct[0],y_sync_final_vct[1],y_sync_final_vct[2]);
 	syncPart->setPXYZ(y_sync_final_vct[3],y_sync_final_vct[4],y_sync_final_vct[5]);	
-	double v_sync_final = c_light*syncPart->getBeta();
-	double energy_sync_final = syncPart->getEnergy();
-	double pSyncPart_final = syncPart->getMomentum();
-  double beta_sync_final = syncPart->getBeta();	
+	v_sync_final = c_light*syncPart->getBeta();
+	energy_sync_final = syncPart->getEnergy();
+	pSyncPart_final = syncPart->getMomentum();
+	beta_sync_final = syncPart->getBeta();	
 	nx_final_vct[0] = syncPart->getNormalXX();
 	nx_final_vct[1] = syncPart->getNormalXY();
 	nx_final_vct[2] = syncPart->getNormalXZ();
 	ny_final_vct[0] = syncPart->getNormalYX();
 	ny_final_vct[1] = syncPart->getNormalYY();
 	ny_final_vct[2] = syncPart->getNormalYZ();
-	p_sync_final_vct[0] = syncPart->getPX();
-	p_sync_final_vct[1] = syncPart->getPY();
-	p_sync_final_vct[2] = syncPart->getPZ();	
-	p_norm_sync_final_vct[0] = p_sync_final_vct[0]/pSyncPart_final;
-	p_norm_sync_final_vct[1] = p_sync_final_vct[1]/pSyncPart_final;
-	p_norm_sync_final_vct[2] = p_sync_final_vct[2]/pSyncPart_final;
+	p_norm_sync_final_vct[0] = syncPart->getPX()/pSyncPart_final;
+	p_norm_sync_final_vct[1] = syncPart->getPY()/pSyncPart_final;
+	p_norm_sync_final_vct[2] = syncPart->getPZ()/pSyncPart_final;
 	r_sync_final_vct[0] = syncPart->getX();
 	r_sync_final_vct[1] = syncPart->getY();
 	r_sync_final_vct[2] = syncPart->getZ();		
-	double t_start = 0.;
-	double t_final = 0.;
-	double pz_along = 0.;
-	double enrg_part = 0.;
-	double p_part2 = 0.;
-	double p_part = 0.;
-	double x = 0., y = 0., xp = 0., yp = 0., z = 0., dE = 0.;
-	double xp2 = 0.;
-	double yp2 = 0.;
-	double px_xp_coef = 0.;
-	double xp_coef = 0.;
-	for(int ip = 0, nParts = bunch->getSize(); ip < nParts; ip++){
-		x = partCoordArr[ip][0];
-		y = partCoordArr[ip][2];
-		xp = partCoordArr[ip][1];
-		yp = partCoordArr[ip][3];
-		z = partCoordArr[ip][4];
-		dE = partCoordArr[ip][5];
-		// Transformations here are the subject of the meaning of x' and y' and
-    // how they are related to the transverse momentum of particles.
-		// Here we use these transformations to comply to the Drift element of the TEAPOT.
-		// At the end of the loop we have to do backward transformations.
-		enrg_part = energy_sync_start+dE;
-		p_part2 = enrg_part*(enrg_part + 2*mass);
-		p_part = sqrt(p_part2);
-		xp_coef = 1./(1.+dE/(pSyncPart_start*beta_sync_start));
-		xp2 = pow(xp*xp_coef,2);
-		yp2 = pow(yp*xp_coef,2);		
-		pz_along = sqrt(p_part2/(1.+xp2+yp2));
-		px_xp_coef = pz_along*xp_coef;
-		//find the transverse (relative to the synch. particle moment) moment vector
-		p_start_vct[0] = px_xp_coef*(xp*nx_start_vct[0] + yp*ny_start_vct[0]);
-		p_start_vct[1] = px_xp_coef*(xp*nx_start_vct[1] + yp*ny_start_vct[1]);
-		p_start_vct[2] = px_xp_coef*(xp*nx_start_vct[2] + yp*ny_start_vct[2]);
-		p_start_vct[0] = p_start_vct[0] + pz_along*p_norm_sync_start_vct[0];
-		p_start_vct[1] = p_start_vct[1] + pz_along*p_norm_sync_start_vct[1];
-		p_start_vct[2] = p_start_vct[2] + pz_along*p_norm_sync_start_vct[2];	
-		//now absolute position 
-		r_start_vct[0] = r_sync_start_vct[0] + x*nx_start_vct[0] + y*ny_start_vct[0];
-		r_start_vct[1] = r_sync_start_vct[1] + x*nx_start_vct[1] + y*ny_start_vct[1];
-		r_start_vct[2] = r_sync_start_vct[2] + x*nx_start_vct[2] + y*ny_start_vct[2];
-		enrg_part = syncPart->momentumToEnergy(p_part);
-		v_vct[0] = c_light*p_start_vct[0]/enrg_part;
-		v_vct[1] = c_light*p_start_vct[1]/enrg_part;
-		v_vct[2] = c_light*p_start_vct[2]/enrg_part;
-		//t_start has been used, we can use it again 
-		//find the entrance point and time
-	  cross_t = plEntrV[0]*v_vct[0] + plEntrV[1]*v_vct[1] + plEntrV[2]*v_vct[2];
-	  t_start = -(plEntrV[0]*r_start_vct[0] + plEntrV[1]*r_start_vct[1] + 
-		            plEntrV[2]*r_start_vct[2] + plEntrV[3])/cross_t;	
-		r_start_vct[0] = t_start*v_vct[0] + r_start_vct[0];
-		r_start_vct[1] = t_start*v_vct[1] + r_start_vct[1];
-		r_start_vct[2] = t_start*v_vct[2] + r_start_vct[2];
-		//std::cerr<<"debug t_start="<< t_start <<std::endl;	
-		t_start = t_start - partCoordArr[ip][4]/v_sync_start;
-		//std::cerr<<"debug r_sync_start="<< r_sync_start_vct[0] <<" "<< r_sync_start_vct[1] <<" "<< r_sync_start_vct[2] <<std::endl;
-		//std::cerr<<"debug p_sync_start="<< p_sync_start_vct[0]<<" "<< p_sync_start_vct[1]<<" "<< p_sync_start_vct[2] <<std::endl;
-		//std::cerr<<"debug r_start="<< r_start_vct[0]<<" "<< r_start_vct[1]<<" "<< r_start_vct[2] <<std::endl;
-		//std::cerr<<"debug p_start="<< p_start_vct[0]<<" "<< p_start_vct[1]<<" "<< p_start_vct[2] <<std::endl;		
-		//start tracking
-	  y_in_vct[0] = r_start_vct[0];
-	  y_in_vct[1] = r_start_vct[1];
-	  y_in_vct[2] = r_start_vct[2];
-	  y_in_vct[3] = p_start_vct[0];
-	  y_in_vct[4] = p_start_vct[1];
-	  y_in_vct[5] = p_start_vct[2];	
-		for(int i = 0; i < 6; i++){
-			y_out_vct[i] = y_in_vct[i];
-		}
-		int step_count = 0;
-		double t = t_start;
-		while(isBeforeExit(y_out_vct) && bunch->flag(ip) > 0){
-			partCoordArr[ip][0] = y_in_vct[0];
-			partCoordArr[ip][2] = y_in_vct[1];
-			partCoordArr[ip][4] = y_in_vct[2];
-			partCoordArr[ip][1] = y_in_vct[3];
-			partCoordArr[ip][3] = y_in_vct[4];
-			partCoordArr[ip][5] = y_in_vct[5];
-			step_count = step_count + 1;
+	if(blockSize > 1 || adaptiveStep > 0){
+		trackParticlesInBlocks(bunch,fieldSource,extEff,nMax);
+	}
+	else {
+		for(int ip = 0, nParts = bunch->getSize(); ip < nParts; ip++){
+			double t = startParticle(syncPart,partCoordArr[ip],y_in_vct);
 			for(int i = 0; i < 6; i++){
-				y_in_vct[i] = y_out_vct[i];
-			}		
-			rk4Step(t,t_step,fieldSource);
-			//place to account for external effeects
-			if(extEff != NULL) extEff->applyEffectsForEach(bunch, ip, y_in_vct, y_out_vct, t, t_step, fieldSource, this);
-			t = t + t_step;
-			/**
-			double e_x,e_y,e_z,b_x,b_y,b_z;
-			fieldSource->getElectricMagneticField(y_out_vct[0],y_out_vct[1],y_out_vct[2],t, e_x,e_y,e_z, b_x,b_y,b_z);
-			std::cout<<"debug step="<<step_count<<" z ="<<y_out_vct[2]<<" x="<<y_out_vct[0]<<" y="<<y_out_vct[1]<<" t="<<t<<std::endl;
-			std::cout<<"debug   ex="<<e_x<<" ey="<<e_y<<" ez="<<e_z<<std::endl;
-			std::cout<<"debug   bx="<<b_x<<" by="<<b_y<<" bz="<<b_z<<std::endl;
-			*/
-			if(step_count > nMax){
-				ORBIT_MPI_Finalize("RungeKuttaTracker::trackBunch - particle cannot exit outside.");
+				y_out_vct[i] = y_in_vct[i];
 			}
-		}
-		if(bunch->flag(ip) > 0){
-			//interpolate the crossing point
-			cross_t = (y_out_vct[0] - y_in_vct[0])*plExitV[0] +
-			          (y_out_vct[1] - y_in_vct[1])*plExitV[1] +
-			          (y_out_vct[2] - y_in_vct[2])*plExitV[2];
-			cross_t = -(plExitV[0]*y_in_vct[0] + 
-				          plExitV[1]*y_in_vct[1] + 
-				          plExitV[2]*y_in_vct[2] + plExitV[3])/cross_t;	
-			for(int i = 0; i < 3; i++){
-				r_final_vct[i] = cross_t* (y_out_vct[i] - y_in_vct[i])+ y_in_vct[i];
-				//std::cerr<<"debug r_vct["<< i<<"]="<< r_final_vct[i]<<std::endl;
-			}
-			for(int i = 0; i < 3; i++){
-				p_final_vct[i] = cross_t* (y_out_vct[i+3] - y_in_vct[i+3])+ y_in_vct[i+3];
-				//std::cerr<<"debug p_vct["<< i<<"]="<< p_final_vct[i]<<std::endl;
+			int step_count = 0;
+			while(isBeforeExit(y_out_vct) && bunch->flag(ip) > 0){
+				partCoordArr[ip][0] = y_in_vct[0];
+				partCoordArr[ip][2] = y_in_vct[1];
+				partCoordArr[ip][4] = y_in_vct[2];
+				partCoordArr[ip][1] = y_in_vct[3];
+				partCoordArr[ip][3] = y_in_vct[4];
+				partCoordArr[ip][5] = y_in_vct[5];
+				step_count = step_count + 1;
+				for(int i = 0; i < 6; i++){
+					y_in_vct[i] = y_out_vct[i];
+				}		
+				rk4Step(t,t_step,fieldSource);
+				//place to account for external effeects
+				if(extEff != NULL) extEff->applyEffectsForEach(bunch, ip, y_in_vct, y_out_vct, t, t_step, fieldSource, this);
+				t = t + t_step;
+				if(step_count > nMax){
+					ORBIT_MPI_Finalize("RungeKuttaTracker::trackBunch - particle cannot exit outside.");
+				}
 			}
-			//for(int i = 0; i < 6; i++){
-			//	std::cerr<<"debug p_sync["<< i<<"]="<< y_sync_final_vct[i]<<std::endl;
-			//}
-			for(int i = 0; i < 3; i++){
-				r_final_vct[i] = (r_final_vct[i] - r_sync_final_vct[i]);
+			if(bunch->flag(ip) > 0){
+				finishParticle(syncPart,partCoordArr[ip],y_in_vct,y_out_vct,t,t_step);
 			}
-			t_final = t + t_step*(cross_t - 1.);
-			//std::cerr<<"debug t_final="<< t_final <<std::endl;
-			//tracking is finished, let's put final coordinates 
-		  p_part2 = p_final_vct[0]*p_final_vct[0] + p_final_vct[1]*p_final_vct[1] + p_final_vct[2]*p_final_vct[2];
-			p_part = sqrt(p_part2);
-		  enrg_part = syncPart->momentumToEnergy(p_part);
-			partCoordArr[ip][5] = enrg_part - energy_sync_final;
-			xp = (p_final_vct[0]*nx_final_vct[0] + p_final_vct[1]*nx_final_vct[1] + p_final_vct[2]*nx_final_vct[2]);
-			yp = (p_final_vct[0]*ny_final_vct[0] + p_final_vct[1]*ny_final_vct[1] + p_final_vct[2]*ny_final_vct[2]);
-			pz_along = sqrt(p_part2 - xp*xp -yp*yp);
-			xp_coef = (1.+partCoordArr[ip][5]/(pSyncPart_final*beta_sync_final))/pz_along;
-			partCoordArr[ip][1] = xp*xp_coef;			
-			partCoordArr[ip][3] = yp*xp_coef;
-			partCoordArr[ip][0] = (r_final_vct[0]*nx_final_vct[0] + 
-				                     r_final_vct[1]*nx_final_vct[1] + 
-														  r_final_vct[2]*nx_final_vct[2]);
-			partCoordArr[ip][2] = (r_final_vct[0]*ny_final_vct[0] + 
-				                     r_final_vct[1]*ny_final_vct[1] + 
-														  r_final_vct[2]*ny_final_vct[2]);
-			partCoordArr[ip][4] = (-(t_final - t_sync_final))*v_sync_final +
-				                    (r_final_vct[0]*p_norm_sync_final_vct[0] +
-				                     r_final_vct[1]*p_norm_sync_final_vct[1] +
-														  r_final_vct[2]*p_norm_sync_final_vct[2]);
 		}
 	}
 	//------------------------------------------------
@@ -484,6 +376,245 @@ void RungeKuttaTracker::trackBunch(Bunch* bunch, BaseFieldSource* fieldSource, E
 	*/
 }
 
+/** 
+  It transforms the particle's coordinates x, x', y, y', z, dE into the position and momentum
+	vectors y[6] at the entrance plane, and returns the time of the crossing the entrance plane.
+*/
+double RungeKuttaTracker::startParticle(SyncPart* syncPart, double* coord, double* y){
+	double x = coord[0];
+	double y_p = coord[2];
+	double xp = coord[1];
+	double yp = coord[3];
+	double dE = coord[5];
+	// Transformations here are the subject of the meaning of x' and y' and
+	// how they are related to the transverse momentum of particles.
+	// Here we use these transformations to comply to the Drift element of the TEAPOT.
+	// At the end of the tracking we have to do backward transformations.
+	double enrg_part = energy_sync_start+dE;
+	double p_part2 = enrg_part*(enrg_part + 2*mass);
+	double p_part = sqrt(p_part2);
+	double xp_coef = 1./(1.+dE/(pSyncPart_start*beta_sync_start));
+	double xp2 = pow(xp*xp_coef,2);
+	double yp2 = pow(yp*xp_coef,2);		
+	double pz_along = sqrt(p_part2/(1.+xp2+yp2));
+	double px_xp_coef = pz_along*xp_coef;
+	double p_start_vct[3];
+	double r_start_vct[3];
+	double v_vct[3];
+	//find the transverse (relative to the synch. particle moment) moment vector
+	for(int i = 0; i < 3; i++){
+		p_start_vct[i] = px_xp_coef*(xp*nx_start_vct[i] + yp*ny_start_vct[i]);
+		p_start_vct[i] = p_start_vct[i] + pz_along*p_norm_sync_start_vct[i];
+	}
+	//now absolute position 
+	for(int i = 0; i < 3; i++){
+		r_start_vct[i] = r_sync_start_vct[i] + x*nx_start_vct[i] + y_p*ny_start_vct[i];
+	}
+	enrg_part = syncPart->momentumToEnergy(p_part);
+	for(int i = 0; i < 3; i++){
+		v_vct[i] = c_light*p_start_vct[i]/enrg_part;
+	}
+	//find the entrance point and time
+	double cross_t = plEntrV[0]*v_vct[0] + plEntrV[1]*v_vct[1] + plEntrV[2]*v_vct[2];
+	double t_start = -(plEntrV[0]*r_start_vct[0] + plEntrV[1]*r_start_vct[1] + 
+		                 plEntrV[2]*r_start_vct[2] + plEntrV[3])/cross_t;	
+	for(int i = 0; i < 3; i++){
+		y[i] = t_start*v_vct[i] + r_start_vct[i];
+		y[i+3] = p_start_vct[i];
+	}
+	t_start = t_start - coord[4]/v_sync_start;
+	return t_start;
+}
+
+/** 
+  It finds the crossing point of the exit plane between y_in and y_out vectors
+	of the last step and transforms it back into the x, x', y, y', z, dE coordinates.
+*/
+void RungeKuttaTracker::finishParticle(SyncPart* syncPart, double* coord, double* y_in, double* y_out, double t, double t_st){
+	double r_final_vct[3];
+	double p_final_vct[3];
+	//interpolate the crossing point
+	double cross_t = (y_out[0] - y_in[0])*plExitV[0] +
+	                 (y_out[1] - y_in[1])*plExitV[1] +
+	                 (y_out[2] - y_in[2])*plExitV[2];
+	cross_t = -(plExitV[0]*y_in[0] + 
+	            plExitV[1]*y_in[1] + 
+	            plExitV[2]*y_in[2] + plExitV[3])/cross_t;	
+	for(int i = 0; i < 3; i++){
+		r_final_vct[i] = cross_t* (y_out[i] - y_in[i])+ y_in[i];
+		p_final_vct[i] = cross_t* (y_out[i+3] - y_in[i+3])+ y_in[i+3];
+		r_final_vct[i] = (r_final_vct[i] - r_sync_final_vct[i]);
+	}
+	double t_final = t + t_st*(cross_t - 1.);
+	//tracking is finished, let's put final coordinates 
+	double p_part2 = p_final_vct[0]*p_final_vct[0] + p_final_vct[1]*p_final_vct[1] + p_final_vct[2]*p_final_vct[2];
+	double p_part = sqrt(p_part2);
+	double enrg_part = syncPart->momentumToEnergy(p_part);
+	coord[5] = enrg_part - energy_sync_final;
+	double xp = (p_final_vct[0]*nx_final_vct[0] + p_final_vct[1]*nx_final_vct[1] + p_final_vct[2]*nx_final_vct[2]);
+	double yp = (p_final_vct[0]*ny_final_vct[0] + p_final_vct[1]*ny_final_vct[1] + p_final_vct[2]*ny_final_vct[2]);
+	double pz_along = sqrt(p_part2 - xp*xp -yp*yp);
+	double xp_coef = (1.+coord[5]/(pSyncPart_final*beta_sync_final))/pz_along;
+	coord[1] = xp*xp_coef;			
+	coord[3] = yp*xp_coef;
+	coord[0] = (r_final_vct[0]*nx_final_vct[0] + 
+	            r_final_vct[1]*nx_final_vct[1] + 
+	            r_final_vct[2]*nx_final_vct[2]);
+	coord[2] = (r_final_vct[0]*ny_final_vct[0] + 
+	            r_final_vct[1]*ny_final_vct[1] + 
+	            r_final_vct[2]*ny_final_vct[2]);
+	coord[4] = (-(t_final - t_sync_final))*v_sync_final +
+	           (r_final_vct[0]*p_norm_sync_final_vct[0] +
+	            r_final_vct[1]*p_norm_sync_final_vct[1] +
+	            r_final_vct[2]*p_norm_sync_final_vct[2]);
+}
+
+/** 
+  It tracks the particles of the bunch in blocks of blockSize particles. All particles in
+	the block make the integration step together, so the field source is called once for 
+	all of them on each Runge-Kutta stage. When a particle crosses the exit plane its place
+	in the block is taken by the next particle of the bunch. If the adaptive step is on, 
+	the Cash-Karp embedded method is used, and the step of each particle is controlled 
+	separately to keep the local error below eps/n_steps.
+*/
+void RungeKuttaTracker::trackParticlesInBlocks(Bunch* bunch, BaseFieldSource* fieldSource, ExternalEffects* extEff, int nMax){
+	SyncPart* syncPart = bunch->getSyncPart();
+	double** partCoordArr = bunch->coordArr();
+	int nParts = bunch->getSize();
+	int nb = blockSize;
+	if(nb < 1) nb = 1;
+	resizeBlockBuffers(nb);
+	std::vector<int> ip_arr(nb), count_arr(nb), pend_arr(nb), pend_next_arr(nb);
+	std::vector<double> t_arr(nb), h_arr(nb), h_used_arr(nb);
+	std::vector<double> y_in_arr(6*nb), y_out_arr(6*nb);
+	std::vector<double> g_t_arr(nb), g_h_arr(nb), g_err_arr(nb);
+	std::vector<double> g_y_arr(6*nb), g_y_out_arr(6*nb);
+	double h_max = 10.*t_step;
+	double h_min = 1.0e-6*t_step;
+	int nMaxSteps = nMax;
+	if(adaptiveStep > 0) nMaxSteps = 10*nMax;
+	int nAct = 0;
+	int ip_next = 0;
+	while(nAct > 0 || ip_next < nParts){
+		//fill the free places in the block by new particles
+		while(nAct < nb && ip_next < nParts){
+			int ip = ip_next;
+			ip_next++;
+			double* y_in = &y_in_arr[6*nAct];
+			t_arr[nAct] = startParticle(syncPart,partCoordArr[ip],y_in);
+			for(int i = 0; i < 6; i++){
+				y_out_arr[6*nAct+i] = y_in[i];
+			}
+			ip_arr[nAct] = ip;
+			count_arr[nAct] = 0;
+			h_arr[nAct] = t_step;
+			h_used_arr[nAct] = t_step;
+			nAct++;
+		}
+		//remove the particles that crossed the exit plane or were killed
+		int ind = 0;
+		while(ind < nAct){
+			int ip = ip_arr[ind];
+			if(isBeforeExit(&y_out_arr[6*ind]) && bunch->flag(ip) > 0){
+				ind++;
+				continue;
+			}
+			if(bunch->flag(ip) > 0){
+				finishParticle(syncPart,partCoordArr[ip],&y_in_arr[6*ind],&y_out_arr[6*ind],t_arr[ind],h_used_arr[ind]);
+			}
+			nAct--;
+			if(ind != nAct){
+				ip_arr[ind] = ip_arr[nAct];
+				count_arr[ind] = count_arr[nAct];
+				t_arr[ind] = t_arr[nAct];
+				h_arr[ind] = h_arr[nAct];
+				h_used_arr[ind] = h_used_arr[nAct];
+				for(int i = 0; i < 6; i++){
+					y_in_arr[6*ind+i] = y_in_arr[6*nAct+i];
+					y_out_arr[6*ind+i] = y_out_arr[6*nAct+i];
+				}
+			}
+		}
+		if(nAct == 0) continue;
+		//one integration step for all particles in the block
+		for(ind = 0; ind < nAct; ind++){
+			double* coord = partCoordArr[ip_arr[ind]];
+			double* y_in = &y_in_arr[6*ind];
+			double* y_out = &y_out_arr[6*ind];
+			coord[0] = y_in[0];
+			coord[2] = y_in[1];
+			coord[4] = y_in[2];
+			coord[1] = y_in[3];
+			coord[3] = y_in[4];
+			coord[5] = y_in[5];
+			for(int i = 0; i < 6; i++){
+				y_in[i] = y_out[i];
+			}
+			count_arr[ind] += 1;
+			pend_arr[ind] = ind;
+		}
+		int nPend = nAct;
+		while(nPend > 0){
+			for(int k = 0; k < nPend; k++){
+				ind = pend_arr[k];
+				g_t_arr[k] = t_arr[ind];
+				g_h_arr[k] = h_arr[ind];
+				for(int i = 0; i < 6; i++){
+					g_y_arr[6*k+i] = y_in_arr[6*ind+i];
+				}
+			}
+			if(adaptiveStep > 0){
+				rkckStepArr(nPend,&g_t_arr[0],&g_h_arr[0],&g_y_arr[0],&g_y_out_arr[0],&g_err_arr[0],fieldSource);
+			}
+			else {
+				rk4StepArr(nPend,&g_t_arr[0],&g_h_arr[0],&g_y_arr[0],&g_y_out_arr[0],fieldSource);
+			}
+			int nPendNext = 0;
+			for(int k = 0; k < nPend; k++){
+				ind = pend_arr[k];
+				if(adaptiveStep > 0 && g_err_arr[k] > 1.0){
+					//the step is rejected
+					double fact = 0.9*pow(g_err_arr[k],-0.25);
+					if(fact < 0.1) fact = 0.1;
+					h_arr[ind] = fact*g_h_arr[k];
+					count_arr[ind] += 1;
+					if(h_arr[ind] < h_min || count_arr[ind] > nMaxSteps){
+						ORBIT_MPI_Finalize("RungeKuttaTracker::trackBunch - the adaptive step cannot reach the accuracy.");
+					}
+					pend_next_arr[nPendNext] = ind;
+					nPendNext++;
+					continue;
+				}
+				for(int i = 0; i < 6; i++){
+					y_out_arr[6*ind+i] = g_y_out_arr[6*k+i];
+				}
+				h_used_arr[ind] = g_h_arr[k];
+				if(adaptiveStep > 0){
+					double err = g_err_arr[k];
+					if(err < 1.0e-4) err = 1.0e-4;
+					double fact = 0.9*pow(err,-0.2);
+					if(fact > 5.) fact = 5.;
+					h_arr[ind] = fact*g_h_arr[k];
+					if(h_arr[ind] > h_max) h_arr[ind] = h_max;
+				}
+			}
+			for(int k = 0; k < nPendNext; k++){
+				pend_arr[k] = pend_next_arr[k];
+			}
+			nPend = nPendNext;
+		}
+		for(ind = 0; ind < nAct; ind++){
+			//place to account for external effeects
+			if(extEff != NULL) extEff->applyEffectsForEach(bunch, ip_arr[ind], &y_in_arr[6*ind], &y_out_arr[6*ind], 
+				                                           t_arr[ind], h_used_arr[ind], fieldSource, this);
+			t_arr[ind] += h_used_arr[ind];
+			if(count_arr[ind] > nMaxSteps){
+				ORBIT_MPI_Finalize("RungeKuttaTracker::trackBunch - particle cannot exit outside.");
+			}
+		}
+	}
+}
+
 void RungeKuttaTracker::track(Bunch* bunch,double t_begin, double t_period, double t_step_in, 
 	                            BaseFieldSource* fieldSource, ExternalEffects* extEff)
 {
@@ -653,3 +784,148 @@ void RungeKuttaTracker::calculateRightSideODE(double t, BaseFieldSource* fieldSo
 	ff_vct[5] = ff_vct[5]/1.0e+9;
 }
 
+void RungeKuttaTracker::resizeBlockBuffers(int nb){
+	if(((int) blk_t_arr.size()) >= nb) return;
+	blk_y_arr.resize(6*nb);
+	blk_t_arr.resize(nb);
+	blk_f_arr.resize(6*nb);
+	blk_k_arr.resize(6*6*nb);
+	blk_r_arr.resize(3*nb);
+	blk_e_arr.resize(3*nb);
+	blk_b_arr.resize(3*nb);
+}
+
+void RungeKuttaTracker::rk4StepArr(int n, double* t_arr, double* h_arr, double* y_arr, double* y_out_arr, 
+	                                 BaseFieldSource* fieldSource){
+	double* y_st = &blk_y_arr[0];
+	double* t_st = &blk_t_arr[0];
+	double* ff = &blk_f_arr[0];
+	double* k1 = &blk_k_arr[0];
+	double* k2 = k1 + 6*n;
+	double* k3 = k2 + 6*n;
+	double* k4 = k3 + 6*n;
+	calculateRightSideODEArr(n,y_arr,t_arr,ff,fieldSource);
+	for(int ip = 0; ip < n; ip++){
+		t_st[ip] = t_arr[ip] + h_arr[ip]*0.5;
+		for(int i = 0; i < 6; i++){
+			k1[6*ip+i] = h_arr[ip]*ff[6*ip+i];
+			y_st[6*ip+i] = y_arr[6*ip+i] + k1[6*ip+i]*0.5;
+		}
+	}
+	calculateRightSideODEArr(n,y_st,t_st,ff,fieldSource);
+	for(int ip = 0; ip < n; ip++){
+		for(int i = 0; i < 6; i++){
+			k2[6*ip+i] = h_arr[ip]*ff[6*ip+i];
+			y_st[6*ip+i] = y_arr[6*ip+i] + k2[6*ip+i]*0.5;
+		}
+	}
+	calculateRightSideODEArr(n,y_st,t_st,ff,fieldSource);
+	for(int ip = 0; ip < n; ip++){
+		t_st[ip] = t_arr[ip] + h_arr[ip];
+		for(int i = 0; i < 6; i++){
+			k3[6*ip+i] = h_arr[ip]*ff[6*ip+i];
+			y_st[6*ip+i] = y_arr[6*ip+i] + k3[6*ip+i];
+		}
+	}
+	calculateRightSideODEArr(n,y_st,t_st,ff,fieldSource);
+	for(int ip = 0; ip < n; ip++){
+		for(int i = 0; i < 6; i++){
+			k4[6*ip+i] = h_arr[ip]*ff[6*ip+i];
+			int j = 6*ip+i;
+			y_out_arr[j] = y_arr[j] + (k1[j] + 2*(k2[j] + k3[j]) + k4[j])/6.0;
+		}
+	}
+}
+
+void RungeKuttaTracker::rkckStepArr(int n, double* t_arr, double* h_arr, double* y_arr, double* y_out_arr, 
+	                                  double* err_arr, BaseFieldSource* fieldSource){
+	//Cash-Karp coefficients
+	static const double a_arr[6] = {0., 0.2, 0.3, 0.6, 1.0, 0.875};
+	static const double b_arr[6][5] = {
+		{0., 0., 0., 0., 0.},
+		{0.2, 0., 0., 0., 0.},
+		{3.0/40.0, 9.0/40.0, 0., 0., 0.},
+		{0.3, -0.9, 1.2, 0., 0.},
+		{-11.0/54.0, 2.5, -70.0/27.0, 35.0/27.0, 0.},
+		{1631.0/55296.0, 175.0/512.0, 575.0/13824.0, 44275.0/110592.0, 253.0/4096.0}};
+	static const double c_arr[6] = {37.0/378.0, 0., 250.0/621.0, 125.0/594.0, 0., 512.0/1771.0};
+	static const double dc_arr[6] = {37.0/378.0 - 2825.0/27648.0, 0., 250.0/621.0 - 18575.0/48384.0,
+		125.0/594.0 - 13525.0/55296.0, -277.0/14336.0, 512.0/1771.0 - 0.25};
+	double* y_st = &blk_y_arr[0];
+	double* t_st = &blk_t_arr[0];
+	double* ff = &blk_f_arr[0];
+	double* k_arr = &blk_k_arr[0];
+	for(int is = 0; is < 6; is++){
+		for(int ip = 0; ip < n; ip++){
+			t_st[ip] = t_arr[ip] + a_arr[is]*h_arr[ip];
+			for(int i = 0; i < 6; i++){
+				double val = y_arr[6*ip+i];
+				for(int js = 0; js < is; js++){
+					val += b_arr[is][js]*k_arr[6*n*js + 6*ip + i];
+				}
+				y_st[6*ip+i] = val;
+			}
+		}
+		calculateRightSideODEArr(n,y_st,t_st,ff,fieldSource);
+		double* k = k_arr + 6*n*is;
+		for(int ip = 0; ip < n; ip++){
+			for(int i = 0; i < 6; i++){
+				k[6*ip+i] = h_arr[ip]*ff[6*ip+i];
+			}
+		}
+	}
+	//the local error is normalized by eps/n_steps for positions and 
+	//by the same relative value for momentum
+	double eps_r = eps/n_steps;
+	for(int ip = 0; ip < n; ip++){
+		double* y = y_arr + 6*ip;
+		double p = sqrt(y[3]*y[3] + y[4]*y[4] + y[5]*y[5]);
+		double eps_p = p*eps_r/length;
+		double err = 0.;
+		for(int i = 0; i < 6; i++){
+			double val = y[i];
+			double d_val = 0.;
+			for(int is = 0; is < 6; is++){
+				val += c_arr[is]*k_arr[6*n*is + 6*ip + i];
+				d_val += dc_arr[is]*k_arr[6*n*is + 6*ip + i];
+			}
+			y_out_arr[6*ip+i] = val;
+			if(i < 3){
+				d_val = fabs(d_val)/eps_r;
+			}
+			else {
+				d_val = fabs(d_val)/eps_p;
+			}
+			if(d_val > err) err = d_val;
+		}
+		err_arr[ip] = err;
+	}
+}
+
+void RungeKuttaTracker::calculateRightSideODEArr(int n, double* y_arr, double* t_arr, double* f_arr, 
+	                                               BaseFieldSource* fieldSource){
+	double* r_arr = &blk_r_arr[0];
+	double* e_arr = &blk_e_arr[0];
+	double* b_arr = &blk_b_arr[0];
+	for(int ip = 0; ip < n; ip++){
+		r_arr[3*ip+0] = y_arr[6*ip+0];
+		r_arr[3*ip+1] = y_arr[6*ip+1];
+		r_arr[3*ip+2] = y_arr[6*ip+2];
+	}
+	fieldSource->getElectricMagneticFieldArr(n,r_arr,t_arr,e_arr,b_arr);
+	for(int ip = 0; ip < n; ip++){
+		double* y = y_arr + 6*ip;
+		double* ff = f_arr + 6*ip;
+		double* e = e_arr + 3*ip;
+		double* b = b_arr + 3*ip;
+		double coef = mass2 + y[3]*y[3] + y[4]*y[4] + y[5]*y[5];
+		coef = c_light/sqrt(coef);
+		ff[0] = y[3]*coef;
+		ff[1] = y[4]*coef;
+		ff[2] = y[5]*coef;
+		coef *= charge;
+		ff[3] = c_light*(charge*e[0] + coef*(y[4]*b[2] - y[5]*b[1]))/1.0e+9;
+		ff[4] = c_light*(charge*e[1] + coef*(y[5]*b[0] - y[3]*b[2]))/1.0e+9;
+		ff[5] = c_light*(charge*e[2] + coef*(y[3]*b[1] - y[4]*b[0]))/1.0e+9;
+	}
+}
@@ -17,6 +17,8 @@
 #ifndef RUNGE_KUTTA_3D_TRACKER_H
 #define RUNGE_KUTTA_3D_TRACKER_H
 
+#include <vector>
+
 #include "Bunch.hh"
 #include "BaseFieldSource.hh"
 #include "ExternalEffects.hh"
@@ -63,6 +65,20 @@ namespace TrackerRK4{
 		/** It returns the approximate length of the region. */
 		double getLength();
 		
+		/** It sets the number of particles that are integrated together. 
+		    If it is 1 and the adaptive step is off the particles are tracked one by one.
+		*/
+		void setBlockSize(int blockSize);
+		
+		/** It returns the number of particles that are integrated together. */
+		int getBlockSize();
+		
+		/** It switches on (1) or off (0) the adaptive step size control for particles. */
+		void setAdaptiveStep(int adaptiveStep);
+		
+		/** It returns 1 if the adaptive step size control is on and 0 otherwise. */
+		int getAdaptiveStep();
+		
 		/** It sets (a*x+b*y+c*z+d=0) coefficients for the entrance plane. */
 		void setEntrPlane(double a, double b, double c, double d);
 		
@@ -115,6 +131,25 @@ namespace TrackerRK4{
 		void calculateRightSideODE(double t, OrbitUtils::BaseFieldSource* fieldSource);
 		void rk4Step(double t, double t_st, OrbitUtils::BaseFieldSource* fieldSource);
 		
+		//transforms x,xp,y,yp,z,dE into r,p vector at the entrance and returns the start time
+		double startParticle(SyncPart* syncPart, double* coord, double* y);
+		
+		//finds the exit plane crossing and transforms r,p back into x,xp,y,yp,z,dE
+		void finishParticle(SyncPart* syncPart, double* coord, double* y_in, double* y_out, double t, double t_st);
+		
+		//tracks particles of the bunch in blocks with the bulk field calculations
+		void trackParticlesInBlocks(Bunch* bunch, OrbitUtils::BaseFieldSource* fieldSource, ExternalEffects* extEff, int nMax);
+		
+		//the block versions of the right side of ODE and the integration steps
+		//y_arr are [n*6] arrays, t_arr and h_arr are [n] arrays
+		void resizeBlockBuffers(int nb);
+		void calculateRightSideODEArr(int n, double* y_arr, double* t_arr, double* f_arr, 
+			                            OrbitUtils::BaseFieldSource* fieldSource);
+		void rk4StepArr(int n, double* t_arr, double* h_arr, double* y_arr, double* y_out_arr, 
+			              OrbitUtils::BaseFieldSource* fieldSource);
+		void rkckStepArr(int n, double* t_arr, double* h_arr, double* y_arr, double* y_out_arr, 
+			               double* err_arr, OrbitUtils::BaseFieldSource* fieldSource);
+		
 		//-----------------------------------
 		//  private data members
 		//-----------------------------------
@@ -162,6 +197,40 @@ namespace TrackerRK4{
 		double k2_vct[6];
 		double k3_vct[6];
 		double k4_vct[6];
+		
+		//number of particles integrated together 
+		int blockSize;
+		
+		//adaptive step switch
+		int adaptiveStep;
+		
+		//the synchronous particle frames at the entrance and exit
+		double nx_start_vct[3];
+		double ny_start_vct[3];
+		double nx_final_vct[3];
+		double ny_final_vct[3];
+		double p_norm_sync_start_vct[3];
+		double p_norm_sync_final_vct[3];
+		double r_sync_start_vct[3];	
+		double r_sync_final_vct[3];
+		double v_sync_start;
+		double v_sync_final;
+		double beta_sync_start;
+		double beta_sync_final;
+		double energy_sync_start;
+		double energy_sync_final;
+		double pSyncPart_start;
+		double pSyncPart_final;
+		double t_sync_final;
+		
+		//buffers for the block integration
+		std::vector<double> blk_y_arr;
+		std::vector<double> blk_t_arr;
+		std::vector<double> blk_f_arr;
+		std::vector<double> blk_k_arr;
+		std::vector<double> blk_r_arr;
+		std::vector<double> blk_e_arr;
+		std::vector<double> blk_b_arr;
 	};
 	
 }; // end of TrackerRK4 name-space
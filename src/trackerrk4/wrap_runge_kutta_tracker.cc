@@ -96,6 +96,34 @@ extern "C" {
 		return Py_BuildValue("i",cpp_RungeKuttaTracker->getStepsNumber());
   }	
 	
+	// blockSize([n]) - set or get the number of particles integrated together
+  static PyObject* RungeKuttaTracker_blockSize(PyObject *self, PyObject *args){
+    pyORBIT_Object* pyRungeKuttaTracker = (pyORBIT_Object*) self;
+		RungeKuttaTracker* cpp_RungeKuttaTracker = (RungeKuttaTracker*) pyRungeKuttaTracker->cpp_obj;
+		int n = - 1;
+		if(!PyArg_ParseTuple(args,"|i:blockSize",&n)){
+			error("PyRungeKuttaTracker - the call should be - blockSize([n]).");
+		}
+		if(n > 0){
+			cpp_RungeKuttaTracker->setBlockSize(n);
+		}
+		return Py_BuildValue("i",cpp_RungeKuttaTracker->getBlockSize());
+  }	
+	
+	// adaptiveStep([0 or 1]) - set or get the adaptive step size control switch
+  static PyObject* RungeKuttaTracker_adaptiveStep(PyObject *self, PyObject *args){
+    pyORBIT_Object* pyRungeKuttaTracker = (pyORBIT_Object*) self;
+		RungeKuttaTracker* cpp_RungeKuttaTracker = (RungeKuttaTracker*) pyRungeKuttaTracker->cpp_obj;
+		int adaptive = - 1;
+		if(!PyArg_ParseTuple(args,"|i:adaptiveStep",&adaptive)){
+			error("PyRungeKuttaTracker - the call should be - adaptiveStep([0 or 1]).");
+		}
+		if(adaptive >= 0){
+			cpp_RungeKuttaTracker->setAdaptiveStep(adaptive);
+		}
+		return Py_BuildValue("i",cpp_RungeKuttaTracker->getAdaptiveStep());
+  }	
+	
 	// entrancePlane([(a,b,c,d)]) - set or get the coeff. in a*x+b*y+c*z+d = 0 entrance plane
   static PyObject* RungeKuttaTracker_entrancePlane(PyObject *self, PyObject *args){
     pyORBIT_Object* pyRungeKuttaTracker = (pyORBIT_Object*) self;
@@ -222,6 +250,8 @@ extern "C" {
 		{ "length",          RungeKuttaTracker_length,          METH_VARARGS,"length([L in meter]) - approximate length."},
 		{ "timeStep",        RungeKuttaTracker_timeStep,        METH_VARARGS,"returns time step in seconds."},
 		{ "stepsNumber",     RungeKuttaTracker_stepsNumber,     METH_VARARGS,"sets or returns the number of steps in integration."},
+		{ "blockSize",       RungeKuttaTracker_blockSize,       METH_VARARGS,"sets or returns the number of particles integrated together."},
+		{ "adaptiveStep",    RungeKuttaTracker_adaptiveStep,    METH_VARARGS,"sets or returns 1 or 0 - adaptive step size control is on or off."},
 		{ "entrancePlane",   RungeKuttaTracker_entrancePlane,   METH_VARARGS,"sets or returns (a,b,c,d) in a*x+b*y+c*z+d=0 for entrance."}, 
 		{ "exitPlane",       RungeKuttaTracker_exitPlane,       METH_VARARGS,"sets or returns (a,b,c,d) in a*x+b*y+c*z+d=0 for exit."}, 
 		{ "isOutside",       RungeKuttaTracker_isOutside,       METH_VARARGS,"returns 0 or 1"}, 
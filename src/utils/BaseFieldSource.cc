@@ -36,4 +36,14 @@ void BaseFieldSource::getElectricMagneticField(
 	
 }
 
-
+void BaseFieldSource::getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+		double* e_arr, double* h_arr){
+	
+	for(int i = 0; i < nPoints; i++){
+		double* r = r_arr + 3*i;
+		double* e = e_arr + 3*i;
+		double* h = h_arr + 3*i;
+		getElectricMagneticField(r[0],r[1],r[2],t_arr[i],e[0],e[1],e[2],h[0],h[1],h[2]);
+	}
+	
+}
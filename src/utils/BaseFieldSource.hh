@@ -38,6 +38,15 @@ namespace OrbitUtils{
 			  double x, double y, double z, double t, 
 				double& E_x, double& E_y, double& E_z,
 				double& H_x, double& H_y, double& H_z);
+		
+		/** Returns components of the electric and magnetic filds for nPoints points. 
+		    The r_arr, e_arr, and h_arr arrays are [nPoints*3] arrays of (x,y,z) vectors,
+		    and t_arr is [nPoints] array of times. The default implementation calls 
+		    getElectricMagneticField(...) for each point. Subclasses can override it to
+		    avoid the virtual call per point.
+		*/
+		virtual void getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+				double* e_arr, double* h_arr);
 
 	};
 };
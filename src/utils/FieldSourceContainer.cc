@@ -82,6 +82,32 @@ void FieldSourceContainer::getElectricMagneticField(double x, double y, double z
 	
 }
 
+/** Returns the sums of the fields of all sources for nPoints points. */
+void FieldSourceContainer::getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+				double* e_arr, double* h_arr)	{
+	
+	if(nPoints <= 0) return;
+	
+	for(int i = 0, n = 3*nPoints; i < n; i++){
+		e_arr[i] = 0.;
+		h_arr[i] = 0.;
+	}
+	
+	if(((int) e_buff.size()) < 3*nPoints){
+		e_buff.resize(3*nPoints);
+		h_buff.resize(3*nPoints);
+	}
+	
+	for (int i=0;i<ref.size();i++){
+		ref[i]->getElectricMagneticFieldArr(nPoints, r_arr, t_arr, &e_buff[0], &h_buff[0]);
+		for(int j = 0, n = 3*nPoints; j < n; j++){
+			e_arr[j] += e_buff[j];
+			h_arr[j] += h_buff[j];
+		}
+	}
+	
+}
+
 
 
 
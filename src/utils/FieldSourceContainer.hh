@@ -48,9 +48,19 @@ namespace OrbitUtils{
 						double& E_x, double& E_y, double& E_z,
 						double& H_x, double& H_y, double& H_z);
 		
+		/** Returns the sums of the fields of all sources for nPoints points. 
+		    Each source is called once for all points.
+		*/
+		void getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+						double* e_arr, double* h_arr);
+		
 		private:
 
 			std::vector<BaseFieldSource*>	ref;
+			
+			//buffers for the fields of one source
+			std::vector<double> e_buff;
+			std::vector<double> h_buff;
 
 	};
 };
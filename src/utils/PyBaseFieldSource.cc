@@ -11,6 +11,9 @@
 //    It should be sub-classed on Python level and implements 
 //    getElectricMagneticField(x,y,z,t) method (returns (Ex,Ey,Ez,Bx,By,Bz)).
 //    The results of these methods will be available from the c++ level.
+//    The subclass can also implement getElectricMagneticFieldArr(points)
+//    method for the bulk calculations. The points is a tuple of (x,y,z,t)
+//    tuples, and the method returns a sequence of (Ex,Ey,Ez,Bx,By,Bz).
 //    This is an example of embedding Python in C++ Orbit level.
 //
 //    ATTENTION: Using this class in real calculations is not wise! 
@@ -48,3 +51,35 @@ void PyBaseFieldSource::getElectricMagneticField(
 		//the references should be decreased because they were created as "new reference"
 		Py_DECREF(ef_tuple);
 }
+
+void PyBaseFieldSource::getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+	double* e_arr, double* h_arr)
+{
+	PyObject* py_wrp = getPyWrapper();
+	if(!PyObject_HasAttrString(py_wrp,"getElectricMagneticFieldArr")){
+		BaseFieldSource::getElectricMagneticFieldArr(nPoints,r_arr,t_arr,e_arr,h_arr);
+		return;
+	}
+	PyObject* py_points = PyTuple_New(nPoints);
+	for(int i = 0; i < nPoints; i++){
+		double* r = r_arr + 3*i;
+		PyTuple_SET_ITEM(py_points,i,Py_BuildValue("(dddd)",r[0],r[1],r[2],t_arr[i]));
+	}
+	PyObject* py_fields = PyObject_CallMethod(py_wrp,(char*) "getElectricMagneticFieldArr",(char*) "(O)",py_points);
+	Py_DECREF(py_points);
+	if(py_fields == NULL || !PySequence_Check(py_fields) || PySequence_Size(py_fields) != nPoints){
+		ORBIT_MPI_Finalize("PyBaseFieldSource - getElectricMagneticFieldArr(points) should return the sequence of fields for all points!");
+	}
+	for(int i = 0; i < nPoints; i++){
+		double* e = e_arr + 3*i;
+		double* h = h_arr + 3*i;
+		//the new reference
+		PyObject* py_field = PySequence_GetItem(py_fields,i);
+		if(!PyArg_ParseTuple(py_field,"dddddd:electric_magnetic_field",&e[0],&e[1],&e[2],&h[0],&h[1],&h[2])){
+			ORBIT_MPI_Finalize("PyBaseFieldSource - getElectricMagneticFieldArr(points) should return (Ex,Ey,Ez,Bx,By,Bz) for each point!");
+		}
+		Py_DECREF(py_field);
+	}
+	//the references should be decreased because they were created as "new reference"
+	Py_DECREF(py_fields);
+}
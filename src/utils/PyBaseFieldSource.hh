@@ -11,6 +11,9 @@
 //    It should be sub-classed on Python level and implements 
 //    getElectricMagneticField(x,y,z,t) method (returns (Ex,Ey,Ez,Bx,By,Bz)).
 //    The results of these methods will be available from the c++ level.
+//    The subclass can also implement getElectricMagneticFieldArr(points)
+//    method for the bulk calculations. The points is a tuple of (x,y,z,t)
+//    tuples, and the method returns a sequence of (Ex,Ey,Ez,Bx,By,Bz).
 //    This is an example of embedding Python in C++ Orbit level.
 //
 //    ATTENTION: Using this class in real calculations is not wise! 
@@ -55,6 +58,14 @@ namespace OrbitUtils{
 				double& fe_x, double& fe_y, double& fe_z,
 				double& fm_x, double& fm_y, double& fm_z);
 
+			/** Returns E and B for nPoints points. It calls the Python 
+			    getElectricMagneticFieldArr(points) method once for all points if the 
+			    Python class has it, and getElectricMagneticField(x,y,z,t) for each 
+			    point otherwise.
+			*/
+			void getElectricMagneticFieldArr(int nPoints, double* r_arr, double* t_arr,
+				double* e_arr, double* h_arr);
+
 	};
 };
 
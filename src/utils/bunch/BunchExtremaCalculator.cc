@@ -131,6 +131,43 @@ void BunchExtremaCalculator::getExtremaXpYpdE(Bunch* bunch,
 	OrbitUtils::BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index1);	
 }
 	
+/** The method calculates the extrema of all 6D coordinates in one pass and one MPI reduction. */
+void BunchExtremaCalculator::getExtrema(Bunch* bunch, double* coordMin, double* coordMax)
+{
+	int buff_index0 = 0;
+	int buff_index1 = 0;
+	double* gridLimArr  = BufferStore::getBufferStore()->getFreeDoubleArr(buff_index0,12);
+	double* gridLimArr_out = BufferStore::getBufferStore()->getFreeDoubleArr(buff_index1,12);
+	for (int i = 0; i < 6; i++){
+		gridLimArr[2*i] = DBL_MAX;
+		gridLimArr[2*i+1] = -DBL_MAX;
+	}
+	
+	double** partArr=bunch->coordArr();
+	double* coordArr = NULL;
+	for (int ip = 0, n = bunch->getSize(); ip < n; ip++){
+		coordArr = partArr[ip];
+		for (int i = 0; i < 6; i++){
+			if(coordArr[i] < gridLimArr[2*i]) gridLimArr[2*i] = coordArr[i];
+			if(coordArr[i] > gridLimArr[2*i+1]) gridLimArr[2*i+1] = coordArr[i];
+		}
+	}
+	
+	for (int i = 0; i < 6; i++){
+		gridLimArr[2*i] = - gridLimArr[2*i];
+	}
+
+	ORBIT_MPI_Allreduce(gridLimArr,gridLimArr_out,12,MPI_DOUBLE,MPI_MAX,bunch->getMPI_Comm_Local()->comm);
+
+	for (int i = 0; i < 6; i++){
+		coordMin[i] = - gridLimArr_out[2*i];
+		coordMax[i] = gridLimArr_out[2*i+1];
+	}
+
+	OrbitUtils::BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index0);
+	OrbitUtils::BufferStore::getBufferStore()->setUnusedDoubleArr(buff_index1);	
+}
+	
 /** The method calculates the z extrema of the particles coordinates in the bunch. */
 void BunchExtremaCalculator::getExtremaZ(Bunch* bunch, 
 	double& zMin, double& zMax)
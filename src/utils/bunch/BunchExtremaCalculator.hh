@@ -48,6 +48,9 @@ namespace OrbitUtils{
 			double& ypMin, double& ypMax, 
 			double& dE_Min, double& dE_Max);
 			
+			/** The method calculates the extrema of all 6D coordinates in one pass and one MPI reduction. */
+			void getExtrema(Bunch* bunch, double* coordMin, double* coordMax);
+			
 			/** The method calculates the z extrema of the particles coordinates in the bunch. */
 			void getExtremaZ(Bunch* bunch,  
 				double& zMin, double& zMax)	;	
@@ -27,6 +27,12 @@
 //    These functions will fill out the A_mtr that will be a transport matrix between
 //    initial coordinates and 6D coordinates.
 //    
+//    6. transport_mtrx_sums_from_init_coords(bunch, double* sums_arr)
+//    7. transport_mtrx_from_sums(double* sums_arr, Matrix* A_mtr)
+//    These functions split the function 3 into the local accumulation of sums
+//    and the solution of the normal equations. The sums for many places in the 
+//    lattice can be summed over CPUs in one MPI call before the solution.
+//
 //    5. This function will apply weights for macro-size of each particle according to the 
 //    value wx = exp(-(x^2+(alphax*x+betax*x')^2)/(2*(betax*emittancex)) etc. This function
 //    is used inside the function 4.
@@ -309,6 +315,140 @@ namespace OrbitUtils{
 		return n_parts_global;
 	}
 	
+	/** 
+	  A function accumulates the local sums for the transport matrix
+	  in one pass over the particles. The sums are added to sums_arr.
+	  It returns the number of particles in the bunch.
+	*/
+	int transport_mtrx_sums_from_init_coords(Bunch* bunch, double* sums_arr){
+		
+		if(bunch->hasParticleAttributes("ParticleInitialCoordinates") == 0){
+			int rank_MPI = 0;
+			ORBIT_MPI_Comm_rank(bunch->getMPI_Comm_Local()->comm, &rank_MPI);
+			if(rank_MPI == 0){
+				std::cerr << "OrbitUtils::bunch_utils_functions::transport_mtrx_sums_from_init_coords(...) function"<< std::endl;
+				std::cerr << "There is no ParticleAttributes  in Bunch with this name."<< std::endl;
+				std::cerr << "Attr. name:"<<" ParticleInitialCoordinates "<< std::endl;
+			}
+			ORBIT_MPI_Finalize();		
+		}
+		ParticleInitialCoordinates* partInitCoordsAttr = (ParticleInitialCoordinates*) bunch->getParticleAttributes("ParticleInitialCoordinates");
+		ParticleMacroSize* partMacroSizeAttr = NULL;
+		if(bunch->hasParticleAttributes("macrosize") != 0){
+			partMacroSizeAttr  = (ParticleMacroSize*) bunch->getParticleAttributes("macrosize");
+		}
+		
+		int n_parts = bunch->getSize();
+		double** coordArr = bunch->coordArr();
+		double* s1_in   = sums_arr + 3;
+		double* s1_out  = sums_arr + 9;
+		double* q1_in   = sums_arr + 15;
+		double* q1_out  = sums_arr + 21;
+		double* q2_inin = sums_arr + 27;
+		double* q2_inout = sums_arr + 63;
+		double x_in[6];
+		double m_size = 1.0;
+		for(int ind = 0; ind < n_parts; ind++){
+			if(partMacroSizeAttr != NULL) m_size = partMacroSizeAttr->macrosize(ind);
+			double m2 = m_size*m_size;
+			double* x_out = coordArr[ind];
+			for (int i = 0; i < 6; i++){
+				x_in[i] = partInitCoordsAttr->attValue(ind,i);
+			}
+			sums_arr[1] += m_size;
+			sums_arr[2] += m2;
+			for (int i = 0; i < 6; i++){
+				s1_in[i]  += m_size*x_in[i];
+				s1_out[i] += m_size*x_out[i];
+				q1_in[i]  += m2*x_in[i];
+				q1_out[i] += m2*x_out[i];
+				double m2x = m2*x_in[i];
+				for (int j = i; j < 6; j++){
+					q2_inin[6*i+j] += m2x*x_in[j];
+				}
+				for (int j = 0; j < 6; j++){
+					q2_inout[6*i+j] += m2x*x_out[j];
+				}
+			}
+		}
+		sums_arr[0] += n_parts;
+		return n_parts;
+	}
+	
+	/** 
+	  A function calculates the transport matrix A (7x7) from the accumulated sums.
+	  It returns 0 if unsuccessful or the size of the statistics otherwise.
+	*/
+	int transport_mtrx_from_sums(double* sums_arr, Matrix* A_mtr){
+		
+		if(A_mtr->rows() != 7 || A_mtr->columns() != 7){
+			std::cerr << "OrbitUtils::bunch_utils_functions::transport_mtrx_from_sums(...) function"<< std::endl;
+			std::cerr << "Matix have wrong size (not 7x7)!"<< std::endl;
+			std::cerr << "Matrix A is:"<<A_mtr->rows()<<"x"<<A_mtr->columns()<< std::endl;
+			ORBIT_MPI_Finalize();				
+		}
+		
+		A_mtr->zero();
+		int n_parts_global = int(sums_arr[0] + 0.5);
+		if(n_parts_global <= 6 || sums_arr[1] == 0.) return 0;
+		
+		double total_macrosize = sums_arr[1];
+		double q0 = sums_arr[2];
+		double* s1_in   = sums_arr + 3;
+		double* s1_out  = sums_arr + 9;
+		double* q1_in   = sums_arr + 15;
+		double* q1_out  = sums_arr + 21;
+		double* q2_inin = sums_arr + 27;
+		double* q2_inout = sums_arr + 63;
+		
+		double arr_init_avg[6];
+		double arr_avg[6];
+		for (int i = 0; i < 6; i++){
+			arr_init_avg[i] = s1_in[i]/total_macrosize;
+			arr_avg[i] = s1_out[i]/total_macrosize;
+		}
+		
+		//---- the centered sums: sum(m^2*(x - x_avg)*(y - y_avg))
+		Matrix* XTXmtrx = new Matrix(6,6);
+		Matrix* XTYmtrx = new Matrix(6,6);
+		Matrix* Amtrx = new Matrix(6,6);
+		double** xtx = XTXmtrx->getArray();
+		double** xty = XTYmtrx->getArray();
+		for (int i = 0; i < 6; i++){
+			for (int j = i; j < 6; j++){
+				xtx[i][j] = q2_inin[6*i+j] - arr_init_avg[i]*q1_in[j] - q1_in[i]*arr_init_avg[j]
+				            + q0*arr_init_avg[i]*arr_init_avg[j];
+				xtx[j][i] = xtx[i][j];
+			}
+			for (int j = 0; j < 6; j++){
+				xty[i][j] = q2_inout[6*i+j] - arr_init_avg[i]*q1_out[j] - q1_in[i]*arr_avg[j]
+				            + q0*arr_init_avg[i]*arr_avg[j];
+			}
+		}
+		
+		// A^T = (X^T * X)^-1 * (X^T *Y)
+		XTXmtrx->copyTo(Amtrx);
+		MatrixOperations::invert(Amtrx);
+		
+		Amtrx->mult(XTYmtrx);
+		Amtrx->transpose();
+		for (int i = 0; i < 6; i++){
+			A_mtr->getArray()[i][6] = 0.;
+			for (int j = 0; j < 6; j++){
+				A_mtr->getArray()[i][j] = Amtrx->getArray()[i][j];
+				A_mtr->getArray()[i][6] -= Amtrx->getArray()[i][j]*arr_init_avg[j];
+			}
+			A_mtr->getArray()[i][6] += arr_avg[i];
+		}
+		A_mtr->getArray()[6][6] = 1.0;
+		
+		delete XTXmtrx;
+		delete XTYmtrx;
+		delete Amtrx;
+		
+		return n_parts_global;
+	}
+	
 	/** A function analyzes 6D coordinates and initial coords.
 	    Macrosize of macro-particles in the bunch will be 
 	    multiplied by wx*wy*wz where
@@ -60,6 +60,31 @@ namespace OrbitUtils{
 	*/
 	int transport_mtrx_from_init_coords(Bunch* bunch, Matrix* A_mtr, int appl_twiss_x, int appl_twiss_y, int appl_twiss_z);	
 	
+	/** The size of the array with sums for the transport matrix accumulation. */
+	const int TRANSPORT_MTRX_SUMS_SIZE = 99;
+	
+	/** A function accumulates the local (this CPU only) sums for the transport matrix
+	    between the initial coordinates attributes and the 6D coordinates in one pass 
+	    over the particles. The sums are added to sums_arr with TRANSPORT_MTRX_SUMS_SIZE
+	    elements:
+	    [0] number of particles, [1] sum(m), [2] sum(m^2), 
+	    [3-8] sum(m*x_in), [9-14] sum(m*x_out), [15-20] sum(m^2*x_in), [21-26] sum(m^2*x_out),
+	    [27-62] sum(m^2*x_in*x_in^T), [63-98] sum(m^2*x_in*x_out^T),
+	    where m is the macrosize particle attribute or 1 if it is not defined.
+	    The arrays from different CPUs or bunches should be summed before the
+	    transport_mtrx_from_sums(...) call.
+	    It returns the number of particles in the bunch.
+	*/
+	int transport_mtrx_sums_from_init_coords(Bunch* bunch, double* sums_arr);
+	
+	/** A function calculates the transport matrix A (7x7) with the last column as a vector b
+	    from the sums accumulated by the transport_mtrx_sums_from_init_coords(...) function.
+	    The result is the same as for transport_mtrx_from_init_coords(bunch,A_mtr) without
+	    Twiss weights.
+			It returns 0 if unsuccessful or the size of the statistics otherwise.
+	*/
+	int transport_mtrx_from_sums(double* sums_arr, Matrix* A_mtr);
+	
 	/** A function analyzes bunch with (ParticleInitialCoordinates) attributes 
 	    Macrosizes of macro-particles in the bunch will be 
 	    multiplied by the numbers wx0*wy0*wz0*wx1*wy1*wz1 where
@@ -21,11 +21,21 @@
 //    of the phase space by using functions from TwissFilteringFunctions.cc
 //    Function 1 assumes the equal weights for all macro-partiles, and 2nd uses weights according
 //    wx = exp(-(x^2+(alphax*x+betax*x')^2)/(2*(betax*emittancex)) etc.
+//    In the parallel case the macro-particles with the same Id could be on
+//    different CPUs. The bunch_sort_id_global(...) functions redistribute
+//    macro-particles between CPUs (the parallel sample sort), so the CPU
+//    with index i will have Ids from the i-th range of Ids only. The in and out
+//    bunches are redistributed with the same ranges, so the pairs of
+//    macro-particles with the same Id end up on the same CPU.
+//    The bunch_id_deltas(...) and bunch_id_survivors(...) functions use the
+//    same distributed matching to give the per-particle coordinate changes
+//    and the survivor mask of the input bunch without gathering to one CPU.
 //
 ///////////////////////////////////////////////////////////////////////////
 
 #include <algorithm>    // std::sort
 #include <vector>       // std::vector
+#include <climits>      // INT_MAX
 
 #include "ParticlesWithIdFunctions.hh"
 #include "ParticleIdNumber.hh"
@@ -71,22 +81,410 @@ namespace OrbitUtils{
 		}
 		mycomparator.partAttr = partAttr;
 		std::sort(numb_vector.begin(),numb_vector.end(),mycomparator);		
-		std::vector<double*> partVect(n_parts);
+		//---- the coordinates are copied, because the rows of coordArr()
+		//---- point into the contiguous block of the bunch and cannot be swapped
+		std::vector<double> partVect(n_parts*6);
 		std::vector<int> idVect(n_parts);
 		double** coordArr = bunch->coordArr();
 		for(int i=0; i<n_parts; ++i){
-			partVect[i] = coordArr[i];
+			for(int k=0; k<6; ++k){
+				partVect[i*6+k] = coordArr[i][k];
+			}
 			idVect[i] =partAttr->getIdNumber(i); 
 		}
 		int ind = 0;
 		for(int i=0; i<n_parts; ++i){
 			ind = numb_vector[i];
-			coordArr[i] = partVect[ind];
+			for(int k=0; k<6; ++k){
+				coordArr[i][k] = partVect[ind*6+k];
+			}
 			partAttr->setIdNumber(i,idVect[ind]);
 		}
 	}
 	
 	
+	/** 
+	  Calculates the Id ranges for CPUs (size_MPI-1 splitters) by using
+	  the regular sampling of Ids of macro-particles on all CPUs.
+	  CPU with index i will keep Ids in [splitters[i-1],splitters[i]).
+	*/
+	static void get_id_splitters(Bunch* bunch, std::vector<int>& splitters){
+		int size_MPI,rank_MPI;
+		ORBIT_MPI_Comm_size(bunch->getMPI_Comm_Local()->comm, &size_MPI);
+		ORBIT_MPI_Comm_rank(bunch->getMPI_Comm_Local()->comm, &rank_MPI);
+		splitters.clear();
+		splitters.resize(size_MPI-1,0);
+		if(size_MPI == 1) return;
+		bunch->compress();
+		int n_parts = bunch->getSize();
+		ParticleIdNumber* partAttr = (ParticleIdNumber*) bunch->getParticleAttributes("ParticleIdNumber");
+		std::vector<int> idVect(n_parts);
+		for(int i=0; i<n_parts; ++i){
+			idVect[i] = partAttr->getIdNumber(i);
+		}
+		std::sort(idVect.begin(),idVect.end());
+		//---- the samples are at [rank*(size-1)...], the numbers of samples at the end
+		int n_samples = size_MPI-1;
+		int n_arr = size_MPI*n_samples + size_MPI;
+		std::vector<int> sample_arr(n_arr,0);
+		std::vector<int> sample_arr_mpi(n_arr,0);
+		if(n_parts > 0){
+			for(int i=0; i<n_samples; ++i){
+				long ind = ((long) (i+1))*n_parts/size_MPI;
+				sample_arr[rank_MPI*n_samples + i] = idVect[ind];
+			}
+			sample_arr[size_MPI*n_samples + rank_MPI] = n_samples;
+		}
+		ORBIT_MPI_Allreduce(&sample_arr[0],&sample_arr_mpi[0],n_arr,MPI_INT,MPI_SUM,bunch->getMPI_Comm_Local()->comm);
+		std::vector<int> samples;
+		for(int i_cpu=0; i_cpu<size_MPI; ++i_cpu){
+			if(sample_arr_mpi[size_MPI*n_samples + i_cpu] == 0) continue;
+			for(int i=0; i<n_samples; ++i){
+				samples.push_back(sample_arr_mpi[i_cpu*n_samples + i]);
+			}
+		}
+		int n_samples_total = samples.size();
+		if(n_samples_total == 0) return;
+		std::sort(samples.begin(),samples.end());
+		for(int i=0; i<n_samples; ++i){
+			long ind = ((long) (i+1))*n_samples_total/size_MPI;
+			splitters[i] = samples[ind];
+		}
+	}
+	
+	/** 
+	  Moves macro-particles between CPUs according to Id ranges defined by splitters.
+	  The coordinates and all particles' attributes are moved.
+	*/
+	static void redistribute_by_id(Bunch* bunch, std::vector<int>& splitters){
+		int size_MPI,rank_MPI;
+		MPI_Comm comm = bunch->getMPI_Comm_Local()->comm;
+		ORBIT_MPI_Comm_size(comm, &size_MPI);
+		ORBIT_MPI_Comm_rank(comm, &rank_MPI);
+		if(size_MPI == 1) return;
+		bunch->compress();
+		int n_parts = bunch->getSize();
+		ParticleIdNumber* partAttr = (ParticleIdNumber*) bunch->getParticleAttributes("ParticleIdNumber");
+		//---- particles attributes layout
+		std::vector<std::string> attr_names;
+		bunch->getParticleAttributesNames(attr_names);
+		std::vector<ParticleAttributes*> attrVect;
+		int n_attr = 0;
+		for(int i=0, n = attr_names.size(); i<n; ++i){
+			ParticleAttributes* attr = bunch->getParticleAttributes(attr_names[i]);
+			attrVect.push_back(attr);
+			n_attr += attr->getAttSize();
+		}
+		int n_rec = 6 + n_attr;
+		//---- destination CPUs
+		std::vector<int> destVect(n_parts);
+		std::vector<int> count_send(size_MPI,0);
+		for(int i=0; i<n_parts; ++i){
+			int id = partAttr->getIdNumber(i);
+			int dest = std::upper_bound(splitters.begin(),splitters.end(),id) - splitters.begin();
+			destVect[i] = dest;
+			count_send[dest] += 1;
+		}
+		//---- the matrix of numbers of particles [from*size+to]
+		std::vector<int> count_mtrx(size_MPI*size_MPI,0);
+		std::vector<int> count_mtrx_mpi(size_MPI*size_MPI,0);
+		for(int i_cpu=0; i_cpu<size_MPI; ++i_cpu){
+			count_mtrx[rank_MPI*size_MPI + i_cpu] = count_send[i_cpu];
+		}
+		ORBIT_MPI_Allreduce(&count_mtrx[0],&count_mtrx_mpi[0],size_MPI*size_MPI,MPI_INT,MPI_SUM,comm);
+		//---- pack the send buffer grouped by destination
+		std::vector<int> offset_send(size_MPI+1,0);
+		std::vector<int> offset_recv(size_MPI+1,0);
+		for(int i_cpu=0; i_cpu<size_MPI; ++i_cpu){
+			offset_send[i_cpu+1] = offset_send[i_cpu] + count_send[i_cpu];
+			offset_recv[i_cpu+1] = offset_recv[i_cpu] + count_mtrx_mpi[i_cpu*size_MPI + rank_MPI];
+		}
+		int n_parts_recv = offset_recv[size_MPI];
+		std::vector<double> send_buff(n_parts*n_rec+1);
+		std::vector<double> recv_buff(n_parts_recv*n_rec+1);
+		std::vector<int> pos_send(offset_send.begin(),offset_send.end()-1);
+		double** coordArr = bunch->coordArr();
+		for(int i=0; i<n_parts; ++i){
+			double* rec = &send_buff[(pos_send[destVect[i]]++)*n_rec];
+			for(int k=0; k<6; ++k){
+				rec[k] = coordArr[i][k];
+			}
+			int ind_rec = 6;
+			for(int i_attr=0, n = attrVect.size(); i_attr<n; ++i_attr){
+				ParticleAttributes* attr = attrVect[i_attr];
+				for(int k=0, n_att = attr->getAttSize(); k<n_att; ++k){
+					rec[ind_rec] = attr->attValue(i,k);
+					ind_rec++;
+				}
+			}
+		}
+		//---- pairwise exchange: at each step CPUs are split into disjoint pairs
+		MPI_Status statusMPI;
+		for(int step=0; step<size_MPI; ++step){
+			int partner = (step - rank_MPI + size_MPI) % size_MPI;
+			int n_send = count_send[partner]*n_rec;
+			int n_recv = count_mtrx_mpi[partner*size_MPI + rank_MPI]*n_rec;
+			double* send_arr = &send_buff[offset_send[partner]*n_rec];
+			double* recv_arr = &recv_buff[offset_recv[partner]*n_rec];
+			if(partner == rank_MPI){
+				for(int i=0; i<n_send; ++i){
+					recv_arr[i] = send_arr[i];
+				}
+				continue;
+			}
+			if(rank_MPI < partner){
+				if(n_send > 0) ORBIT_MPI_Send(send_arr,n_send,MPI_DOUBLE,partner,1112,comm);
+				if(n_recv > 0) ORBIT_MPI_Recv(recv_arr,n_recv,MPI_DOUBLE,partner,1112,comm,&statusMPI);
+			} else {
+				if(n_recv > 0) ORBIT_MPI_Recv(recv_arr,n_recv,MPI_DOUBLE,partner,1112,comm,&statusMPI);
+				if(n_send > 0) ORBIT_MPI_Send(send_arr,n_send,MPI_DOUBLE,partner,1112,comm);
+			}
+		}
+		//---- unpack
+		bunch->deleteAllParticles();
+		for(int i=0; i<n_parts_recv; ++i){
+			double* rec = &recv_buff[i*n_rec];
+			int ind = bunch->addParticle(rec[0],rec[1],rec[2],rec[3],rec[4],rec[5]);
+			int ind_rec = 6;
+			for(int i_attr=0, n = attrVect.size(); i_attr<n; ++i_attr){
+				ParticleAttributes* attr = attrVect[i_attr];
+				for(int k=0, n_att = attr->getAttSize(); k<n_att; ++k){
+					attr->attValue(ind,k) = rec[ind_rec];
+					ind_rec++;
+				}
+			}
+		}
+		bunch->compress();
+	}
+	
+	/** A function that will sort the bunch according to Id over all CPUs.*/
+	void bunch_sort_id_global(Bunch* bunch){
+		bunch_sort_id_global(bunch,NULL);
+	}
+	
+	/** 
+	  A function that will sort two bunches according to Id over all CPUs. 
+	  The Id ranges for CPUs are defined by bunch_in.
+	*/
+	void bunch_sort_id_global(Bunch* bunch_in, Bunch* bunch_out){
+		int size_MPI,rank_MPI;
+		ORBIT_MPI_Comm_size(bunch_in->getMPI_Comm_Local()->comm, &size_MPI);
+		ORBIT_MPI_Comm_rank(bunch_in->getMPI_Comm_Local()->comm, &rank_MPI);
+		if(bunch_in->hasParticleAttributes("ParticleIdNumber") == 0 || 
+			(bunch_out != NULL && bunch_out->hasParticleAttributes("ParticleIdNumber") == 0)){
+			if(rank_MPI == 0){
+				std::cerr << "OrbitUtils::bunch_utils_functions::bunch_sort_id_global(...) function"<< std::endl;
+				std::cerr << "There is no ParticleAttributes in Bunch with this name."<< std::endl;
+				std::cerr << "name:"<<" ParticleIdNumber "<< std::endl;
+			}
+			ORBIT_MPI_Finalize();		
+		}
+		if(bunch_out != NULL && bunch_in->getMPI_Comm_Local() != bunch_out->getMPI_Comm_Local()){
+			if(rank_MPI == 0){
+				std::cerr << "OrbitUtils::bunch_utils_functions::bunch_sort_id_global(...) function"<< std::endl;
+				std::cerr << "Bunches In and Out have different MPI communicators!"<< std::endl;
+				std::cerr << "That is WRONG!"<< std::endl;
+			}
+			ORBIT_MPI_Finalize();			
+		}
+		if(size_MPI > 1){
+			std::vector<int> splitters;
+			get_id_splitters(bunch_in,splitters);
+			redistribute_by_id(bunch_in,splitters);
+			if(bunch_out != NULL) redistribute_by_id(bunch_out,splitters);
+		}
+		bunch_sort_id(bunch_in);
+		if(bunch_out != NULL) bunch_sort_id(bunch_out);
+	}
+	
+	/** 
+	  Fills out bunch_in_match and bunch_out_match with macro-particles 
+	  from bunch_in and bunch_out that have the same Id. 
+	*/
+	int bunch_match_id(Bunch* bunch_in, Bunch* bunch_out, Bunch* bunch_in_match, Bunch* bunch_out_match){
+		int size_MPI,rank_MPI;
+		ORBIT_MPI_Comm_size(bunch_in->getMPI_Comm_Local()->comm, &size_MPI);
+		ORBIT_MPI_Comm_rank(bunch_in->getMPI_Comm_Local()->comm, &rank_MPI);
+		if(bunch_in->hasParticleAttributes("ParticleIdNumber") == 0 || bunch_out->hasParticleAttributes("ParticleIdNumber") == 0){
+			if(rank_MPI == 0){
+				std::cerr << "OrbitUtils::bunch_utils_functions::bunch_match_id(...) function"<< std::endl;
+				std::cerr << "There is no ParticleAttributes  in Bunch with this name."<< std::endl;
+				std::cerr << "name:"<<" ParticleIdNumber "<< std::endl;
+			}
+			ORBIT_MPI_Finalize();		
+		}		
+		bunch_in->copyEmptyBunchTo(bunch_in_match);
+		bunch_out->copyEmptyBunchTo(bunch_out_match);
+		//---- in the parallel case the copies of bunches are redistributed between CPUs
+		Bunch* b_in = bunch_in;
+		Bunch* b_out = bunch_out;
+		if(size_MPI > 1){
+			b_in = new Bunch();
+			b_out = new Bunch();
+			bunch_in->copyBunchTo(b_in);
+			bunch_out->copyBunchTo(b_out);
+			bunch_sort_id_global(b_in,b_out);
+		} else {
+			bunch_sort_id(b_in);
+			bunch_sort_id(b_out);
+		}
+		int n_parts_in = b_in->getSize();
+		int n_parts_out = b_out->getSize();
+		ParticleIdNumber* partAttr_in = (ParticleIdNumber*) b_in->getParticleAttributes("ParticleIdNumber");		
+		ParticleIdNumber* partAttr_out = (ParticleIdNumber*) b_out->getParticleAttributes("ParticleIdNumber");
+		ParticleIdNumber* partAttr_in_match = (ParticleIdNumber*) bunch_in_match->getParticleAttributes("ParticleIdNumber");		
+		ParticleIdNumber* partAttr_out_match = (ParticleIdNumber*) bunch_out_match->getParticleAttributes("ParticleIdNumber");
+		ParticleMacroSize* partMacroSizeAttr_in = NULL;
+		ParticleMacroSize* partMacroSizeAttr_in_match = NULL;
+		ParticleMacroSize* partMacroSizeAttr_out_match = NULL;
+		if(b_in->hasParticleAttributes("macrosize") != 0 && b_out->hasParticleAttributes("macrosize") != 0){
+			partMacroSizeAttr_in = (ParticleMacroSize*) b_in->getParticleAttributes("macrosize");
+			partMacroSizeAttr_in_match  = (ParticleMacroSize*) bunch_in_match->getParticleAttributes("macrosize");
+			partMacroSizeAttr_out_match  = (ParticleMacroSize*) bunch_out_match->getParticleAttributes("macrosize");
+		}			
+		int ind_start_in = 0;
+		int count = 0;
+		for(int ind_out = 0; ind_out < n_parts_out; ind_out++){
+			int id_out =  partAttr_out->getIdNumber(ind_out);
+			for(int ind_in = ind_start_in; ind_in < n_parts_in; ind_in++){
+				if(partAttr_in->getIdNumber(ind_in) == id_out){
+					double* arr = b_in->coordArr()[ind_in];
+					bunch_in_match->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
+					arr = b_out->coordArr()[ind_out];
+					bunch_out_match->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
+					partAttr_in_match->setIdNumber(count,id_out);
+					partAttr_out_match->setIdNumber(count,id_out);
+					ind_start_in = ind_in;
+					if(partMacroSizeAttr_in != NULL){
+						double m_size = partMacroSizeAttr_in->macrosize(ind_in);
+						partMacroSizeAttr_in_match->macrosize(count) = m_size;
+						partMacroSizeAttr_out_match->macrosize(count) = m_size;
+					}		
+					count++;
+					break;
+				}
+			}
+		}
+		if(size_MPI > 1){
+			delete b_in;
+			delete b_out;
+		}
+		bunch_in_match->compress();
+		bunch_out_match->compress();
+		return bunch_in_match->getSizeGlobal();
+	}
+	
+	/** 
+	  Fills out bunch_delta with the differences of coordinates x_out - x_in of
+	  the macro-particles from bunch_in and bunch_out with the same Id.
+	  The bunch_delta is distributed between CPUs by Id ranges.
+	  It returns the global number of pairs.
+	*/
+	int bunch_id_deltas(Bunch* bunch_in, Bunch* bunch_out, Bunch* bunch_delta){
+		Bunch* b_in_tmp = new Bunch();
+		Bunch* b_out_tmp = new Bunch();
+		int n_pairs_global = bunch_match_id(bunch_in,bunch_out,b_in_tmp,b_out_tmp);
+		b_out_tmp->copyEmptyBunchTo(bunch_delta);
+		ParticleIdNumber* partAttr_tmp = (ParticleIdNumber*) b_out_tmp->getParticleAttributes("ParticleIdNumber");
+		ParticleIdNumber* partAttr_delta = (ParticleIdNumber*) bunch_delta->getParticleAttributes("ParticleIdNumber");
+		double** coordArr_in = b_in_tmp->coordArr();
+		double** coordArr_out = b_out_tmp->coordArr();
+		for(int ind = 0, n_parts = b_out_tmp->getSize(); ind < n_parts; ind++){
+			double* arr_in = coordArr_in[ind];
+			double* arr_out = coordArr_out[ind];
+			int ind_delta = bunch_delta->addParticle(arr_out[0] - arr_in[0],arr_out[1] - arr_in[1],
+				arr_out[2] - arr_in[2],arr_out[3] - arr_in[3],arr_out[4] - arr_in[4],arr_out[5] - arr_in[5]);
+			partAttr_delta->setIdNumber(ind_delta,partAttr_tmp->getIdNumber(ind));
+		}
+		delete b_in_tmp;
+		delete b_out_tmp;
+		return n_pairs_global;
+	}
+	
+	/** 
+	  Fills out the survivor mask for the macro-particles of bunch_in on this CPU.
+	  The mask[i] is 1 if the macro-particle i of bunch_in has the Id that is present
+	  in bunch_out on any CPU, and 0 otherwise. In the parallel case the Ids are
+	  matched on the CPUs defined by the Id ranges, and the flags are sent back
+	  to the CPUs of bunch_in. The bunches are not changed except the compress().
+	  It returns the global number of survived macro-particles.
+	*/
+	int bunch_id_survivors(Bunch* bunch_in, Bunch* bunch_out, std::vector<int>& mask){
+		int size_MPI,rank_MPI;
+		MPI_Comm comm = bunch_in->getMPI_Comm_Local()->comm;
+		ORBIT_MPI_Comm_size(comm, &size_MPI);
+		ORBIT_MPI_Comm_rank(comm, &rank_MPI);
+		if(bunch_in->hasParticleAttributes("ParticleIdNumber") == 0 || bunch_out->hasParticleAttributes("ParticleIdNumber") == 0){
+			if(rank_MPI == 0){
+				std::cerr << "OrbitUtils::bunch_utils_functions::bunch_id_survivors(...) function"<< std::endl;
+				std::cerr << "There is no ParticleAttributes  in Bunch with this name."<< std::endl;
+				std::cerr << "name:"<<" ParticleIdNumber "<< std::endl;
+			}
+			ORBIT_MPI_Finalize();		
+		}
+		bunch_in->compress();
+		bunch_out->compress();
+		int n_parts = bunch_in->getSize();
+		mask.assign(n_parts,0);
+		//---- the copy of bunch_in keeps the origin (CPU rank, index) in x and x' 
+		Bunch* b_in = new Bunch();
+		Bunch* b_out = new Bunch();
+		bunch_in->copyEmptyBunchTo(b_in);
+		bunch_out->copyBunchTo(b_out);
+		ParticleIdNumber* partAttr = (ParticleIdNumber*) bunch_in->getParticleAttributes("ParticleIdNumber");
+		ParticleIdNumber* partAttr_in = (ParticleIdNumber*) b_in->getParticleAttributes("ParticleIdNumber");
+		for(int i = 0; i < n_parts; i++){
+			int ind = b_in->addParticle((double) rank_MPI,(double) i,0.,0.,0.,0.);
+			partAttr_in->setIdNumber(ind,partAttr->getIdNumber(i));
+		}
+		if(size_MPI > 1){
+			bunch_sort_id_global(b_in,b_out);
+		} else {
+			bunch_sort_id(b_in);
+			bunch_sort_id(b_out);
+		}
+		//---- both bunches are sorted by Id on this CPU, so one merge pass is enough
+		ParticleIdNumber* partAttr_out = (ParticleIdNumber*) b_out->getParticleAttributes("ParticleIdNumber");
+		int n_parts_in = b_in->getSize();
+		int n_parts_out = b_out->getSize();
+		std::vector<int> flagVect(n_parts_in,0);
+		int ind_out = 0;
+		int n_survived = 0;
+		for(int ind_in = 0; ind_in < n_parts_in; ind_in++){
+			int id_in = partAttr_in->getIdNumber(ind_in);
+			while(ind_out < n_parts_out && partAttr_out->getIdNumber(ind_out) < id_in){ind_out++;}
+			if(ind_out < n_parts_out && partAttr_out->getIdNumber(ind_out) == id_in){
+				flagVect[ind_in] = 1;
+				n_survived++;
+			}
+		}
+		//---- the flags are sent back to the origin CPUs. The Id of a record is
+		//---- the origin rank, and the splitters [1,2,...,size-1] send it there.
+		Bunch* b_back = new Bunch();
+		b_in->copyEmptyBunchTo(b_back);
+		ParticleIdNumber* partAttr_back = (ParticleIdNumber*) b_back->getParticleAttributes("ParticleIdNumber");
+		double** coordArr = b_in->coordArr();
+		for(int ind_in = 0; ind_in < n_parts_in; ind_in++){
+			int ind = b_back->addParticle(coordArr[ind_in][1],(double) flagVect[ind_in],0.,0.,0.,0.);
+			partAttr_back->setIdNumber(ind,(int) coordArr[ind_in][0]);
+		}
+		std::vector<int> splitters(size_MPI-1,0);
+		for(int i = 0; i < size_MPI-1; i++){
+			splitters[i] = i+1;
+		}
+		redistribute_by_id(b_back,splitters);
+		coordArr = b_back->coordArr();
+		for(int ind = 0, n = b_back->getSize(); ind < n; ind++){
+			mask[(int) coordArr[ind][0]] = (int) coordArr[ind][1];
+		}
+		delete b_in;
+		delete b_out;
+		delete b_back;
+		int n_survived_global = 0;
+		ORBIT_MPI_Allreduce(&n_survived,&n_survived_global,1,MPI_INT,MPI_SUM,comm);
+		return n_survived_global;
+	}
+	
 	int transport_mtrx(Bunch* bunch_in, Bunch* bunch_out, Matrix* A_mtr){
 		return transport_mtrx(bunch_in,bunch_out,A_mtr,0,0,0);
 	}
@@ -130,43 +528,8 @@ namespace OrbitUtils{
 		//---------------fill out the temporary bunches
 		Bunch* b_in_tmp = new Bunch();
 		Bunch* b_out_tmp = new Bunch();
-		bunch_in->copyEmptyBunchTo(b_in_tmp);
-		bunch_out->copyEmptyBunchTo(b_out_tmp);
-		bunch_sort_id(bunch_in);
-		bunch_sort_id(bunch_out);
-		int n_parts_in = bunch_in->getSize();
-		int n_parts_out = bunch_out->getSize();
-		ParticleIdNumber* partAttr_in = (ParticleIdNumber*) bunch_in->getParticleAttributes("ParticleIdNumber");		
-		ParticleIdNumber* partAttr_out = (ParticleIdNumber*) bunch_out->getParticleAttributes("ParticleIdNumber");
-		ParticleMacroSize* partMacroSizeAttr_in = NULL;
+		bunch_match_id(bunch_in,bunch_out,b_in_tmp,b_out_tmp);
 		ParticleMacroSize* partMacroSizeAttr_in_tmp = NULL;
-		ParticleMacroSize* partMacroSizeAttr_out_tmp = NULL;
-		if(bunch_in->hasParticleAttributes("macrosize") != 0 && bunch_out->hasParticleAttributes("macrosize") != 0){
-			partMacroSizeAttr_in = (ParticleMacroSize*) bunch_in->getParticleAttributes("macrosize");
-			partMacroSizeAttr_in_tmp  = (ParticleMacroSize*) b_in_tmp->getParticleAttributes("macrosize");
-			partMacroSizeAttr_out_tmp  = (ParticleMacroSize*) b_out_tmp->getParticleAttributes("macrosize");
-		}			
-		int ind_start_in = 0;
-		int count = 0;
-		for(int ind_out = 0; ind_out < n_parts_out; ind_out++){
-			int id_out =  partAttr_out->getIdNumber(ind_out);
-			for(int ind_in = ind_start_in; ind_in < n_parts_in; ind_in++){
-				if(partAttr_in->getIdNumber(ind_in) == id_out){
-					double* arr = bunch_in->coordArr()[ind_in];
-					b_in_tmp->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
-					arr = bunch_out->coordArr()[ind_out];
-					b_out_tmp->addParticle(arr[0],arr[1],arr[2],arr[3],arr[4],arr[5]);
-					ind_start_in = ind_in;
-					if(partMacroSizeAttr_in != NULL){
-						double m_size = partMacroSizeAttr_in->macrosize(ind_in);
-						partMacroSizeAttr_in_tmp->macrosize(count) = m_size;
-						partMacroSizeAttr_out_tmp->macrosize(count) = m_size;
-					}		
-					count++;
-					break;
-				}
-			}
-		}
 		
 		b_in_tmp->compress();
 		b_out_tmp->compress();
@@ -236,7 +599,7 @@ namespace OrbitUtils{
 			
 			for(int ind = 0; ind < n_parts; ind++){
 				double m_size = 1.0;
-				if(partMacroSizeAttr_in != NULL) m_size = partMacroSizeAttr_in_tmp->macrosize(ind);
+				if(partMacroSizeAttr_in_tmp != NULL) m_size = partMacroSizeAttr_in_tmp->macrosize(ind);
 				for (int i = 0; i < 6; i++){
 					b_in_tmp->coordArr()[ind][i] -= m_size*arr_avg_in_mpi[i]; 
 					b_out_tmp->coordArr()[ind][i] -= m_size*arr_avg_out_mpi[i];
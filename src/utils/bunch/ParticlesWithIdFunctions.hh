@@ -18,6 +18,7 @@
 #define PARTICLES_WITH_ID_FUNCTIONS_H
 
 #include <cmath>
+#include <vector>
 
 //ORBIT bunch
 #include "Bunch.hh"
@@ -29,6 +30,47 @@ namespace OrbitUtils{
 	/** A function that will sort bunch according to Id.*/
 	void bunch_sort_id(Bunch* bunch);
 	
+	/** 
+	  A function that will sort bunch according to Id over all CPUs. 
+	  Macro-particles are moved between CPUs, and after sorting the CPU 
+	  with a bigger rank has bigger Ids. 
+	*/
+	void bunch_sort_id_global(Bunch* bunch);
+	
+	/** 
+	  A function that will sort two bunches according to Id over all CPUs. 
+	  The Id ranges for CPUs are the same for both bunches and defined by bunch_in, 
+	  so the macro-particles with the same Id will be on the same CPU. 
+	  The bunch_out could be NULL.
+	*/
+	void bunch_sort_id_global(Bunch* bunch_in, Bunch* bunch_out);
+	
+	/** 
+	  A function fills out bunch_in_match and bunch_out_match with the pairs of
+	  macro-particles from bunch_in and bunch_out with the same Id. The pairs
+	  have the same index and they are on the same CPU. In the parallel case 
+	  the macro-particles with the same Id could be on different CPUs in bunch_in 
+	  and bunch_out. The initial bunches are not changed in this case.
+	  It returns the global number of pairs.
+	*/
+	int bunch_match_id(Bunch* bunch_in, Bunch* bunch_out, Bunch* bunch_in_match, Bunch* bunch_out_match);
+	
+	/** 
+	  A function fills out bunch_delta with the differences of coordinates
+	  x_out - x_in of the macro-particles with the same Id in bunch_in and bunch_out. 
+	  The bunch_delta is distributed between CPUs according to the Id ranges. 
+	  It returns the global number of pairs.
+	*/
+	int bunch_id_deltas(Bunch* bunch_in, Bunch* bunch_out, Bunch* bunch_delta);
+	
+	/** 
+	  A function fills out the mask for the local macro-particles of bunch_in. 
+	  The mask[i] is 1 if the Id of the macro-particle i is present in bunch_out on
+	  any CPU, and 0 if the macro-particle was lost. 
+	  It returns the global number of survived macro-particles.
+	*/
+	int bunch_id_survivors(Bunch* bunch_in, Bunch* bunch_out, std::vector<int>& mask);
+	
 	/** 
 	  Calculates transport matrix A: x_out = A*x_in +b. A is a 7x7 matrix. 
 		The last column of A is the b vector.
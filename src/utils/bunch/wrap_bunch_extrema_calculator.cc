@@ -91,6 +91,26 @@ extern "C" {
 		return Py_BuildValue("(d,d)", zMin, zMax);
   }
   
+	//Calculates xMin,xMax, xpMin,xpMax, yMin,yMax, ypMin,ypMax, zMin,zMax, dE_Min,dE_Max
+  static PyObject* BunchExtremaCalculator_extrema(PyObject *self, PyObject *args){
+		PyObject *pyIn;
+		if(!PyArg_ParseTuple(args,"O:extrema",&pyIn)){
+			error("PyBunchExtremaCalculator - extrema(Bunch) - Bunch is needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType))){
+			error("PyBunchExtremaCalculator - extrema(Bunch) - input parameter is not Bunch");
+		}		
+		Bunch* bunch = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		BunchExtremaCalculator* cpp_BunchExtremaCalculator = (BunchExtremaCalculator*) (((pyORBIT_Object*) self)->cpp_obj);
+		double coordMin[6];
+		double coordMax[6];
+		cpp_BunchExtremaCalculator->getExtrema(bunch, coordMin, coordMax);	
+		return Py_BuildValue("(d,d,d,d,d,d,d,d,d,d,d,d)", 
+			coordMin[0], coordMax[0], coordMin[1], coordMax[1], coordMin[2], coordMax[2],
+			coordMin[3], coordMax[3], coordMin[4], coordMax[4], coordMin[5], coordMax[5]);
+  }
+  
   //-----------------------------------------------------
   //destructor for python BunchExtremaCalculator class (__del__ method).
   //-----------------------------------------------------
@@ -105,6 +125,7 @@ extern "C" {
     { "extremaXYZ",      BunchExtremaCalculator_extremaXYZ    ,METH_VARARGS,"Returns tuple with (xMin, xMax, yMin, yMax, zMin, zMax)"},
     { "extremaXpYpdE",   BunchExtremaCalculator_extremaXpYpdE ,METH_VARARGS,"Returns tuple with (xpMin, xpMax, ypMin, ypMax, dE_Min, dE_Max)"},
     { "extremaZ",        BunchExtremaCalculator_extremaZ      ,METH_VARARGS,"Returns tuple with (zMin, zMax)"},
+    { "extrema",         BunchExtremaCalculator_extrema       ,METH_VARARGS,"Returns tuple with (xMin, xMax, xpMin, xpMax, yMin, yMax, ypMin, ypMax, zMin, zMax, dE_Min, dE_Max)"},
     {NULL}
   };
 
@@ -40,6 +40,90 @@ extern "C" {
     return Py_None;	
 	}	
 	
+	static PyObject* wrap_part_wit_id_sort_global(PyObject* self, PyObject* args)
+	{
+		PyObject *pyIn;
+		PyObject *pyOut = NULL;
+		if(!PyArg_ParseTuple(args,"O|O:bunchSortIdGlobal",&pyIn,&pyOut)){
+			error("bunchSortIdGlobal(Bunch[,Bunch out]) - Bunch is needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType)) || (pyOut != NULL && !PyObject_IsInstance(pyOut,pyBunchType))){
+			error("bunchSortIdGlobal(Bunch[,Bunch out]) - input parameter is not Bunch");
+		}		
+		Bunch* bunch_in = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		Bunch* bunch_out = NULL;
+		if(pyOut != NULL) bunch_out = (Bunch*) ((pyORBIT_Object*) pyOut)->cpp_obj;
+		bunch_sort_id_global(bunch_in,bunch_out);
+    Py_INCREF(Py_None);
+    return Py_None;	
+	}	
+	
+	static PyObject* wrap_part_wit_id_match(PyObject* self, PyObject* args)
+	{
+		PyObject *pyIn;
+		PyObject *pyOut;
+		PyObject *pyInMatch;
+		PyObject *pyOutMatch;
+		if(!PyArg_ParseTuple(args,"OOOO:bunchMatchId",&pyIn,&pyOut,&pyInMatch,&pyOutMatch)){
+			error("bunchMatchId(Bunch in,Bunch out,Bunch in_match,Bunch out_match) - 4 Bunches are needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType)) || (!PyObject_IsInstance(pyOut,pyBunchType)) ||
+			(!PyObject_IsInstance(pyInMatch,pyBunchType)) || (!PyObject_IsInstance(pyOutMatch,pyBunchType))){
+			error("bunchMatchId(Bunch in,Bunch out,Bunch in_match,Bunch out_match) - input parameter is not Bunch");
+		}		
+		Bunch* bunch_in = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		Bunch* bunch_out = (Bunch*) ((pyORBIT_Object*) pyOut)->cpp_obj;
+		Bunch* bunch_in_match = (Bunch*) ((pyORBIT_Object*) pyInMatch)->cpp_obj;
+		Bunch* bunch_out_match = (Bunch*) ((pyORBIT_Object*) pyOutMatch)->cpp_obj;
+		int n_pairs = bunch_match_id(bunch_in,bunch_out,bunch_in_match,bunch_out_match);
+    return Py_BuildValue("i", n_pairs);	
+	}	
+	
+	static PyObject* wrap_part_wit_id_deltas(PyObject* self, PyObject* args)
+	{
+		PyObject *pyIn;
+		PyObject *pyOut;
+		PyObject *pyDelta;
+		if(!PyArg_ParseTuple(args,"OOO:bunchIdDeltas",&pyIn,&pyOut,&pyDelta)){
+			error("bunchIdDeltas(Bunch in,Bunch out,Bunch delta) - 3 Bunches are needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType)) || (!PyObject_IsInstance(pyOut,pyBunchType)) ||
+			(!PyObject_IsInstance(pyDelta,pyBunchType))){
+			error("bunchIdDeltas(Bunch in,Bunch out,Bunch delta) - input parameter is not Bunch");
+		}		
+		Bunch* bunch_in = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		Bunch* bunch_out = (Bunch*) ((pyORBIT_Object*) pyOut)->cpp_obj;
+		Bunch* bunch_delta = (Bunch*) ((pyORBIT_Object*) pyDelta)->cpp_obj;
+		int n_pairs = bunch_id_deltas(bunch_in,bunch_out,bunch_delta);
+    return Py_BuildValue("i", n_pairs);	
+	}	
+	
+	static PyObject* wrap_part_wit_id_survivors(PyObject* self, PyObject* args)
+	{
+		PyObject *pyIn;
+		PyObject *pyOut;
+		if(!PyArg_ParseTuple(args,"OO:bunchIdSurvivors",&pyIn,&pyOut)){
+			error("bunchIdSurvivors(Bunch in,Bunch out) - 2 Bunches are needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType)) || (!PyObject_IsInstance(pyOut,pyBunchType))){
+			error("bunchIdSurvivors(Bunch in,Bunch out) - input parameter is not Bunch");
+		}		
+		Bunch* bunch_in = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		Bunch* bunch_out = (Bunch*) ((pyORBIT_Object*) pyOut)->cpp_obj;
+		std::vector<int> mask;
+		bunch_id_survivors(bunch_in,bunch_out,mask);
+		int n_parts = mask.size();
+		PyObject* pyMask = PyTuple_New(n_parts);
+		for(int i = 0; i < n_parts; i++){
+			PyTuple_SetItem(pyMask,i,Py_BuildValue("i",mask[i]));
+		}
+    return pyMask;	
+	}	
+	
 	static PyObject* wrap_transport_mtrx(PyObject* self, PyObject* args)
 	{
 		PyObject *pyIn;
@@ -122,6 +206,54 @@ extern "C" {
     return Py_BuildValue("i", n_stat);	
 	}		
 	
+	static PyObject* wrap_transport_mtrx_sums_from_init_coords(PyObject* self, PyObject* args)
+	{
+		PyObject *pyIn;
+		if(!PyArg_ParseTuple(args,"O:transportMtrxSumsFromInitCoords",&pyIn)){
+			error("transportMtrxSumsFromInitCoords(Bunch) - Bunch is needed.");
+		}			
+		PyObject* pyBunchType = wrap_orbit_bunch::getBunchType("Bunch");
+		if((!PyObject_IsInstance(pyIn,pyBunchType))){
+			error("transportMtrxSumsFromInitCoords(Bunch) - input parameter is not Bunch");
+		}	
+		Bunch* bunch = (Bunch*) ((pyORBIT_Object*) pyIn)->cpp_obj;
+		double sums_arr[TRANSPORT_MTRX_SUMS_SIZE];
+		for(int i = 0; i < TRANSPORT_MTRX_SUMS_SIZE; i++){
+			sums_arr[i] = 0.;
+		}
+		transport_mtrx_sums_from_init_coords(bunch,sums_arr);
+		PyObject* resTuple = PyTuple_New(TRANSPORT_MTRX_SUMS_SIZE);
+		for(int i = 0; i < TRANSPORT_MTRX_SUMS_SIZE; i++){
+			PyTuple_SetItem(resTuple,i,Py_BuildValue("d",sums_arr[i]));
+		}
+		return resTuple;
+	}
+	
+	static PyObject* wrap_transport_mtrx_from_sums(PyObject* self, PyObject* args)
+	{
+		PyObject *pySums;
+		PyObject *pyM;
+		if(!PyArg_ParseTuple(args,"OO:transportMtrxFromSums",&pySums,&pyM)){
+			error("transportMtrxFromSums(sums,Matrix) - sums sequence and Matrix are needed.");
+		}
+		if(!PySequence_Check(pySums) || PySequence_Size(pySums) != TRANSPORT_MTRX_SUMS_SIZE){
+			error("transportMtrxFromSums(sums,Matrix) - sums should be a sequence from transportMtrxSumsFromInitCoords(bunch).");
+		}
+		PyObject* pyORBIT_Matrix_Type = wrap_orbit_utils::getOrbitUtilsType("Matrix");
+		if(!PyObject_IsInstance(pyM,pyORBIT_Matrix_Type)){
+			error("transportMtrxFromSums(sums,Matrix) - function needs a matrix.");
+		}
+		double sums_arr[TRANSPORT_MTRX_SUMS_SIZE];
+		for(int i = 0; i < TRANSPORT_MTRX_SUMS_SIZE; i++){
+			PyObject* pyVal = PySequence_GetItem(pySums,i);
+			sums_arr[i] = PyFloat_AsDouble(pyVal);
+			Py_DECREF(pyVal);
+		}
+		Matrix* mtrx = (Matrix*) ((pyORBIT_Object*) pyM)->cpp_obj;
+		int n_stat = transport_mtrx_from_sums(sums_arr,mtrx);
+    return Py_BuildValue("i", n_stat);	
+	}
+	
 	static PyObject* wrap_bunch_twiss_filtering(PyObject* self, PyObject* args)
 	{
 		PyObject *pyIn;
@@ -145,10 +277,16 @@ extern "C" {
 	// they will be vailable from python level
 	static PyMethodDef BunchUtilsFunctionMethods[] = { 		
 		{"bunchSortId",  wrap_part_wit_id_sort    , METH_VARARGS, "bunchSortId(bunch) - Sorting bunch according to the Id particles attributes."},
+		{"bunchSortIdGlobal",  wrap_part_wit_id_sort_global, METH_VARARGS, "bunchSortIdGlobal(bunch[,bunch_out]) - Sorting bunch (or two bunches) according to the Id over all CPUs."},
+		{"bunchMatchId",  wrap_part_wit_id_match, METH_VARARGS, "bunchMatchId(bunch in,bunch out,bunch in_match,bunch out_match) - pairs of particles with the same Id over all CPUs."},
+		{"bunchIdDeltas",  wrap_part_wit_id_deltas, METH_VARARGS, "bunchIdDeltas(bunch in,bunch out,bunch delta) - coordinates differences out - in of particles with the same Id over all CPUs."},
+		{"bunchIdSurvivors",  wrap_part_wit_id_survivors, METH_VARARGS, "bunchIdSurvivors(bunch in,bunch out) - tuple of 0/1 flags for local particles of bunch in that are present in bunch out."},
 		{"transportMtrx", wrap_transport_mtrx , METH_VARARGS, "transportMtrx(bunch in, bunch out, matrix) - calculates transport matrix."},
 		{"copyCoordsToInitCoordsAttr",wrap_copyCoordsToInitCoordsAttr, METH_VARARGS,"copyCoordsToInitCoordsAttr(bunch) - copy coords to Init Coords Attr."},
 		{"swapInitCoordsAttrAndCoords",wrap_swapInitCoordsAttrAndCoords, METH_VARARGS,"swapInitCoordsAttrAndCoords(bunch) - swap coords to Init Coords Attr."},
 		{"transportMtrxFromInitCoords", wrap_transport_mtrx_from_init_coords , METH_VARARGS, "transportMtrx(bunch in, matrix) - calculates transport matrix."},
+		{"transportMtrxSumsFromInitCoords", wrap_transport_mtrx_sums_from_init_coords , METH_VARARGS, "transportMtrxSumsFromInitCoords(bunch) - returns the local sums for the transport matrix."},
+		{"transportMtrxFromSums", wrap_transport_mtrx_from_sums , METH_VARARGS, "transportMtrxFromSums(sums, matrix) - calculates transport matrix from the summed sums."},
 		{"bunchTwissFiltering",  wrap_bunch_twiss_filtering, METH_VARARGS, "bunchTwissFiltering(bunch_in,bunch_bad, x_lim, y_lim, z_lim) - bunch Twiss filtering"},		
 		{NULL, NULL, 0, NULL}        /* Sentinel */
 	};